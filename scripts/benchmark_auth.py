@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Authentication overhead per request with and without the principal cache.
+
+Resolves the principal of one bearer token through
+``get_current_user_from_token`` (the dependency behind every authenticated
+endpoint) with PRINCIPAL_CACHE_TTL=0, which reads the user from the metadata
+database each time, and with the in-process principal cache enabled, and
+reports time and database statements per request.
+
+Needs a migrated metadata database (DATABASE_URL); the benchmark creates its
+own user and deletes it afterwards.
+
+Usage:
+    python scripts/benchmark_auth.py [--requests 1000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from text2x.api.auth import (  # noqa: E402
+    create_access_token,
+    get_current_user_from_token,
+    invalidate_principal,
+)
+from text2x.config import settings  # noqa: E402
+from text2x.models.base import DatabaseConfig, close_db, init_db  # noqa: E402
+from text2x.repositories.user import UserRepository  # noqa: E402
+
+
+async def run(db, credentials, requests: int, cache_ttl: int) -> dict:
+    """Authenticate the same token repeatedly and count database work per request."""
+    statements = 0
+
+    def count(*args, **kwargs):
+        nonlocal statements
+        statements += 1
+
+    settings.principal_cache_ttl = cache_ttl
+    event.listen(db.engine.sync_engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    try:
+        for _ in range(requests):
+            await get_current_user_from_token(credentials)
+    finally:
+        elapsed = time.perf_counter() - start
+        event.remove(db.engine.sync_engine, "before_cursor_execute", count)
+
+    return {"statements": statements / requests, "us": elapsed / requests * 1_000_000}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per variant")
+    args = parser.parse_args()
+
+    db = init_db(DatabaseConfig.from_settings())
+    repository = UserRepository()
+    user = await repository.create_user(
+        email=f"benchmark-{uuid.uuid4().hex[:8]}@example.com",
+        password=uuid.uuid4().hex,
+        name="Benchmark",
+    )
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=create_access_token(str(user.id), user.email)
+    )
+    cache_ttl = settings.principal_cache_ttl or 30
+    try:
+        uncached = await run(db, credentials, args.requests, cache_ttl=0)
+        cached = await run(db, credentials, args.requests, cache_ttl=cache_ttl)
+    finally:
+        await invalidate_principal(str(user.id))
+        await repository.delete_user(user.id)
+        await close_db()
+
+    print(f"{'per request':<24}{'statements':>12}{'us':>10}")
+    for label, result in (("database lookup", uncached), ("principal cache", cached)):
+        print(f"{label:<24}{result['statements']:>12.2f}{result['us']:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the per-call AWS credential overhead in LiteLLMClient.
+
+Compares resolving credentials on every call (a new boto3 session, credential
+resolution and os.environ writes, as LiteLLMClient used to do) with the
+cached AWSCredentialProvider now used to build each request's arguments.
+
+Static dummy credentials are used, so no AWS access or network is needed;
+with instance-role credentials the per-call resolution is slower still.
+
+Usage:
+    python scripts/benchmark_llm_credentials.py [--calls 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import boto3
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from text2x.llm.credentials import AWSCredentialProvider  # noqa: E402
+
+
+def resolve_per_call() -> None:
+    """What every LLM call did before: resolve through boto3 and rewrite the environment."""
+    credentials = boto3.Session().get_credentials()
+    frozen = credentials.get_frozen_credentials()
+    os.environ["AWS_ACCESS_KEY_ID"] = frozen.access_key
+    os.environ["AWS_SECRET_ACCESS_KEY"] = frozen.secret_key
+
+
+def time_per_call(fn, calls: int) -> float:
+    """Mean microseconds per call."""
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000, help="Calls per variant")
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "AKIABENCHMARK")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark-secret")
+
+    provider = AWSCredentialProvider("us-east-1")
+
+    per_call = time_per_call(resolve_per_call, args.calls)
+    cached = time_per_call(provider.litellm_kwargs, args.calls)
+
+    print(f"{'variant':<32}{'us/call':>12}")
+    print(f"{'resolve per call (before)':<32}{per_call:>12.1f}")
+    print(f"{'cached provider (after)':<32}{cached:>12.1f}")
+    print(f"speedup: {per_call / cached:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
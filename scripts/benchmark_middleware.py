@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Throughput of a trivial endpoint behind the observability middleware.
+
+Serves ``GET /ping`` (returning a small JSON body) through httpx's ASGI
+transport, so no network or server is involved, with:
+
+- no middleware
+- the former ``BaseHTTPMiddleware`` implementation (reproduced below: the
+  same correlation ID, metrics and two log lines per request)
+- the pure ASGI ``RequestTracingMiddleware``, logging every request and with
+  request logs sampled at ``--sample-rate``
+
+and reports requests per second and the added latency per request. Log
+records are created at INFO and discarded by a NullHandler, so formatting
+and I/O costs are left out.
+
+Usage:
+    python scripts/benchmark_middleware.py [--requests 5000] [--sample-rate 0.1]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from text2x.api.middleware import RequestTracingMiddleware  # noqa: E402
+from text2x.utils.observability import (  # noqa: E402
+    correlation_context,
+    generate_correlation_id,
+    record_http_duration,
+    record_http_request,
+    sanitize_endpoint,
+)
+
+logger = logging.getLogger("text2x.api.middleware")
+
+
+class BaseHTTPTracingMiddleware(BaseHTTPMiddleware):
+    """The previous RequestTracingMiddleware, for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        correlation_id = request.headers.get("X-Correlation-ID") or generate_correlation_id()
+        with correlation_context(correlation_id):
+            start_time = time.time()
+            logger.info(
+                "Request started",
+                extra={
+                    "correlation_id": correlation_id,
+                    "method": request.method,
+                    "path": request.url.path,
+                    "user_agent": request.headers.get("User-Agent", "unknown"),
+                    "client_host": request.client.host if request.client else "unknown",
+                },
+            )
+            response = await call_next(request)
+            duration = time.time() - start_time
+            endpoint = sanitize_endpoint(request.url.path)
+            record_http_request(request.method, endpoint, response.status_code)
+            record_http_duration(request.method, endpoint, duration)
+            logger.info(
+                "Request completed",
+                extra={
+                    "correlation_id": correlation_id,
+                    "method": request.method,
+                    "path": request.url.path,
+                    "status_code": response.status_code,
+                    "duration_ms": round(duration * 1000, 2),
+                },
+            )
+            response.headers["X-Correlation-ID"] = correlation_id
+            return response
+
+
+def make_app(middleware=None, **options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+    return app
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    """Send requests one after another and return the seconds per request."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(requests, 200)):  # warm up
+            await client.get("/ping")
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/ping")
+        return (time.perf_counter() - start) / requests
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per variant")
+    parser.add_argument(
+        "--sample-rate", type=float, default=0.1, help="Request log sample rate to compare"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+
+    variants = [
+        ("no middleware", make_app()),
+        ("BaseHTTPMiddleware", make_app(BaseHTTPTracingMiddleware)),
+        ("pure ASGI", make_app(RequestTracingMiddleware, sample_rate=1.0)),
+        (
+            f"pure ASGI, {args.sample_rate:g} sampled",
+            make_app(RequestTracingMiddleware, sample_rate=args.sample_rate),
+        ),
+    ]
+    results = [(label, await run(app, args.requests)) for label, app in variants]
+
+    baseline = results[0][1]
+    print(f"{'variant':<30}{'req/s':>10}{'added us/req':>14}")
+    for label, seconds in results:
+        print(f"{label:<30}{1 / seconds:>10.0f}{(seconds - baseline) * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
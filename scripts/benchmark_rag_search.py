@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Recall and latency of the database RAG search, the former way and with full-text search.
+
+Writes ``--examples`` approved examples for a throwaway provider, then looks
+up ``--queries`` of their questions (with one word dropped) and reports how
+often the example asked about is among the top ``--limit`` results, and the
+time per lookup:
+
+- former: ``list_approved`` (the most recent ``2 * limit`` examples), scored
+  by keyword overlap in Python
+- full-text: ``RAGExampleRepository.search``, ranked in PostgreSQL over all
+  of the provider's examples
+
+Needs a migrated metadata database (DATABASE_URL); the benchmark deletes its
+examples afterwards.
+
+Usage:
+    python scripts/benchmark_rag_search.py [--examples 50000] [--queries 200] [--limit 5]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import delete, insert, text
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from text2x.models.base import DatabaseConfig, close_db, init_db  # noqa: E402
+from text2x.models.rag import ExampleStatus, RAGExample  # noqa: E402
+from text2x.repositories.rag import RAGExampleRepository  # noqa: E402
+
+WORDS = (
+    "orders customers revenue region month total join filter group status amount "
+    "created shipped pending product category quantity price discount average count "
+    "supplier invoice payment refund warehouse stock employee department salary year"
+).split()
+
+
+def former_search(examples, query: str, limit: int):
+    """Keyword overlap scoring the database fallback used before."""
+    query_words = {word for word in query.lower().split() if len(word) > 2}
+    scored = []
+    for example in examples:
+        example_words = {
+            word for word in example.natural_language_query.lower().split() if len(word) > 2
+        }
+        overlap = len(query_words & example_words) / max(len(query_words), 1)
+        scored.append((overlap, example))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [example for _, example in scored[:limit]]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--examples", type=int, default=50000, help="Approved examples written")
+    parser.add_argument("--queries", type=int, default=200, help="Lookups per variant")
+    parser.add_argument("--limit", type=int, default=5, help="Examples returned per lookup")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    provider_id = f"benchmark-{uuid.uuid4().hex[:8]}"
+    now = datetime.utcnow()
+    questions = [" ".join(rng.sample(WORDS, 6)) for _ in range(args.examples)]
+
+    db = init_db(DatabaseConfig.from_settings())
+    repository = RAGExampleRepository()
+    try:
+        async with db.session() as session:
+            for start in range(0, args.examples, 5000):
+                await session.execute(insert(RAGExample), [
+                    {
+                        "id": uuid.uuid4(), "provider_id": provider_id,
+                        "natural_language_query": question, "generated_query": "SELECT 1",
+                        "is_good_example": True, "status": ExampleStatus.APPROVED,
+                        "involved_tables": [question.split()[0]], "query_intent": "filter",
+                        "complexity_level": "simple", "embeddings_generated": False,
+                        "created_at": now, "updated_at": now,
+                    }
+                    for question in questions[start:start + 5000]
+                ])
+            # Planner statistics, as autovacuum keeps them
+            await session.execute(text("ANALYZE rag_examples"))
+
+        results = {"former": [0, 0.0], "full-text": [0, 0.0]}
+        for asked in rng.sample(questions, min(args.queries, len(questions))):
+            words = asked.split()
+            words.pop(rng.randrange(len(words)))
+            query = " ".join(words)
+
+            start = time.perf_counter()
+            recent = await repository.list_approved(provider_id, limit=args.limit * 2)
+            found = former_search(recent, query, args.limit)
+            results["former"][1] += time.perf_counter() - start
+            results["former"][0] += asked in [e.natural_language_query for e in found]
+
+            start = time.perf_counter()
+            found = await repository.search(query, provider_id, limit=args.limit)
+            results["full-text"][1] += time.perf_counter() - start
+            results["full-text"][0] += asked in [e.natural_language_query for e, _ in found]
+    finally:
+        async with db.session() as session:
+            await session.execute(delete(RAGExample).where(RAGExample.provider_id == provider_id))
+        await close_db()
+
+    queries = min(args.queries, len(questions))
+    print(f"{'variant':<12}{'recall':>8}{'ms':>8}")
+    for label, (hits, elapsed) in results.items():
+        print(f"{label:<12}{hits / queries:>8.2f}{elapsed / queries * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
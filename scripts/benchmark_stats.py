@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Dashboard statistics computed the former way, in one aggregate query, and from rollups.
+
+Writes ``--examples`` RAG examples over ``--providers`` providers and
+``--feedback`` feedback rows spread over ``--days`` days into a SQLite file,
+then times each way of computing the RAG statistics and the last 30 days of
+feedback statistics:
+
+- former: RAG examples loaded (up to 1000 per status) and counted with
+  len(); feedback with five separate queries
+- aggregate: ``StatsRepository`` reading live, one GROUP BY with FILTER
+  clauses per statistic
+- rollups: ``StatsRepository`` reading the rollup tables after a refresh
+
+The former RAG counts are capped at 1000 per status, so they are wrong once
+a status has more examples. rag_examples is reduced to the columns the
+statistics read (plus the query texts loaded by the former way), since its
+other columns use Postgres-only types. SQLite's planner cannot estimate an
+open-ended range, so it scans user_feedback for the live part of the window
+after the rollup's coverage (today); Postgres estimates it from its column
+statistics and reads it through ix_user_feedback_created_at.
+
+Usage:
+    python scripts/benchmark_stats.py [--examples 20000] [--feedback 20000] [--days 90]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import text2x.models.base as models_base  # noqa: E402
+from text2x.models.base import Base, DatabaseConfig, DatabaseSession  # noqa: E402
+from text2x.models.conversation import Conversation, ConversationTurn  # noqa: E402
+from text2x.models.feedback import FeedbackCategory, FeedbackRating, UserFeedback  # noqa: E402
+from text2x.models.stats import (  # noqa: E402
+    FeedbackDailyStats,
+    RAGExampleStats,
+    StatsRollupState,
+)
+from text2x.repositories.stats import StatsRepository  # noqa: E402
+
+STATUSES = ("PENDING_REVIEW", "APPROVED", "REJECTED")
+
+FORMER_FEEDBACK = (
+    "SELECT count(*) FROM user_feedback WHERE created_at >= :since",
+    "SELECT rating, count(*) FROM user_feedback WHERE created_at >= :since GROUP BY rating",
+    "SELECT feedback_category, count(*) FROM user_feedback WHERE created_at >= :since "
+    "GROUP BY feedback_category",
+    "SELECT avg(t.confidence_score) FROM user_feedback f JOIN conversation_turns t "
+    "ON f.turn_id = t.id WHERE f.created_at >= :since AND f.rating = 'UP'",
+    "SELECT avg(t.confidence_score) FROM user_feedback f JOIN conversation_turns t "
+    "ON f.turn_id = t.id WHERE f.created_at >= :since AND f.rating = 'DOWN'",
+)
+
+
+async def open_db(path: Path) -> DatabaseSession:
+    db = DatabaseSession(DatabaseConfig())
+    db.engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    db.session_factory = async_sessionmaker(db.engine, expire_on_commit=False)
+    async with db.engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[
+                Conversation.__table__,
+                ConversationTurn.__table__,
+                UserFeedback.__table__,
+                RAGExampleStats.__table__,
+                FeedbackDailyStats.__table__,
+                StatsRollupState.__table__,
+            ],
+        )
+        await conn.execute(text(
+            "CREATE TABLE rag_examples (id CHAR(32) PRIMARY KEY, provider_id VARCHAR(255), "
+            "status VARCHAR(14), natural_language_query TEXT, generated_query TEXT, "
+            "created_at DATETIME, updated_at DATETIME)"
+        ))
+        await conn.execute(text(
+            "CREATE INDEX ix_rag_examples_provider_status ON rag_examples (provider_id, status)"
+        ))
+    models_base._db_session = db
+    return db
+
+
+async def write_rows(db: DatabaseSession, args) -> None:
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    async with db.session() as session:
+        await session.execute(
+            text("INSERT INTO rag_examples VALUES (:id, :provider, :status, :q, :sql, :at, :at)"),
+            [
+                {
+                    "id": uuid4().hex,
+                    "provider": f"p{rng.randrange(args.providers)}",
+                    "status": rng.choice(STATUSES),
+                    "q": "show total revenue per region for last month",
+                    "sql": "SELECT region, sum(amount) FROM orders GROUP BY region",
+                    "at": now - timedelta(days=rng.random() * args.days),
+                }
+                for _ in range(args.examples)
+            ],
+        )
+
+        conversation_id = uuid4()
+        await session.execute(insert(Conversation).values(
+            id=conversation_id, user_id="u1", provider_id="p0", status="ACTIVE",
+            created_at=now, updated_at=now,
+        ))
+        turns, feedback = [], []
+        for n in range(args.feedback):
+            created_at = now - timedelta(days=rng.random() * args.days)
+            turn_id = uuid4()
+            turns.append({
+                "id": turn_id, "conversation_id": conversation_id, "turn_number": n + 1,
+                "user_input": "q", "generated_query": "SELECT 1",
+                "confidence_score": rng.random(), "iterations": 1,
+                "clarification_needed": False, "created_at": created_at,
+                "updated_at": created_at,
+            })
+            feedback.append({
+                "id": uuid4(), "turn_id": turn_id,
+                "rating": rng.choice(list(FeedbackRating)),
+                "feedback_category": rng.choice(list(FeedbackCategory)),
+                "user_id": "u1", "created_at": created_at, "updated_at": created_at,
+            })
+        await session.execute(insert(ConversationTurn), turns)
+        await session.execute(insert(UserFeedback), feedback)
+        # Planner statistics, as Postgres autovacuum keeps them
+        await session.execute(text("ANALYZE"))
+
+
+async def former_rag(db: DatabaseSession) -> int:
+    total = 0
+    async with db.engine.connect() as conn:
+        for status in STATUSES:
+            rows = await conn.execute(
+                text("SELECT * FROM rag_examples WHERE status = :status LIMIT 1000"),
+                {"status": status},
+            )
+            total += len(rows.all())
+    return total
+
+
+async def former_feedback(db: DatabaseSession, since: datetime) -> int:
+    async with db.engine.connect() as conn:
+        results = [
+            (await conn.execute(text(sql), {"since": since})).all() for sql in FORMER_FEEDBACK
+        ]
+    return results[0][0][0]
+
+
+async def timed(call, repeat: int = 5) -> tuple:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = await call()
+    return (time.perf_counter() - start) / repeat, result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--examples", type=int, default=20000, help="RAG examples written")
+    parser.add_argument("--providers", type=int, default=5, help="Distinct providers")
+    parser.add_argument("--feedback", type=int, default=20000, help="Feedback rows written")
+    parser.add_argument("--days", type=int, default=90, help="Days the rows are spread over")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = await open_db(Path(directory) / "stats.db")
+        await write_rows(db, args)
+        since = datetime.utcnow() - timedelta(days=30)
+        live, rollups = StatsRepository(use_rollups=False), StatsRepository(use_rollups=True)
+
+        async def feedback_total(repo):
+            totals = await repo.feedback_by_category(since)
+            return sum(t.feedback_count for t in totals.values())
+
+        refresh, _ = await timed(lambda: rollups.refresh_rollups(full=True), repeat=1)
+        results = [
+            ("former", await timed(lambda: former_rag(db)),
+             await timed(lambda: former_feedback(db, since))),
+            ("aggregate",
+             await timed(lambda: live.rag_statistics()),
+             await timed(lambda: feedback_total(live))),
+            ("rollups",
+             await timed(lambda: rollups.rag_statistics()),
+             await timed(lambda: feedback_total(rollups))),
+        ]
+        await db.engine.dispose()
+
+    print(f"{'variant':<12}{'RAG ms':>10}{'RAG total':>11}{'feedback ms':>13}{'30d total':>11}")
+    for label, (rag_time, rag), (feedback_time, feedback) in results:
+        rag_total = rag if isinstance(rag, int) else rag.totals.total
+        print(
+            f"{label:<12}{rag_time * 1000:>10.2f}{rag_total:>11}"
+            f"{feedback_time * 1000:>13.2f}{feedback:>11}"
+        )
+    print(f"full rollup refresh: {refresh * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
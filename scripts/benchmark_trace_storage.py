@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Storage size of conversation turns with and without trace storage.
+
+Writes ``--turns`` synthetic turns spread over ``--connections`` schema
+contexts (one audit log per turn) into a SQLite file:
+
+- inline: every turn and audit log carries its own copy of the schema
+  context and the turn carries its trace documents, as before trace storage
+- compacted: the same rows after ``TraceRepository.compact`` and VACUUM
+- trace storage: the turns written through ``ConversationTurnRepository``
+
+and reports the database size, the bytes held in conversation_turns rows
+(the table every conversation query reads) and the time to scan them.
+audit_logs is reduced to the columns compaction touches, since its other
+columns use Postgres-only types.
+
+Usage:
+    python scripts/benchmark_trace_storage.py [--turns 2000] [--connections 3]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import text2x.models.base as models_base  # noqa: E402
+from text2x.models.base import Base, DatabaseConfig, DatabaseSession  # noqa: E402
+from text2x.models.conversation import Conversation, ConversationTurn  # noqa: E402
+from text2x.models.trace import SchemaContextRecord, TurnTrace  # noqa: E402
+from text2x.repositories.conversation import ConversationTurnRepository  # noqa: E402
+from text2x.repositories.trace import TraceRepository, store_schema_contexts  # noqa: E402
+
+WORDS = (
+    "orders customers revenue region month total join filter group status amount "
+    "created shipped pending product category quantity price discount average count"
+).split()
+
+TURN_BYTES = (
+    "SELECT sum(length(user_input) + length(generated_query)"
+    " + coalesce(length(validation_result), 0) + coalesce(length(execution_result), 0)"
+    " + coalesce(length(reasoning_trace), 0) + coalesce(length(schema_context), 0)"
+    " + coalesce(length(rag_examples_used), 0)) FROM conversation_turns"
+)
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def schema_context(rng: random.Random, connection: int) -> dict:
+    tables = [
+        {
+            "name": f"c{connection}_table_{t}",
+            "description": sentence(rng, 12),
+            "columns": [
+                {"name": f"col_{c}", "type": rng.choice(["int", "text", "timestamp"]),
+                 "description": sentence(rng, 6)}
+                for c in range(12)
+            ],
+        }
+        for t in range(30)
+    ]
+    return {"tables": [t["name"] for t in tables[:3]], "relevant_tables": tables}
+
+
+def turn_documents(rng: random.Random) -> dict:
+    return {
+        "reasoning_trace": {
+            "intent": rng.choice(["aggregation", "filter", "join"]),
+            "steps": [
+                {"agent": rng.choice(["schema", "query_builder", "validator"]),
+                 "thought": sentence(rng, rng.randint(20, 60))}
+                for _ in range(rng.randint(4, 12))
+            ],
+        },
+        "execution_result": {
+            "success": True,
+            "row_count": 10,
+            "result_preview": [
+                {"id": n, "region": rng.choice(WORDS), "total": rng.random() * 1000}
+                for n in range(10)
+            ],
+        },
+        "rag_examples_used": {
+            "examples": [{"question": sentence(rng, 10), "query": sentence(rng, 15)}
+                         for _ in range(3)]
+        },
+    }
+
+
+async def open_db(path: Path) -> DatabaseSession:
+    db = DatabaseSession(DatabaseConfig())
+    db.engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    db.session_factory = async_sessionmaker(db.engine, expire_on_commit=False)
+    async with db.engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[
+                Conversation.__table__,
+                ConversationTurn.__table__,
+                SchemaContextRecord.__table__,
+                TurnTrace.__table__,
+            ],
+        )
+        await conn.execute(text(
+            "CREATE TABLE audit_logs (id CHAR(32) PRIMARY KEY, turn_id CHAR(32), "
+            "schema_context_used JSON, schema_context_hash VARCHAR(64), updated_at DATETIME)"
+        ))
+    models_base._db_session = db
+    return db
+
+
+async def write_turns(db: DatabaseSession, args, inline: bool) -> None:
+    rng = random.Random(7)
+    contexts = [schema_context(rng, n) for n in range(args.connections)]
+    conversations = []
+    async with db.session() as session:
+        for n in range(max(1, args.turns // 5)):
+            conversation = Conversation(user_id="u1", provider_id=f"p{n % args.connections}")
+            session.add(conversation)
+            conversations.append(conversation)
+    repo = ConversationTurnRepository()
+    for n in range(args.turns):
+        context = contexts[n % args.connections]
+        documents = turn_documents(rng)
+        if inline:
+            turn_id = uuid4()
+            async with db.session() as session:
+                await session.execute(insert(ConversationTurn).values(
+                    id=turn_id, conversation_id=conversations[n // 5].id, turn_number=n % 5 + 1,
+                    user_input=sentence(rng, 10), generated_query=sentence(rng, 20),
+                    confidence_score=0.9, iterations=1, clarification_needed=False,
+                    validation_result={"is_valid": True}, schema_context=context,
+                    created_at=datetime.utcnow(), updated_at=datetime.utcnow(), **documents,
+                ))
+        else:
+            turn_id = (await repo.create(
+                conversations[n // 5].id, n % 5 + 1, sentence(rng, 10), sentence(rng, 20), 0.9,
+                validation_result={"is_valid": True}, schema_context=context, **documents,
+            )).id
+        async with db.session() as session:
+            # What AuditLogRepository wrote before and after trace storage
+            if inline:
+                await session.execute(
+                    text("INSERT INTO audit_logs (id, turn_id, schema_context_used) "
+                         "VALUES (:id, :turn_id, :context)"),
+                    {"id": uuid4().hex, "turn_id": turn_id.hex, "context": json.dumps(context)},
+                )
+            else:
+                (fingerprint,) = await store_schema_contexts(session, [context])
+                await session.execute(
+                    text("INSERT INTO audit_logs (id, turn_id, schema_context_hash) "
+                         "VALUES (:id, :turn_id, :fingerprint)"),
+                    {"id": uuid4().hex, "turn_id": turn_id.hex, "fingerprint": fingerprint},
+                )
+
+
+async def measure(db: DatabaseSession) -> tuple:
+    async with db.engine.connect() as conn:
+        pages = (await conn.execute(text("PRAGMA page_count"))).scalar()
+        page_size = (await conn.execute(text("PRAGMA page_size"))).scalar()
+        turn_bytes = (await conn.execute(text(TURN_BYTES))).scalar()
+        start = time.perf_counter()
+        for _ in range(5):
+            (await conn.execute(text("SELECT * FROM conversation_turns"))).all()
+        scan = (time.perf_counter() - start) / 5
+    return pages * page_size, turn_bytes, scan
+
+
+async def vacuum(db: DatabaseSession) -> None:
+    async with db.engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM"))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=2000, help="Turns written per variant")
+    parser.add_argument(
+        "--connections", type=int, default=3, help="Distinct schema contexts"
+    )
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        db = await open_db(Path(directory) / "inline.db")
+        await write_turns(db, args, inline=True)
+        await vacuum(db)
+        results.append(("inline", await measure(db)))
+        await TraceRepository().compact(retention_days=0)
+        await vacuum(db)
+        results.append(("compacted", await measure(db)))
+        await db.engine.dispose()
+
+        db = await open_db(Path(directory) / "trace_storage.db")
+        await write_turns(db, args, inline=False)
+        await vacuum(db)
+        results.append(("trace storage", await measure(db)))
+        await db.engine.dispose()
+
+    print(f"{'variant':<16}{'database MB':>13}{'turn row MB':>13}{'scan ms':>10}")
+    for label, (size, turn_bytes, scan) in results:
+        print(f"{label:<16}{size / 1e6:>13.2f}{turn_bytes / 1e6:>13.2f}{scan * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
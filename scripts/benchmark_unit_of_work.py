@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Round trips of one feedback submission with and without a unit of work.
+
+Submits thumbs-down feedback (feedback row + review queue entry, the
+POST /conversations/{id}/turns/{turn_id}/feedback path) through
+FeedbackService, once with every repository call in its own session and once
+inside DatabaseSession.unit_of_work() as the API's db_unit_of_work dependency
+does, and reports statements, commits and pool checkouts per submission.
+
+Needs a migrated metadata database (DATABASE_URL); the benchmark creates its
+own conversation and deletes it, and the review entries, afterwards.
+
+Usage:
+    python scripts/benchmark_unit_of_work.py [--submissions 50]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from sqlalchemy import delete, event
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from text2x.models.base import DatabaseConfig, close_db, init_db  # noqa: E402
+from text2x.models.feedback import FeedbackCategory, FeedbackRating  # noqa: E402
+from text2x.models.rag import RAGExample  # noqa: E402
+from text2x.repositories.conversation import (  # noqa: E402
+    ConversationRepository,
+    ConversationTurnRepository,
+)
+from text2x.services.feedback_service import FeedbackService  # noqa: E402
+
+
+async def run(db, submissions: int, unit_of_work: bool) -> dict:
+    """Submit feedback for fresh turns and count database work per submission."""
+    conversation = await ConversationRepository().create(user_id="benchmark")
+    turns = [
+        await ConversationTurnRepository().create(
+            conversation_id=conversation.id,
+            turn_number=number,
+            user_input="How many orders were placed yesterday?",
+            generated_query="SELECT count(*) FROM orders",
+            confidence_score=0.5,
+            reasoning_trace={},
+        )
+        for number in range(1, submissions + 1)
+    ]
+
+    counts = {"statements": 0, "commits": 0, "checkouts": 0}
+
+    def count(name):
+        def listener(*args, **kwargs):
+            counts[name] += 1
+
+        return listener
+
+    listeners = [
+        (db.engine.sync_engine, "before_cursor_execute", count("statements")),
+        (db.engine.sync_engine, "commit", count("commits")),
+        (db.engine.sync_engine.pool, "checkout", count("checkouts")),
+    ]
+    for target, name, listener in listeners:
+        event.listen(target, name, listener)
+
+    service = FeedbackService()
+    start = time.perf_counter()
+    try:
+        for turn in turns:
+            async with db.unit_of_work() if unit_of_work else nullcontext():
+                await service.submit_feedback(
+                    turn_id=turn.id,
+                    rating=FeedbackRating.DOWN,
+                    category=FeedbackCategory.INCORRECT_RESULT,
+                    user_id="benchmark",
+                )
+    finally:
+        elapsed = time.perf_counter() - start
+        for target, name, listener in listeners:
+            event.remove(target, name, listener)
+        async with db.session() as session:
+            await session.execute(
+                delete(RAGExample).where(RAGExample.source_conversation_id == conversation.id)
+            )
+        await ConversationRepository().delete(conversation.id)
+
+    result = {name: value / submissions for name, value in counts.items()}
+    result["ms"] = elapsed / submissions * 1000
+    return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--submissions", type=int, default=50, help="Submissions per variant")
+    args = parser.parse_args()
+
+    db = init_db(DatabaseConfig.from_settings())
+    try:
+        per_call = await run(db, args.submissions, unit_of_work=False)
+        unit = await run(db, args.submissions, unit_of_work=True)
+    finally:
+        await close_db()
+
+    print(f"{'per submission':<28}{'statements':>12}{'commits':>10}{'checkouts':>11}{'ms':>9}")
+    for label, result in (("session per call", per_call), ("unit of work", unit)):
+        print(
+            f"{label:<28}{result['statements']:>12.1f}{result['commits']:>10.1f}"
+            f"{result['checkouts']:>11.1f}{result['ms']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -198,6 +198,41 @@ async def test_get_conversation(mock_client):
     assert conversation.status == ConversationStatus.ACTIVE
 
 
+@pytest.mark.asyncio
+async def test_iter_conversations_follows_cursors(mock_client):
+    """Test iterating conversations across pages."""
+    now = datetime.now(timezone.utc).isoformat()
+
+    def page(ids, next_cursor):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {
+            "conversations": [
+                {
+                    "id": str(conversation_id),
+                    "status": "active",
+                    "turn_count": 2,
+                    "last_user_input": "How many orders?",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for conversation_id in ids
+            ],
+            "next_cursor": next_cursor,
+        }
+        return response
+
+    ids = [uuid4() for _ in range(3)]
+    mock_client._client.request.side_effect = [page(ids[:2], "c2"), page(ids[2:], None)]
+
+    seen = [c.id async for c in mock_client.iter_conversations(page_size=2)]
+
+    assert seen == ids
+    calls = mock_client._client.request.call_args_list
+    assert calls[0].kwargs["params"] == {"limit": 2}
+    assert calls[1].kwargs["params"] == {"limit": 2, "cursor": "c2"}
+
+
 @pytest.mark.asyncio
 async def test_submit_feedback(mock_client):
     """Test submit feedback."""
@@ -192,6 +192,71 @@ async def test_query_stream_with_error(mock_ws_client):
     assert events[1].data["message"] == "Provider not found"
 
 
+@pytest.mark.asyncio
+async def test_query_stream_stops_when_cancelled(mock_ws_client):
+    """Test query streaming ends on a cancelled event."""
+    messages = [
+        {"type": "progress", "data": {"stage": "execution", "job": {"sid": "123"}}},
+        {"type": "cancelled", "data": {"message": "Query processing cancelled"}},
+        {"type": "progress", "data": {"stage": "never_read"}},
+    ]
+
+    mock_ws_client._ws.recv.side_effect = [json.dumps(msg) for msg in messages]
+
+    events = []
+    async for event in mock_ws_client.query_stream(
+        provider_id="splunk_main",
+        query="Show me errors",
+    ):
+        events.append(event)
+        if event.is_progress:
+            await mock_ws_client.cancel()
+
+    assert len(events) == 2
+    assert events[1].is_cancelled
+    sent = [json.loads(call.args[0]) for call in mock_ws_client._ws.send.call_args_list]
+    assert sent[-1] == {"action": "cancel"}
+
+
+@pytest.mark.asyncio
+async def test_query_stream_token_and_tool_events(mock_ws_client):
+    """Test query streaming exposes token deltas and tool calls."""
+    messages = [
+        {"type": "token", "data": {"text": "```sql\nSELECT"}},
+        {"type": "token", "data": {"text": " 1", "partial_query": "SELECT 1"}},
+        {"type": "tool_started", "data": {"tool": "validate_query", "tool_use_id": "t1"}},
+        {"type": "tool_finished", "data": {"tool": "validate_query", "tool_use_id": "t1", "status": "success"}},
+        {"type": "result", "data": {"generated_query": "SELECT 1"}},
+    ]
+
+    mock_ws_client._ws.recv.side_effect = [json.dumps(msg) for msg in messages]
+
+    events = []
+    async for event in mock_ws_client.query_stream(
+        provider_id="postgres_main",
+        query="Show me one",
+        stream_tokens=True,
+    ):
+        events.append(event)
+
+    assert [e.is_token for e in events] == [True, True, False, False, False]
+    assert events[1].data["partial_query"] == "SELECT 1"
+    assert events[2].is_tool_started
+    assert events[3].is_tool_finished
+    assert events[4].is_result
+    sent = json.loads(mock_ws_client._ws.send.call_args_list[0].args[0])
+    assert sent["options"]["stream_tokens"] is True
+
+
+@pytest.mark.asyncio
+async def test_request_job_status(mock_ws_client):
+    """Test requesting search job status."""
+    await mock_ws_client.request_job_status("123")
+
+    sent_data = mock_ws_client._ws.send.call_args[0][0]
+    assert json.loads(sent_data) == {"action": "job_status", "sid": "123"}
+
+
 @pytest.mark.asyncio
 async def test_query_stream_auto_connect():
     """Test query stream auto-connects if not connected."""
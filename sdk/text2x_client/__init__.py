@@ -3,8 +3,10 @@
 from .client import Text2XClient
 from .models import (
     ComplexityLevel,
+    ConversationListResponse,
     ConversationResponse,
     ConversationStatus,
+    ConversationSummary,
     ConversationTurnResponse,
     ErrorResponse,
     ExampleRequest,
@@ -43,6 +45,8 @@ __all__ = [
     "QueryResponse",
     "ConversationResponse",
     "ConversationTurnResponse",
+    "ConversationListResponse",
+    "ConversationSummary",
     "ProviderInfo",
     "ProviderSchema",
     "TableInfo",
@@ -1,13 +1,16 @@
 """Async HTTP client for Text2X API."""
 
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 from uuid import UUID
 
 import httpx
 from pydantic import ValidationError
 
 from .models import (
+    ConversationListResponse,
     ConversationResponse,
+    ConversationStatus,
+    ConversationSummary,
     ErrorResponse,
     ExampleRequest,
     FeedbackRequest,
@@ -225,6 +228,76 @@ class Text2XClient:
         except ValidationError as e:
             raise Text2XValidationError(f"Invalid response: {e}") from e
 
+    async def list_conversations(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[ConversationStatus] = None,
+        connection_id: Optional[UUID] = None,
+    ) -> ConversationListResponse:
+        """List your conversations, most recently updated first.
+
+        Args:
+            limit: Maximum number of conversations in the page (1-200)
+            cursor: ``next_cursor`` of the previous page, None for the first page
+            status: Only conversations with this status
+            connection_id: Only conversations on this connection
+
+        Returns:
+            ConversationListResponse with the page and the next page's cursor
+
+        Example:
+            ```python
+            page = await client.list_conversations(limit=20)
+            while page.next_cursor:
+                page = await client.list_conversations(limit=20, cursor=page.next_cursor)
+            ```
+        """
+        params: dict[str, Any] = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        if status:
+            params["status"] = status.value
+        if connection_id:
+            params["connection_id"] = str(connection_id)
+
+        data = await self._request("GET", "/api/v1/conversations", params=params)
+
+        try:
+            return ConversationListResponse(**data)
+        except ValidationError as e:
+            raise Text2XValidationError(f"Invalid response: {e}") from e
+
+    async def iter_conversations(
+        self,
+        page_size: int = 50,
+        status: Optional[ConversationStatus] = None,
+        connection_id: Optional[UUID] = None,
+    ) -> AsyncIterator[ConversationSummary]:
+        """Iterate over all your conversations, following page cursors.
+
+        Args:
+            page_size: Conversations fetched per request
+            status: Only conversations with this status
+            connection_id: Only conversations on this connection
+
+        Example:
+            ```python
+            async for conversation in client.iter_conversations():
+                print(conversation.id, conversation.turn_count)
+            ```
+        """
+        cursor: Optional[str] = None
+        while True:
+            page = await self.list_conversations(
+                limit=page_size, cursor=cursor, status=status, connection_id=connection_id
+            )
+            for conversation in page.conversations:
+                yield conversation
+            if not page.next_cursor:
+                return
+            cursor = page.next_cursor
+
     async def submit_feedback(
         self,
         conversation_id: UUID,
@@ -92,6 +92,10 @@ class QueryOptions(BaseModel):
         le=20,
         description="Number of RAG examples to retrieve",
     )
+    stream_tokens: bool = Field(
+        default=True,
+        description="Stream model tokens and tool calls as WebSocket events",
+    )
 
 
 class QueryRequest(BaseModel):
@@ -335,6 +339,31 @@ class ConversationResponse(BaseModel):
     turns: list[ConversationTurnResponse] = Field(default_factory=list)
 
 
+class ConversationSummary(BaseModel):
+    """A conversation in a listing, with its turn count and last turn."""
+
+    model_config = ConfigDict(extra="allow")
+
+    id: UUID
+    provider_id: Optional[str] = None
+    connection_id: Optional[UUID] = None
+    status: ConversationStatus
+    turn_count: int
+    last_turn_at: Optional[datetime] = None
+    last_user_input: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class ConversationListResponse(BaseModel):
+    """One page of conversations."""
+
+    model_config = ConfigDict(extra="allow")
+
+    conversations: list[ConversationSummary] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
 # RAG Example Models
 class RAGExampleResponse(BaseModel):
     """Response model for RAG examples."""
@@ -51,6 +51,21 @@ class StreamEvent:
         """Check if this is a progress event."""
         return self.type == "progress"
 
+    @property
+    def is_token(self) -> bool:
+        """Check if this is a model token delta."""
+        return self.type == "token"
+
+    @property
+    def is_tool_started(self) -> bool:
+        """Check if the agent started a tool call."""
+        return self.type == "tool_started"
+
+    @property
+    def is_tool_finished(self) -> bool:
+        """Check if an agent tool call finished."""
+        return self.type == "tool_finished"
+
     @property
     def is_clarification(self) -> bool:
         """Check if this is a clarification request."""
@@ -66,6 +81,16 @@ class StreamEvent:
         """Check if this is an error event."""
         return self.type == "error"
 
+    @property
+    def is_job_status(self) -> bool:
+        """Check if this is a search job status reply."""
+        return self.type == "job_status"
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Check if query processing was cancelled."""
+        return self.type == "cancelled"
+
 
 class WebSocketClient:
     """WebSocket client for streaming Text2X query processing.
@@ -185,7 +210,10 @@ class WebSocketClient:
             **options: Additional query options (max_iterations, confidence_threshold, etc.)
 
         Yields:
-            StreamEvent objects with type and data
+            StreamEvent objects with type and data. While the agent runs,
+            ``token`` events carry text deltas (``text``, and ``partial_query``
+            once a SQL block has started) and ``tool_started``/``tool_finished``
+            events report tool calls; pass ``stream_tokens=False`` to skip them.
 
         Raises:
             WebSocketConnectionError: If connection fails or is closed
@@ -200,6 +228,10 @@ class WebSocketClient:
             ):
                 if event.is_progress:
                     print(f"Step: {event.data['step']}")
+                elif event.is_token:
+                    print(event.data["text"], end="", flush=True)
+                elif event.is_tool_started:
+                    print(f"Calling {event.data['tool']}...")
                 elif event.is_clarification:
                     print(f"Questions: {event.data['questions']}")
                 elif event.is_result:
@@ -247,14 +279,42 @@ class WebSocketClient:
 
                 yield event
 
-                # Stop streaming after result or error
-                if event.is_result or event.is_error:
+                # Stop streaming after result, error or cancellation
+                if event.is_result or event.is_error or event.is_cancelled:
                     break
 
             except WebSocketConnectionError:
                 # Connection closed, stop streaming
                 break
 
+    async def cancel(self, sid: Optional[str] = None) -> None:
+        """Cancel the query being streamed, or a single search job.
+
+        Without a ``sid`` the running search jobs are cancelled and the stream
+        ends with a ``cancelled`` event. With a ``sid`` only that job is
+        cancelled and a ``job_status`` event reports the outcome.
+
+        Args:
+            sid: Optional search job ID (from an execution progress event)
+        """
+        message: dict[str, Any] = {"action": "cancel"}
+        if sid:
+            message["sid"] = sid
+        await self._send_message(message)
+
+    async def request_job_status(self, sid: Optional[str] = None) -> None:
+        """Ask for search job status while a query is being streamed.
+
+        The reply arrives on the stream as a ``job_status`` event.
+
+        Args:
+            sid: Optional search job ID; defaults to all running jobs
+        """
+        message: dict[str, Any] = {"action": "job_status"}
+        if sid:
+            message["sid"] = sid
+        await self._send_message(message)
+
     async def query_stream_with_clarification(
         self,
         provider_id: str,
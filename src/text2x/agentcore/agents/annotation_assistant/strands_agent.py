@@ -255,21 +255,27 @@ def assistant_save_annotation(
         nest_asyncio.apply()
 
         loop = asyncio.get_event_loop()
-        annotation = loop.run_until_complete(
-            ctx.annotation_repo.create(
-                provider_id=ctx.provider_id,
-                description=description,
+        # Upsert so re-annotating a target updates it instead of duplicating it
+        upserted = loop.run_until_complete(
+            ctx.annotation_repo.upsert_many(
+                ctx.provider_id,
+                [
+                    {
+                        "description": description,
+                        "table_name": table_name,
+                        "column_name": column_name,
+                        "business_terms": business_terms,
+                        "examples": examples,
+                        "relationships": relationships,
+                        "date_format": date_format,
+                        "enum_values": enum_values,
+                        "sensitive": sensitive,
+                    }
+                ],
                 created_by=ctx.user_id,
-                table_name=table_name,
-                column_name=column_name,
-                business_terms=business_terms,
-                examples=examples,
-                relationships=relationships,
-                date_format=date_format,
-                enum_values=enum_values,
-                sensitive=sensitive,
             )
         )
+        annotation = upserted[0]
 
         return {
             "success": True,
@@ -6,6 +6,7 @@ This agent provides tools to help experts understand and annotate database schem
 - sample_data: Get sample rows from a table to understand data patterns
 - column_stats: Get statistics about column values (distinct count, nulls, etc.)
 - save_annotation: Save schema annotations to the database
+- save_annotations: Save many annotations in one bulk upsert
 
 Supports multi-turn chat for interactive schema exploration and annotation.
 """
@@ -49,6 +50,18 @@ def get_tool_context() -> AnnotationToolContext:
     return _tool_context
 
 
+def _run_async(coro):
+    """Run a coroutine from a synchronous tool, even inside a running event loop."""
+    import asyncio
+
+    loop = asyncio.get_event_loop()
+    if loop.is_running():
+        import concurrent.futures
+        with concurrent.futures.ThreadPoolExecutor() as pool:
+            return pool.submit(asyncio.run, coro).result()
+    return asyncio.run(coro)
+
+
 # Define tools as standalone functions with @tool decorator
 
 @tool
@@ -247,43 +260,26 @@ def save_annotation(
         return {"error": "Cannot specify both table_name and column_name"}
 
     try:
-        import asyncio
-
-        # Create annotation
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                annotation = pool.submit(
-                    asyncio.run,
-                    ctx.annotation_repo.create(
-                        provider_id=ctx.provider_id,
-                        description=description,
-                        created_by=ctx.user_id,
-                        table_name=table_name,
-                        column_name=column_name,
-                        business_terms=business_terms,
-                        examples=examples,
-                        relationships=relationships,
-                        date_format=date_format,
-                        enum_values=enum_values,
-                        sensitive=sensitive,
-                    )
-                ).result()
-        else:
-            annotation = asyncio.run(ctx.annotation_repo.create(
+        # Upsert so re-annotating a target updates it instead of failing
+        annotation = _run_async(
+            ctx.annotation_repo.upsert_many(
                 provider_id=ctx.provider_id,
-                description=description,
                 created_by=ctx.user_id,
-                table_name=table_name,
-                column_name=column_name,
-                business_terms=business_terms,
-                examples=examples,
-                relationships=relationships,
-                date_format=date_format,
-                enum_values=enum_values,
-                sensitive=sensitive,
-            ))
+                annotations=[
+                    {
+                        "description": description,
+                        "table_name": table_name,
+                        "column_name": column_name,
+                        "business_terms": business_terms,
+                        "examples": examples,
+                        "relationships": relationships,
+                        "date_format": date_format,
+                        "enum_values": enum_values,
+                        "sensitive": sensitive,
+                    }
+                ],
+            )
+        )[0]
 
         return {
             "success": True,
@@ -300,6 +296,55 @@ def save_annotation(
         }
 
 
+@tool
+def save_annotations(annotations: list) -> dict:
+    """Save many schema annotations (e.g. every column of a table) in one call.
+
+    Args:
+        annotations: List of annotation objects, each with "description" and either
+            "table_name" or "column_name" (format: "table.column"), plus any of
+            "business_terms", "examples", "relationships", "date_format",
+            "enum_values" and "sensitive"
+
+    Returns:
+        Dictionary with success status and the saved targets
+    """
+    ctx = get_tool_context()
+
+    if not annotations:
+        return {"error": "annotations must not be empty"}
+
+    for index, annotation in enumerate(annotations):
+        if not isinstance(annotation, dict) or not annotation.get("description"):
+            return {"error": f"annotations[{index}]: description is required"}
+        if bool(annotation.get("table_name")) == bool(annotation.get("column_name")):
+            return {
+                "error": f"annotations[{index}]: provide exactly one of table_name or column_name"
+            }
+
+    try:
+        saved = _run_async(
+            ctx.annotation_repo.upsert_many(
+                provider_id=ctx.provider_id,
+                created_by=ctx.user_id,
+                annotations=annotations,
+            )
+        )
+
+        return {
+            "success": True,
+            "saved": len(saved),
+            "targets": [annotation.target for annotation in saved],
+            "message": f"Successfully saved {len(saved)} annotations",
+        }
+    except Exception as e:
+        logger.error(f"Failed to save annotations: {e}", exc_info=True)
+        return {
+            "success": False,
+            "error": f"Failed to save annotations: {str(e)}",
+        }
+
+
 # System prompt for the annotation agent
 AUTO_ANNOTATION_SYSTEM_PROMPT = """You are an expert database schema annotation assistant. Your role is to help database experts and domain experts create meaningful annotations for database schemas.
 
@@ -324,6 +369,10 @@ You have access to the following tools:
    - enum_values (optional): Valid enumeration values
    - sensitive (optional): Whether data is sensitive (PII)
 
+4. **save_annotations** - Save many annotations at once
+   - annotations (required): List of objects with the same fields as save_annotation
+   - Prefer this when annotating several columns of a table
+
 **Your responsibilities:**
 1. Help users understand database tables and columns by sampling data and showing statistics
 2. Guide users in creating comprehensive, accurate annotations
@@ -373,7 +422,7 @@ class AutoAnnotationAgent:
         self.agent = Agent(
             model=model,
             system_prompt=AUTO_ANNOTATION_SYSTEM_PROMPT,
-            tools=[sample_data, column_stats, save_annotation],
+            tools=[sample_data, column_stats, save_annotation, save_annotations],
             name=name,
             description="Auto-annotation agent for schema understanding and annotation",
         )
@@ -422,7 +471,7 @@ class AutoAnnotationAgent:
             self.agent = Agent(
                 model=self.agent.model,
                 system_prompt=AUTO_ANNOTATION_SYSTEM_PROMPT,
-                tools=[sample_data, column_stats, save_annotation],
+                tools=[sample_data, column_stats, save_annotation, save_annotations],
                 name=self.name,
                 description="Auto-annotation agent for schema understanding and annotation",
             )
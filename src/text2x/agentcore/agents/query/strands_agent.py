@@ -13,7 +13,7 @@ Supports multi-turn chat for iterative query refinement.
 """
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 from dataclasses import dataclass
 
 from strands import Agent
@@ -24,6 +24,15 @@ from text2x.providers.base import QueryProvider
 logger = logging.getLogger(__name__)
 
 
+class StreamEventType:
+    """Incremental events yielded by QueryAgent.stream()."""
+
+    TOKEN = "token"
+    TOOL_STARTED = "tool_started"
+    TOOL_FINISHED = "tool_finished"
+    RESULT = "result"
+
+
 # Tool context dataclass to share state between tools
 @dataclass
 class QueryToolContext:
@@ -119,7 +128,7 @@ Return the query that best answers this question."""
 
 
 @tool
-def execute_query(query: str) -> dict:
+async def execute_query(query: str) -> dict:
     """Execute a SQL query and return results.
 
     Args:
@@ -143,18 +152,20 @@ def execute_query(query: str) -> dict:
         }
 
     try:
-        import asyncio
-
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                result = pool.submit(
-                    asyncio.run,
-                    ctx.provider.execute_query(query, limit=100)
-                ).result()
-        else:
-            result = asyncio.run(ctx.provider.execute_query(query, limit=100))
+        from text2x.services.cost_guard import get_cost_guard
+
+        # Over-budget queries are rejected or sampled before they reach the database
+        decision = await get_cost_guard().check(ctx.provider, query, limit=100)
+        if not decision.allowed:
+            return {
+                "success": False,
+                "error": decision.error,
+                "cost_guard": decision.to_dict(),
+            }
+
+        # Awaited on the agent's event loop, in the query's context, so search
+        # jobs it starts are recorded in the query's search_job_scope
+        result = await ctx.provider.execute_query(decision.query, limit=100)
 
         if result and result.success:
             return {
@@ -163,6 +174,7 @@ def execute_query(query: str) -> dict:
                 "columns": result.columns or [],
                 "rows": result.sample_rows[:100] or [],
                 "execution_time_ms": getattr(result, "execution_time_ms", 0),
+                "cost_guard": decision.to_dict(),
             }
         else:
             return {
@@ -178,7 +190,7 @@ def execute_query(query: str) -> dict:
 
 
 @tool
-def validate_query(query: str) -> dict:
+async def validate_query(query: str) -> dict:
     """Validate a SQL query for syntax and safety.
 
     Args:
@@ -207,18 +219,11 @@ def validate_query(query: str) -> dict:
             warnings.append("UPDATE without WHERE clause will affect all rows")
 
         # Try to validate with provider if available
+        plan_estimate = None
         if ctx.provider and hasattr(ctx.provider, "validate_syntax"):
-            import asyncio
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    validation_result = pool.submit(
-                        asyncio.run,
-                        ctx.provider.validate_syntax(query)
-                    ).result()
-            else:
-                validation_result = asyncio.run(ctx.provider.validate_syntax(query))
+            from text2x.services.validation_cache import get_validation_cache
+
+            validation_result = await get_validation_cache().validate(ctx.provider, query)
 
             if not validation_result.valid:
                 return {
@@ -228,11 +233,16 @@ def validate_query(query: str) -> dict:
                     "warnings": warnings,
                 }
 
+            warnings.extend(validation_result.warnings)
+            if validation_result.plan_estimate:
+                plan_estimate = validation_result.plan_estimate.to_dict()
+
         return {
             "success": True,
             "valid": True,
             "errors": [],
             "warnings": warnings,
+            "plan_estimate": plan_estimate,
         }
 
     except Exception as e:
@@ -307,6 +317,89 @@ def explain_query(query: str) -> dict:
         }
 
 
+QUERY_TOOLS = [generate_query, execute_query, validate_query, explain_query]
+
+
+SQL_FENCE = "```sql"
+CODE_FENCE = "```"
+
+
+def extract_sql(text: str) -> Optional[str]:
+    """Extract the SQL from the first ```sql block of a response.
+
+    Args:
+        text: Response text
+
+    Returns:
+        SQL text, or None if there is no complete sql block
+    """
+    start = text.lower().find(SQL_FENCE)
+    if start < 0:
+        return None
+    start += len(SQL_FENCE)
+    end = text.find(CODE_FENCE, start)
+    if end < 0:
+        return None
+    return text[start:end].strip()
+
+
+class PartialSQLTracker:
+    """Follows the first ```sql block of a response as it is streamed.
+
+    Each delta is scanned once, so following a response is linear in its
+    length. The SQL so far is only reported at boundaries: when the block
+    opens or closes, and when a delta ends a line or statement.
+    """
+
+    def __init__(self):
+        self._tail = ""  # Unscanned end of the text that may start a fence
+        self._parts: Optional[list] = None  # SQL so far, once the block opened
+        self.closed = False
+
+    @property
+    def query(self) -> Optional[str]:
+        """The SQL streamed so far, or None before the block opened."""
+        return "".join(self._parts).strip() if self._parts is not None else None
+
+    def feed(self, delta: str) -> Optional[str]:
+        """
+        Scan the next delta of the response.
+
+        Args:
+            delta: Text appended to the response
+
+        Returns:
+            The SQL so far if the delta reached a boundary, else None
+        """
+        if self.closed:
+            return None
+
+        opened = False
+        if self._parts is None:
+            window = self._tail + delta
+            start = window.lower().find(SQL_FENCE)
+            if start < 0:
+                self._tail = window[-(len(SQL_FENCE) - 1):]
+                return None
+            self._parts, self._tail, opened = [], "", True
+            delta = window[start + len(SQL_FENCE):]
+
+        window = self._tail + delta
+        end = window.find(CODE_FENCE)
+        if end >= 0:
+            self._parts.append(window[:end])
+            self.closed = True
+            return self.query
+
+        # Trailing backticks may be the start of the closing fence
+        keep = len(window) - len(window.rstrip("`"))
+        self._parts.append(window[:len(window) - keep])
+        self._tail = window[len(window) - keep:]
+        if opened or "\n" in delta or ";" in delta:
+            return self.query
+        return None
+
+
 def get_query_system_prompt(schema_context: Dict[str, Any] = None) -> str:
     """Get system prompt for query agent with optional schema context.
 
@@ -401,16 +494,21 @@ class QueryAgent:
         self._schema_context: Dict[str, Any] = {}
 
         # Create Strands Agent with tools
-        self.agent = Agent(
-            model=model,
-            system_prompt=get_query_system_prompt(),
-            tools=[generate_query, execute_query, validate_query, explain_query],
-            name=name,
-            description="Query agent for natural language to SQL conversion",
-        )
+        self.agent = self._create_agent()
 
         logger.info(f"QueryAgent '{name}' initialized with Strands SDK")
 
+    def _create_agent(self, schema_context: Dict[str, Any] = None) -> Agent:
+        """Create the Strands agent (and a fresh conversation) for a schema context."""
+        return Agent(
+            model=self._model,
+            system_prompt=get_query_system_prompt(schema_context),
+            tools=QUERY_TOOLS,
+            name=self.name,
+            description="Query agent for natural language to SQL conversion",
+            callback_handler=None,
+        )
+
     def set_provider(self, provider: QueryProvider) -> None:
         """Set the query provider for this agent.
 
@@ -424,13 +522,7 @@ class QueryAgent:
         """Update schema context and recreate agent with new system prompt."""
         if schema_context != self._schema_context:
             self._schema_context = schema_context
-            self.agent = Agent(
-                model=self._model,
-                system_prompt=get_query_system_prompt(schema_context),
-                tools=[generate_query, execute_query, validate_query, explain_query],
-                name=self.name,
-                description="Query agent for natural language to SQL conversion",
-            )
+            self.agent = self._create_agent(schema_context)
 
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process user input and return response.
@@ -449,71 +541,100 @@ class QueryAgent:
             - execution_result: dict - Query execution result (if executed)
             - tool_calls: List[Dict] - Tool calls made (if any)
         """
+        output: Dict[str, Any] = {}
+        async for event in self.stream(input_data):
+            if event["type"] == StreamEventType.RESULT:
+                output = event["result"]
+        return output
+
+    async def stream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Process user input, yielding events as the model responds.
+
+        Takes the same input as process(). Yields dicts with a "type" of:
+            - token: "text" delta, plus "partial_query" (the SQL so far) when
+              the delta opens or closes the sql block or ends one of its
+              lines or statements
+            - tool_started: "tool" and "tool_use_id" of a tool the model calls
+            - tool_finished: "tool", "tool_use_id" and "status" of its result
+            - result: "result", the output of process(); always the last event
+
+        Closing the iterator early stops the model stream.
+        """
         user_message = input_data["user_message"]
-        provider_id = input_data.get("provider_id", "")
         schema_context = input_data.get("schema_context", {})
-        enable_execution = input_data.get("enable_execution", False)
-        reset_conversation = input_data.get("reset_conversation", False)
 
         # Update schema context if changed
         self._update_schema_context(schema_context)
 
         # Set up tool context
-        ctx = QueryToolContext(
+        set_query_context(QueryToolContext(
             provider=self.provider,
-            provider_id=provider_id,
+            provider_id=input_data.get("provider_id", ""),
             schema_context=schema_context,
-            enable_execution=enable_execution,
-        )
-        set_query_context(ctx)
+            enable_execution=input_data.get("enable_execution", False),
+        ))
 
         # Reset conversation if requested
-        if reset_conversation:
-            self.agent = Agent(
-                model=self._model,
-                system_prompt=get_query_system_prompt(schema_context),
-                tools=[generate_query, execute_query, validate_query, explain_query],
-                name=self.name,
-                description="Query agent for natural language to SQL conversion",
-            )
-
-        # Invoke the Strands agent
-        result = self.agent(user_message)
-
-        # Extract response
-        response_text = str(result)
-
-        # Extract tool calls and results
-        tool_calls = []
-        generated_query = None
-        query_explanation = None
-        execution_result = None
-
-        if hasattr(result, 'messages'):
-            for msg in result.messages:
-                if hasattr(msg, 'tool_use'):
-                    tool_name = msg.tool_use.name if hasattr(msg.tool_use, 'name') else str(msg.tool_use)
-                    tool_calls.append({
-                        "tool": tool_name,
-                        "result": "executed",
-                    })
-
-        # Try to extract SQL query from response
-        if "```sql" in response_text.lower():
-            try:
-                start = response_text.lower().find("```sql") + 6
-                end = response_text.find("```", start)
-                if end > start:
-                    generated_query = response_text[start:end].strip()
-            except Exception:
-                pass
-
-        return {
-            "response": response_text,
-            "generated_query": generated_query,
-            "query_explanation": query_explanation,
-            "execution_result": execution_result,
-            "tool_calls": tool_calls,
+        if input_data.get("reset_conversation", False):
+            self.agent = self._create_agent(schema_context)
+
+        streamed_text = ""
+        sql_tracker = PartialSQLTracker()
+        tool_calls: Dict[str, Dict[str, Any]] = {}
+        agent_result = None
+
+        async for event in self.agent.stream_async(user_message):
+            if event.get("data"):
+                streamed_text += event["data"]
+                token = {"type": StreamEventType.TOKEN, "text": event["data"]}
+                partial_query = sql_tracker.feed(event["data"])
+                if partial_query is not None:
+                    token["partial_query"] = partial_query
+                yield token
+
+            elif "current_tool_use" in event:
+                tool_use = event["current_tool_use"]
+                tool_use_id = tool_use.get("toolUseId")
+                if tool_use_id and tool_use_id not in tool_calls:
+                    tool_calls[tool_use_id] = {"tool": tool_use.get("name"), "status": "running"}
+                    yield {
+                        "type": StreamEventType.TOOL_STARTED,
+                        "tool": tool_use.get("name"),
+                        "tool_use_id": tool_use_id,
+                    }
+
+            elif "message" in event:
+                for block in event["message"].get("content", []):
+                    tool_result = block.get("toolResult") if isinstance(block, dict) else None
+                    if not tool_result:
+                        continue
+                    tool_use_id = tool_result.get("toolUseId")
+                    call = tool_calls.setdefault(tool_use_id, {"tool": None})
+                    call["status"] = tool_result.get("status", "success")
+                    yield {
+                        "type": StreamEventType.TOOL_FINISHED,
+                        "tool": call["tool"],
+                        "tool_use_id": tool_use_id,
+                        "status": call["status"],
+                    }
+
+            elif "result" in event:
+                agent_result = event["result"]
+
+        response_text = str(agent_result) if agent_result is not None else streamed_text
+
+        yield {
+            "type": StreamEventType.RESULT,
+            "result": {
+                "response": response_text,
+                "generated_query": extract_sql(response_text),
+                "query_explanation": None,
+                "execution_result": None,
+                "tool_calls": [
+                    {"tool": call["tool"], "tool_use_id": tool_use_id, "result": call["status"]}
+                    for tool_use_id, call in tool_calls.items()
+                ],
+            },
         }
 
     def get_system_prompt(self, schema_context: Dict[str, Any] = None) -> str:
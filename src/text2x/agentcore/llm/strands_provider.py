@@ -3,19 +3,78 @@
 Uses Strands SDK's built-in LiteLLMModel for Bedrock integration.
 """
 
+import copy
 import logging
-from typing import Optional
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Optional
 
 from strands.models.litellm import LiteLLMModel
 
 from text2x.agentcore.config import AgentCoreConfig
+from text2x.llm.credentials import AWSCredentialProvider, get_aws_credential_provider
+from text2x.services.llm_gateway import estimate_tokens, get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
 
+def _stream_usage(event: dict) -> Optional[int]:
+    """Total tokens from a Strands metadata event."""
+    if isinstance(event, dict) and "metadata" in event:
+        return event["metadata"].get("usage", {}).get("totalTokens")
+    return None
+
+
+class GatewayLiteLLMModel(LiteLLMModel):
+    """LiteLLMModel whose model calls go through the LLM gateway.
+
+    Bedrock models are given cached AWS credentials with each call. The model
+    is shared by concurrent agent calls, so its client_args are never changed.
+    """
+
+    def __init__(
+        self,
+        client_args: Optional[dict] = None,
+        credentials: Optional[AWSCredentialProvider] = None,
+        **model_config: Any,
+    ):
+        super().__init__(client_args=client_args, **model_config)
+        self.credentials = credentials
+
+    def _for_call(self) -> LiteLLMModel:
+        """This model, or a shallow copy whose client_args carry current credentials."""
+        if self.credentials is None:
+            return self
+        model = copy.copy(self)
+        model.client_args = {**self.client_args, **self.credentials.litellm_kwargs()}
+        return model
+
+    async def stream(self, messages, *args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
+        model_id = self.get_config()["model_id"]
+        model = self._for_call()
+        max_tokens = model.client_args.get("max_tokens")
+        gateway_stream = get_llm_gateway().stream(
+            model_id,
+            lambda: LiteLLMModel.stream(model, messages, *args, **kwargs),
+            estimated_tokens=estimate_tokens(messages, max_tokens),
+            usage_of=_stream_usage,
+        )
+        async with aclosing(gateway_stream) as events:
+            async for event in events:
+                yield event
+
+    async def structured_output(self, *args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
+        structured = LiteLLMModel.structured_output(self._for_call(), *args, **kwargs)
+        async with aclosing(structured) as events:
+            async for event in events:
+                yield event
+
+
 def create_litellm_model(config: Optional[AgentCoreConfig] = None) -> LiteLLMModel:
     """Create a Strands LiteLLM model provider for AgentCore.
 
+    Model calls go through the LLM gateway (concurrency, rate and circuit
+    breaker limits per model).
+
     Args:
         config: AgentCore configuration (defaults to from_env)
 
@@ -34,9 +93,14 @@ def create_litellm_model(config: Optional[AgentCoreConfig] = None) -> LiteLLMMod
     if config.api_base:
         client_args["base_url"] = config.api_base
 
-    model = LiteLLMModel(
+    credentials = None
+    if config.model.startswith("bedrock/"):
+        credentials = get_aws_credential_provider(config.region)
+
+    model = GatewayLiteLLMModel(
         model_id=config.model,
         client_args=client_args,
+        credentials=credentials,
     )
 
     logger.info(f"Created Strands LiteLLM model provider: {config.model}")
@@ -1,8 +1,8 @@
 """Base Agent class with LLM integration"""
-import asyncio
 import json
+import logging
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import httpx
@@ -22,6 +22,8 @@ else:
     # Fallback if dynamic import fails
     from text2x.models import ReasoningTrace
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class LLMConfig:
@@ -56,6 +58,7 @@ class LLMClient:
     
     def __init__(self, config: LLMConfig):
         self.config = config
+        self.model = config.model
         self.client = httpx.AsyncClient(timeout=config.timeout)
     
     async def invoke(
@@ -124,6 +127,7 @@ class LiteLLMAdapter:
             else:
                 model = f"bedrock/{model}"
         
+        self.model = model
         self.litellm_client = LiteLLMClient(
             model=model,
             region=DEFAULT_REGION,
@@ -171,6 +175,11 @@ class LiteLLMAdapter:
 class BaseAgent(ABC):
     """Base class for all agents"""
     
+    # Cache temperature-0 LLM responses (opt-in per agent); TTL in seconds,
+    # None uses settings.llm_cache_ttl
+    llm_cache_enabled: bool = False
+    llm_cache_ttl: Optional[int] = None
+    
     def __init__(self, llm_config: LLMConfig, agent_name: Optional[str] = None):
         self.llm_config = llm_config
         
@@ -182,25 +191,85 @@ class BaseAgent(ABC):
         
         self.agent_name = agent_name or self.__class__.__name__
         self.reasoning_traces: List[ReasoningTrace] = []
+        
+        # Response cache (resolved lazily) and its usage since the last trace
+        self.llm_response_cache = None
+        self.llm_cache_usage = {"hits": 0, "misses": 0, "saved_tokens": 0}
     
     async def invoke_llm(
         self,
         messages: List[LLMMessage],
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        max_retries: int = 3
+        max_retries: Optional[int] = None
     ) -> LLMResponse:
-        """Invoke LLM with exponential backoff retry"""
-        for attempt in range(max_retries):
-            try:
-                return await self.llm_client.invoke(messages, temperature, max_tokens)
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise
-                wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                await asyncio.sleep(wait_time)
-        
-        raise RuntimeError("Max retries exceeded")
+        """
+        Invoke LLM through the gateway, serving deterministic calls from cache.
+
+        The gateway applies the model's concurrency, rate and circuit breaker
+        limits and retries transient failures with jittered backoff
+        (max_retries attempts, defaulting to settings.llm_max_retries).
+        """
+        from text2x.services.llm_gateway import estimate_tokens, get_llm_gateway
+        
+        cache_key = self._llm_cache_key(messages, temperature, max_tokens)
+        if cache_key:
+            cached = await self.llm_response_cache.get(cache_key)
+            if cached:
+                response = LLMResponse(**cached)
+                self._record_llm_cache_hit(response)
+                return response
+            self.llm_cache_usage["misses"] += 1
+        
+        response = await get_llm_gateway().call(
+            getattr(self.llm_client, "model", self.llm_config.model),
+            lambda: self.llm_client.invoke(messages, temperature, max_tokens),
+            estimated_tokens=estimate_tokens(
+                [m.content for m in messages],
+                max_tokens if max_tokens is not None else self.llm_config.max_tokens,
+            ),
+            max_retries=max_retries,
+        )
+        
+        if cache_key:
+            await self.llm_response_cache.set(cache_key, asdict(response), ttl=self.llm_cache_ttl)
+        return response
+    
+    def _llm_cache_key(
+        self,
+        messages: List[LLMMessage],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> Optional[str]:
+        """Cache key for a call, or None if the call must not be cached"""
+        from text2x.config import settings
+        from text2x.services.llm_response_cache import LLMResponseCache, get_llm_response_cache
+        
+        if not (self.llm_cache_enabled and settings.llm_cache_enabled):
+            return None
+        
+        temp = temperature if temperature is not None else self.llm_config.temperature
+        if not LLMResponseCache.is_cacheable(temp):
+            return None
+        
+        if self.llm_response_cache is None:
+            self.llm_response_cache = get_llm_response_cache()
+        
+        return LLMResponseCache.make_key(
+            model=getattr(self.llm_client, "model", self.llm_config.model),
+            messages=[{"role": m.role, "content": m.content} for m in messages],
+            temperature=temp,
+            max_tokens=max_tokens if max_tokens is not None else self.llm_config.max_tokens,
+        )
+    
+    def _record_llm_cache_hit(self, response: LLMResponse) -> None:
+        """Count a cache hit and the tokens it saved"""
+        from text2x.utils.observability import record_llm_cache_saved_tokens
+        
+        self.llm_cache_usage["hits"] += 1
+        self.llm_cache_usage["saved_tokens"] += response.tokens_used
+        record_llm_cache_saved_tokens(self.agent_name, response.tokens_used)
+        logger.debug(f"{self.agent_name}: LLM response served from cache")
     
     def add_trace(
         self,
@@ -209,7 +278,11 @@ class BaseAgent(ABC):
         output_data: Dict[str, Any],
         duration_ms: float
     ) -> None:
-        """Add reasoning trace entry"""
+        """Add reasoning trace entry, including LLM cache usage since the last one"""
+        if self.llm_cache_usage["hits"] or self.llm_cache_usage["misses"]:
+            output_data = {**output_data, "llm_cache": dict(self.llm_cache_usage)}
+            self.llm_cache_usage = {"hits": 0, "misses": 0, "saved_tokens": 0}
+        
         trace = ReasoningTrace(
             agent_name=self.agent_name,
             step=step,
@@ -227,6 +300,7 @@ class BaseAgent(ABC):
     def clear_traces(self) -> None:
         """Clear reasoning traces"""
         self.reasoning_traces = []
+        self.llm_cache_usage = {"hits": 0, "misses": 0, "saved_tokens": 0}
     
     def build_system_prompt(self) -> str:
         """Build system prompt for this agent"""
@@ -2,8 +2,11 @@
 import json
 import time
 from typing import Dict, Any, List, Optional
-from text2x.agents.base import BaseAgent, LLMConfig, LLMMessage
-from text2x.models import SchemaContext, QueryResult, RAGExample, ValidationResult, ValidationStatus
+from text2x.agents.base import BaseAgent, LLMConfig, LLMMessage, _domain_models
+from text2x.models import SchemaContext, QueryResult, RAGExample, ValidationStatus
+
+# The domain ValidationResult (text2x.models exports the DB structure of that name)
+ValidationResult = _domain_models.ValidationResult
 
 
 class QueryBuilderAgent(BaseAgent):
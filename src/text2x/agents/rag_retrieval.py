@@ -28,6 +28,8 @@ class RAGRetrievalAgent(BaseAgent):
     Implementation follows design.md section 3.5 and 3.3 (RAG Query Strategy)
     """
 
+    llm_cache_enabled = True
+
     def __init__(
         self,
         llm_config: LLMConfig,
@@ -17,6 +17,8 @@ class SchemaExpertAgent(BaseAgent):
     - Enrich context with annotations
     """
     
+    llm_cache_enabled = True
+    
     def __init__(self, llm_config: LLMConfig, provider: QueryProvider):
         super().__init__(llm_config, agent_name="SchemaExpertAgent")
         self.provider = provider
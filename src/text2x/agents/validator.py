@@ -1,9 +1,13 @@
 """Validator Agent - validates and tests generated queries"""
 import time
 from typing import Dict, Any, Optional, List
-from text2x.agents.base import BaseAgent, LLMConfig, LLMMessage
-from text2x.models import ValidationResult, ValidationStatus, ExecutionResult
-from text2x.providers.base import QueryProvider, ProviderCapability
+from text2x.agents.base import BaseAgent, LLMConfig, LLMMessage, _domain_models
+from text2x.models import ValidationStatus
+from text2x.providers.base import PlanEstimate, QueryProvider, ProviderCapability
+
+# Domain results (text2x.models exports the DB structures of these names)
+ValidationResult = _domain_models.ValidationResult
+ExecutionResult = _domain_models.ExecutionResult
 
 
 class ValidatorAgent(BaseAgent):
@@ -17,6 +21,8 @@ class ValidatorAgent(BaseAgent):
     - Provide diagnostic feedback for refinement
     """
     
+    llm_cache_enabled = True
+    
     def __init__(
         self,
         llm_config: LLMConfig,
@@ -40,6 +46,7 @@ class ValidatorAgent(BaseAgent):
         Output:
             - validation_result: ValidationResult
             - execution_result: Optional[ExecutionResult]
+            - plan_estimate: Optional[PlanEstimate] (planner cost/row estimates)
         """
         start_time = time.time()
         
@@ -47,7 +54,7 @@ class ValidatorAgent(BaseAgent):
         user_query = input_data.get("user_query", "")
         
         # Validation pipeline
-        validation_result, execution_result = await self._run_validation_pipeline(
+        validation_result, execution_result, plan_estimate = await self._run_validation_pipeline(
             query=query,
             user_query=user_query
         )
@@ -59,35 +66,37 @@ class ValidatorAgent(BaseAgent):
             output_data={
                 "valid": validation_result.valid,
                 "status": validation_result.validation_status.value,
-                "executed": execution_result is not None
+                "executed": execution_result is not None,
+                "plan_estimate": plan_estimate.to_dict() if plan_estimate else None
             },
             duration_ms=duration_ms
         )
         
         return {
             "validation_result": validation_result,
-            "execution_result": execution_result
+            "execution_result": execution_result,
+            "plan_estimate": plan_estimate
         }
     
     async def _run_validation_pipeline(
         self,
         query: str,
         user_query: str
-    ) -> tuple[ValidationResult, Optional[ExecutionResult]]:
-        """Run complete validation pipeline"""
+    ) -> tuple[ValidationResult, Optional[ExecutionResult], Optional[PlanEstimate]]:
+        """Run complete validation pipeline, also returning the planner estimate"""
         # Step 1: Syntax validation
-        syntax_result = await self._validate_syntax(query)
+        syntax_result, plan_estimate = await self._validate_syntax(query)
         if not syntax_result.valid:
-            return syntax_result, None
+            return syntax_result, None, plan_estimate
         
         # Step 2: Semantic validation (basic checks)
         semantic_result = await self._validate_semantics(query, user_query)
         if not semantic_result.valid:
-            return semantic_result, None
+            return semantic_result, None, plan_estimate
         
         # Step 3: Execution test (if provider supports it)
         if ProviderCapability.QUERY_EXECUTION in self.provider.get_capabilities():
-            execution_result = await self._execute_query(query)
+            execution_result = await self._execute_query(query, plan_estimate)
             
             # Step 4: Result analysis
             result_validation = await self._analyze_results(
@@ -96,38 +105,48 @@ class ValidatorAgent(BaseAgent):
                 execution_result=execution_result
             )
             
-            return result_validation, execution_result
+            return result_validation, execution_result, plan_estimate
         else:
             # No execution capability, mark as passed if syntax/semantics OK
             return ValidationResult(
                 valid=True,
                 validation_status=ValidationStatus.PASSED
-            ), None
+            ), None, plan_estimate
     
-    async def _validate_syntax(self, query: str) -> ValidationResult:
-        """Validate query syntax using provider"""
+    async def _validate_syntax(
+        self,
+        query: str
+    ) -> tuple[ValidationResult, Optional[PlanEstimate]]:
+        """
+        Validate query syntax using provider (repeat validations are served from cache)
+        
+        Returns:
+            The validation result and the provider's planner estimate, if any
+        """
+        from text2x.services.validation_cache import get_validation_cache
+        
         try:
-            provider_result = await self.provider.validate_syntax(query)
+            provider_result = await get_validation_cache().validate(self.provider, query)
             
             if provider_result.valid:
                 return ValidationResult(
                     valid=True,
                     validation_status=ValidationStatus.PENDING
-                )
+                ), provider_result.plan_estimate
             else:
                 return ValidationResult(
                     valid=False,
                     validation_status=ValidationStatus.FAILED,
                     error=f"Syntax error: {provider_result.error}",
                     suggestions=["Check query syntax", "Verify table and column names"]
-                )
+                ), provider_result.plan_estimate
         except Exception as e:
             return ValidationResult(
                 valid=False,
                 validation_status=ValidationStatus.FAILED,
                 error=f"Syntax validation failed: {str(e)}",
                 suggestions=["Review query structure"]
-            )
+            ), None
     
     async def _validate_semantics(self, query: str, user_query: str) -> ValidationResult:
         """Basic semantic validation"""
@@ -161,10 +180,33 @@ class ValidatorAgent(BaseAgent):
             validation_status=ValidationStatus.PENDING
         )
     
-    async def _execute_query(self, query: str) -> ExecutionResult:
-        """Execute query with safety limits"""
+    async def _execute_query(
+        self,
+        query: str,
+        plan_estimate: Optional[PlanEstimate] = None
+    ) -> ExecutionResult:
+        """Execute query with safety limits, after checking its estimated cost
+        
+        ``plan_estimate`` (from syntax validation) saves the cost guard from
+        estimating the query again.
+        """
+        from text2x.services.cost_guard import get_cost_guard
+        
         try:
-            result = await self.provider.execute_query(query, limit=self.execution_limit)
+            start_time = time.time()
+            decision = await get_cost_guard().check(
+                self.provider, query, estimate=plan_estimate, limit=self.execution_limit
+            )
+            self.add_trace(
+                step="cost_guard",
+                input_data={"query_length": len(query)},
+                output_data=decision.to_dict(),
+                duration_ms=(time.time() - start_time) * 1000
+            )
+            if not decision.allowed:
+                return ExecutionResult(success=False, error=decision.error)
+            
+            result = await self.provider.execute_query(decision.query, limit=self.execution_limit)
             
             if result and result.success:
                 return result
@@ -242,6 +284,10 @@ class ValidatorAgent(BaseAgent):
             suggestions.append("Review query syntax")
             suggestions.append("Check for missing or extra commas, parentheses")
         
+        if 'cost budget' in error_lower:
+            suggestions.append("Add selective filters or aggregate before joining")
+            suggestions.append("Check JOIN conditions for a missing key (cartesian product)")
+        
         if 'ambiguous' in error_lower:
             suggestions.append("Add table aliases to disambiguate columns")
             suggestions.append("Qualify column names with table names")
@@ -1,4 +1,5 @@
 """FastAPI application setup and configuration."""
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
@@ -17,7 +18,7 @@ from text2x.utils.observability import setup_json_logging, get_correlation_id
 
 # Configure logging based on settings
 if settings.log_format == "json":
-    setup_json_logging(settings.log_level)
+    setup_json_logging(settings.log_level, use_queue=settings.log_queue_enabled)
 else:
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper()),
@@ -38,6 +39,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await initialize_database()
         logger.info("Database initialized successfully")
 
+        # Start the batched audit trail writer
+        from text2x.services.audit_sink import get_audit_sink
+
+        await get_audit_sink().start()
+
+        # Keep the dashboard statistics rollups current
+        if settings.stats_rollups_enabled:
+            from text2x.services.stats_rollup import get_stats_rollup_job
+
+            await get_stats_rollup_job().start()
+
         # Seed default super admin
         await seed_default_admin()
         logger.info("Default super admin seeded")
@@ -68,11 +80,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Shutting down Text2DSL API...")
 
     try:
+        if settings.stats_rollups_enabled:
+            from text2x.services.stats_rollup import get_stats_rollup_job
+
+            await get_stats_rollup_job().stop()
+
+        # Write queued audit events while the database is still open
+        from text2x.services.audit_sink import get_audit_sink
+
+        await get_audit_sink().stop()
+        logger.info("Audit sink flushed")
+
         # Close database connections
         if app_state.db_engine:
-            await app_state.db_engine.dispose()
+            from text2x.models.base import close_db
+
+            await close_db()
+            app_state.db_engine = None
             logger.info("Database connections closed")
 
+        # Stop cache invalidation listener before closing Redis
+        from text2x.services.tiered_cache import stop_invalidation_listener
+
+        await stop_invalidation_listener()
+
         # Close Redis connection
         if app_state.redis_client:
             await app_state.redis_client.close()
@@ -95,23 +126,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
 
 async def initialize_database() -> None:
-    """Initialize database connection pool."""
+    """Initialize the metadata database engine and connection pool."""
     from sqlalchemy import text
-    from sqlalchemy.ext.asyncio import create_async_engine
     from text2x.models.base import DatabaseConfig, init_db
 
     try:
-        app_state.db_engine = create_async_engine(
-            settings.database_url,
-            pool_size=settings.database_pool_size,
-            max_overflow=settings.database_max_overflow,
-            echo=settings.database_echo,
-            pool_pre_ping=True,  # Verify connections before using
-        )
-
-        # Also initialize the models database session
-        config = DatabaseConfig.from_env()
-        init_db(config)
+        # One engine for repositories, route helpers and the provider factory
+        db = init_db(DatabaseConfig.from_settings())
+        app_state.db_engine = db.engine
 
         # Test connection
         async with app_state.db_engine.connect() as conn:
@@ -136,11 +158,31 @@ async def initialize_redis() -> None:
         # Test connection
         await app_state.redis_client.ping()
 
+        # Apply cache invalidations broadcast by other API nodes
+        from text2x.services.tiered_cache import start_invalidation_listener
+
+        await start_invalidation_listener(app_state.redis_client)
+
+        # Tag annotation cache keys written before tag-based invalidation
+        asyncio.create_task(migrate_annotation_cache_tags())
+
     except Exception as e:
         logger.error(f"Failed to initialize Redis: {e}")
         raise
 
 
+async def migrate_annotation_cache_tags() -> None:
+    """Register legacy annotation cache keys in their connection tag sets."""
+    from text2x.services.annotation_cache_service import AnnotationCacheService
+
+    try:
+        tagged = await AnnotationCacheService().migrate_untagged_keys()
+        if tagged:
+            logger.info(f"Migrated {tagged} annotation cache keys to tag sets")
+    except Exception as e:
+        logger.warning(f"Annotation cache tag migration failed: {e}")
+
+
 async def initialize_opensearch() -> None:
     """Initialize OpenSearch connection."""
     from opensearchpy import AsyncOpenSearch
@@ -398,16 +440,32 @@ async def query_websocket(websocket: WebSocket) -> None:
             "trace_level": "none" | "summary" | "full",
             "max_iterations": 3,
             "confidence_threshold": 0.8,
-            "enable_execution": false
+            "enable_execution": false,
+            "stream_tokens": true
         }
     }
 
     The server will respond with a stream of events:
     {
-        "type": "progress" | "clarification" | "result" | "error",
+        "type": "progress" | "token" | "tool_started" | "tool_finished" | "clarification"
+                | "result" | "error" | "job_status" | "cancelled",
         "data": {...},
         "trace": {...}  // if trace_level != "none"
     }
+
+    While the agent runs, "token" events carry model text deltas ({"text": ...},
+    plus "partial_query" whenever the SQL block opens, closes or ends a line)
+    and tool events report the agent's tool calls ({"tool", "tool_use_id",
+    "status"}).
+    Set options.stream_tokens to false to receive only progress and result.
+
+    While the query is processed the client may send {"action": "cancel"};
+    disconnecting also cancels processing.
+
+    For providers that run search jobs (Splunk), execution progress events
+    carry the running job, and the client may also send:
+    {"action": "job_status", "sid": "optional-sid"}
+    {"action": "cancel", "sid": "optional-sid"}  // without sid cancels the query
     """
     await websocket.accept()
     logger.info(f"WebSocket connection accepted from {websocket.client}")
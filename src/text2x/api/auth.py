@@ -15,6 +15,8 @@ from text2x.config import settings
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
+    from text2x.services.tiered_cache import TieredCache
+
 logger = logging.getLogger(__name__)
 
 # Security schemes
@@ -52,6 +54,7 @@ class TokenData(BaseModel):
     user_id: str
     email: str
     roles: list[str] = Field(default_factory=list)
+    issued_at: Optional[int] = None  # "iat" claim, seconds since the epoch
 
 
 def create_access_token(
@@ -158,6 +161,7 @@ def decode_token(token: str) -> TokenData:
         user_id: str = payload.get("sub")
         email: str = payload.get("email")
         roles: list[str] = payload.get("roles", [])
+        issued_at: Optional[int] = payload.get("iat")
 
         if user_id is None or email is None:
             raise HTTPException(
@@ -166,7 +170,7 @@ def decode_token(token: str) -> TokenData:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return TokenData(user_id=user_id, email=email, roles=roles)
+        return TokenData(user_id=user_id, email=email, roles=roles, issued_at=issued_at)
 
     except JWTError as e:
         logger.warning(f"JWT validation failed: {e}")
@@ -235,44 +239,36 @@ async def get_current_user_from_token(
     token = credentials.credentials
     token_data = decode_token(token)
 
-    # Try to fetch user from database to verify it exists and is active
-    try:
-        from uuid import UUID
-        from text2x.repositories.user import UserRepository
-
-        repository = UserRepository()
-        db_user = await repository.get_by_id(UUID(token_data.user_id))
-
-        if db_user:
-            # Use database user information
-            if not db_user.is_active:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="User account is inactive",
-                )
-
-            user = User(
-                id=str(db_user.id),
-                email=db_user.email,
-                name=db_user.name,
-                role=db_user.role.value if hasattr(db_user.role, 'value') else str(db_user.role),
-                roles=[db_user.role.value if hasattr(db_user.role, 'value') else str(db_user.role)],
-                is_active=db_user.is_active,
-                created_at=db_user.created_at.isoformat() if hasattr(db_user.created_at, 'isoformat') else str(db_user.created_at),
-                updated_at=db_user.updated_at.isoformat() if hasattr(db_user.updated_at, 'isoformat') else str(db_user.updated_at),
-            )
-            return user
-    except Exception as e:
-        # If database lookup fails, fall back to token data
-        # This allows the system to work even if DB is temporarily unavailable
-        logger.debug(f"Database user lookup failed, using token data: {e}")
-
-    # Fall back to token data (backward compatibility)
-    user = User(
-        id=token_data.user_id,
-        email=token_data.email,
-        roles=token_data.roles,
-    )
+    # The principal is cached per token, so a re-issued token always reloads the user
+    cache = principal_cache() if settings.principal_cache_ttl > 0 else None
+    cache_key = f"{token_data.user_id}:{token_data.issued_at}"
+    user = cache.get_local(cache_key) if cache else None
+
+    if user is None:
+        # Try to fetch user from database to verify it exists and is active
+        try:
+            from text2x.repositories.user import UserRepository
+
+            repository = UserRepository()
+            db_user = await repository.get_by_id(UUID(token_data.user_id))
+
+            if db_user:
+                # Use database user information
+                user = _user_from_db(db_user)
+                if cache:
+                    cache.set_local(cache_key, user)
+        except Exception as e:
+            # If database lookup fails, fall back to token data
+            # This allows the system to work even if DB is temporarily unavailable
+            logger.debug(f"Database user lookup failed, using token data: {e}")
+
+    if user is None:
+        # Fall back to token data (backward compatibility)
+        user = User(
+            id=token_data.user_id,
+            email=token_data.email,
+            roles=token_data.roles,
+        )
 
     if not user.is_active:
         raise HTTPException(
@@ -283,6 +279,50 @@ async def get_current_user_from_token(
     return user
 
 
+def _user_from_db(db_user) -> User:
+    role = db_user.role.value if hasattr(db_user.role, 'value') else str(db_user.role)
+    return User(
+        id=str(db_user.id),
+        email=db_user.email,
+        name=db_user.name,
+        role=role,
+        roles=[role],
+        is_active=db_user.is_active,
+        created_at=db_user.created_at.isoformat() if hasattr(db_user.created_at, 'isoformat') else str(db_user.created_at),
+        updated_at=db_user.updated_at.isoformat() if hasattr(db_user.updated_at, 'isoformat') else str(db_user.updated_at),
+    )
+
+
+def principal_cache() -> "TieredCache":
+    """
+    Get the in-process cache of authenticated principals.
+
+    Entries are keyed by user id and token ``iat`` and live for
+    PRINCIPAL_CACHE_TTL seconds; they are never written to Redis. Cached
+    principals are shared between requests and must be treated as read-only.
+    """
+    from text2x.services.tiered_cache import get_tiered_cache
+
+    return get_tiered_cache(
+        "principals",
+        ttl=settings.principal_cache_ttl,
+        max_local_entries=settings.principal_cache_max_entries,
+    )
+
+
+async def invalidate_principal(user_id: str) -> None:
+    """
+    Drop a user's cached principals on every node.
+
+    Call after changing anything the principal carries (role, active status,
+    name, email) so the next request reloads the user.
+
+    Args:
+        user_id: User identifier
+    """
+    await principal_cache().invalidate_local_prefix(f"{user_id}:")
+
+
 async def get_current_user_from_api_key(
     api_key: Optional[str] = Security(api_key_header),
 ) -> Optional[User]:
@@ -0,0 +1,26 @@
+"""Shared FastAPI dependencies."""
+from typing import AsyncGenerator
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from text2x.models.base import get_db
+
+
+async def get_unit_of_work() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Run the request's repository calls in one session and one transaction.
+
+    Repositories join the unit of work automatically through
+    ``get_db().session()``; it is committed once after the endpoint returns
+    and rolled back if the endpoint raises.
+
+    Yields:
+        AsyncSession shared by the request
+    """
+    async with get_db().unit_of_work() as session:
+        yield session
+
+
+# Ends with the endpoint, before the response is sent, so commit errors reach the client
+db_unit_of_work = Depends(get_unit_of_work, scope="function")
@@ -1,160 +1,162 @@
-"""FastAPI middleware for observability and request tracking."""
+"""ASGI middleware for observability and request tracking."""
 import logging
+import random
 import time
-from typing import Callable
+from typing import Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from text2x.config import settings
 from text2x.utils.observability import (
     correlation_context,
     generate_correlation_id,
     record_http_duration,
     record_http_request,
     sanitize_endpoint,
-    set_correlation_id,
 )
 
 logger = logging.getLogger(__name__)
 
 
-class RequestTracingMiddleware(BaseHTTPMiddleware):
+class RequestTracingMiddleware:
     """
-    Middleware for request tracing and observability.
+    Pure ASGI middleware for request tracing and observability.
 
     Features:
-    - Generates correlation IDs for each request
-    - Logs request start/end with latency
-    - Tracks request metadata (method, path, status_code, user_agent)
+    - Generates correlation IDs for each request (or reuses the client's)
     - Adds correlation ID to response headers
     - Records Prometheus metrics for HTTP requests
+    - Logs one line per completed request with method, path, status_code,
+      latency and client, sampled by REQUEST_LOG_SAMPLE_RATE; failed requests,
+      server errors and requests slower than REQUEST_LOG_SLOW_MS are always logged
+
+    Unlike ``BaseHTTPMiddleware`` it wraps only ``send``: responses are passed
+    through message by message, so streaming responses are never buffered and
+    the correlation ID stays set while their body is produced. Latency covers
+    the whole response, including a streamed body.
     """
 
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: Optional[float] = None,
+        slow_ms: Optional[int] = None,
+        header_name: Optional[str] = None,
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            sample_rate: Fraction of requests logged (default: REQUEST_LOG_SAMPLE_RATE)
+            slow_ms: Latency from which requests are always logged
+                (default: REQUEST_LOG_SLOW_MS)
+            header_name: Correlation ID header (default: CORRELATION_ID_HEADER)
+        """
+        self.app = app
+        self.sample_rate = settings.request_log_sample_rate if sample_rate is None else sample_rate
+        self.slow_seconds = (settings.request_log_slow_ms if slow_ms is None else slow_ms) / 1000
+        self.header_name = header_name or settings.correlation_id_header
+        self._header_key = self.header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        correlation_id = self._header(scope, self._header_key) or generate_correlation_id()
+        status_code = 500  # reported if the app fails before responding
+
+        async def send_with_correlation_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(self.header_name, correlation_id)
+            await send(message)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request and add observability."""
-        # Generate or extract correlation ID
-        correlation_id = request.headers.get("X-Correlation-ID")
-        if not correlation_id:
-            correlation_id = generate_correlation_id()
-
-        # Set correlation ID in context
         with correlation_context(correlation_id):
-            set_correlation_id(correlation_id)
-
-            # Track request start time
-            start_time = time.time()
-
-            # Extract request metadata
-            method = request.method
-            path = request.url.path
-            user_agent = request.headers.get("User-Agent", "unknown")
-            client_host = request.client.host if request.client else "unknown"
-
-            # Log request start
-            logger.info(
-                "Request started",
-                extra={
-                    "correlation_id": correlation_id,
-                    "method": method,
-                    "path": path,
-                    "user_agent": user_agent,
-                    "client_host": client_host,
-                },
-            )
-
-            try:
-                # Process request
-                response = await call_next(request)
-
-                # Calculate duration
-                duration = time.time() - start_time
-
-                # Sanitize endpoint for metrics (replace IDs with placeholders)
-                sanitized_endpoint = sanitize_endpoint(path)
-
-                # Record metrics
-                record_http_request(method, sanitized_endpoint, response.status_code)
-                record_http_duration(method, sanitized_endpoint, duration)
-
-                # Log request completion
-                logger.info(
-                    "Request completed",
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Request started",
                     extra={
                         "correlation_id": correlation_id,
-                        "method": method,
-                        "path": path,
-                        "status_code": response.status_code,
-                        "duration_ms": round(duration * 1000, 2),
+                        "method": scope["method"],
+                        "path": scope["path"],
                     },
                 )
 
-                # Add correlation ID to response headers
-                response.headers["X-Correlation-ID"] = correlation_id
-
-                return response
-
+            start_time = time.perf_counter()
+            try:
+                await self.app(scope, receive, send_with_correlation_id)
             except Exception as exc:
-                # Calculate duration even for errors
-                duration = time.time() - start_time
-
-                # Sanitize endpoint for metrics
-                sanitized_endpoint = sanitize_endpoint(path)
-
-                # Record error metrics (status 500)
-                record_http_request(method, sanitized_endpoint, 500)
-                record_http_duration(method, sanitized_endpoint, duration)
-
-                # Log error
-                logger.error(
-                    "Request failed",
-                    extra={
-                        "correlation_id": correlation_id,
-                        "method": method,
-                        "path": path,
-                        "duration_ms": round(duration * 1000, 2),
-                        "error": str(exc),
-                    },
-                    exc_info=True,
-                )
-
-                # Re-raise the exception to be handled by FastAPI exception handlers
+                self._finish(scope, correlation_id, status_code, start_time, exc)
+                # Re-raise the exception to be handled by the server / error middleware
                 raise
-
-
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware for detailed request/response logging.
-
-    This is a lighter alternative if you don't need full tracing.
-    """
-
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Log request and response details."""
-        start_time = time.time()
-
-        # Get or generate correlation ID
-        correlation_id = request.headers.get("X-Correlation-ID", generate_correlation_id())
-        set_correlation_id(correlation_id)
-
-        logger.debug(
-            f"Incoming request: {request.method} {request.url.path}",
-            extra={"correlation_id": correlation_id},
+            self._finish(scope, correlation_id, status_code, start_time)
+
+    def _finish(
+        self,
+        scope: Scope,
+        correlation_id: str,
+        status_code: int,
+        start_time: float,
+        error: Optional[Exception] = None,
+    ) -> None:
+        duration = time.perf_counter() - start_time
+        method = scope["method"]
+        path = scope["path"]
+
+        # Sanitize endpoint for metrics (replace IDs with placeholders)
+        sanitized_endpoint = sanitize_endpoint(path)
+        record_http_request(method, sanitized_endpoint, status_code)
+        record_http_duration(method, sanitized_endpoint, duration)
+
+        if error is not None:
+            logger.error(
+                "Request failed",
+                extra={
+                    "correlation_id": correlation_id,
+                    "method": method,
+                    "path": path,
+                    "duration_ms": round(duration * 1000, 2),
+                    "error": str(error),
+                },
+                exc_info=error,
+            )
+            return
+
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        if (
+            status_code < 500
+            and duration < self.slow_seconds
+            and self.sample_rate < 1.0
+            and random.random() >= self.sample_rate
+        ):
+            return
+
+        client = scope.get("client")
+        logger.info(
+            "Request completed",
+            extra={
+                "correlation_id": correlation_id,
+                "method": method,
+                "path": path,
+                "status_code": status_code,
+                "duration_ms": round(duration * 1000, 2),
+                "user_agent": self._header(scope, b"user-agent") or "unknown",
+                "client_host": client[0] if client else "unknown",
+            },
         )
 
-        response = await call_next(request)
-        duration = time.time() - start_time
+    @staticmethod
+    def _header(scope: Scope, key: bytes) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == key:
+                return value.decode("latin-1")
+        return None
 
-        logger.debug(
-            f"Response: {response.status_code} ({duration*1000:.2f}ms)",
-            extra={"correlation_id": correlation_id},
-        )
 
-        response.headers["X-Correlation-ID"] = correlation_id
-        return response
+# The former lighter logging-only middleware; request tracing now costs no more
+LoggingMiddleware = RequestTracingMiddleware
@@ -91,6 +91,10 @@ class QueryOptions(BaseModel):
         le=20,
         description="Number of RAG examples to retrieve",
     )
+    stream_tokens: bool = Field(
+        default=True,
+        description="Stream model tokens and tool calls as WebSocket events",
+    )
 
 
 class QueryRequest(BaseModel):
@@ -338,6 +342,31 @@ class ConversationResponse(BaseModel):
     turns: list[ConversationTurnResponse] = Field(default_factory=list)
 
 
+class ConversationSummaryResponse(BaseModel):
+    """Response model for a conversation in a listing (no turns)."""
+
+    model_config = ConfigDict(extra="allow")
+
+    id: UUID
+    provider_id: Optional[str] = None
+    connection_id: Optional[UUID] = None
+    status: ConversationStatus
+    turn_count: int
+    last_turn_at: Optional[datetime] = Field(None, description="When the last turn was created")
+    last_user_input: Optional[str] = Field(None, description="User input of the last turn")
+    created_at: datetime
+    updated_at: datetime
+
+
+class ConversationListResponse(BaseModel):
+    """Response model for one page of conversations."""
+
+    conversations: list[ConversationSummaryResponse] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to get the next page; null on the last page"
+    )
+
+
 # RAG Example Models
 class RAGExampleResponse(BaseModel):
     """Response model for RAG examples."""
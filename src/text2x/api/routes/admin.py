@@ -7,12 +7,12 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from text2x.api.auth import get_current_active_user, require_role, require_any_role
-from text2x.api.state import app_state
 from text2x.api.models import ErrorResponse
 from text2x.api.auth import User, get_current_active_user, require_role
+from text2x.models.base import get_db
 from text2x.models.admin import AdminRole, WorkspaceAdmin
 from text2x.models.workspace import Workspace
 from text2x.repositories.admin import WorkspaceAdminRepository
@@ -23,13 +23,8 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 async def get_session() -> AsyncSession:
-    """Get database session from app state."""
-    session_maker = async_sessionmaker(
-        app_state.db_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
-    return session_maker()
+    """Get a session from the shared metadata database engine."""
+    return get_db().session_factory()
 
 
 # ============================================================================
@@ -11,11 +11,12 @@ from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, ConfigDict
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from text2x.api.models import ErrorResponse, TableInfo
 from text2x.api.state import app_state
 from text2x.config import settings
+from text2x.models.base import get_db
 from text2x.models.workspace import Connection, ProviderType
 from text2x.providers.sql_provider import SQLConnectionConfig, SQLProvider
 from text2x.repositories.annotation import SchemaAnnotationRepository
@@ -240,13 +241,8 @@ JSON OUTPUT:"""
 
 
 async def get_session() -> AsyncSession:
-    """Get database session from app state."""
-    session_maker = async_sessionmaker(
-        app_state.db_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
-    return session_maker()
+    """Get a session from the shared metadata database engine."""
+    return get_db().session_factory()
 
 
 # Request/Response Models
@@ -910,41 +906,38 @@ async def save_annotation(
         )
         result = annotation.to_dict()
 
-    # Save column annotations
+    # Save column annotations in one upsert
     if request.columns:
+        column_rows = []
         for col in request.columns:
             col_name = col.get("name")  # Use column name as-is (e.g., "metadata.request_id")
             existing_col = next((a for a in existing if a.column_name == col_name), None)
 
-            if existing_col:
-                await repo.update(
-                    annotation_id=existing_col.id,
-                    description=col.get("description", ""),
-                    examples=[col.get("sample_values")] if col.get("sample_values") else None,
-                )
-            elif col.get("description"):
-                await repo.create(
-                    provider_id=str(connection_id),
-                    table_name=request.table_name,  # Set table_name for column annotations
-                    column_name=col_name,
-                    description=col.get("description", ""),
-                    created_by="system",
-                    examples=[col.get("sample_values")] if col.get("sample_values") else None,
-                )
-            elif col.get("description"):
-                await repo.create(
-                    provider_id=str(connection_id),
-                    column_name=col_name,
-                    description=col.get("description", ""),
-                    created_by="system",
-                    examples=[col.get("sample_values")] if col.get("sample_values") else None,
-                )
+            if not existing_col and not col.get("description"):
+                continue
+
+            column_rows.append(
+                {
+                    # Match the stored row's table_name so the upsert updates it in place
+                    "table_name": existing_col.table_name if existing_col else request.table_name,
+                    "column_name": col_name,
+                    "description": col.get("description", ""),
+                    "examples": [col.get("sample_values")] if col.get("sample_values") else None,
+                }
+            )
+
+        await repo.upsert_many(
+            provider_id=str(connection_id), annotations=column_rows, created_by="system"
+        )
 
     result["columns"] = request.columns or []
 
     # Invalidate annotation cache
-    await cache_service.invalidate_table_annotation(connection_id, request.table_name)
-    await cache_service.invalidate_all_for_connection(connection_id)
+    await cache_service.invalidate_many(
+        connection_id,
+        request.table_name,
+        [col.get("name") for col in request.columns or [] if col.get("name")],
+    )
 
     return result
 
@@ -1,24 +1,31 @@
 """Conversation management endpoints."""
 import logging
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from text2x.api.state import app_state
+from text2x.api.auth import User, get_current_user
+from text2x.api.dependencies import db_unit_of_work
 from text2x.api.models import (
+    ConversationListResponse,
     ConversationResponse,
     ConversationStatus,
+    ConversationSummaryResponse,
     ConversationTurnResponse,
     ErrorResponse,
     ValidationStatus,
 )
 from text2x.api.routes.feedback import SubmitFeedbackRequest, FeedbackResponse
+from text2x.models.base import get_db
 from text2x.models.conversation import Conversation, ConversationTurn
+from text2x.models.conversation import ConversationStatus as DBConversationStatus
 from text2x.models.feedback import FeedbackCategory, FeedbackRating
 from text2x.models.rag import RAGExample, ExampleStatus
+from text2x.repositories.conversation import ConversationRepository, defer_turn_details
 from text2x.services.feedback_service import FeedbackService
 
 logger = logging.getLogger(__name__)
@@ -27,15 +34,83 @@ router = APIRouter(prefix="/conversations", tags=["conversations"])
 
 
 async def get_session() -> AsyncSession:
-    """Get database session from app state."""
-    from sqlalchemy.ext.asyncio import async_sessionmaker
+    """Get a session from the shared metadata database engine."""
+    return get_db().session_factory()
 
-    session_maker = async_sessionmaker(
-        app_state.db_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
+
+@router.get(
+    "",
+    response_model=ConversationListResponse,
+    summary="List conversations",
+    description="List your conversations, most recently updated first, one page at a time",
+)
+async def list_conversations(
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of conversations"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    status_filter: Optional[ConversationStatus] = Query(None, alias="status"),
+    connection_id: Optional[UUID] = Query(None, description="Only this connection's"),
+    current_user: Optional[User] = Depends(get_current_user),
+) -> ConversationListResponse:
+    """
+    List the current user's conversations with turn counts and last turns.
+
+    Pages are cursor-based: pass the ``next_cursor`` of a response to get the
+    next page, until it is null. Turns themselves are not returned; use
+    ``GET /conversations/{conversation_id}`` for those.
+
+    Args:
+        limit: Maximum number of conversations per page
+        cursor: Cursor of the page to return (optional)
+        status_filter: Only conversations with this status (optional)
+        connection_id: Only conversations on this connection (optional)
+        current_user: Current authenticated user
+
+    Returns:
+        Page of conversation summaries and the next page's cursor
+
+    Raises:
+        HTTPException: If the cursor is invalid (400) or listing fails (500)
+    """
+    try:
+        page = await ConversationRepository().list_summaries(
+            user_id=current_user.id if current_user else "anonymous",
+            connection_id=connection_id,
+            status=DBConversationStatus(status_filter.value) if status_filter else None,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorResponse(error="invalid_cursor", message=str(e)).model_dump(),
+        )
+    except Exception as e:
+        logger.error(f"Error listing conversations: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ErrorResponse(
+                error="fetch_error",
+                message="Failed to list conversations",
+            ).model_dump(),
+        )
+
+    return ConversationListResponse(
+        conversations=[
+            ConversationSummaryResponse(
+                id=item.conversation.id,
+                provider_id=item.conversation.provider_id,
+                connection_id=item.conversation.connection_id,
+                status=ConversationStatus(item.conversation.status.value),
+                turn_count=item.turn_count,
+                last_turn_at=item.last_turn.created_at if item.last_turn else None,
+                last_user_input=item.last_turn.user_input if item.last_turn else None,
+                created_at=item.conversation.created_at,
+                updated_at=item.conversation.updated_at,
+            )
+            for item in page.items
+        ],
+        next_cursor=page.next_cursor,
     )
-    return session_maker()
 
 
 @router.get(
@@ -66,10 +141,10 @@ async def get_conversation(conversation_id: UUID) -> ConversationResponse:
         logger.info(f"Fetching conversation {conversation_id}")
 
         async with await get_session() as session:
-            # Query conversation with turns eagerly loaded
+            # Query conversation with turns eagerly loaded, without their large JSON columns
             stmt = (
                 select(Conversation)
-                .options(selectinload(Conversation.turns))
+                .options(selectinload(Conversation.turns).options(*defer_turn_details()))
                 .where(Conversation.id == conversation_id)
             )
             result = await session.execute(stmt)
@@ -187,6 +262,7 @@ async def get_conversation_turns(
                 select(ConversationTurn)
                 .where(ConversationTurn.conversation_id == conversation_id)
                 .order_by(ConversationTurn.turn_number)
+                .options(*defer_turn_details())
             )
             result = await session.execute(stmt)
             turns = result.scalars().all()
@@ -237,6 +313,7 @@ async def get_conversation_turns(
     status_code=status.HTTP_201_CREATED,
     summary="Submit user feedback",
     description="Submit thumbs up/down feedback for a generated query",
+    dependencies=[db_unit_of_work],
 )
 async def submit_feedback(
     conversation_id: UUID,
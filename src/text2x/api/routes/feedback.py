@@ -7,13 +7,14 @@ from uuid import UUID
 from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field, ConfigDict
 
+from text2x.api.dependencies import db_unit_of_work
 from text2x.api.models import ErrorResponse
 from text2x.models.feedback import FeedbackCategory, FeedbackRating
 from text2x.services.feedback_service import FeedbackService
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/feedback", tags=["feedback"])
+router = APIRouter(prefix="/feedback", tags=["feedback"], dependencies=[db_unit_of_work])
 
 
 # Request/Response Models
@@ -6,7 +6,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query, status
 from sqlalchemy import select, func
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from text2x.api.models import (
     ErrorResponse,
@@ -14,7 +14,7 @@ from text2x.api.models import (
     ProviderSchema,
     TableInfo,
 )
-from text2x.api.state import app_state
+from text2x.models.base import get_db
 from text2x.models.workspace import Provider, Connection
 from text2x.services.schema_service import SchemaService
 
@@ -24,13 +24,8 @@ router = APIRouter(prefix="/providers", tags=["providers"])
 
 
 async def get_session() -> AsyncSession:
-    """Get database session from app state."""
-    session_maker = async_sessionmaker(
-        app_state.db_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
-    return session_maker()
+    """Get a session from the shared metadata database engine."""
+    return get_db().session_factory()
 
 
 @router.get(
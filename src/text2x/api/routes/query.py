@@ -8,6 +8,7 @@ from uuid import UUID, uuid4
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from text2x.api.auth import User, get_current_user
+from text2x.api.dependencies import db_unit_of_work
 from text2x.api.models import (
     ConversationResponse,
     ConversationTurnResponse,
@@ -18,6 +19,7 @@ from text2x.api.models import (
     ValidationStatus,
 )
 from text2x.config import settings
+from text2x.models.base import get_db
 from text2x.repositories.annotation import SchemaAnnotationRepository
 from text2x.repositories.conversation import ConversationRepository
 from text2x.repositories.provider import ProviderRepository
@@ -285,7 +287,9 @@ async def get_conversation(
 
         # Fetch from database
         conversation_repo = ConversationRepository()
-        conversation = await conversation_repo.get_by_id(conversation_id)
+        conversation = await conversation_repo.get_by_id(
+            conversation_id, with_turn_details=False
+        )
 
         if not conversation:
             raise HTTPException(
@@ -367,7 +371,9 @@ async def get_conversation_turns(
 
         # Fetch from database
         conversation_repo = ConversationRepository()
-        conversation = await conversation_repo.get_by_id(conversation_id)
+        conversation = await conversation_repo.get_by_id(
+            conversation_id, with_turn_details=False
+        )
 
         if not conversation:
             raise HTTPException(
@@ -415,6 +421,7 @@ async def get_conversation_turns(
     "/conversations/{conversation_id}/feedback",
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Submit user feedback",
+    dependencies=[db_unit_of_work],
 )
 async def submit_feedback(
     conversation_id: UUID,
@@ -445,7 +452,9 @@ async def submit_feedback(
             if not turn_id:
                 # Get the latest turn for this conversation
                 conversation_repo = ConversationRepository()
-                conversation = await conversation_repo.get_by_id(conversation_id)
+                conversation = await conversation_repo.get_by_id(
+                    conversation_id, with_turn_details=False
+                )
                 if conversation and conversation.turns:
                     turn_id = conversation.turns[-1].id
                 else:
@@ -464,14 +473,16 @@ async def submit_feedback(
             rating = FeedbackRating.UP if feedback.is_query_correct else FeedbackRating.DOWN
             category = FeedbackCategory.CORRECTNESS
 
+            # Savepoints keep a failure below from rolling back the rest of the request
             try:
-                await feedback_service.submit_feedback(
-                    turn_id=turn_id,
-                    rating=rating,
-                    category=category,
-                    user_id="anonymous",  # Will be replaced with auth context
-                    feedback_text=feedback.feedback_text if hasattr(feedback, 'feedback_text') else None,
-                )
+                async with get_db().session(savepoint=True):
+                    await feedback_service.submit_feedback(
+                        turn_id=turn_id,
+                        rating=rating,
+                        category=category,
+                        user_id="anonymous",  # Will be replaced with auth context
+                        feedback_text=feedback.feedback_text if hasattr(feedback, 'feedback_text') else None,
+                    )
             except Exception as e:
                 logger.error(f"Failed to submit feedback: {e}", exc_info=True)
                 # Don't fail the request if feedback submission fails
@@ -481,34 +492,37 @@ async def submit_feedback(
             if not feedback.is_query_correct and feedback.corrected_query:
                 logger.info("Adding corrected query to RAG store as learning example")
                 try:
-                    rag_service = RAGService()
-
-                    # Get conversation to extract provider_id and original query
-                    conversation_repo = ConversationRepository()
-                    conversation = await conversation_repo.get_by_id(conversation_id)
-
-                    if conversation:
-                        # Get the turn to get the original query
-                        from text2x.repositories.conversation import ConversationTurnRepository
-                        turn_repo = ConversationTurnRepository()
-                        turn = await turn_repo.get_by_id(turn_id)
-
-                        if turn:
-                            # Add the corrected example to RAG (auto-approve good corrections)
-                            await rag_service.add_example(
-                                nl_query=turn.user_input,
-                                generated_query=feedback.corrected_query,
-                                is_good=True,
-                                provider_id=conversation.provider_id or "unknown",
-                                auto_approve=True,  # Auto-approve user corrections with high confidence
-                                metadata={
-                                    "source": "user_feedback",
-                                    "original_query": turn.generated_query,
-                                    "conversation_id": str(conversation_id),
-                                    "turn_id": str(turn_id),
-                                },
-                            )
-                            logger.info(f"Successfully added corrected query to RAG for turn {turn_id}")
+                    async with get_db().session(savepoint=True):
+                        rag_service = RAGService()
+
+                        # Get conversation to extract provider_id and original query
+                        conversation_repo = ConversationRepository()
+                        conversation = await conversation_repo.get_by_id(
+                            conversation_id, with_turn_details=False
+                        )
+
+                        if conversation:
+                            # Get the turn to get the original query
+                            from text2x.repositories.conversation import ConversationTurnRepository
+                            turn_repo = ConversationTurnRepository()
+                            turn = await turn_repo.get_by_id(turn_id, with_details=False)
+
+                            if turn:
+                                # Add the corrected example to RAG (auto-approve good corrections)
+                                await rag_service.add_example(
+                                    nl_query=turn.user_input,
+                                    generated_query=feedback.corrected_query,
+                                    is_good=True,
+                                    provider_id=conversation.provider_id or "unknown",
+                                    auto_approve=True,  # Auto-approve user corrections with high confidence
+                                    metadata={
+                                        "source": "user_feedback",
+                                        "original_query": turn.generated_query,
+                                        "conversation_id": str(conversation_id),
+                                        "turn_id": str(turn_id),
+                                    },
+                                )
+                                logger.info(f"Successfully added corrected query to RAG for turn {turn_id}")
                 except Exception as e:
                     logger.error(f"Failed to add corrected query to RAG: {e}", exc_info=True)
                     # Don't fail the request if RAG addition fails
@@ -43,6 +43,10 @@ class RAGSearchRequest(BaseModel):
         default=None,
         description="Optional query intent filter (e.g., 'aggregation', 'filter')",
     )
+    tables: Optional[List[str]] = Field(
+        default=None,
+        description="Only return examples involving any of these tables (optional)",
+    )
     min_similarity: float = Field(
         default=0.5,
         ge=0.0,
@@ -152,6 +156,7 @@ async def search_similar_queries(
             query_intent=request.query_intent,
             min_similarity=request.min_similarity,
             include_sample_queries=True,
+            tables=request.tables,
         )
 
         # Convert to response format
@@ -6,11 +6,10 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import desc, func, select
+from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from text2x.api.state import app_state
 from text2x.api.auth import User, get_current_user, require_expert, check_workspace_expert
 from text2x.api.models import (
     ErrorResponse,
@@ -20,8 +19,10 @@ from text2x.api.models import (
     ReviewUpdateRequest,
     ValidationStatus,
 )
+from text2x.models.base import get_db
 from text2x.models.conversation import Conversation, ConversationTurn
 from text2x.models.rag import RAGExample
+from text2x.repositories.stats import StatsRepository
 from text2x.services.review_service import ReviewService, ReviewDecision
 from text2x.services.rag_service import RAGService
 from text2x.utils.observability import (
@@ -39,15 +40,8 @@ router = APIRouter(prefix="/review", tags=["review"])
 
 
 async def get_session() -> AsyncSession:
-    """Get database session from app state."""
-    from sqlalchemy.ext.asyncio import async_sessionmaker
-
-    session_maker = async_sessionmaker(
-        app_state.db_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
-    return session_maker()
+    """Get a session from the shared metadata database engine."""
+    return get_db().session_factory()
 
 
 def calculate_review_priority(
@@ -506,55 +500,32 @@ async def get_review_stats(
     try:
         logger.info("Fetching review queue statistics")
 
-        async with await get_session() as session:
-            # Count pending reviews
-            stmt = select(func.count()).where(
-                RAGExample.status == ExampleStatus.PENDING_REVIEW
-            )
-            result = await session.execute(stmt)
-            pending_count = result.scalar()
-
-            # Count by status
-            stmt = select(RAGExample.status, func.count()).group_by(RAGExample.status)
-            result = await session.execute(stmt)
-            status_counts = {status.value: count for status, count in result}
-
-            # Count by provider
-            stmt = (
-                select(RAGExample.provider_id, func.count())
-                .where(RAGExample.status == ExampleStatus.PENDING_REVIEW)
-                .group_by(RAGExample.provider_id)
-            )
-            result = await session.execute(stmt)
-            provider_counts = {provider: count for provider, count in result}
-
-            # Get oldest pending item
-            stmt = (
-                select(RAGExample.created_at)
-                .where(RAGExample.status == ExampleStatus.PENDING_REVIEW)
-                .order_by(RAGExample.created_at)
-                .limit(1)
-            )
-            result = await session.execute(stmt)
-            oldest = result.scalar_one_or_none()
-
-            stats = {
-                "pending_reviews": pending_count,
-                "status_breakdown": status_counts,
-                "by_provider": provider_counts,
-                "oldest_pending": oldest.isoformat() if oldest else None,
-                "oldest_age_hours": (
-                    (datetime.utcnow() - oldest).total_seconds() / 3600
-                    if oldest
-                    else 0
-                ),
-            }
+        rag_stats = await StatsRepository().rag_statistics()
+        totals = rag_stats.totals
+        provider_counts = {
+            provider: counts.pending_review
+            for provider, counts in rag_stats.by_provider.items()
+            if counts.pending_review
+        }
+        oldest = totals.oldest_pending
+
+        stats = {
+            "pending_reviews": totals.pending_review,
+            "status_breakdown": totals.by_status(),
+            "by_provider": provider_counts,
+            "oldest_pending": oldest.isoformat() if oldest else None,
+            "oldest_age_hours": (
+                (datetime.utcnow() - oldest).total_seconds() / 3600
+                if oldest
+                else 0
+            ),
+        }
 
-            logger.info(
-                f"Review queue stats: {pending_count} pending, "
-                f"{len(provider_counts)} providers"
-            )
-            return stats
+        logger.info(
+            f"Review queue stats: {totals.pending_review} pending, "
+            f"{len(provider_counts)} providers"
+        )
+        return stats
 
     except Exception as e:
         logger.error(f"Error fetching review stats: {e}", exc_info=True)
@@ -9,6 +9,7 @@ from pydantic import BaseModel, EmailStr, Field
 from text2x.api.auth import (
     User as AuthUser,
     get_current_active_user,
+    invalidate_principal,
     require_role,
 )
 from text2x.api.models import ErrorResponse
@@ -321,6 +322,7 @@ async def update_user(
                 detail="User not found",
             )
 
+        await invalidate_principal(str(user.id))
         logger.info(f"User updated successfully: {user.id}")
 
         return UserResponse(
@@ -384,6 +386,7 @@ async def deactivate_user(
                 detail="User not found",
             )
 
+        await invalidate_principal(str(user.id))
         logger.info(f"User deactivated successfully: {user.id}")
 
     except HTTPException:
@@ -510,6 +513,7 @@ async def update_own_profile(
                 detail="User not found",
             )
 
+        await invalidate_principal(str(user.id))
         logger.info(f"Profile updated successfully: {user.id}")
 
         return UserResponse(
@@ -8,12 +8,12 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 from sqlalchemy import select, func, delete
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from text2x.api.auth import User, get_current_active_user
-from text2x.api.state import app_state
 from text2x.api.models import ErrorResponse
+from text2x.models.base import get_db
 from text2x.models.workspace import Workspace, Provider, Connection
 
 logger = logging.getLogger(__name__)
@@ -22,13 +22,8 @@ router = APIRouter(prefix="/workspaces", tags=["workspaces"])
 
 
 async def get_session() -> AsyncSession:
-    """Get database session from app state."""
-    session_maker = async_sessionmaker(
-        app_state.db_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
-    return session_maker()
+    """Get a session from the shared metadata database engine."""
+    return get_db().session_factory()
 
 
 # ============================================================================
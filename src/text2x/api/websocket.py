@@ -1,6 +1,8 @@
 """WebSocket handler for streaming query processing."""
+import asyncio
 import logging
-from typing import AsyncGenerator, Optional, Any
+from contextlib import aclosing
+from typing import AsyncGenerator, Awaitable, Optional, Any, Set
 from uuid import UUID, uuid4
 
 from fastapi import WebSocket, WebSocketDisconnect, status
@@ -14,6 +16,7 @@ from text2x.api.models import (
 )
 from text2x.api.state import app_state
 from text2x.config import settings
+from text2x.providers.base import ProviderCapability, search_job_scope
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +67,29 @@ class EventType:
     CLARIFICATION = "clarification"
     RESULT = "result"
     ERROR = "error"
+    JOB_STATUS = "job_status"
+    CANCELLED = "cancelled"
+    TOKEN = "token"
+    TOOL_STARTED = "tool_started"
+    TOOL_FINISHED = "tool_finished"
+
+
+# Agent stream events forwarded to the client as they happen
+STREAMED_EVENTS = (EventType.TOKEN, EventType.TOOL_STARTED, EventType.TOOL_FINISHED)
+
+# Events buffered for a slow client before token deltas are merged
+STREAM_BUFFER_SIZE = 64
+
+
+class ControlAction:
+    """Client messages accepted while a query is being processed."""
+
+    CANCEL = "cancel"
+    JOB_STATUS = "job_status"
+
+
+# Seconds between checks for search job progress to forward to the client
+JOB_PROGRESS_INTERVAL = 0.5
 
 
 class ProgressStage:
@@ -147,7 +173,7 @@ async def handle_websocket_query(
                 raise ValueError(f"Connection {request.provider_id} not found")
 
             # Create agent instance
-            agent = QueryAgent(runtime, agent_name)
+            agent = QueryAgent(model=runtime.strands_model, name=agent_name)
 
             # Set provider on agent
             agent.set_provider(query_provider)
@@ -200,14 +226,38 @@ async def handle_websocket_query(
         except Exception as e:
             logger.warning(f"Failed to get schema: {e}")
 
-        # Process query through QueryAgent
-        agent_result = await agent.process({
+        agent_input = {
             "user_message": request.query,
             "provider_id": request.provider_id,
             "schema_context": schema_context,
             "enable_execution": enable_execution,
             "reset_conversation": not request.conversation_id,
-        })
+        }
+        if request.options.stream_tokens:
+            processing = stream_agent_events(websocket, agent, agent_input, trace_level)
+        else:
+            processing = agent.process(agent_input)
+
+        # Process query through QueryAgent, serving cancel and search job controls
+        agent_result = await process_with_controls(
+            websocket,
+            processing,
+            getattr(agent, "provider", None),
+            trace_level=trace_level,
+        )
+        if agent_result is None:
+            await send_event(
+                websocket,
+                EventType.CANCELLED,
+                {
+                    "stage": "cancelled",
+                    "message": "Query processing cancelled",
+                    "conversation_id": str(conversation_id),
+                },
+                trace_level=trace_level,
+            )
+            logger.info("WebSocket query processing cancelled by client")
+            return
 
         # Send completion progress
         await send_event(
@@ -278,6 +328,294 @@ async def handle_websocket_query(
         )
 
 
+def supports_search_jobs(provider: Any) -> bool:
+    """Whether a provider runs queries as jobs that can be inspected and cancelled."""
+    try:
+        return ProviderCapability.SEARCH_JOBS in provider.get_capabilities()
+    except Exception:
+        return False
+
+
+async def process_with_controls(
+    websocket: WebSocket,
+    processing: Awaitable[dict],
+    provider: Any,
+    trace_level: TraceLevel = TraceLevel.NONE,
+) -> Optional[dict]:
+    """
+    Await query processing while serving client control messages.
+
+    The client may send ``{"action": "cancel"}`` while the query is being
+    processed, and processing is cancelled when the client disconnects.
+    For providers with search jobs (e.g. Splunk), the jobs started while
+    processing this query are also reported as execution progress events,
+    ``{"action": "job_status", "sid": ...}`` is answered for them, and
+    cancelling (or disconnecting) cancels them. Providers are shared between
+    clients, so other clients' jobs are never reported or cancelled.
+
+    Args:
+        websocket: WebSocket connection
+        processing: Awaitable producing the agent result
+        provider: Query provider used by the agent
+        trace_level: Trace level setting
+
+    Returns:
+        The agent result, or None if the client cancelled the query
+
+    Raises:
+        WebSocketDisconnect: If the client disconnected during processing
+    """
+    # The processing task inherits the scope, so it records the jobs it starts
+    with search_job_scope() as sids:
+        task = asyncio.ensure_future(processing)
+    if not supports_search_jobs(provider):
+        provider = None
+
+    helpers = [
+        asyncio.create_task(_handle_controls(websocket, provider, sids, task, trace_level))
+    ]
+    if provider is not None:
+        helpers.append(
+            asyncio.create_task(_forward_job_progress(websocket, provider, sids, trace_level))
+        )
+    controls = helpers[0]
+
+    try:
+        return await task
+    except asyncio.CancelledError:
+        current = asyncio.current_task()
+        if current is not None and current.cancelling():
+            raise
+        # Cancelled by the client; surface a disconnect to the caller
+        if controls.done() and isinstance(controls.exception(), WebSocketDisconnect):
+            raise controls.exception()
+        return None
+    finally:
+        for helper in helpers:
+            helper.cancel()
+        await asyncio.gather(*helpers, return_exceptions=True)
+
+
+def _own_active_jobs(provider: Any, sids: Set[str]) -> list:
+    """Running jobs of the provider that were started by this query."""
+    return [job for job in provider.get_active_search_jobs() if job.sid in sids]
+
+
+async def _cancel_search_jobs(provider: Any, sids: Set[str], sid: Optional[str] = None) -> list:
+    """Cancel one search job, or all running jobs started by this query."""
+    if provider is None:
+        return []
+    targets = [sid] if sid else [job.sid for job in _own_active_jobs(provider, sids)]
+    cancelled = []
+    for job_sid in targets:
+        if await provider.cancel_search_job(job_sid):
+            cancelled.append(job_sid)
+    return cancelled
+
+
+async def _handle_controls(
+    websocket: WebSocket,
+    provider: Any,
+    sids: Set[str],
+    task: asyncio.Future,
+    trace_level: TraceLevel,
+) -> None:
+    """Serve client control messages until processing finishes."""
+    while not task.done():
+        try:
+            message = await websocket.receive_json()
+        except WebSocketDisconnect:
+            await _cancel_search_jobs(provider, sids)
+            task.cancel()
+            raise
+
+        action = message.get("action") if isinstance(message, dict) else None
+        sid = message.get("sid") if isinstance(message, dict) else None
+
+        if sid and action in (ControlAction.CANCEL, ControlAction.JOB_STATUS) and sid not in sids:
+            await send_event(
+                websocket,
+                EventType.ERROR,
+                {"error": "unknown_job", "message": f"No search job '{sid}' in this query"},
+                trace_level=TraceLevel.NONE,
+            )
+        elif action == ControlAction.CANCEL:
+            cancelled = await _cancel_search_jobs(provider, sids, sid)
+            logger.info(f"Client cancelled query processing (search jobs: {cancelled})")
+            if not sid:
+                task.cancel()
+                return
+            await send_event(
+                websocket,
+                EventType.JOB_STATUS,
+                {"sid": sid, "cancelled": sid in cancelled},
+                trace_level=trace_level,
+            )
+        elif action == ControlAction.JOB_STATUS and provider is not None:
+            if sid:
+                job = await provider.get_search_job_status(sid)
+                jobs = [job] if job else []
+            else:
+                jobs = _own_active_jobs(provider, sids)
+            await send_event(
+                websocket,
+                EventType.JOB_STATUS,
+                {"sid": sid, "jobs": [job.to_dict() for job in jobs]},
+                trace_level=trace_level,
+            )
+        else:
+            await send_event(
+                websocket,
+                EventType.ERROR,
+                {
+                    "error": "query_in_progress",
+                    "message": "A query is already being processed; send 'cancel' or 'job_status'",
+                },
+                trace_level=TraceLevel.NONE,
+            )
+
+
+async def _forward_job_progress(
+    websocket: WebSocket,
+    provider: Any,
+    sids: Set[str],
+    trace_level: TraceLevel,
+) -> None:
+    """Send an execution progress event whenever one of this query's jobs changes status."""
+    last_sent: dict = {}
+    while True:
+        for job in _own_active_jobs(provider, sids):
+            job_data = job.to_dict()
+            if last_sent.get(job.sid) == job_data:
+                continue
+            last_sent[job.sid] = job_data
+            await send_event(
+                websocket,
+                EventType.PROGRESS,
+                {
+                    "stage": ProgressStage.EXECUTION,
+                    "message": f"Search job {job.status.value.lower()}",
+                    "progress": job.progress / 100,
+                    "job": job_data,
+                },
+                trace_level=trace_level,
+            )
+        await asyncio.sleep(JOB_PROGRESS_INTERVAL)
+
+
+class EventRelay:
+    """
+    Bounded buffer between an agent's event stream and a WebSocket client.
+
+    Events are sent by a separate task so the model stream is not paced by
+    the client. When the buffer is full, token deltas are merged into one
+    pending token event instead of blocking; tool events wait for room.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        trace_level: TraceLevel = TraceLevel.NONE,
+        max_buffered: int = STREAM_BUFFER_SIZE,
+    ):
+        self.websocket = websocket
+        self.trace_level = trace_level
+        self.merged_tokens = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+        self._pending_token: Optional[dict] = None
+        self._error: Optional[Exception] = None
+
+    async def publish(self, event_type: str, data: dict) -> None:
+        """Queue an event for the client."""
+        if self._error is not None:
+            raise self._error
+
+        if event_type != EventType.TOKEN:
+            await self._flush_token()
+            await self._queue.put((event_type, data))
+            return
+
+        if self._pending_token is None:
+            self._pending_token = dict(data)
+        else:
+            self._pending_token["text"] += data.get("text", "")
+            if "partial_query" in data:
+                self._pending_token["partial_query"] = data["partial_query"]
+            self.merged_tokens += 1
+
+        if not self._queue.full():
+            self._queue.put_nowait((EventType.TOKEN, self._pending_token))
+            self._pending_token = None
+
+    async def close(self) -> None:
+        """Queue any pending token and mark the end of the stream."""
+        await self._flush_token()
+        await self._queue.put(None)
+
+    async def run(self) -> None:
+        """Send queued events until the stream is closed."""
+        while (item := await self._queue.get()) is not None:
+            if self._error is not None:
+                continue  # keep draining so publishers never block
+            event_type, data = item
+            try:
+                await send_event(self.websocket, event_type, data, trace_level=self.trace_level)
+            except Exception as e:
+                self._error = e
+
+    async def _flush_token(self) -> None:
+        if self._pending_token is not None:
+            token, self._pending_token = self._pending_token, None
+            await self._queue.put((EventType.TOKEN, token))
+
+
+async def stream_agent_events(
+    websocket: WebSocket,
+    agent: Any,
+    agent_input: dict,
+    trace_level: TraceLevel = TraceLevel.NONE,
+) -> dict:
+    """
+    Run the agent, forwarding its token and tool events to the client.
+
+    Agents without a ``stream()`` method are awaited as a whole. Cancelling
+    the returned coroutine closes the agent stream (and the model call).
+
+    Args:
+        websocket: WebSocket connection
+        agent: Query agent
+        agent_input: Input for the agent
+        trace_level: Trace level setting
+
+    Returns:
+        The agent result
+    """
+    if not hasattr(agent, "stream"):
+        return await agent.process(agent_input)
+
+    relay = EventRelay(websocket, trace_level)
+    sender = asyncio.create_task(relay.run())
+    result: dict = {}
+    try:
+        async with aclosing(agent.stream(agent_input)) as events:
+            async for event in events:
+                event_type = event.get("type")
+                if event_type == "result":
+                    result = event["result"]
+                elif event_type in STREAMED_EVENTS:
+                    await relay.publish(
+                        event_type, {k: v for k, v in event.items() if k != "type"}
+                    )
+        await relay.close()
+        await sender
+    finally:
+        sender.cancel()
+
+    if relay.merged_tokens:
+        logger.debug(f"Merged {relay.merged_tokens} token events for a slow client")
+    return result
+
+
 async def send_event(
     websocket: WebSocket,
     event_type: str,
@@ -46,6 +46,15 @@ class Settings(BaseSettings):
     database_pool_size: int = Field(default=10, validation_alias="DATABASE_POOL_SIZE")
     database_max_overflow: int = Field(default=20, validation_alias="DATABASE_MAX_OVERFLOW")
     database_echo: bool = Field(default=False, validation_alias="DATABASE_ECHO")
+    database_pool_timeout: float = Field(
+        default=30.0, validation_alias="DATABASE_POOL_TIMEOUT"
+    )  # seconds to wait for a pooled connection
+    database_pool_recycle: int = Field(
+        default=1800, validation_alias="DATABASE_POOL_RECYCLE"
+    )  # seconds; -1 keeps connections forever
+    database_statement_cache_size: int = Field(
+        default=100, validation_alias="DATABASE_STATEMENT_CACHE_SIZE"
+    )  # asyncpg prepared statements per connection; 0 behind PgBouncer transaction pooling
 
     # Redis
     redis_url: str = Field(
@@ -59,6 +68,37 @@ class Settings(BaseSettings):
         default=1800, validation_alias="REDIS_ANNOTATION_CACHE_TTL"
     )  # 30 minutes
 
+    # In-process cache tier (in front of Redis)
+    schema_local_cache_ttl: int = Field(
+        default=300, validation_alias="SCHEMA_LOCAL_CACHE_TTL"
+    )  # 5 minutes
+    schema_local_cache_max_entries: int = Field(
+        default=256, validation_alias="SCHEMA_LOCAL_CACHE_MAX_ENTRIES"
+    )
+    annotation_local_cache_ttl: int = Field(
+        default=300, validation_alias="ANNOTATION_LOCAL_CACHE_TTL"
+    )  # 5 minutes
+    annotation_local_cache_max_entries: int = Field(
+        default=10000, validation_alias="ANNOTATION_LOCAL_CACHE_MAX_ENTRIES"
+    )
+    cache_negative_ttl: int = Field(
+        default=60, validation_alias="CACHE_NEGATIVE_TTL"
+    )  # 1 minute
+
+    # Query validation result cache (keyed by connection, schema and query)
+    validation_cache_enabled: bool = Field(
+        default=True, validation_alias="VALIDATION_CACHE_ENABLED"
+    )
+    validation_cache_ttl: int = Field(
+        default=3600, validation_alias="VALIDATION_CACHE_TTL"
+    )  # 1 hour
+    validation_cache_negative_ttl: int = Field(
+        default=60, validation_alias="VALIDATION_CACHE_NEGATIVE_TTL"
+    )  # invalid results, 1 minute
+    validation_local_cache_max_entries: int = Field(
+        default=4096, validation_alias="VALIDATION_LOCAL_CACHE_MAX_ENTRIES"
+    )
+
     # OpenSearch / Vector Store
     opensearch_url: str = Field(
         default="http://localhost:9200",
@@ -103,6 +143,33 @@ class Settings(BaseSettings):
     llm_max_tokens: int = Field(default=4096, validation_alias="LLM_MAX_TOKENS")
     llm_timeout: int = Field(default=120, validation_alias="LLM_TIMEOUT")  # seconds
 
+    # LLM response cache (temperature-0 calls of agents that opt in)
+    llm_cache_enabled: bool = Field(default=True, validation_alias="LLM_CACHE_ENABLED")
+    llm_cache_ttl: int = Field(default=86400, validation_alias="LLM_CACHE_TTL")  # 1 day
+    llm_local_cache_ttl: int = Field(
+        default=3600, validation_alias="LLM_LOCAL_CACHE_TTL"
+    )  # 1 hour
+    llm_local_cache_max_entries: int = Field(
+        default=2048, validation_alias="LLM_LOCAL_CACHE_MAX_ENTRIES"
+    )
+
+    # LLM gateway (per-model limits applied to every LLM call)
+    llm_initial_concurrency: int = Field(default=8, validation_alias="LLM_INITIAL_CONCURRENCY")
+    llm_min_concurrency: int = Field(default=1, validation_alias="LLM_MIN_CONCURRENCY")
+    llm_max_concurrency: int = Field(default=32, validation_alias="LLM_MAX_CONCURRENCY")
+    llm_tokens_per_minute: int = Field(
+        default=0, validation_alias="LLM_TOKENS_PER_MINUTE"
+    )  # 0 disables the token bucket
+    llm_max_retries: int = Field(default=3, validation_alias="LLM_MAX_RETRIES")
+    llm_backoff_base: float = Field(default=1.0, validation_alias="LLM_BACKOFF_BASE")  # seconds
+    llm_backoff_max: float = Field(default=30.0, validation_alias="LLM_BACKOFF_MAX")  # seconds
+    llm_circuit_failure_threshold: int = Field(
+        default=5, validation_alias="LLM_CIRCUIT_FAILURE_THRESHOLD"
+    )
+    llm_circuit_reset_timeout: float = Field(
+        default=30.0, validation_alias="LLM_CIRCUIT_RESET_TIMEOUT"
+    )  # seconds
+
     # AWS Configuration (for Bedrock)
     aws_region: str = Field(default="us-east-1", validation_alias="AWS_REGION")
     aws_access_key_id: Optional[str] = Field(default=None, validation_alias="AWS_ACCESS_KEY_ID")
@@ -128,9 +195,55 @@ class Settings(BaseSettings):
     query_timeout: int = Field(default=300, validation_alias="QUERY_TIMEOUT")
     enable_execution: bool = Field(default=False, validation_alias="ENABLE_EXECUTION")
 
+    # Cost guardrails checked before execution (0 disables a threshold);
+    # workspaces override these under settings["cost_guardrails"]
+    cost_guard_enabled: bool = Field(default=True, validation_alias="COST_GUARD_ENABLED")
+    cost_guard_max_rows: int = Field(
+        default=10_000_000, validation_alias="COST_GUARD_MAX_ROWS"
+    )
+    cost_guard_max_cost: float = Field(default=0, validation_alias="COST_GUARD_MAX_COST")
+    cost_guard_max_scanned_bytes: int = Field(
+        default=10 * 1024**3, validation_alias="COST_GUARD_MAX_SCANNED_BYTES"
+    )  # 10 GiB
+    cost_guard_action: str = Field(
+        default="reject", validation_alias="COST_GUARD_ACTION"
+    )  # reject or sample
+    cost_guard_sample_percent: float = Field(
+        default=1.0, validation_alias="COST_GUARD_SAMPLE_PERCENT"
+    )
+
+    # Audit trail sink: events are written in batches of up to audit_batch_size,
+    # at least every audit_flush_interval_ms; producers wait when the queue is full
+    audit_batch_size: int = Field(default=200, validation_alias="AUDIT_BATCH_SIZE")
+    audit_flush_interval_ms: int = Field(
+        default=250, validation_alias="AUDIT_FLUSH_INTERVAL_MS"
+    )
+    audit_queue_size: int = Field(default=10_000, validation_alias="AUDIT_QUEUE_SIZE")
+
+    # Trace storage: turn traces whose JSON is larger than trace_inline_max_bytes
+    # are compressed into turn_traces; compaction drops traces older than
+    # trace_retention_days (0 keeps them forever)
+    trace_inline_max_bytes: int = Field(default=2048, validation_alias="TRACE_INLINE_MAX_BYTES")
+    trace_retention_days: int = Field(default=90, validation_alias="TRACE_RETENTION_DAYS")
+
+    # Dashboard statistics: with stats_rollups_enabled, a background job keeps
+    # rollup tables current every stats_refresh_interval_seconds and dashboards
+    # read them instead of aggregating examples and feedback on each request
+    stats_rollups_enabled: bool = Field(default=False, validation_alias="STATS_ROLLUPS_ENABLED")
+    stats_refresh_interval_seconds: int = Field(
+        default=60, validation_alias="STATS_REFRESH_INTERVAL_SECONDS"
+    )
+
     # Logging
     log_level: str = Field(default="INFO", validation_alias="LOG_LEVEL")
     log_format: str = Field(default="json", validation_alias="LOG_FORMAT")  # json or text
+    # Fraction of requests logged on completion; failed and slow requests always are
+    request_log_sample_rate: float = Field(
+        default=1.0, validation_alias="REQUEST_LOG_SAMPLE_RATE"
+    )
+    request_log_slow_ms: int = Field(default=1000, validation_alias="REQUEST_LOG_SLOW_MS")
+    # Format and write JSON logs on a listener thread instead of the calling thread
+    log_queue_enabled: bool = Field(default=False, validation_alias="LOG_QUEUE_ENABLED")
 
     # Observability - Metrics
     enable_metrics: bool = Field(default=True, validation_alias="ENABLE_METRICS")
@@ -159,6 +272,11 @@ class Settings(BaseSettings):
     jwt_algorithm: str = Field(default="HS256", validation_alias="JWT_ALGORITHM")
     jwt_expire_minutes: int = Field(default=30, validation_alias="JWT_EXPIRE_MINUTES")
     jwt_refresh_expire_days: int = Field(default=7, validation_alias="JWT_REFRESH_EXPIRE_DAYS")
+    # Authenticated principals cached in-process per user and token (0 disables)
+    principal_cache_ttl: int = Field(default=30, validation_alias="PRINCIPAL_CACHE_TTL")
+    principal_cache_max_entries: int = Field(
+        default=10000, validation_alias="PRINCIPAL_CACHE_MAX_ENTRIES"
+    )
     api_key_header: str = Field(default="X-API-Key", validation_alias="API_KEY_HEADER")
     allow_self_registration: bool = Field(default=False, validation_alias="ALLOW_SELF_REGISTRATION")
 
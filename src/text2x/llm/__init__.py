@@ -1,43 +1,29 @@
 """LiteLLM client for AWS Bedrock integration
 
-IMPORTANT: This module sets up AWS credentials before importing litellm.
-Import order matters - boto3 credentials must be in env vars first.
+AWS credentials are resolved once (see ``credentials.AWSCredentialProvider``)
+and passed to LiteLLM with each Bedrock request; the process environment is
+not modified.
 """
 import os
-import boto3
+from typing import Optional, List, Dict, Any
+
+import litellm
+from litellm import completion, acompletion
+
+from .credentials import get_aws_credential_provider
 
 # Default settings - use cross-region inference profiles
 DEFAULT_MODEL = "bedrock/us.anthropic.claude-opus-4-5-20251101-v1:0"
 DEFAULT_REGION = os.getenv("AWS_REGION", "us-east-1")
 
+litellm.set_verbose = False
 
-def _setup_aws_credentials():
-    """Setup AWS credentials from instance role for LiteLLM"""
-    try:
-        session = boto3.Session(region_name=DEFAULT_REGION)
-        creds = session.get_credentials()
-        if creds:
-            frozen = creds.get_frozen_credentials()
-            os.environ['AWS_ACCESS_KEY_ID'] = frozen.access_key
-            os.environ['AWS_SECRET_ACCESS_KEY'] = frozen.secret_key
-            if frozen.token:
-                os.environ['AWS_SESSION_TOKEN'] = frozen.token
-            os.environ['AWS_REGION_NAME'] = DEFAULT_REGION
-            return True
-    except Exception as e:
-        print(f"Warning: Could not setup AWS credentials: {e}")
-    return False
-
-
-# Setup credentials BEFORE importing litellm
-_setup_aws_credentials()
-
-# Now import litellm (after credentials are in env)
-from typing import Optional, List, Dict, Any
-import litellm
-from litellm import completion, acompletion
 
-litellm.set_verbose = False
+def _credential_kwargs(model: str) -> Dict[str, Any]:
+    """Explicit AWS credentials for Bedrock models."""
+    if model.startswith("bedrock/"):
+        return get_aws_credential_provider(DEFAULT_REGION).litellm_kwargs()
+    return {}
 
 
 def get_completion(
@@ -54,12 +40,13 @@ def get_completion(
         messages.append({"role": "system", "content": system})
     messages.append({"role": "user", "content": prompt})
     
+    model = model or DEFAULT_MODEL
     response = completion(
-        model=model or DEFAULT_MODEL,
+        model=model,
         messages=messages,
         temperature=temperature,
         max_tokens=max_tokens,
-        **kwargs
+        **{**_credential_kwargs(model), **kwargs}
     )
     return response.choices[0].message.content
 
@@ -78,12 +65,13 @@ async def get_completion_async(
         messages.append({"role": "system", "content": system})
     messages.append({"role": "user", "content": prompt})
     
+    model = model or DEFAULT_MODEL
     response = await acompletion(
-        model=model or DEFAULT_MODEL,
+        model=model,
         messages=messages,
         temperature=temperature,
         max_tokens=max_tokens,
-        **kwargs
+        **{**_credential_kwargs(model), **kwargs}
     )
     return response.choices[0].message.content
 
@@ -96,12 +84,13 @@ def get_chat_completion(
     **kwargs
 ) -> str:
     """Chat completion with message history"""
+    model = model or DEFAULT_MODEL
     response = completion(
-        model=model or DEFAULT_MODEL,
+        model=model,
         messages=messages,
         temperature=temperature,
         max_tokens=max_tokens,
-        **kwargs
+        **{**_credential_kwargs(model), **kwargs}
     )
     return response.choices[0].message.content
 
@@ -114,12 +103,13 @@ async def get_chat_completion_async(
     **kwargs
 ) -> str:
     """Async chat completion with message history"""
+    model = model or DEFAULT_MODEL
     response = await acompletion(
-        model=model or DEFAULT_MODEL,
+        model=model,
         messages=messages,
         temperature=temperature,
         max_tokens=max_tokens,
-        **kwargs
+        **{**_credential_kwargs(model), **kwargs}
     )
     return response.choices[0].message.content
 
@@ -0,0 +1,153 @@
+"""Cached AWS credentials for Bedrock calls made through LiteLLM.
+
+Resolving credentials builds a boto3 session and may query the instance
+metadata service, which is too slow for the hot path of every LLM call.
+``AWSCredentialProvider`` resolves them once and hands out the cached frozen
+credentials. Temporary credentials (instance roles, SSO, assumed roles) are
+refreshed in a background thread shortly before they expire; callers only
+block on a refresh once the credentials are about to expire.
+
+Credentials are passed to LiteLLM as request arguments, never written to
+``os.environ``.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import boto3
+
+logger = logging.getLogger(__name__)
+
+# Refresh in the background once credentials expire within this many seconds
+ADVISORY_REFRESH_SECONDS = 15 * 60
+
+# Refresh before returning once credentials expire within this many seconds
+MANDATORY_REFRESH_SECONDS = 60
+
+
+class AWSCredentialProvider:
+    """Resolves AWS credentials once and keeps them fresh."""
+
+    def __init__(
+        self,
+        region: str,
+        session: Optional[boto3.Session] = None,
+        advisory_refresh: float = ADVISORY_REFRESH_SECONDS,
+        mandatory_refresh: float = MANDATORY_REFRESH_SECONDS,
+    ):
+        """
+        Initialize the provider. Nothing is resolved until first use.
+
+        Args:
+            region: AWS region passed to Bedrock
+            session: boto3 session to resolve credentials with (optional)
+            advisory_refresh: Seconds before expiry to start a background refresh
+            mandatory_refresh: Seconds before expiry to refresh before returning
+        """
+        self.region = region
+        self.advisory_refresh = advisory_refresh
+        self.mandatory_refresh = mandatory_refresh
+        self._session = session
+        self._credentials = None
+        self._expires_at: Optional[float] = None  # monotonic; None for static credentials
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    @property
+    def is_resolved(self) -> bool:
+        """Whether credentials have been resolved (later calls do not block on boto3)."""
+        return self._credentials is not None
+
+    def _resolve(self) -> None:
+        """Resolve credentials through boto3 and cache the frozen values."""
+        session = self._session or boto3.Session(region_name=self.region)
+        credentials = session.get_credentials()
+        if credentials is None:
+            raise RuntimeError("No AWS credentials available")
+
+        frozen = credentials.get_frozen_credentials()
+        expiry = getattr(credentials, "_expiry_time", None)
+        expires_at = None
+        if isinstance(expiry, datetime):
+            remaining = (expiry - datetime.now(timezone.utc)).total_seconds()
+            expires_at = time.monotonic() + remaining
+
+        self._credentials = frozen
+        self._expires_at = expires_at
+        self._session = session
+        logger.debug(
+            "Resolved AWS credentials"
+            + (f" (expire in {expires_at - time.monotonic():.0f}s)" if expires_at else "")
+        )
+
+    def _refresh_in_background(self) -> None:
+        """Start a background refresh unless one is already running."""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+
+        def refresh() -> None:
+            try:
+                with self._lock:
+                    self._resolve()
+            except Exception as e:
+                logger.warning(f"Background AWS credential refresh failed: {e}")
+
+        self._refresh_thread = threading.Thread(
+            target=refresh, name="aws-credential-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def get_credentials(self) -> Any:
+        """
+        Get the cached frozen credentials, resolving or refreshing as needed.
+
+        Returns:
+            botocore ReadOnlyCredentials (access_key, secret_key, token)
+
+        Raises:
+            RuntimeError: If no credentials can be resolved
+        """
+        credentials, expires_at = self._credentials, self._expires_at
+        if credentials is not None:
+            remaining = None if expires_at is None else expires_at - time.monotonic()
+            if remaining is None or remaining > self.advisory_refresh:
+                return credentials
+            if remaining > self.mandatory_refresh:
+                self._refresh_in_background()
+                return credentials
+
+        with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            remaining = None if self._expires_at is None else self._expires_at - time.monotonic()
+            if self._credentials is None or (
+                remaining is not None and remaining <= self.mandatory_refresh
+            ):
+                self._resolve()
+            return self._credentials
+
+    def litellm_kwargs(self) -> Dict[str, Any]:
+        """Arguments that authenticate a LiteLLM Bedrock call."""
+        credentials = self.get_credentials()
+        kwargs = {
+            "aws_access_key_id": credentials.access_key,
+            "aws_secret_access_key": credentials.secret_key,
+            "aws_region_name": self.region,
+        }
+        if credentials.token:
+            kwargs["aws_session_token"] = credentials.token
+        return kwargs
+
+
+_providers: Dict[str, AWSCredentialProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_aws_credential_provider(region: str) -> AWSCredentialProvider:
+    """Get the shared credential provider for a region."""
+    with _providers_lock:
+        if region not in _providers:
+            _providers[region] = AWSCredentialProvider(region)
+        return _providers[region]
@@ -1,15 +1,18 @@
 """LiteLLM client configured for AWS Bedrock.
 
-Uses instance role credentials via boto3 for authentication.
+Uses instance role credentials via boto3 for authentication, resolved once
+and cached by ``AWSCredentialProvider``.
 """
 
+import asyncio
 import os
 from typing import Any
 
-import boto3
 import litellm
 from litellm import acompletion, completion
 
+from text2x.llm.credentials import get_aws_credential_provider
+
 
 # Configure LiteLLM
 litellm.set_verbose = False
@@ -20,29 +23,6 @@ DEFAULT_MODEL = "bedrock/us.anthropic.claude-opus-4-5-20251101-v1:0"
 DEFAULT_REGION = os.environ.get("AWS_REGION", "us-east-1")
 
 
-def _ensure_aws_credentials() -> None:
-    """Ensure AWS credentials are available in environment.
-
-    LiteLLM doesn't automatically pick up instance role credentials,
-    so we fetch them via boto3 and set environment variables.
-    Only called for Bedrock models.
-    """
-    # Skip if credentials already set (e.g., by explicit env vars)
-    if os.environ.get("AWS_ACCESS_KEY_ID") and os.environ.get("AWS_SECRET_ACCESS_KEY"):
-        return
-
-    session = boto3.Session()
-    credentials = session.get_credentials()
-    if credentials is None:
-        raise RuntimeError("No AWS credentials available")
-
-    creds = credentials.get_frozen_credentials()
-    os.environ["AWS_ACCESS_KEY_ID"] = creds.access_key
-    os.environ["AWS_SECRET_ACCESS_KEY"] = creds.secret_key
-    if creds.token:
-        os.environ["AWS_SESSION_TOKEN"] = creds.token
-
-
 class LiteLLMClient:
     """LiteLLM client wrapper supporting multiple providers."""
 
@@ -70,17 +50,21 @@ class LiteLLMClient:
         self.default_kwargs = kwargs
         self.is_bedrock = model.startswith("bedrock/")
 
-        # Set API credentials in environment for LiteLLM
-        # LiteLLM uses NVIDIA_NIM_API_KEY for nvidia_nim models
-        if api_key and "nvidia" in model.lower():
-            os.environ["NVIDIA_NIM_API_KEY"] = api_key
-        elif api_key:
-            os.environ["OPENAI_API_KEY"] = api_key  # Fallback for other providers
+        # Bedrock credentials are resolved on first use and cached per region
+        self.credentials = get_aws_credential_provider(region) if self.is_bedrock else None
 
-        # Only setup AWS credentials for Bedrock models
-        if self.is_bedrock:
-            os.environ.setdefault("AWS_REGION", region)
-            _ensure_aws_credentials()
+    def _request_kwargs(self, overrides: dict[str, Any]) -> dict[str, Any]:
+        """Completion arguments, including the credentials for the provider."""
+        merged_kwargs = {**self.default_kwargs, **overrides}
+
+        # Pass credentials explicitly rather than through the process environment
+        if self.credentials is not None:
+            merged_kwargs.update(self.credentials.litellm_kwargs())
+        if self.api_key:
+            merged_kwargs["api_key"] = self.api_key
+        if self.api_base:
+            merged_kwargs["api_base"] = self.api_base
+        return merged_kwargs
 
     def complete(
         self,
@@ -96,18 +80,7 @@ class LiteLLMClient:
         Returns:
             LiteLLM completion response
         """
-        # Refresh credentials for Bedrock models
-        if self.is_bedrock:
-            _ensure_aws_credentials()
-
-        merged_kwargs = {**self.default_kwargs, **kwargs}
-        
-        # Pass API credentials directly for non-Bedrock providers
-        if self.api_key:
-            merged_kwargs["api_key"] = self.api_key
-        if self.api_base:
-            merged_kwargs["api_base"] = self.api_base
-            
+        merged_kwargs = self._request_kwargs(kwargs)
         return completion(
             model=self.model,
             messages=messages,
@@ -128,18 +101,11 @@ class LiteLLMClient:
         Returns:
             LiteLLM completion response
         """
-        # Refresh credentials for Bedrock models
-        if self.is_bedrock:
-            _ensure_aws_credentials()
+        if self.credentials is not None and not self.credentials.is_resolved:
+            # First call: resolve off the event loop (may query instance metadata)
+            await asyncio.to_thread(self.credentials.get_credentials)
 
-        merged_kwargs = {**self.default_kwargs, **kwargs}
-        
-        # Pass API credentials directly for non-Bedrock providers
-        if self.api_key:
-            merged_kwargs["api_key"] = self.api_key
-        if self.api_base:
-            merged_kwargs["api_base"] = self.api_base
-            
+        merged_kwargs = self._request_kwargs(kwargs)
         return await acompletion(
             model=self.model,
             messages=messages,
@@ -0,0 +1,154 @@
+"""trace_storage
+
+Revision ID: 14b918859947
+Revises: c81e4a9d2f60
+Create Date: 2026-10-19 09:41:27.553018
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "14b918859947"
+down_revision: Union[str, Sequence[str], None] = "c81e4a9d2f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - shared schema contexts and compressed turn traces.
+
+    Existing rows keep their inline documents; ``python
+    src/text2x/scripts/compact_traces.py`` moves them in batches.
+    """
+    op.create_table(
+        "schema_contexts",
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("content", postgresql.JSON(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("fingerprint"),
+    )
+    op.create_table(
+        "turn_traces",
+        sa.Column("turn_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("codec", sa.String(length=16), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("raw_bytes", sa.Integer(), nullable=False),
+        sa.Column("stored_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["turn_id"], ["conversation_turns.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("turn_id"),
+    )
+    # Payloads are already compressed; keep TOAST from compressing them again
+    op.execute("ALTER TABLE turn_traces ALTER COLUMN payload SET STORAGE EXTERNAL")
+
+    op.add_column(
+        "conversation_turns",
+        sa.Column("schema_context_hash", sa.String(length=64), nullable=True),
+    )
+    op.add_column("conversation_turns", sa.Column("trace_bytes", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "fk_conversation_turns_schema_context",
+        "conversation_turns",
+        "schema_contexts",
+        ["schema_context_hash"],
+        ["fingerprint"],
+    )
+    op.create_index(
+        op.f("ix_conversation_turns_schema_context_hash"),
+        "conversation_turns",
+        ["schema_context_hash"],
+    )
+    op.alter_column(
+        "conversation_turns",
+        "reasoning_trace",
+        existing_type=postgresql.JSON(),
+        nullable=True,
+    )
+
+    op.add_column(
+        "audit_logs",
+        sa.Column("schema_context_hash", sa.String(length=64), nullable=True),
+    )
+    op.create_foreign_key(
+        "fk_audit_logs_schema_context",
+        "audit_logs",
+        "schema_contexts",
+        ["schema_context_hash"],
+        ["fingerprint"],
+    )
+    op.create_index(
+        op.f("ix_audit_logs_schema_context_hash"),
+        "audit_logs",
+        ["schema_context_hash"],
+    )
+    op.alter_column(
+        "audit_logs",
+        "schema_context_used",
+        existing_type=postgresql.JSON(),
+        nullable=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - inline schema contexts again and drop trace storage.
+
+    Schema contexts are copied back into their turns and audit logs. Traces
+    held compressed in turn_traces cannot be decompressed in SQL and are
+    replaced by an empty reasoning trace.
+    """
+    op.execute(
+        """
+        UPDATE conversation_turns t
+        SET schema_context = s.content
+        FROM schema_contexts s
+        WHERE t.schema_context_hash = s.fingerprint AND t.schema_context IS NULL
+        """
+    )
+    op.execute(
+        """
+        UPDATE audit_logs a
+        SET schema_context_used = s.content
+        FROM schema_contexts s
+        WHERE a.schema_context_hash = s.fingerprint AND a.schema_context_used IS NULL
+        """
+    )
+    op.execute("UPDATE audit_logs SET schema_context_used = '{}' WHERE schema_context_used IS NULL")
+    op.execute("UPDATE conversation_turns SET reasoning_trace = '{}' WHERE reasoning_trace IS NULL")
+
+    op.alter_column(
+        "audit_logs",
+        "schema_context_used",
+        existing_type=postgresql.JSON(),
+        nullable=False,
+    )
+    op.drop_index(op.f("ix_audit_logs_schema_context_hash"), table_name="audit_logs")
+    op.drop_constraint("fk_audit_logs_schema_context", "audit_logs", type_="foreignkey")
+    op.drop_column("audit_logs", "schema_context_hash")
+
+    op.alter_column(
+        "conversation_turns",
+        "reasoning_trace",
+        existing_type=postgresql.JSON(),
+        nullable=False,
+    )
+    op.drop_index(
+        op.f("ix_conversation_turns_schema_context_hash"), table_name="conversation_turns"
+    )
+    op.drop_constraint(
+        "fk_conversation_turns_schema_context", "conversation_turns", type_="foreignkey"
+    )
+    op.drop_column("conversation_turns", "trace_bytes")
+    op.drop_column("conversation_turns", "schema_context_hash")
+
+    op.drop_table("turn_traces")
+    op.drop_table("schema_contexts")
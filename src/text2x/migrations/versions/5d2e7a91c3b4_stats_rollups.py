@@ -0,0 +1,74 @@
+"""stats_rollups
+
+Revision ID: 5d2e7a91c3b4
+Revises: 14b918859947
+Create Date: 2026-10-19 14:12:05.318240
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2e7a91c3b4"
+down_revision: Union[str, Sequence[str], None] = "14b918859947"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - dashboard statistics rollups and their indexes.
+
+    The rollup tables start empty; they are filled by the first refresh once
+    STATS_ROLLUPS_ENABLED is set, and dashboards aggregate live until then.
+    """
+    op.create_table(
+        "rag_example_stats",
+        sa.Column("provider_id", sa.String(length=255), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("example_count", sa.Integer(), nullable=False),
+        sa.Column("oldest_created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("provider_id", "status"),
+    )
+    op.create_table(
+        "feedback_daily_stats",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("category", sa.String(length=50), nullable=False),
+        sa.Column("feedback_count", sa.Integer(), nullable=False),
+        sa.Column("up_count", sa.Integer(), nullable=False),
+        sa.Column("down_count", sa.Integer(), nullable=False),
+        sa.Column("up_confidence_sum", sa.Float(), nullable=False),
+        sa.Column("down_confidence_sum", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "category"),
+    )
+    op.create_table(
+        "stats_rollup_state",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=True),
+        sa.Column("full_refreshed_at", sa.DateTime(), nullable=True),
+        sa.Column("covered_until", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+    # Live aggregates group by provider and status; refreshes find changed rows
+    op.create_index(
+        "ix_rag_examples_provider_status", "rag_examples", ["provider_id", "status"]
+    )
+    op.create_index("ix_rag_examples_updated_at", "rag_examples", ["updated_at"])
+    op.create_index("ix_user_feedback_created_at", "user_feedback", ["created_at"])
+    op.create_index("ix_user_feedback_updated_at", "user_feedback", ["updated_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop statistics rollups and their indexes."""
+    op.drop_index("ix_user_feedback_updated_at", table_name="user_feedback")
+    op.drop_index("ix_user_feedback_created_at", table_name="user_feedback")
+    op.drop_index("ix_rag_examples_updated_at", table_name="rag_examples")
+    op.drop_index("ix_rag_examples_provider_status", table_name="rag_examples")
+    op.drop_table("stats_rollup_state")
+    op.drop_table("feedback_daily_stats")
+    op.drop_table("rag_example_stats")
@@ -0,0 +1,73 @@
+"""rag_example_search
+
+Revision ID: 9a41c6e07b2d
+Revises: 5d2e7a91c3b4
+Create Date: 2026-10-19 16:48:32.904117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a41c6e07b2d"
+down_revision: Union[str, Sequence[str], None] = "5d2e7a91c3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - full-text and trigram search over RAG example questions.
+
+    Adding the generated column rewrites rag_examples once, holding an
+    exclusive lock on it for the duration. The trigram index is only created
+    where the pg_trgm extension is available.
+    """
+    op.add_column(
+        "rag_examples",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', natural_language_query)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_rag_examples_search_vector",
+        "rag_examples",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX IF NOT EXISTS ix_rag_examples_nl_query_trgm
+                    ON rag_examples USING gin (natural_language_query gin_trgm_ops);
+            END IF;
+        EXCEPTION WHEN insufficient_privilege THEN
+            NULL;  -- not allowed to install it
+        END
+        $$
+        """
+    )
+    op.create_index(
+        "ix_rag_examples_involved_tables_gin",
+        "rag_examples",
+        ["involved_tables"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop RAG example search (pg_trgm is left installed)."""
+    op.drop_index("ix_rag_examples_involved_tables_gin", table_name="rag_examples")
+    op.execute("DROP INDEX IF EXISTS ix_rag_examples_nl_query_trgm")
+    op.drop_index("ix_rag_examples_search_vector", table_name="rag_examples")
+    op.drop_column("rag_examples", "search_vector")
@@ -0,0 +1,49 @@
+"""unique_annotation_target
+
+Revision ID: 9c4e2b7d1a3f
+Revises: f27186f7a305
+Create Date: 2026-10-18 10:12:41.219834
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4e2b7d1a3f"
+down_revision: Union[str, Sequence[str], None] = "f27186f7a305"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - enforce one annotation per target for bulk upserts."""
+    # Keep the most recently updated annotation when duplicates exist
+    op.execute(
+        """
+        DELETE FROM schema_annotations a
+        USING schema_annotations b
+        WHERE a.provider_id = b.provider_id
+          AND COALESCE(a.table_name, '') = COALESCE(b.table_name, '')
+          AND COALESCE(a.column_name, '') = COALESCE(b.column_name, '')
+          AND (a.updated_at, a.id) < (b.updated_at, b.id)
+        """
+    )
+    op.create_index(
+        "uq_schema_annotations_target",
+        "schema_annotations",
+        [
+            "provider_id",
+            sa.text("COALESCE(table_name, '')"),
+            sa.text("COALESCE(column_name, '')"),
+        ],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the annotation target unique index."""
+    op.drop_index("uq_schema_annotations_target", table_name="schema_annotations")
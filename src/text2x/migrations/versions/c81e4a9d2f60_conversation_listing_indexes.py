@@ -0,0 +1,44 @@
+"""conversation_listing_indexes
+
+Revision ID: c81e4a9d2f60
+Revises: 9c4e2b7d1a3f
+Create Date: 2026-10-18 16:05:12.408317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c81e4a9d2f60"
+down_revision: Union[str, Sequence[str], None] = "9c4e2b7d1a3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - index keyset pagination and turn aggregates of listings."""
+    op.create_index(
+        "ix_conversations_user_updated",
+        "conversations",
+        ["user_id", "updated_at", "id"],
+    )
+    op.create_index(
+        "ix_conversations_connection_updated",
+        "conversations",
+        ["connection_id", "updated_at", "id"],
+    )
+    op.create_index(
+        "ix_conversation_turns_conversation_turn",
+        "conversation_turns",
+        ["conversation_id", "turn_number"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the conversation listing indexes."""
+    op.drop_index("ix_conversation_turns_conversation_turn", table_name="conversation_turns")
+    op.drop_index("ix_conversations_connection_updated", table_name="conversations")
+    op.drop_index("ix_conversations_user_updated", table_name="conversations")
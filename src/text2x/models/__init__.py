@@ -10,6 +10,8 @@ This package contains all SQLAlchemy models for the Text2DSL system:
 - Audit logs
 - Schema annotations
 - User feedback
+- Trace storage (shared schema contexts, compressed turn traces)
+- Statistics rollups
 """
 
 from .admin import AdminRole, WorkspaceAdmin
@@ -35,6 +37,8 @@ from .conversation import (
 )
 from .feedback import FeedbackCategory, FeedbackRating, UserFeedback
 from .rag import ComplexityLevel, ExampleStatus, QueryIntent, RAGExample
+from .stats import FeedbackDailyStats, RAGExampleStats, StatsRollupState
+from .trace import SchemaContextRecord, TurnTrace
 from .workspace import (
     Connection,
     ConnectionStatus,
@@ -113,6 +117,13 @@ __all__ = [
     "UserFeedback",
     "FeedbackRating",
     "FeedbackCategory",
+    # Trace storage models
+    "SchemaContextRecord",
+    "TurnTrace",
+    # Statistics rollup models
+    "RAGExampleStats",
+    "FeedbackDailyStats",
+    "StatsRollupState",
     # Domain models (from models.py)
     "ColumnInfo",
     "TableInfo",
@@ -9,7 +9,7 @@ business terms, examples, and special handling hints.
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, Column, String, Text
+from sqlalchemy import Boolean, Column, Index, String, Text, func
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 
 from .base import Base, TimestampMixin, UUIDMixin
@@ -63,6 +63,17 @@ class SchemaAnnotation(Base, UUIDMixin, TimestampMixin):
     
     # Creation metadata
     created_by = Column(String(255), nullable=False)
+
+    __table_args__ = (
+        # One annotation per target; backs SchemaAnnotationRepository.upsert_many
+        Index(
+            "uq_schema_annotations_target",
+            provider_id,
+            func.coalesce(table_name, ""),
+            func.coalesce(column_name, ""),
+            unique=True,
+        ),
+    )
     
     def __repr__(self) -> str:
         target = self.table_name or self.column_name
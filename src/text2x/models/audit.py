@@ -63,7 +63,14 @@ class AuditLog(Base, UUIDMixin, TimestampMixin):
     provider_id = Column(String(255), nullable=False, index=True)
     
     # Processing details
-    schema_context_used = Column(JSON, nullable=False)
+    # Legacy inline copy; new logs reference a shared SchemaContextRecord
+    schema_context_used = Column(JSON(none_as_null=True), nullable=True)
+    schema_context_hash = Column(
+        String(64),
+        ForeignKey("schema_contexts.fingerprint"),
+        nullable=True,
+        index=True,
+    )
     rag_examples_retrieved = Column(ARRAY(PGUUID(as_uuid=True)), nullable=True)
     iterations = Column(Integer, nullable=False, default=1)
     
@@ -6,15 +6,29 @@ This module provides the foundational components for the database layer:
 - Async database session management
 - Database configuration
 - Common mixins and utilities
+
+The API process holds a single metadata-database engine (``init_db``); the
+repositories, route helpers and provider factory all take their sessions from
+``get_db().session_factory`` so that the pool can be sized and observed in one
+place.
+
+Repository calls made inside ``DatabaseSession.unit_of_work()`` (the API's
+``db_unit_of_work`` dependency) share one session and are committed once when
+the unit of work ends, instead of each call checking out a connection and
+committing on its own.
 """
 
 import os
+import time
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional, Tuple
 from uuid import UUID, uuid4
 
 from sqlalchemy import Column, DateTime, String
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -22,6 +36,9 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase, declared_attr
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from text2x.utils.observability import record_db_pool_checkout, set_db_pool_connections
 
 
 class Base(DeclarativeBase):
@@ -56,6 +73,10 @@ class DatabaseConfig:
         pool_size: int = 5,
         max_overflow: int = 10,
         echo: bool = False,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = 1800,
+        statement_cache_size: int = 100,
+        database_url: Optional[URL] = None,
     ):
         """
         Initialize database configuration.
@@ -69,6 +90,12 @@ class DatabaseConfig:
             pool_size: Connection pool size
             max_overflow: Maximum overflow connections
             echo: Whether to echo SQL statements (for debugging)
+            pool_timeout: Seconds to wait for a pooled connection
+            pool_recycle: Seconds after which connections are replaced (-1: never)
+            statement_cache_size: Prepared statements cached per asyncpg
+                connection (0 disables, e.g. behind PgBouncer transaction pooling)
+            database_url: Complete connection URL; used as is instead of one
+                built from the individual fields (keeps query parameters)
         """
         self.host = host
         self.port = port
@@ -78,13 +105,54 @@ class DatabaseConfig:
         self.pool_size = pool_size
         self.max_overflow = max_overflow
         self.echo = echo
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.statement_cache_size = statement_cache_size
+        self.database_url = database_url
 
     @property
-    def url(self) -> str:
+    def url(self) -> URL:
         """Get the database connection URL."""
-        return (
-            f"postgresql+asyncpg://{self.user}:{self.password}"
-            f"@{self.host}:{self.port}/{self.database}"
+        if self.database_url is not None:
+            return self.database_url
+        return URL.create(
+            "postgresql+asyncpg",
+            username=self.user,
+            password=self.password,
+            host=self.host,
+            port=self.port,
+            database=self.database,
+        )
+
+    @classmethod
+    def from_settings(cls) -> "DatabaseConfig":
+        """
+        Create database configuration from application settings.
+
+        Uses DATABASE_URL and the DATABASE_POOL_* / DATABASE_STATEMENT_CACHE_SIZE
+        settings, so the API's pool is configured in the same place as the rest
+        of the application. DATABASE_URL is connected to as given, including
+        its query parameters (e.g. ``?ssl=require``).
+
+        Returns:
+            DatabaseConfig instance
+        """
+        from text2x.config import settings
+
+        url = make_url(settings.database_url)
+        return cls(
+            host=url.host or "localhost",
+            port=url.port or 5432,
+            database=url.database or "text2dsl",
+            user=url.username or "postgres",
+            password=url.password or "postgres",
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            echo=settings.database_echo,
+            pool_timeout=settings.database_pool_timeout,
+            pool_recycle=settings.database_pool_recycle,
+            statement_cache_size=settings.database_statement_cache_size,
+            database_url=url,
         )
 
     @classmethod
@@ -137,6 +205,33 @@ class DatabaseConfig:
         )
 
 
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that exports checkout waits and pool occupancy.
+
+    The wait covers queueing for a free connection and, when the pool grows
+    into its overflow, opening a new one.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except sa_exc.TimeoutError:
+            record_db_pool_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        record_db_pool_checkout(time.perf_counter() - start)
+        self._export_state()
+        return record
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._export_state()
+
+    def _export_state(self) -> None:
+        set_db_pool_connections(self.checkedout(), self.checkedin(), self.overflow())
+
+
 class DatabaseSession:
     """
     Manages database engine and session creation.
@@ -155,10 +250,19 @@ class DatabaseSession:
         self.config = config
         self.engine = create_async_engine(
             config.url,
+            poolclass=InstrumentedAsyncPool,
             pool_size=config.pool_size,
             max_overflow=config.max_overflow,
+            pool_timeout=config.pool_timeout,
+            pool_recycle=config.pool_recycle,
             echo=config.echo,
             pool_pre_ping=True,  # Enable connection health checks
+            connect_args={
+                # SQLAlchemy's per-connection cache of asyncpg prepared statements
+                "prepared_statement_cache_size": config.statement_cache_size,
+                # asyncpg's own statement cache (must also be 0 behind PgBouncer)
+                "statement_cache_size": config.statement_cache_size,
+            },
         )
         self.session_factory = async_sessionmaker(
             self.engine,
@@ -167,10 +271,21 @@ class DatabaseSession:
         )
 
     @asynccontextmanager
-    async def session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def session(self, savepoint: bool = False) -> AsyncGenerator[AsyncSession, None]:
         """
         Create an async database session context manager.
 
+        Inside a unit of work the unit's session is yielded instead: changes
+        are flushed on exit and committed when the unit of work ends. An error
+        marks the unit of work as failed, so it rolls back rather than commit
+        partial work even if the caller handles the error.
+
+        Args:
+            savepoint: Inside a unit of work, run this scope in a savepoint so
+                that an error discards only its changes and the unit of work
+                can carry on. Costs two extra round trips; use it only around
+                work whose errors are caught and ignored.
+
         Usage:
             async with db.session() as session:
                 result = await session.execute(query)
@@ -179,6 +294,12 @@ class DatabaseSession:
         Yields:
             AsyncSession instance
         """
+        current = _unit_of_work.get()
+        if current is not None and current[0] is self:
+            async with _join(current[1], savepoint) as session:
+                yield session
+            return
+
         async with self.session_factory() as session:
             try:
                 yield session
@@ -189,6 +310,48 @@ class DatabaseSession:
             finally:
                 await session.close()
 
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Share one session, and one commit, across all ``session()`` calls.
+
+        Nested units of work join the outer one, like ``session()`` calls.
+        An error that escapes the outermost unit, or that was raised in any
+        joined scope without a savepoint, rolls back all of its changes.
+        Keep units of work short:
+        the session holds its connection from the first statement until the
+        commit, so slow work (LLM calls) should not run inside one.
+
+        Usage:
+            async with db.unit_of_work():
+                feedback = await FeedbackRepository().create(...)
+                await RAGExampleRepository().create(...)
+
+        Yields:
+            AsyncSession shared by the unit of work
+        """
+        current = _unit_of_work.get()
+        if current is not None and current[0] is self:
+            async with _join(current[1], savepoint=False) as session:
+                yield session
+            return
+
+        async with self.session_factory() as session:
+            token = _unit_of_work.set((self, session))
+            try:
+                yield session
+                if session.info.pop(_FAILED, False):
+                    raise RuntimeError(
+                        "A scope in this unit of work failed; its changes were rolled back"
+                    )
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                session.info.pop(_FAILED, None)
+                _unit_of_work.reset(token)
+
     async def close(self) -> None:
         """Close the database engine and all connections."""
         await self.engine.dispose()
@@ -197,6 +360,37 @@ class DatabaseSession:
 # Global database session instance
 _db_session: DatabaseSession | None = None
 
+# Unit of work of the current request/task: (owning DatabaseSession, shared session)
+_unit_of_work: ContextVar[Optional[Tuple[DatabaseSession, AsyncSession]]] = ContextVar(
+    "unit_of_work", default=None
+)
+
+
+# Session.info key set when a joined scope fails outside a savepoint
+_FAILED = "unit_of_work_failed"
+
+
+@asynccontextmanager
+async def _join(session: AsyncSession, savepoint: bool) -> AsyncGenerator[AsyncSession, None]:
+    """Run a scope on a unit of work's session, flushing its changes on exit."""
+    if savepoint:
+        failed = session.info.get(_FAILED, False)
+        try:
+            async with session.begin_nested():
+                yield session
+        except Exception:
+            # The savepoint discarded the failed scope, whatever failed inside it
+            session.info[_FAILED] = failed
+            raise
+        return
+
+    try:
+        yield session
+        await session.flush()
+    except Exception:
+        session.info[_FAILED] = True
+        raise
+
 
 def init_db(config: DatabaseConfig | None = None) -> DatabaseSession:
     """
@@ -17,6 +17,7 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -27,6 +28,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base, TimestampMixin, UUIDMixin
 
 if TYPE_CHECKING:
+    from .trace import SchemaContextRecord, TurnTrace
     from .workspace import Connection
 
 
@@ -88,6 +90,12 @@ class Conversation(Base, UUIDMixin, TimestampMixin):
         cascade="all, delete-orphan",
     )
     
+    __table_args__ = (
+        # Keyset pagination of listings (see ConversationRepository.list_summaries)
+        Index("ix_conversations_user_updated", "user_id", "updated_at", "id"),
+        Index("ix_conversations_connection_updated", "connection_id", "updated_at", "id"),
+    )
+    
     def __repr__(self) -> str:
         return (
             f"<Conversation(id={self.id}, user_id={self.user_id}, "
@@ -126,19 +134,37 @@ class ConversationTurn(Base, UUIDMixin, TimestampMixin):
     
     # Validation and execution results stored as JSON
     validation_result = Column(JSON, nullable=True)
-    execution_result = Column(JSON, nullable=True)
+    execution_result = Column(JSON(none_as_null=True), nullable=True)
     
     # Reasoning trace showing the decision-making process
-    reasoning_trace = Column(JSON, nullable=False)
-    
-    # Schema context used for this turn
-    schema_context = Column(JSON, nullable=True)
+    reasoning_trace = Column(JSON(none_as_null=True), nullable=True)
+    
+    # Schema context used for this turn (legacy rows; new turns reference
+    # a shared SchemaContextRecord by schema_context_hash instead)
+    schema_context = Column(JSON(none_as_null=True), nullable=True)
+    schema_context_hash = Column(
+        String(64),
+        ForeignKey("schema_contexts.fingerprint"),
+        nullable=True,
+        index=True,
+    )
     
     # RAG examples used for this turn
-    rag_examples_used = Column(JSON, nullable=True)
+    rag_examples_used = Column(JSON(none_as_null=True), nullable=True)
+    
+    # Size of the JSON of the trace columns, stored inline or in turn_traces;
+    # NULL for turns written before trace storage, 0 once the trace expired
+    trace_bytes = Column(Integer, nullable=True)
     
     # Relationships
     conversation = relationship("Conversation", back_populates="turns")
+    # Trace storage, only loaded on request (see repositories.trace)
+    trace: Mapped[Optional["TurnTrace"]] = relationship(
+        "TurnTrace", uselist=False, viewonly=True, lazy="raise"
+    )
+    schema_context_record: Mapped[Optional["SchemaContextRecord"]] = relationship(
+        "SchemaContextRecord", viewonly=True, lazy="raise"
+    )
     audit_log = relationship(
         "AuditLog",
         back_populates="turn",
@@ -152,6 +178,11 @@ class ConversationTurn(Base, UUIDMixin, TimestampMixin):
         cascade="all, delete-orphan",
     )
     
+    __table_args__ = (
+        # Turn counts and last turns of listed conversations
+        Index("ix_conversation_turns_conversation_turn", "conversation_id", "turn_number"),
+    )
+    
     def __repr__(self) -> str:
         return (
             f"<ConversationTurn(id={self.id}, "
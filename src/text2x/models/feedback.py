@@ -10,7 +10,7 @@ from enum import Enum as PyEnum
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID
 
-from sqlalchemy import Boolean, Column, Enum, ForeignKey, Text
+from sqlalchemy import Boolean, Column, Enum, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -92,6 +92,12 @@ class UserFeedback(Base, UUIDMixin, TimestampMixin):
         back_populates="feedback",
     )
 
+    __table_args__ = (
+        # Statistics over a time window, and incremental rollup refreshes
+        Index("ix_user_feedback_created_at", "created_at"),
+        Index("ix_user_feedback_updated_at", "updated_at"),
+    )
+
     def __repr__(self) -> str:
         return (
             f"<UserFeedback(id={self.id}, turn_id={self.turn_id}, "
@@ -12,19 +12,26 @@ from typing import Optional
 from uuid import UUID
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
+    Computed,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     String,
     Text,
+    event,
 )
-from sqlalchemy.dialects.postgresql import ARRAY, JSON, UUID as PGUUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import ARRAY, JSON, TSVECTOR, UUID as PGUUID
+from sqlalchemy.orm import deferred, relationship
 
 from .base import Base, TimestampMixin, UUIDMixin
 
+# Text search configuration of RAGExample.search_vector; queries must use the same
+SEARCH_CONFIG = "english"
+
 
 class ExampleStatus(str, PyEnum):
     """Status of a RAG example in the review pipeline."""
@@ -82,6 +89,15 @@ class RAGExample(Base, UUIDMixin, TimestampMixin):
     # Additional metadata stored as JSON (named extra_metadata to avoid SQLAlchemy reserved 'metadata')
     extra_metadata = Column("metadata", JSON, nullable=True)
 
+    # Full-text search over the question, for retrieval without OpenSearch
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(f"to_tsvector('{SEARCH_CONFIG}', natural_language_query)", persisted=True),
+            nullable=True,
+        )
+    )
+
     # Note: Question embeddings are stored in OpenSearch/vector DB
     # This field just tracks if embeddings have been generated
     embeddings_generated = Column(Boolean, nullable=False, default=False)
@@ -89,6 +105,16 @@ class RAGExample(Base, UUIDMixin, TimestampMixin):
     # Relationships
     source_conversation = relationship("Conversation")
 
+    __table_args__ = (
+        # Counts per provider and status, and incremental rollup refreshes
+        Index("ix_rag_examples_provider_status", "provider_id", "status"),
+        Index("ix_rag_examples_updated_at", "updated_at"),
+        # Database retrieval: full-text and trigram matches, table overlap
+        # (the trigram index is created by TRIGRAM_INDEX_DDL)
+        Index("ix_rag_examples_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_rag_examples_involved_tables_gin", "involved_tables", postgresql_using="gin"),
+    )
+
     def __repr__(self) -> str:
         return (
             f"<RAGExample(id={self.id}, provider_id={self.provider_id}, "
@@ -144,6 +170,29 @@ class RAGExample(Base, UUIDMixin, TimestampMixin):
         return self.expert_corrected_query is not None
 
 
+# Trigram matching of questions needs the pg_trgm contrib extension, which
+# not every server ships; without it, searches rank by full text only
+TRIGRAM_INDEX_DDL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS ix_rag_examples_nl_query_trgm
+            ON rag_examples USING gin (natural_language_query gin_trgm_ops);
+    END IF;
+EXCEPTION WHEN insufficient_privilege THEN
+    NULL;  -- not allowed to install it
+END
+$$
+"""
+
+event.listen(
+    RAGExample.__table__,
+    "after_create",
+    DDL(TRIGRAM_INDEX_DDL).execute_if(dialect="postgresql"),
+)
+
+
 class QueryIntent(str, PyEnum):
     """Common query intents for categorization."""
 
@@ -0,0 +1,78 @@
+"""
+Statistics rollup models for Text2DSL.
+
+Dashboard statistics are aggregated in SQL. When STATS_ROLLUPS_ENABLED is
+set, a background job (``services.stats_rollup``) also keeps these tables
+up to date, so dashboards read a handful of pre-aggregated rows instead of
+scanning examples and feedback:
+
+- ``RAGExampleStats``: example counts per provider and status
+- ``FeedbackDailyStats``: feedback counts and confidence sums per UTC day
+  and category, for complete days
+- ``StatsRollupState``: how far each rollup has been refreshed
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, Float, Integer, String
+
+from .base import Base
+
+
+class RAGExampleStats(Base):
+    """Number of RAG examples of a provider in one review status."""
+
+    __tablename__ = "rag_example_stats"
+
+    provider_id = Column(String(255), primary_key=True)
+    status = Column(String(50), primary_key=True)
+    example_count = Column(Integer, nullable=False, default=0)
+    oldest_created_at = Column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<RAGExampleStats(provider_id={self.provider_id}, status={self.status}, "
+            f"count={self.example_count})>"
+        )
+
+
+class FeedbackDailyStats(Base):
+    """Feedback given on one UTC day in one category."""
+
+    __tablename__ = "feedback_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    category = Column(String(50), primary_key=True)
+    feedback_count = Column(Integer, nullable=False, default=0)
+    up_count = Column(Integer, nullable=False, default=0)
+    down_count = Column(Integer, nullable=False, default=0)
+    # Sums of the rated turns' confidence scores, for averages over any range
+    up_confidence_sum = Column(Float, nullable=False, default=0.0)
+    down_confidence_sum = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<FeedbackDailyStats(day={self.day}, category={self.category}, "
+            f"count={self.feedback_count})>"
+        )
+
+
+class StatsRollupState(Base):
+    """
+    Refresh progress of one rollup table.
+
+    Rows changed since ``refreshed_at`` (less a safety lag) are re-aggregated
+    by the next incremental refresh. ``covered_until`` is the instant before
+    which the rollup is complete; rows created later are aggregated live.
+    """
+
+    __tablename__ = "stats_rollup_state"
+
+    name = Column(String(50), primary_key=True)
+    refreshed_at = Column(DateTime, nullable=True)
+    full_refreshed_at = Column(DateTime, nullable=True)
+    covered_until = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<StatsRollupState(name={self.name}, refreshed_at={self.refreshed_at})>"
@@ -0,0 +1,100 @@
+"""
+Trace storage models for Text2DSL.
+
+Conversation turns keep only small, frequently read fields inline. The bulky
+documents produced while answering a question live here:
+
+- ``SchemaContextRecord``: schema contexts, stored once per fingerprint (the
+  SHA-256 of their canonical JSON) and referenced by hash from turns and
+  audit logs, since consecutive questions against a connection usually see
+  the same context
+- ``TurnTrace``: a turn's reasoning trace, execution result and RAG examples,
+  compressed into one blob when their JSON is larger than
+  TRACE_INLINE_MAX_BYTES, and only read when a single turn is inspected
+"""
+
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Dict
+from uuid import UUID
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import JSON, UUID as PGUUID
+
+from .base import Base
+
+# Turn columns moved into TurnTrace payloads
+TURN_TRACE_COLUMNS = ("reasoning_trace", "execution_result", "rag_examples_used")
+
+
+def canonical_json(value: Any) -> bytes:
+    """Serialize a JSON document with sorted keys and no whitespace."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+class SchemaContextRecord(Base):
+    """
+    A schema context shared by every turn and audit log that used it.
+
+    The primary key is derived from the content, so rows are never updated
+    except for ``last_used_at``.
+    """
+
+    __tablename__ = "schema_contexts"
+
+    fingerprint = Column(String(64), primary_key=True)
+    content = Column(JSON, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Refreshed on every write referencing the context (see compaction)
+    last_used_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<SchemaContextRecord(fingerprint={self.fingerprint}, size={self.size_bytes})>"
+
+
+class TurnTrace(Base):
+    """
+    Compressed trace documents of one conversation turn.
+
+    The payload is the zlib-compressed JSON object of the turn's
+    TURN_TRACE_COLUMNS; those columns are NULL on the turn row itself.
+    """
+
+    __tablename__ = "turn_traces"
+
+    turn_id = Column(
+        PGUUID(as_uuid=True),
+        ForeignKey("conversation_turns.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    codec = Column(String(16), nullable=False, default="zlib")
+    payload = Column(LargeBinary, nullable=False)
+    raw_bytes = Column(Integer, nullable=False)
+    stored_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    @classmethod
+    def pack(cls, turn_id: UUID, raw: bytes) -> "TurnTrace":
+        """Build a trace row from the serialized JSON of a turn's trace documents."""
+        payload = zlib.compress(raw)
+        return cls(
+            turn_id=turn_id,
+            codec="zlib",
+            payload=payload,
+            raw_bytes=len(raw),
+            stored_bytes=len(payload),
+        )
+
+    def unpack(self) -> Dict[str, Any]:
+        """Decompress the payload into a column name -> value mapping."""
+        if self.codec != "zlib":
+            raise ValueError(f"Unsupported trace codec: {self.codec}")
+        return json.loads(zlib.decompress(self.payload))
+
+    def __repr__(self) -> str:
+        return (
+            f"<TurnTrace(turn_id={self.turn_id}, raw={self.raw_bytes}, "
+            f"stored={self.stored_bytes})>"
+        )
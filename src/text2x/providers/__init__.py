@@ -10,6 +10,7 @@ from .base import (
     ForeignKeyInfo,
     Relationship,
     JoinPath,
+    PlanEstimate,
     ValidationResult,
     ExecutionResult,
 )
@@ -47,6 +48,7 @@ __all__ = [
     "Relationship",
     "JoinPath",
     # Result classes
+    "PlanEstimate",
     "ValidationResult",
     "ExecutionResult",
     # SQL Provider
@@ -1,11 +1,26 @@
 """Base Provider Interface for Text2X"""
 
+import hashlib
+import json
+import re
+import uuid
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, Iterator, List, Optional, Dict, Any, Set
 from enum import Enum
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from text2x.services.cost_guard import CostBudget
+
+# Whitespace runs and quoted literals, for canonicalizing query text
+_QUERY_TOKENS = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\s+")
+
+# Sids of the search jobs started in the current request (see search_job_scope)
+_search_job_scope: ContextVar[Optional[Set[str]]] = ContextVar("search_job_scope", default=None)
+
 
 class ProviderCapability(Enum):
     """Capabilities that a provider can support"""
@@ -16,6 +31,7 @@ class ProviderCapability(Enum):
     QUERY_EXPLANATION = "query_explanation"
     DRY_RUN = "dry_run"
     COST_ESTIMATION = "cost_estimation"
+    SEARCH_JOBS = "search_jobs"  # Long-running jobs that can be inspected and cancelled
 
 
 @dataclass
@@ -101,6 +117,32 @@ class SchemaDefinition:
     collections: Optional[List[str]] = None  # For MongoDB
 
 
+@dataclass
+class PlanEstimate:
+    """Planner estimates for a query, obtained without executing it"""
+
+    total_cost: Optional[float] = None  # Planner cost units (dialect-specific scale)
+    startup_cost: Optional[float] = None
+    estimated_rows: Optional[int] = None
+    estimated_bytes: Optional[int] = None  # Size of the result
+    scanned_bytes: Optional[int] = None  # Data read by scans
+    full_scans: List[str] = field(default_factory=list)  # Tables read in full
+    node_types: List[str] = field(default_factory=list)
+    source: str = ""  # Dialect / system the estimate came from
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_cost": self.total_cost,
+            "startup_cost": self.startup_cost,
+            "estimated_rows": self.estimated_rows,
+            "estimated_bytes": self.estimated_bytes,
+            "scanned_bytes": self.scanned_bytes,
+            "full_scans": list(self.full_scans),
+            "node_types": list(self.node_types),
+            "source": self.source,
+        }
+
+
 @dataclass
 class ValidationResult:
     """Result of query validation"""
@@ -110,6 +152,7 @@ class ValidationResult:
     warnings: List[str] = field(default_factory=list)
     parsed_query: Optional[Any] = None
     validation_time_ms: Optional[float] = None
+    plan_estimate: Optional[PlanEstimate] = None
 
 
 @dataclass
@@ -124,6 +167,7 @@ class ExecutionResult:
     execution_time_ms: Optional[float] = None
     query_plan: Optional[str] = None  # EXPLAIN output if available
     affected_rows: Optional[int] = None  # For UPDATE/DELETE/INSERT
+    truncated: bool = False  # Fetching stopped at the row or byte cap
 
 
 @dataclass
@@ -133,13 +177,73 @@ class ProviderConfig:
     provider_type: str
     timeout_seconds: int = 30
     max_rows: int = 1000
+    max_result_bytes: int = 16 * 1024 * 1024  # Cap on fetched result data (0 = unlimited)
     enable_query_plan: bool = False
     extra_params: Dict[str, Any] = field(default_factory=dict)
 
 
+def schema_fingerprint(schema: SchemaDefinition) -> str:
+    """
+    Stable hash of the parts of a schema that affect query validity
+
+    Args:
+        schema: Schema definition
+
+    Returns:
+        Hex digest that changes whenever a table, column or type changes
+    """
+    payload = {
+        "tables": sorted(
+            [table.name, sorted([col.name, col.type] for col in table.columns)]
+            for table in schema.tables
+        ),
+        "sourcetypes": sorted(schema.sourcetypes or []),
+        "collections": sorted(schema.collections or []),
+    }
+    encoded = json.dumps(payload, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+@contextmanager
+def search_job_scope() -> Iterator[Set[str]]:
+    """
+    Collect the sids of the search jobs started within a block
+
+    Providers are shared between requests, so their list of active jobs
+    includes other users' jobs. Providers with SEARCH_JOBS call
+    record_search_job for each job they start; tasks created inside the
+    block inherit the scope, so jobs started by them are collected too.
+
+    Yields:
+        Set that receives the sid of every job started in the scope
+    """
+    sids: Set[str] = set()
+    token = _search_job_scope.set(sids)
+    try:
+        yield sids
+    finally:
+        _search_job_scope.reset(token)
+
+
+def record_search_job(sid: str) -> None:
+    """Add a newly started search job to the current search_job_scope, if any"""
+    sids = _search_job_scope.get()
+    if sids is not None:
+        sids.add(sid)
+
+
 class QueryProvider(ABC):
     """Base interface for all query providers"""
 
+    # Metadata connection this provider was created for (set by the provider factory)
+    connection_id: Optional[str] = None
+
+    # Fingerprint of the schema last introspected or set
+    schema_fingerprint: Optional[str] = None
+
+    # Cost guardrail thresholds of the owning workspace (set by the provider factory)
+    cost_budget: Optional["CostBudget"] = None
+
     @abstractmethod
     def get_provider_id(self) -> str:
         """Unique identifier for this provider"""
@@ -183,12 +287,67 @@ class QueryProvider(ABC):
             return await self.validate_syntax(query)
         raise NotImplementedError()
 
-    async def estimate_cost(self, query: str) -> Optional[Dict[str, Any]]:
-        """Estimate query cost (optional)"""
+    async def estimate_cost(self, query: str) -> Optional[PlanEstimate]:
+        """Estimate query cost without executing it (optional)"""
         if ProviderCapability.COST_ESTIMATION not in self.get_capabilities():
             return None
         raise NotImplementedError()
 
+    def limit_query(self, query: str, limit: int) -> str:
+        """
+        Rewrite a query the way ``execute_query`` bounds it to ``limit`` rows
+
+        Cost estimates of the rewritten query match what is executed. The
+        default returns the query unchanged.
+        """
+        return query
+
+    def sample_query(
+        self, query: str, percent: float, estimate: Optional[PlanEstimate] = None
+    ) -> Optional[str]:
+        """
+        Rewrite a query to read a sample of its data (optional)
+
+        Args:
+            query: Query to rewrite
+            percent: Share of the data to read (0-100)
+            estimate: Estimate of the query, naming the sources that drive its cost
+
+        Returns:
+            Rewritten query, or None if the provider cannot sample it
+        """
+        return None
+
+    def set_schema(self, schema: Optional[SchemaDefinition]) -> None:
+        """Record the schema that queries are validated against"""
+        self.schema_fingerprint = schema_fingerprint(schema) if schema is not None else None
+
+    def get_cache_identity(self) -> str:
+        """
+        Identity of the data source in caches shared between provider instances
+
+        Providers created for a metadata connection share cache entries; others
+        are scoped to this instance.
+        """
+        if self.connection_id:
+            return self.connection_id
+        if "_instance_id" not in self.__dict__:
+            self._instance_id = f"{self.get_provider_id()}:{uuid.uuid4().hex}"
+        return self._instance_id
+
+    def canonicalize_query(self, query: str) -> str:
+        """
+        Canonical text of a query, so formatting variants share cache entries
+
+        Collapses whitespace outside quoted literals and drops a trailing
+        semicolon. Providers may normalize further.
+        """
+        def collapse(match: "re.Match[str]") -> str:
+            token = match.group(0)
+            return token if token[0] in "'\"" else " "
+
+        return _QUERY_TOKENS.sub(collapse, query.strip()).rstrip("; ")
+
     async def close(self) -> None:
         """Close any open connections"""
         pass
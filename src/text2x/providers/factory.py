@@ -1,16 +1,28 @@
 """Provider factory for creating provider instances from database models."""
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict
 from uuid import UUID
 
+from sqlalchemy import inspect as sa_inspect
+
 from text2x.providers.sql_provider import SQLProvider, SQLConnectionConfig
 from text2x.providers.nosql_provider import NoSQLProvider, MongoDBConnectionConfig
 from text2x.models.workspace import ProviderType
+from text2x.services.cost_guard import CostBudget
 
 if TYPE_CHECKING:
     from text2x.providers.base import QueryProvider
 
 
+def _workspace_settings(provider_model) -> Dict[str, Any]:
+    """Settings of the provider's workspace, if the relationship was loaded"""
+    state = sa_inspect(provider_model, raiseerr=False)
+    if state is not None and "workspace" in state.unloaded:
+        return {}
+    workspace = getattr(provider_model, "workspace", None)
+    return (workspace.settings or {}) if workspace is not None else {}
+
+
 async def get_provider_instance(provider_model) -> "QueryProvider":
     """Create a QueryProvider instance from a provider database model.
 
@@ -49,7 +61,10 @@ async def get_provider_instance(provider_model) -> "QueryProvider":
             username=username,
             password=password,
         )
-        return NoSQLProvider(config)
+        query_provider = NoSQLProvider(config)
+        query_provider.connection_id = str(connection.id)
+        query_provider.cost_budget = CostBudget.from_settings(_workspace_settings(provider_model))
+        return query_provider
     elif provider_type == ProviderType.POSTGRESQL:
         dialect = "postgresql"
     elif provider_type == ProviderType.MYSQL:
@@ -69,7 +84,10 @@ async def get_provider_instance(provider_model) -> "QueryProvider":
         extra_params=connection.connection_options or {},
     )
 
-    return SQLProvider(config)
+    query_provider = SQLProvider(config)
+    query_provider.connection_id = str(connection.id)
+    query_provider.cost_budget = CostBudget.from_settings(_workspace_settings(provider_model))
+    return query_provider
 
 
 async def get_provider_by_connection_id(connection_id: UUID, workspace_id: UUID) -> "QueryProvider":
@@ -85,24 +103,16 @@ async def get_provider_by_connection_id(connection_id: UUID, workspace_id: UUID)
     Raises:
         ValueError: If connection not found or provider type not supported
     """
-    from text2x.api.state import app_state
     from sqlalchemy import select
     from sqlalchemy.orm import selectinload
-    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    from text2x.models.base import get_db
     from text2x.models.workspace import Connection, Provider
 
-    # Create session
-    session_maker = async_sessionmaker(
-        app_state.db_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
-
-    async with session_maker() as session:
+    async with get_db().session_factory() as session:
         # Get connection with its provider
         result = await session.execute(
             select(Connection)
-            .options(selectinload(Connection.provider))
+            .options(selectinload(Connection.provider).selectinload(Provider.workspace))
             .where(Connection.id == connection_id)
         )
         connection = result.scalar_one_or_none()
@@ -143,7 +153,10 @@ async def get_provider_by_connection_id(connection_id: UUID, workspace_id: UUID)
                 username=username,
                 password=password,
             )
-            return NoSQLProvider(config)
+            query_provider = NoSQLProvider(config)
+            query_provider.connection_id = str(connection.id)
+            query_provider.cost_budget = CostBudget.from_settings(_workspace_settings(provider))
+            return query_provider
         else:
             raise ValueError(f"Unsupported provider type: {provider_type}")
 
@@ -157,4 +170,7 @@ async def get_provider_by_connection_id(connection_id: UUID, workspace_id: UUID)
             extra_params=connection.connection_options or {},
         )
 
-        return SQLProvider(config)
+        query_provider = SQLProvider(config)
+        query_provider.connection_id = str(connection.id)
+        query_provider.cost_budget = CostBudget.from_settings(_workspace_settings(provider))
+        return query_provider
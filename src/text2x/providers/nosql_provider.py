@@ -1,6 +1,7 @@
 """NoSQL Provider Implementation for MongoDB"""
 
 import asyncio
+import math
 import time
 import json
 from dataclasses import dataclass, field
@@ -20,6 +21,7 @@ from .base import (
     TableInfo,
     ColumnInfo,
     ProviderConfig,
+    PlanEstimate,
 )
 
 
@@ -122,6 +124,7 @@ class NoSQLProvider(QueryProvider):
             ProviderCapability.SCHEMA_INTROSPECTION,
             ProviderCapability.QUERY_VALIDATION,
             ProviderCapability.QUERY_EXECUTION,
+            ProviderCapability.COST_ESTIMATION,
         ]
 
     async def get_schema(self, force_refresh: bool = False) -> SchemaDefinition:
@@ -204,6 +207,7 @@ class NoSQLProvider(QueryProvider):
             # Cache the schema
             self._schema_cache = schema_def
             self._cache_time = current_time
+            self.set_schema(schema_def)
 
             return schema_def
 
@@ -548,6 +552,8 @@ class NoSQLProvider(QueryProvider):
         if skip:
             cursor = cursor.skip(skip)
 
+        if parsed_query.get("limit"):
+            limit = min(limit, parsed_query["limit"])
         cursor = cursor.limit(limit)
 
         # Fetch results
@@ -747,12 +753,132 @@ class NoSQLProvider(QueryProvider):
 
         return ExecutionResult(success=False, error=f"Unknown delete operation: {operation}")
 
+    async def estimate_cost(self, query: str) -> Optional[PlanEstimate]:
+        """
+        Estimate a read query from ``explain`` (queryPlanner verbosity, nothing runs)
+
+        The winning plan shows whether the collection is scanned in full; the
+        row and byte estimates of a full scan come from collection statistics.
+        Index-driven plans report no row estimate.
+
+        Args:
+            query: MongoDB query (JSON format)
+
+        Returns:
+            PlanEstimate, or None for operations that cannot be explained
+        """
+        parsed_query = json.loads(query) if isinstance(query, str) else query
+        collection_name = parsed_query["collection"]
+        operation = parsed_query.get("operation", "find")
+        filter_query = parsed_query.get("filter", {})
+
+        if operation in ("find", "find_one"):
+            command = {"find": collection_name, "filter": filter_query}
+            if parsed_query.get("limit"):
+                command["limit"] = parsed_query["limit"]
+        elif operation == "aggregate":
+            command = {
+                "aggregate": collection_name,
+                "pipeline": parsed_query.get("pipeline", []),
+                "cursor": {},
+            }
+        elif operation == "count_documents":
+            command = {"count": collection_name, "query": filter_query}
+        elif operation == "distinct":
+            command = {"distinct": collection_name, "key": parsed_query.get("field"), "query": filter_query}
+        else:
+            return None
+
+        explained = await self.database.command({"explain": command, "verbosity": "queryPlanner"})
+
+        estimate = PlanEstimate(source="mongodb")
+        for stage in _plan_stages(explained):
+            estimate.node_types.append(stage)
+        if "COLLSCAN" in estimate.node_types:
+            estimate.full_scans.append(collection_name)
+            stats = await self.database.command("collStats", collection_name)
+            estimate.estimated_rows = int(stats.get("count", 0))
+            estimate.scanned_bytes = int(stats.get("size", 0))
+        return estimate
+
+    def limit_query(self, query: str, limit: int) -> str:
+        """Rewrite a find or aggregate with the limit ``execute_query`` applies"""
+        parsed_query = json.loads(query) if isinstance(query, str) else dict(query)
+        operation = parsed_query.get("operation", "find")
+        if operation == "find":
+            parsed_query["limit"] = min(limit, parsed_query.get("limit") or limit)
+        elif operation == "aggregate":
+            pipeline = list(parsed_query.get("pipeline", []))
+            if not any(stage.get("$limit") for stage in pipeline if isinstance(stage, dict)):
+                pipeline.append({"$limit": limit})
+            parsed_query["pipeline"] = pipeline
+        else:
+            return query
+        return json.dumps(parsed_query)
+
+    def sample_query(
+        self, query: str, percent: float, estimate: Optional[PlanEstimate] = None
+    ) -> Optional[str]:
+        """
+        Rewrite a find or aggregate into a pipeline that starts with ``$sample``
+
+        The sample size is derived from the estimated collection size, so an
+        estimate with row counts is required. A find keeps its limit.
+        """
+        if estimate is None or not estimate.estimated_rows:
+            return None
+        parsed_query = json.loads(query) if isinstance(query, str) else dict(query)
+        operation = parsed_query.get("operation", "find")
+        size = max(1, math.ceil(estimate.estimated_rows * percent / 100))
+        sample = {"$sample": {"size": size}}
+
+        if operation == "aggregate":
+            pipeline = [sample, *parsed_query.get("pipeline", [])]
+        elif operation == "find":
+            pipeline = [sample]
+            if parsed_query.get("filter"):
+                pipeline.append({"$match": parsed_query["filter"]})
+            if parsed_query.get("sort"):
+                pipeline.append({"$sort": dict(parsed_query["sort"])})
+            if parsed_query.get("skip"):
+                pipeline.append({"$skip": parsed_query["skip"]})
+            if parsed_query.get("limit"):
+                pipeline.append({"$limit": parsed_query["limit"]})
+            if parsed_query.get("projection"):
+                pipeline.append({"$project": parsed_query["projection"]})
+        else:
+            return None
+
+        return json.dumps(
+            {"collection": parsed_query["collection"], "operation": "aggregate", "pipeline": pipeline}
+        )
+
     async def close(self) -> None:
         """Close MongoDB connection"""
         if self.client:
             self.client.close()
 
 
+def _plan_stages(node: Any) -> List[str]:
+    """Stage names of every winning plan in an explain document"""
+    stages: List[str] = []
+
+    def walk(value: Any, in_plan: bool) -> None:
+        if isinstance(value, list):
+            for item in value:
+                walk(item, in_plan)
+        elif isinstance(value, dict):
+            if in_plan and isinstance(value.get("stage"), str):
+                stages.append(value["stage"])
+            for key, child in value.items():
+                # Rejected plans were not chosen and would not run
+                if key != "rejectedPlans":
+                    walk(child, in_plan or key == "winningPlan")
+
+    walk(node, False)
+    return stages
+
+
 # Factory function for easy provider creation
 def create_nosql_provider(
     connection_string: str = "mongodb://localhost:27017",
@@ -1,11 +1,15 @@
 """Splunk Provider Implementation for Text2X"""
 import asyncio
+import threading
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, List, Optional, Dict, Any, Tuple
 from enum import Enum
 
+import httpx
 import splunklib.client as client
 from splunklib.results import JSONResultsReader
 
@@ -18,7 +22,35 @@ from .base import (
     TableInfo,
     ColumnInfo,
     ProviderConfig,
+    PlanEstimate,
+    record_search_job,
 )
+from text2x.utils.observability import record_cost_guard_decision
+
+if TYPE_CHECKING:
+    from text2x.services.cost_guard import CostBudget
+
+
+# Internal indexes that are still worth exposing in the schema
+INTERNAL_INDEXES = ("_internal", "_audit")
+
+# Search filter matching all non-internal indexes plus INTERNAL_INDEXES
+ALL_INDEXES_FILTER = " OR ".join(["index=*", *(f"index={name}" for name in INTERNAL_INDEXES)])
+
+# Job polling backoff (seconds); the interval only grows while progress stalls
+POLL_INITIAL_INTERVAL = 0.05
+POLL_BACKOFF_FACTOR = 1.5
+POLL_MAX_INTERVAL = 2.0
+
+# Time allowed past max_time for Splunk to finalize a job (seconds)
+JOB_FINALIZE_GRACE = 5.0
+
+# Time an executing search runs before its progress is extrapolated and
+# checked against the cost budget (seconds)
+COST_ESTIMATE_SECONDS = 2.0
+
+SAMPLE_ROW_COUNT = 10  # Rows returned in ExecutionResult.sample_rows
+RESULTS_PAGE_SIZE = 1000  # Default page size when streaming results
 
 
 class SearchJobStatus(Enum):
@@ -45,6 +77,9 @@ class SplunkConnectionConfig:
     token: Optional[str] = None  # For token-based authentication
     verify: bool = False  # SSL verification
     autologin: bool = True
+    max_concurrent_searches: int = 4  # Bound on parallel introspection jobs
+    field_cache_ttl: int = 3600  # Seconds to cache fields per sourcetype
+    field_sample_size: int = 1000  # Events sampled per sourcetype for fields
     extra_params: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -62,6 +97,37 @@ class SplunkSearchJob:
     latest_time: Optional[str] = None
     run_duration: Optional[float] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dict"""
+        return {
+            "sid": self.sid,
+            "status": self.status.value,
+            "progress": self.progress,
+            "event_count": self.event_count,
+            "result_count": self.result_count,
+            "scan_count": self.scan_count,
+            "error": self.error,
+            "run_duration": self.run_duration,
+        }
+
+    def estimate(self) -> Optional[PlanEstimate]:
+        """
+        Extrapolate the job's cost so far by its progress to the whole time range
+
+        total_cost is expressed in seconds of search time.
+
+        Returns:
+            PlanEstimate, or None if the job has made no progress
+        """
+        fraction = 1.0 if self.status == SearchJobStatus.DONE else self.progress / 100
+        if fraction <= 0:
+            return None
+        return PlanEstimate(
+            total_cost=(self.run_duration or 0.0) / fraction,
+            estimated_rows=int(self.scan_count / fraction),
+            source="splunk",
+        )
+
 
 @dataclass
 class SplunkFieldInfo:
@@ -83,6 +149,20 @@ class SplunkIndexInfo:
     sourcetypes: List[str] = field(default_factory=list)
 
 
+class SplunkRequestError(Exception):
+    """Raised when the Splunk REST API rejects a request"""
+
+
+def _response_error(response: httpx.Response) -> str:
+    """Extract Splunk's error messages from a REST response"""
+    try:
+        messages = response.json().get('messages', [])
+        text = "; ".join(m.get('text', '') for m in messages if isinstance(m, dict))
+    except ValueError:
+        text = response.text
+    return text or f"HTTP {response.status_code}"
+
+
 class SplunkProvider(QueryProvider):
     """Splunk Provider for SPL (Search Processing Language) queries"""
 
@@ -97,15 +177,30 @@ class SplunkProvider(QueryProvider):
         self.config = config
         self.provider_config = provider_config or ProviderConfig(provider_type="splunk")
 
-        # Connection will be created lazily
+        # Connection will be created lazily and shared by all worker threads
         self._service = None
+        self._service_lock = threading.Lock()
         self._schema_cache: Optional[SchemaDefinition] = None
         self._cache_time: Optional[float] = None
         self._cache_ttl = 3600  # 1 hour cache for schema
 
+        # Fields discovered per sourcetype: sourcetype -> (cached_at, fields)
+        self._field_cache: Dict[str, Tuple[float, List[SplunkFieldInfo]]] = {}
+        self._field_cache_lock = threading.Lock()
+
+        # Jobs started by execute_query that have not finished yet: sid -> last status
+        self._active_jobs: Dict[str, SplunkSearchJob] = {}
+        self._active_jobs_lock = threading.Lock()
+
     def _get_service(self) -> client.Service:
-        """Get or create Splunk service connection"""
-        if self._service is None:
+        """Get or create the Splunk service connection (logs in once)"""
+        if self._service is not None:
+            return self._service
+
+        with self._service_lock:
+            if self._service is not None:
+                return self._service
+
             # Build connection arguments
             conn_args = {
                 'host': self.config.host,
@@ -145,6 +240,7 @@ class SplunkProvider(QueryProvider):
             ProviderCapability.SCHEMA_INTROSPECTION,
             ProviderCapability.QUERY_VALIDATION,
             ProviderCapability.QUERY_EXECUTION,
+            ProviderCapability.SEARCH_JOBS,
         ]
 
     async def get_schema(self) -> SchemaDefinition:
@@ -165,6 +261,7 @@ class SplunkProvider(QueryProvider):
         # Update cache
         self._schema_cache = schema
         self._cache_time = time.time()
+        self.set_schema(schema)
 
         return schema
 
@@ -173,60 +270,52 @@ class SplunkProvider(QueryProvider):
         service = self._get_service()
 
         # Get all indexes
-        indexes = service.indexes
         index_infos = []
-        all_sourcetypes = set()
-
-        for index in indexes:
+        for index in service.indexes:
             index_name = index.name
 
             # Skip internal indexes
-            if index_name.startswith('_') and index_name not in ['_internal', '_audit']:
+            if index_name.startswith('_') and index_name not in INTERNAL_INDEXES:
                 continue
 
-            # Get index statistics
-            index_info = SplunkIndexInfo(
+            # Entity.get() issues a REST request; read the already loaded content
+            index_infos.append(SplunkIndexInfo(
                 name=index_name,
-                total_event_count=int(index.get('totalEventCount', 0)),
-                total_size_mb=float(index.get('currentDBSizeMB', 0)),
-            )
-
-            # Get sourcetypes for this index
-            try:
-                # Search for sourcetypes in this index (limited to avoid long query)
-                search_query = f'| metadata type=sourcetypes index={index_name}'
-                job = service.jobs.create(search_query, exec_mode="blocking", max_time=10)
-
-                sourcetypes = []
-                for result in JSONResultsReader(job.results(output_mode='json')):
-                    if isinstance(result, dict) and 'sourcetype' in result:
-                        sourcetype = result['sourcetype']
-                        sourcetypes.append(sourcetype)
-                        all_sourcetypes.add(sourcetype)
-
-                index_info.sourcetypes = sourcetypes
-                job.cancel()
-            except Exception:
-                # If metadata search fails, continue without sourcetypes
-                pass
+                total_event_count=int(index.content.get('totalEventCount', 0)),
+                total_size_mb=float(index.content.get('currentDBSizeMB', 0)),
+            ))
 
-            index_infos.append(index_info)
+        # Get sourcetypes for all indexes at once
+        sourcetypes_by_index = self._get_sourcetypes_by_index(
+            service, [idx.name for idx in index_infos]
+        )
+        all_sourcetypes = set()
+        for idx_info in index_infos:
+            idx_info.sourcetypes = sourcetypes_by_index.get(idx_info.name, [])
+            all_sourcetypes.update(idx_info.sourcetypes)
 
-        # Get common fields across all data
-        # This is done by running a sample search and examining field extractions
-        common_fields = self._get_common_fields(service)
+        # Get fields per sourcetype (cached across schema refreshes)
+        fields_by_sourcetype = self._get_sourcetype_fields(service, all_sourcetypes)
 
         # Convert to TableInfo format (treating indexes as "tables")
         tables = []
         for idx_info in index_infos:
-            # Create columns from common fields
+            # Create columns from default fields plus the index's sourcetype fields
+            index_fields = self._get_default_fields()
+            seen = {f.name for f in index_fields}
+            for sourcetype in idx_info.sourcetypes:
+                for field_info in fields_by_sourcetype.get(sourcetype, []):
+                    if field_info.name not in seen:
+                        seen.add(field_info.name)
+                        index_fields.append(field_info)
+
             columns = [
                 ColumnInfo(
-                    name=field.name,
-                    type=field.type,
-                    comment=f"Common field in Splunk (distinct values: {field.distinct_count})"
+                    name=field_info.name,
+                    type=field_info.type,
+                    comment=f"Common field in Splunk (distinct values: {field_info.distinct_count})"
                 )
-                for field in common_fields
+                for field_info in index_fields
             ]
 
             # Add sourcetype information to comment
@@ -253,10 +342,153 @@ class SplunkProvider(QueryProvider):
             }
         )
 
-    def _get_common_fields(self, service: client.Service) -> List[SplunkFieldInfo]:
-        """Get common fields from Splunk"""
-        # Default common fields in Splunk
-        common_fields = [
+    def _run_search(
+        self, service: client.Service, query: str, max_time: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Run a blocking search job and return all of its result rows"""
+        job = service.jobs.create(query, exec_mode="blocking", max_time=max_time)
+        try:
+            return [
+                result
+                for result in JSONResultsReader(job.results(output_mode='json', count=0))
+                if isinstance(result, dict)
+            ]
+        finally:
+            job.cancel()
+
+    def _get_sourcetypes_by_index(
+        self, service: client.Service, index_names: List[str]
+    ) -> Dict[str, List[str]]:
+        """
+        Get the sourcetypes of every index
+
+        A single tstats search over the index-time metadata returns the
+        (index, sourcetype) pairs for all indexes and is split client-side.
+        If tstats is unavailable, falls back to one metadata search per index
+        run on a bounded thread pool.
+
+        Args:
+            service: Splunk service connection
+            index_names: Names of the indexes to report
+
+        Returns:
+            Mapping of index name to its sourcetypes
+        """
+        sourcetypes_by_index: Dict[str, List[str]] = {name: [] for name in index_names}
+        if not index_names:
+            return sourcetypes_by_index
+
+        try:
+            rows = self._run_search(
+                service, f'| tstats count where {ALL_INDEXES_FILTER} by index, sourcetype'
+            )
+            for row in rows:
+                index_name, sourcetype = row.get('index'), row.get('sourcetype')
+                if index_name in sourcetypes_by_index and sourcetype:
+                    sourcetypes_by_index[index_name].append(sourcetype)
+            return sourcetypes_by_index
+        except Exception:
+            # tstats may be disallowed for this role; query each index instead
+            pass
+
+        def index_sourcetypes(index_name: str) -> List[str]:
+            try:
+                rows = self._run_search(service, f'| metadata type=sourcetypes index={index_name}')
+            except Exception:
+                # If metadata search fails, continue without sourcetypes
+                return []
+            return [row['sourcetype'] for row in rows if 'sourcetype' in row]
+
+        with ThreadPoolExecutor(max_workers=self._max_workers(len(index_names))) as pool:
+            for index_name, sourcetypes in zip(index_names, pool.map(index_sourcetypes, index_names)):
+                sourcetypes_by_index[index_name] = sourcetypes
+
+        return sourcetypes_by_index
+
+    def _get_sourcetype_fields(
+        self, service: client.Service, sourcetypes: Iterable[str]
+    ) -> Dict[str, List[SplunkFieldInfo]]:
+        """
+        Get the search-time fields of each sourcetype
+
+        Fields are cached per sourcetype for ``field_cache_ttl`` seconds, so a
+        schema refresh only samples sourcetypes that are new or expired. The
+        remaining sourcetypes are sampled concurrently on a bounded thread pool.
+
+        Args:
+            service: Splunk service connection
+            sourcetypes: Sourcetypes to get fields for
+
+        Returns:
+            Mapping of sourcetype to its fields (empty if discovery failed)
+        """
+        now = time.time()
+        fields_by_sourcetype: Dict[str, List[SplunkFieldInfo]] = {}
+        missing = []
+
+        with self._field_cache_lock:
+            for sourcetype in sourcetypes:
+                cached = self._field_cache.get(sourcetype)
+                if cached and now - cached[0] < self.config.field_cache_ttl:
+                    fields_by_sourcetype[sourcetype] = cached[1]
+                else:
+                    missing.append(sourcetype)
+
+        if not missing:
+            return fields_by_sourcetype
+
+        def sample_fields(sourcetype: str) -> Optional[List[SplunkFieldInfo]]:
+            try:
+                return self._discover_fields(service, sourcetype)
+            except Exception:
+                # If field discovery fails, the index keeps the default fields
+                return None
+
+        with ThreadPoolExecutor(max_workers=self._max_workers(len(missing))) as pool:
+            discovered = list(pool.map(sample_fields, missing))
+
+        with self._field_cache_lock:
+            for sourcetype, fields in zip(missing, discovered):
+                if fields is None:
+                    fields_by_sourcetype[sourcetype] = []
+                    continue
+                self._field_cache[sourcetype] = (now, fields)
+                fields_by_sourcetype[sourcetype] = fields
+
+        return fields_by_sourcetype
+
+    def _discover_fields(self, service: client.Service, sourcetype: str) -> List[SplunkFieldInfo]:
+        """Sample recent events of a sourcetype and summarize their fields"""
+        escaped = sourcetype.replace('\\', '\\\\').replace('"', '\\"')
+        search_query = (
+            f'search ({ALL_INDEXES_FILTER}) sourcetype="{escaped}" '
+            f'| head {self.config.field_sample_size} '
+            f'| fieldsummary maxvals=0 | fields field, count, distinct_count, numeric_count'
+        )
+
+        fields = []
+        for result in self._run_search(service, search_query, max_time=15):
+            field_name = result.get('field')
+            # Skip internal fields; they are part of the default fields
+            if not field_name or field_name.startswith('_'):
+                continue
+            count = int(result.get('count') or 0)
+            numeric_count = int(result.get('numeric_count') or 0)
+            distinct_count = result.get('distinct_count')
+            fields.append(SplunkFieldInfo(
+                name=field_name,
+                type="number" if count and numeric_count == count else "string",
+                distinct_count=int(distinct_count) if distinct_count is not None else None,
+            ))
+        return fields
+
+    def _max_workers(self, job_count: int) -> int:
+        """Number of threads for a batch of concurrent introspection jobs"""
+        return max(1, min(self.config.max_concurrent_searches, job_count))
+
+    def _get_default_fields(self) -> List[SplunkFieldInfo]:
+        """Get the default fields every Splunk event has"""
+        return [
             SplunkFieldInfo(name="_time", type="timestamp"),
             SplunkFieldInfo(name="_raw", type="string"),
             SplunkFieldInfo(name="host", type="string"),
@@ -266,25 +498,6 @@ class SplunkProvider(QueryProvider):
             SplunkFieldInfo(name="_indextime", type="timestamp"),
         ]
 
-        # Try to get additional fields from recent data
-        try:
-            search_query = 'search * | head 1000 | fieldsummary | fields field'
-            job = service.jobs.create(search_query, exec_mode="blocking", max_time=15)
-
-            for result in JSONResultsReader(job.results(output_mode='json')):
-                if isinstance(result, dict) and 'field' in result:
-                    field_name = result['field']
-                    # Skip internal fields and already included fields
-                    if not field_name.startswith('_') and field_name not in [f.name for f in common_fields]:
-                        common_fields.append(SplunkFieldInfo(name=field_name, type="string"))
-
-            job.cancel()
-        except Exception:
-            # If field discovery fails, just use default fields
-            pass
-
-        return common_fields
-
     async def validate_syntax(self, query: str) -> ValidationResult:
         """
         Validate SPL query syntax
@@ -373,6 +586,13 @@ class SplunkProvider(QueryProvider):
         """
         Execute SPL query and return results
 
+        The search job runs in normal (non-blocking) mode and is polled on the
+        event loop; only the first page of results is fetched for the sample.
+
+        SPL has no planner, so the cost budget is enforced on the job itself:
+        once it has run for COST_ESTIMATE_SECONDS its progress is extrapolated,
+        and a search over budget is cancelled and reported as rejected.
+
         Args:
             query: SPL query to execute
             limit: Maximum number of results to return
@@ -389,8 +609,7 @@ class SplunkProvider(QueryProvider):
             # Add head command if not present to limit results
             safe_query = self._ensure_limit(query, limit)
 
-            # Execute query in thread pool
-            result = await asyncio.to_thread(self._execute_query_sync, safe_query)
+            result = await self._execute_query_async(safe_query)
 
             execution_time_ms = (time.time() - start_time) * 1000
             result.execution_time_ms = execution_time_ms
@@ -404,88 +623,272 @@ class SplunkProvider(QueryProvider):
                 execution_time_ms=(time.time() - start_time) * 1000,
             )
 
-    def _execute_query_sync(self, query: str) -> ExecutionResult:
-        """Execute query synchronously"""
-        service = self._get_service()
+    async def _execute_query_async(self, query: str) -> ExecutionResult:
+        """Run a search job to completion and sample its results"""
+        timeout = self.provider_config.timeout_seconds
 
-        try:
-            # Create search job
-            job = service.jobs.create(
-                query,
-                exec_mode="blocking",  # Wait for job to complete
-                max_time=self.provider_config.timeout_seconds,
-            )
+        async with self._http_session() as http:
+            try:
+                sid = await self._create_search_job(http, query, max_time=timeout)
+            except SplunkRequestError as e:
+                return ExecutionResult(success=False, error=f"Search execution failed: {e}")
 
-            # Wait for job to complete and poll status
-            search_job_info = self._poll_search_job(job)
+            record_search_job(sid)
+            with self._active_jobs_lock:
+                self._active_jobs[sid] = SplunkSearchJob(sid=sid, status=SearchJobStatus.QUEUED)
 
-            if search_job_info.status == SearchJobStatus.FAILED:
-                return ExecutionResult(
-                    success=False,
-                    error=search_job_info.error or "Search job failed",
+            try:
+                job = await self._wait_for_job(
+                    http, sid, timeout + JOB_FINALIZE_GRACE, self._execution_budget()
                 )
 
-            # Get results
-            result_rows = []
-            columns = set()
+                if job.status != SearchJobStatus.DONE:
+                    return ExecutionResult(
+                        success=False,
+                        error=job.error or "Search job failed",
+                    )
+
+                # Stop paging as soon as the sample buffer is full
+                sample_rows: List[Dict[str, Any]] = []
+                columns = set()
+                async for fields, rows in self._iter_result_pages(
+                    http, sid, page_size=SAMPLE_ROW_COUNT, max_rows=SAMPLE_ROW_COUNT
+                ):
+                    columns.update(fields)
+                    for row in rows:
+                        columns.update(row.keys())
+                    sample_rows.extend(rows)
 
-            for result in JSONResultsReader(job.results(output_mode='json')):
-                if isinstance(result, dict):
-                    # Track all columns
-                    columns.update(result.keys())
-                    result_rows.append(result)
+                return ExecutionResult(
+                    success=True,
+                    row_count=job.result_count,
+                    columns=sorted(list(columns)),
+                    sample_rows=sample_rows,
+                )
+            finally:
+                # Clean up, also when the caller is cancelled mid-search
+                with self._active_jobs_lock:
+                    self._active_jobs.pop(sid, None)
+                await self._cancel_job(http, sid)
+
+    def _execution_budget(self) -> Optional["CostBudget"]:
+        """Cost budget enforced on executing jobs, or None if it is disabled"""
+        from text2x.services.cost_guard import CostBudget
+
+        budget = self.cost_budget or CostBudget.from_settings()
+        return budget if budget.enabled else None
+
+    def _check_budget(self, budget: "CostBudget", estimate: PlanEstimate) -> Optional[str]:
+        """Compare a running job's estimate with the budget; the error if it is over"""
+        from text2x.services.cost_guard import ALLOWED, REJECTED
+
+        violations = budget.violations(estimate)
+        record_cost_guard_decision(self.get_query_language(), REJECTED if violations else ALLOWED)
+        if not violations:
+            return None
+        return f"Query exceeds the cost budget: {'; '.join(violations)}"
+
+    @asynccontextmanager
+    async def _http_session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Async HTTP client for the REST API using the shared Splunk session"""
+        service = await asyncio.to_thread(self._get_service)
+        async with httpx.AsyncClient(
+            base_url=f"{self.config.scheme}://{self.config.host}:{self.config.port}",
+            headers=dict(service._auth_headers),
+            verify=self.config.verify,
+            timeout=self.provider_config.timeout_seconds,
+        ) as http:
+            yield http
+
+    def _jobs_path(self, sid: Optional[str] = None, *segments: str) -> str:
+        """REST path of the search jobs collection, a job, or a job sub-resource"""
+        path = f"/servicesNS/{self.config.owner}/{self.config.app}/search/jobs"
+        if sid is not None:
+            path = "/".join([path, sid, *segments])
+        return path
+
+    async def _request(
+        self, http: httpx.AsyncClient, method: str, path: str, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a REST request, logging in again once if the session expired"""
+        response = await http.request(method, path, **kwargs)
+        if response.status_code == 401 and self.config.autologin:
+            service = await asyncio.to_thread(self._get_service)
+            await asyncio.to_thread(service.login)
+            http.headers.update(dict(service._auth_headers))
+            response = await http.request(method, path, **kwargs)
+        return response
+
+    async def _create_search_job(self, http: httpx.AsyncClient, query: str, **params: Any) -> str:
+        """Submit a search job in normal mode and return its sid"""
+        response = await self._request(
+            http,
+            "POST",
+            self._jobs_path(),
+            data={"search": query, "exec_mode": "normal", "output_mode": "json", **params},
+        )
+        if response.status_code >= 400:
+            raise SplunkRequestError(_response_error(response))
+        return response.json()["sid"]
+
+    async def _fetch_job_status(self, http: httpx.AsyncClient, sid: str) -> Optional[SplunkSearchJob]:
+        """Get the current status of a job, or None if it no longer exists"""
+        response = await self._request(
+            http, "GET", self._jobs_path(sid), params={"output_mode": "json"}
+        )
+        if response.status_code == 404:
+            return None
+        if response.status_code >= 400:
+            raise SplunkRequestError(_response_error(response))
 
-            # Clean up
-            job.cancel()
+        content = response.json()["entry"][0]["content"]
+        try:
+            status = SearchJobStatus(content.get('dispatchState', 'RUNNING'))
+        except ValueError:
+            status = SearchJobStatus.RUNNING
+
+        job = SplunkSearchJob(
+            sid=sid,
+            status=status,
+            progress=float(content.get('doneProgress', 0.0)) * 100,
+            event_count=int(content.get('eventCount', 0)),
+            result_count=int(content.get('resultCount', 0)),
+            scan_count=int(content.get('scanCount', 0)),
+            run_duration=float(content.get('runDuration', 0.0)),
+        )
 
-            # Prepare sample rows (first 10)
-            sample_rows = result_rows[:10]
+        # Check for errors
+        if content.get('isFailed') in (True, '1', 1):
+            job.status = SearchJobStatus.FAILED
+            messages = content.get('messages') or []
+            job.error = "; ".join(
+                message.get('text', '') for message in messages if isinstance(message, dict)
+            ) or "Unknown error"
+
+        return job
+
+    async def _wait_for_job(
+        self,
+        http: httpx.AsyncClient,
+        sid: str,
+        timeout: float,
+        budget: Optional["CostBudget"] = None,
+    ) -> SplunkSearchJob:
+        """
+        Poll a search job until it finishes, with adaptive backoff
 
-            return ExecutionResult(
-                success=True,
-                row_count=len(result_rows),
-                columns=sorted(list(columns)),
-                sample_rows=sample_rows,
-            )
+        The polling interval starts small so short searches return quickly,
+        and grows while the job's progress does not change.
 
-        except Exception as e:
-            return ExecutionResult(
-                success=False,
-                error=f"Search execution failed: {str(e)}",
+        Args:
+            http: Async HTTP client
+            sid: Search job ID
+            timeout: Seconds to wait before giving up
+            budget: Cost budget checked once the job has run for
+                COST_ESTIMATE_SECONDS (optional)
+
+        Returns:
+            SplunkSearchJob with final status
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        interval = POLL_INITIAL_INTERVAL
+        last_progress = None
+
+        while True:
+            job = await self._fetch_job_status(http, sid)
+            if job is None:
+                return SplunkSearchJob(sid=sid, status=SearchJobStatus.FAILED, error="Search job was cancelled")
+
+            if job.status in (SearchJobStatus.DONE, SearchJobStatus.FAILED):
+                return job
+
+            with self._active_jobs_lock:
+                self._active_jobs[sid] = job
+
+            if budget is not None and time.monotonic() - start >= COST_ESTIMATE_SECONDS:
+                estimate = job.estimate()
+                if estimate is not None:
+                    error = self._check_budget(budget, estimate)
+                    if error:
+                        job.status = SearchJobStatus.FAILED
+                        job.error = error
+                        return job
+                    budget = None
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                job.status = SearchJobStatus.FAILED
+                job.error = f"Search job timed out after {timeout:.0f}s"
+                return job
+
+            if last_progress is not None and job.progress == last_progress:
+                interval = min(interval * POLL_BACKOFF_FACTOR, POLL_MAX_INTERVAL)
+            last_progress = job.progress
+            await asyncio.sleep(min(interval, remaining))
+
+    async def _iter_result_pages(
+        self,
+        http: httpx.AsyncClient,
+        sid: str,
+        page_size: int = RESULTS_PAGE_SIZE,
+        max_rows: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[List[str], List[Dict[str, Any]]]]:
+        """Yield (fields, rows) for each page of a finished job's results"""
+        offset = 0
+        while max_rows is None or offset < max_rows:
+            count = page_size if max_rows is None else min(page_size, max_rows - offset)
+            response = await self._request(
+                http,
+                "GET",
+                self._jobs_path(sid, "results"),
+                params={"output_mode": "json", "offset": offset, "count": count},
             )
+            if response.status_code >= 400:
+                raise SplunkRequestError(_response_error(response))
 
-    def _poll_search_job(self, job: client.Job, poll_interval: float = 0.5) -> SplunkSearchJob:
+            payload = response.json()
+            rows = [row for row in payload.get('results', []) if isinstance(row, dict)]
+            fields = [
+                f.get('name') if isinstance(f, dict) else f for f in payload.get('fields', [])
+            ]
+            if rows:
+                yield fields, rows
+            if len(rows) < count:
+                return
+            offset += len(rows)
+
+    async def stream_results(
+        self, sid: str, page_size: int = RESULTS_PAGE_SIZE, max_rows: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
         """
-        Poll search job until completion
+        Stream the results of a finished search job page by page
 
         Args:
-            job: Splunk search job
-            poll_interval: Polling interval in seconds
+            sid: Search job ID
+            page_size: Number of rows requested per page
+            max_rows: Stop after this many rows (optional)
 
-        Returns:
-            SplunkSearchJob with final status
+        Yields:
+            Lists of result rows
         """
-        while not job.is_done():
-            time.sleep(poll_interval)
-            job.refresh()
-
-        # Get final job status
-        job_info = SplunkSearchJob(
-            sid=job.sid,
-            status=SearchJobStatus.DONE if job.is_done() else SearchJobStatus.RUNNING,
-            progress=float(job.get('doneProgress', 0.0)) * 100,
-            event_count=int(job.get('eventCount', 0)),
-            result_count=int(job.get('resultCount', 0)),
-            scan_count=int(job.get('scanCount', 0)),
-            run_duration=float(job.get('runDuration', 0.0)),
-        )
+        async with self._http_session() as http:
+            async for _, rows in self._iter_result_pages(http, sid, page_size, max_rows):
+                yield rows
 
-        # Check for errors
-        if job.get('isFailed') == '1':
-            job_info.status = SearchJobStatus.FAILED
-            job_info.error = job.get('messages', 'Unknown error')
+    def get_active_search_jobs(self) -> List[SplunkSearchJob]:
+        """
+        Get the last polled status of jobs started by execute_query
+
+        Returns:
+            SplunkSearchJob for each job still running
+        """
+        with self._active_jobs_lock:
+            return list(self._active_jobs.values())
 
-        return job_info
+    def limit_query(self, query: str, limit: int) -> str:
+        """Rewrite a search with the head command ``execute_query`` applies"""
+        return self._ensure_limit(query, limit)
 
     def _ensure_limit(self, query: str, limit: int) -> str:
         """
@@ -521,25 +924,11 @@ class SplunkProvider(QueryProvider):
             SplunkSearchJob with current status or None if not found
         """
         try:
-            return await asyncio.to_thread(self._get_search_job_status_sync, sid)
+            async with self._http_session() as http:
+                return await self._fetch_job_status(http, sid)
         except Exception:
             return None
 
-    def _get_search_job_status_sync(self, sid: str) -> SplunkSearchJob:
-        """Get search job status synchronously"""
-        service = self._get_service()
-        job = service.job(sid)
-
-        return SplunkSearchJob(
-            sid=job.sid,
-            status=SearchJobStatus(job.get('dispatchState', 'RUNNING')),
-            progress=float(job.get('doneProgress', 0.0)) * 100,
-            event_count=int(job.get('eventCount', 0)),
-            result_count=int(job.get('resultCount', 0)),
-            scan_count=int(job.get('scanCount', 0)),
-            run_duration=float(job.get('runDuration', 0.0)),
-        )
-
     async def cancel_search_job(self, sid: str) -> bool:
         """
         Cancel a running search job
@@ -551,22 +940,27 @@ class SplunkProvider(QueryProvider):
             True if cancelled successfully
         """
         try:
-            await asyncio.to_thread(self._cancel_search_job_sync, sid)
-            return True
+            async with self._http_session() as http:
+                return await self._cancel_job(http, sid)
         except Exception:
             return False
 
-    def _cancel_search_job_sync(self, sid: str) -> None:
-        """Cancel search job synchronously"""
-        service = self._get_service()
-        job = service.job(sid)
-        job.cancel()
+    async def _cancel_job(self, http: httpx.AsyncClient, sid: str) -> bool:
+        """Cancel a job and delete its results; a job that no longer exists counts as cancelled"""
+        try:
+            response = await self._request(
+                http, "POST", self._jobs_path(sid, "control"), data={"action": "cancel"}
+            )
+        except Exception:
+            return False
+        return response.status_code < 400 or response.status_code == 404
 
     async def close(self) -> None:
         """Close Splunk connection"""
-        if self._service:
-            # Splunk SDK doesn't have explicit close, connections are managed automatically
-            self._service = None
+        with self._service_lock:
+            if self._service:
+                # Splunk SDK doesn't have explicit close, connections are managed automatically
+                self._service = None
 
 
 # Factory function for easy provider creation
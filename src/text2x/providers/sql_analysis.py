@@ -0,0 +1,391 @@
+"""Local static analysis of SQL queries before they reach the database.
+
+``SQLStaticAnalyzer`` parses a query into a sqlglot AST and rejects what can
+be decided without a database round trip:
+
+- syntax errors, multiple statements and anything other than a read-only
+  query (DML, DDL, ``SELECT ... INTO``)
+- columns that no table in scope provides
+- comparisons of numeric columns with non-numeric string literals
+
+Checks that need the schema are skipped until one is set; anything the
+analyzer cannot resolve is left to the database. That includes tables that
+are not in the cached ``SchemaDefinition``, since it only lists the default
+schema's tables (not views, other schemas or tables created since), table
+functions, and ``SELECT *`` in a derived table.
+"""
+
+import difflib
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import ParseError
+from sqlglot.optimizer.scope import Scope, traverse_scope
+
+from .base import ColumnInfo, SchemaDefinition, ValidationResult
+
+# SQLConnectionConfig.dialect -> sqlglot dialect
+SQLGLOT_DIALECTS = {
+    "postgresql": "postgres",
+    "postgres": "postgres",
+    "redshift": "redshift",
+    "mysql": "mysql",
+    "mariadb": "mysql",
+    "sqlite": "sqlite",
+    "mssql": "tsql",
+    "oracle": "oracle",
+    "snowflake": "snowflake",
+    "bigquery": "bigquery",
+}
+
+# Statements that modify data or schema
+_WRITE_EXPRESSIONS = (
+    exp.Insert,
+    exp.Update,
+    exp.Delete,
+    exp.Merge,
+    exp.Drop,
+    exp.Create,
+    exp.Alter,
+    exp.TruncateTable,
+    exp.Command,
+)
+
+# sqlglot dialects with ``TABLESAMPLE SYSTEM``; MySQL, SQLite and Redshift have none
+_TABLESAMPLE_DIALECTS = ("postgres",)
+
+_COMPARISONS = (exp.EQ, exp.NEQ, exp.GT, exp.GTE, exp.LT, exp.LTE)
+
+_NUMERIC_TYPES = (
+    "INT", "SERIAL", "NUMERIC", "DECIMAL", "REAL", "FLOAT", "DOUBLE", "NUMBER", "MONEY",
+)
+
+
+def _is_numeric_type(type_name: str) -> bool:
+    type_upper = type_name.upper()
+    return any(t in type_upper for t in _NUMERIC_TYPES) and "INTERVAL" not in type_upper
+
+
+def _is_numeric_literal(value: str) -> bool:
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _closest(name: str, candidates: Iterable[str]) -> str:
+    """' (did you mean ...?)' hint for a misspelled name, or ''"""
+    matches = difflib.get_close_matches(name, list(candidates), n=1)
+    return f" (did you mean '{matches[0]}'?)" if matches else ""
+
+
+class _Unresolvable(Exception):
+    """A reference the analyzer cannot check; left to the database."""
+
+
+class SQLStaticAnalyzer:
+    """Validates SQL queries locally against a cached schema."""
+
+    def __init__(self, dialect: str = "postgresql", schema: Optional[SchemaDefinition] = None):
+        """
+        Initialize analyzer
+
+        Args:
+            dialect: SQL dialect (SQLConnectionConfig.dialect naming)
+            schema: Cached schema to resolve tables and columns against (optional)
+        """
+        self.dialect = SQLGLOT_DIALECTS.get(dialect.lower())
+        self._tables: Optional[Dict[str, Dict[str, ColumnInfo]]] = None
+        self.set_schema(schema)
+
+    def set_schema(self, schema: Optional[SchemaDefinition]) -> None:
+        """Set the schema used for table and column resolution"""
+        if schema is None:
+            self._tables = None
+            return
+        self._tables = {
+            table.name.lower(): {col.name.lower(): col for col in table.columns}
+            for table in schema.tables
+        }
+
+    @property
+    def has_schema(self) -> bool:
+        return self._tables is not None
+
+    def analyze(self, query: str) -> ValidationResult:
+        """
+        Validate a query without touching the database
+
+        Args:
+            query: SQL query to validate
+
+        Returns:
+            ValidationResult; when valid, parsed_query holds the sqlglot AST
+        """
+        start_time = time.perf_counter()
+
+        def result(error: Optional[str] = None, **kwargs) -> ValidationResult:
+            return ValidationResult(
+                valid=error is None,
+                error=error,
+                validation_time_ms=(time.perf_counter() - start_time) * 1000,
+                **kwargs,
+            )
+
+        try:
+            statements = [s for s in sqlglot.parse(query, read=self.dialect) if s is not None]
+        except ParseError as e:
+            detail = e.errors[0] if e.errors else {}
+            location = f" at line {detail['line']}, column {detail['col']}" if "line" in detail else ""
+            return result(f"Syntax error{location}: {detail.get('description', str(e))}")
+
+        if not statements:
+            return result("Empty or invalid query")
+        if len(statements) > 1:
+            return result("Multiple statements not allowed")
+
+        root = statements[0]
+        write = root if isinstance(root, _WRITE_EXPRESSIONS) else root.find(*_WRITE_EXPRESSIONS)
+        if write is not None:
+            warnings = []
+            if isinstance(write, (exp.Update, exp.Delete)) and not write.args.get("where"):
+                warnings.append("Potentially dangerous operation without WHERE clause")
+            return result(
+                f"Only read-only queries are allowed ({write.key.upper()} found)",
+                warnings=warnings,
+            )
+        if not isinstance(root, (exp.Query, exp.Subquery)):
+            return result(f"Only SELECT queries are allowed ({root.key.upper()} found)")
+        if any(select.args.get("into") for select in root.find_all(exp.Select)):
+            return result("SELECT ... INTO is not allowed")
+
+        if self._tables is not None:
+            error = self._check_references(root)
+            if error:
+                return result(error)
+
+        return result(parsed_query=root)
+
+    def canonicalize(self, query: str) -> str:
+        """
+        Regenerate a query from its AST in canonical formatting
+
+        Raises:
+            ParseError: If the query cannot be parsed
+        """
+        statements = sqlglot.parse(query, read=self.dialect)
+        return ";\n".join(s.sql(dialect=self.dialect) for s in statements if s is not None)
+
+    def limit(self, query: str, max_rows: int) -> Optional[str]:
+        """
+        Bound the rows a query returns by rewriting its outermost query
+
+        The limit is generated in the dialect's syntax (``LIMIT``, ``TOP``,
+        ``FETCH FIRST``). An existing literal limit is kept when it is already
+        within ``max_rows`` and lowered otherwise; limits that are not plain
+        row counts (parameters, ``PERCENT``, ``WITH TIES``) are kept and the
+        query is wrapped in a limited subquery.
+
+        Args:
+            query: SQL query
+            max_rows: Maximum number of rows
+
+        Returns:
+            The bounded query, or None if it is not a single read-only query
+            that can be parsed
+        """
+        try:
+            statements = [s for s in sqlglot.parse(query, read=self.dialect) if s is not None]
+        except ParseError:
+            return None
+        if len(statements) != 1 or not isinstance(statements[0], exp.Query):
+            return None
+        root = statements[0]
+
+        existing = root.args.get("limit")
+        if existing is None:
+            return root.limit(max_rows).sql(dialect=self.dialect)
+
+        count = existing.args.get("count") if isinstance(existing, exp.Fetch) else existing.expression
+        options = existing.args.get("limit_options")
+        plain = options is None or not (options.args.get("percent") or options.args.get("with_ties"))
+        if plain and isinstance(count, exp.Literal) and count.is_int:
+            if int(count.this) <= max_rows:
+                return query.strip().rstrip(";")
+            return root.limit(max_rows).sql(dialect=self.dialect)
+
+        return (
+            exp.select("*")
+            .from_(root.subquery("_limited"))
+            .limit(max_rows)
+            .sql(dialect=self.dialect)
+        )
+
+    def sample(self, query: str, percent: float, tables: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        Rewrite a query to read a block sample of its tables (``TABLESAMPLE SYSTEM``)
+
+        Args:
+            query: SQL query
+            percent: Share of each table's blocks to read (0-100)
+            tables: Tables to sample (default: every base table; CTE references
+                are never sampled themselves)
+
+        Returns:
+            The rewritten query, or None if the dialect has no TABLESAMPLE or
+            the query cannot be rewritten
+        """
+        if self.dialect not in _TABLESAMPLE_DIALECTS:
+            return None
+        try:
+            root = sqlglot.parse_one(query, read=self.dialect)
+            scopes = traverse_scope(root)
+        except Exception:
+            return None
+
+        wanted = {t.lower() for t in tables} if tables else None
+        sampled = False
+        for scope in scopes:
+            for source in scope.sources.values():
+                if not isinstance(source, exp.Table) or source.args.get("sample"):
+                    continue
+                if wanted is not None and source.name.lower() not in wanted:
+                    continue
+                source.set(
+                    "sample",
+                    exp.TableSample(method=exp.var("SYSTEM"), percent=exp.Literal.number(percent)),
+                )
+                sampled = True
+        return root.sql(dialect=self.dialect) if sampled else None
+
+    def _check_references(self, root: exp.Expression) -> Optional[str]:
+        """
+        Resolve columns in every scope; return the first error
+
+        Tables outside the cached schema (views, other schemas, tables
+        created since it was introspected) are not errors: their columns
+        are left to the database, like other unresolvable references.
+        """
+        try:
+            scopes = traverse_scope(root)
+        except Exception:
+            return None  # Constructs sqlglot cannot scope are left to the database
+
+        for scope in scopes:
+            for column in scope.columns:
+                if isinstance(column.this, exp.Star):
+                    continue
+                try:
+                    info = self._resolve_column(scope, column)
+                except _Unresolvable:
+                    continue
+                except LookupError as e:
+                    return str(e.args[0])
+
+                if info is not None and isinstance(column.parent, (*_COMPARISONS, exp.In)):
+                    error = self._check_types(column, info)
+                    if error:
+                        return error
+
+        return None
+
+    def _find_source(self, scope: Scope, qualifier: str) -> Union[exp.Table, Scope, None]:
+        """Find a table alias in this scope or an enclosing one (correlated subqueries)"""
+        while scope is not None:
+            if qualifier in scope.sources:
+                return scope.sources[qualifier]
+            scope = scope.parent
+        return None
+
+    def _schema_table(self, source: exp.Table) -> Optional[Dict[str, ColumnInfo]]:
+        """Columns of a table in the cached schema, or None if it is not known"""
+        if source.args.get("db") or source.args.get("catalog"):
+            return None  # The cached schema only covers the default schema
+        return self._tables.get(source.name.lower())
+
+    def _source_columns(self, source) -> Optional[List[str]]:
+        """Lowercase column names a source provides, or None if unknown"""
+        if isinstance(source, exp.Table):
+            columns = self._schema_table(source)
+            return list(columns) if columns else None
+        if isinstance(source, Scope) and isinstance(source.expression, exp.Query):
+            if any(isinstance(s, exp.Star) or s.find(exp.Star) for s in source.expression.selects):
+                return None
+            return [name.lower() for name in source.expression.named_selects]
+        return None
+
+    def _resolve_column(self, scope: Scope, column: exp.Column) -> Optional[ColumnInfo]:
+        """
+        Resolve a column reference
+
+        Returns:
+            The schema ColumnInfo if the column belongs to a schema table, else None
+
+        Raises:
+            LookupError: If the column or its qualifier does not exist
+            _Unresolvable: If the reference cannot be checked locally
+        """
+        name = column.name.lower()
+        qualifier = column.table
+
+        if qualifier:
+            source = self._find_source(scope, qualifier)
+            if source is None:
+                raise LookupError(f"Unknown table or alias '{qualifier}' for column '{column.name}'")
+            columns = self._source_columns(source)
+            if columns is None:
+                raise _Unresolvable()
+            if name not in columns:
+                raise LookupError(
+                    f"Column '{column.name}' does not exist in '{qualifier}'{_closest(name, columns)}"
+                )
+            if isinstance(source, exp.Table):
+                return self._schema_table(source)[name]
+            return None
+
+        candidates: List[str] = []
+        current = scope
+        while current is not None:
+            for source in current.sources.values():
+                columns = self._source_columns(source)
+                if columns is None:
+                    raise _Unresolvable()
+                if name in columns:
+                    if isinstance(source, exp.Table):
+                        return self._schema_table(source)[name]
+                    return None
+                candidates.extend(columns)
+            current = current.parent
+
+        # ORDER BY / GROUP BY may refer to output aliases
+        if isinstance(scope.expression, exp.Query):
+            aliases = (s.alias.lower() for s in scope.expression.selects if isinstance(s, exp.Alias))
+            if name in aliases:
+                return None
+        if not scope.sources:
+            raise _Unresolvable()
+        raise LookupError(f"Column '{column.name}' does not exist{_closest(name, candidates)}")
+
+    def _check_types(self, column: exp.Column, info: ColumnInfo) -> Optional[str]:
+        """Report a numeric column compared with a non-numeric string literal"""
+        if not _is_numeric_type(info.type):
+            return None
+
+        comparison = column.parent
+        if isinstance(comparison, exp.In):
+            if comparison.this is not column:
+                return None
+            literals = comparison.expressions
+        else:
+            literals = [comparison.expression if comparison.this is column else comparison.this]
+
+        for literal in literals:
+            if isinstance(literal, exp.Literal) and literal.is_string and not _is_numeric_literal(literal.this):
+                return (
+                    f"Type mismatch: column '{column.sql()}' is {info.type} "
+                    f"but is compared with '{literal.this}'"
+                )
+        return None
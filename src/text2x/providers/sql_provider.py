@@ -1,12 +1,11 @@
 """SQL Provider Implementation for Text2X"""
 import asyncio
+import logging
 import time
-import re
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from contextlib import asynccontextmanager
 
-import sqlparse
 from sqlalchemy import create_engine, inspect, text, pool, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError, TimeoutError as SQLTimeoutError
@@ -23,7 +22,25 @@ from .base import (
     ForeignKeyInfo,
     Relationship,
     ProviderConfig,
+    PlanEstimate,
 )
+from .sql_analysis import SQLStaticAnalyzer
+from .sql_plans import EXPLAIN_STATEMENTS, parse_plan
+from text2x.utils.observability import record_validation_round_trip_avoided
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_ROW_COUNT = 10  # Rows returned in ExecutionResult.sample_rows
+
+
+def _row_size(row) -> int:
+    """Approximate size of a fetched row in bytes"""
+    size = 0
+    for value in row:
+        if value is None:
+            continue
+        size += len(value) if isinstance(value, (str, bytes, bytearray)) else len(str(value))
+    return size
 
 
 @dataclass
@@ -93,6 +110,9 @@ class SQLProvider(QueryProvider):
                 cursor.close()
         
         self._inspector = None
+        
+        # Local validation against the most recently introspected schema
+        self.analyzer = SQLStaticAnalyzer(config.dialect)
     
     def get_provider_id(self) -> str:
         """Unique identifier for this provider"""
@@ -104,12 +124,15 @@ class SQLProvider(QueryProvider):
     
     def get_capabilities(self) -> List[ProviderCapability]:
         """List of capabilities this provider supports"""
-        return [
+        capabilities = [
             ProviderCapability.SCHEMA_INTROSPECTION,
             ProviderCapability.QUERY_VALIDATION,
             ProviderCapability.QUERY_EXECUTION,
             ProviderCapability.QUERY_EXPLANATION,
         ]
+        if self.config.dialect in EXPLAIN_STATEMENTS:
+            capabilities.append(ProviderCapability.COST_ESTIMATION)
+        return capabilities
     
     async def get_schema(self) -> SchemaDefinition:
         """
@@ -119,7 +142,27 @@ class SQLProvider(QueryProvider):
             SchemaDefinition with tables, columns, indexes, and relationships
         """
         # Use asyncio.to_thread to run blocking SQLAlchemy code in thread pool
-        return await asyncio.to_thread(self._get_schema_sync)
+        schema = await asyncio.to_thread(self._get_schema_sync)
+        self.set_schema(schema)
+        return schema
+    
+    def set_schema(self, schema: Optional[SchemaDefinition]) -> None:
+        """
+        Set the schema that queries are validated against locally
+        
+        Args:
+            schema: Cached schema (e.g. from SchemaService), or None to
+                validate only syntax and statement type locally
+        """
+        super().set_schema(schema)
+        self.analyzer.set_schema(schema)
+    
+    def canonicalize_query(self, query: str) -> str:
+        """Canonical SQL text (sqlglot-formatted, so keyword case and spacing don't matter)"""
+        try:
+            return self.analyzer.canonicalize(query)
+        except Exception:
+            return super().canonicalize_query(query)
     
     def _get_schema_sync(self) -> SchemaDefinition:
         """Synchronous schema introspection"""
@@ -232,6 +275,12 @@ class SQLProvider(QueryProvider):
         """
         Validate SQL query syntax
         
+        The query is first analyzed locally (parse, statement type, and column
+        and type resolution against the cached schema). Only queries
+        that pass are planned by the database (``EXPLAIN`` without executing,
+        see ``sql_plans.EXPLAIN_STATEMENTS``), whose estimates are returned in
+        ``plan_estimate``.
+        
         Args:
             query: SQL query to validate
             
@@ -241,36 +290,27 @@ class SQLProvider(QueryProvider):
         start_time = time.time()
         
         try:
-            # Parse the query using sqlparse
-            parsed = sqlparse.parse(query)
+            local_result = self.analyzer.analyze(query)
+            if not local_result.valid:
+                record_validation_round_trip_avoided(self.config.dialect)
+                local_result.validation_time_ms = (time.time() - start_time) * 1000
+                return local_result
             
-            if not parsed:
-                return ValidationResult(
-                    valid=False,
-                    error="Empty or invalid query",
-                    validation_time_ms=(time.time() - start_time) * 1000,
+            warnings = list(local_result.warnings)
+            if self.config.dialect not in EXPLAIN_STATEMENTS:
+                warnings.append(
+                    f"Database validation skipped: no plan-only EXPLAIN for {self.config.dialect}"
                 )
-            
-            # Check for multiple statements
-            if len(parsed) > 1:
                 return ValidationResult(
-                    valid=False,
-                    error="Multiple statements not allowed",
+                    valid=True,
+                    warnings=warnings,
+                    parsed_query=local_result.parsed_query,
                     validation_time_ms=(time.time() - start_time) * 1000,
                 )
             
-            statement = parsed[0]
-            warnings = []
-            
-            # Check for dangerous operations
-            query_upper = query.upper()
-            if any(kw in query_upper for kw in ["DROP", "TRUNCATE", "DELETE FROM", "UPDATE"]):
-                if "WHERE" not in query_upper and "DROP" not in query_upper:
-                    warnings.append("Potentially dangerous operation without WHERE clause")
-            
-            # Try to prepare the statement (syntax check without execution)
+            # Plan the statement (checks it against the database without executing)
             try:
-                await asyncio.to_thread(self._validate_with_database, query)
+                plan_estimate = await asyncio.to_thread(self._validate_with_database, query)
             except Exception as e:
                 return ValidationResult(
                     valid=False,
@@ -278,11 +318,15 @@ class SQLProvider(QueryProvider):
                     validation_time_ms=(time.time() - start_time) * 1000,
                 )
             
+            if plan_estimate is not None and plan_estimate.full_scans:
+                warnings.append(f"Full table scan on: {', '.join(plan_estimate.full_scans)}")
+            
             return ValidationResult(
                 valid=True,
                 warnings=warnings,
-                parsed_query=statement,
+                parsed_query=local_result.parsed_query,
                 validation_time_ms=(time.time() - start_time) * 1000,
+                plan_estimate=plan_estimate,
             )
             
         except Exception as e:
@@ -292,38 +336,95 @@ class SQLProvider(QueryProvider):
                 validation_time_ms=(time.time() - start_time) * 1000,
             )
     
-    def _validate_with_database(self, query: str) -> None:
-        """Validate query syntax with database (synchronous)"""
+    def _validate_with_database(self, query: str) -> Optional[PlanEstimate]:
+        """
+        Validate query with the database planner (synchronous)
+        
+        The query is planned, never executed. Planner errors (unknown
+        objects, permissions, syntax) propagate to the caller.
+        
+        Returns:
+            Planner estimates, or None if the plan output cannot be parsed
+        """
+        explain = EXPLAIN_STATEMENTS[self.config.dialect]
         with self.engine.connect() as conn:
-            # Use EXPLAIN to validate without executing
-            if self.config.dialect == "postgresql":
-                conn.execute(text(f"EXPLAIN {query}"))
-            else:
-                # For other dialects, just prepare the statement
-                conn.execute(text(query).execution_options(compiled_cache=None))
+            rows = conn.execute(text(f"{explain} {query}")).fetchall()
+        
+        try:
+            return parse_plan(self.config.dialect, rows)
+        except Exception as e:
+            logger.warning(f"Could not parse {self.config.dialect} plan: {e}")
+            return None
+    
+    async def estimate_cost(self, query: str) -> Optional[PlanEstimate]:
+        """
+        Get planner estimates for a query without executing it
+        
+        Args:
+            query: SQL query to plan
+            
+        Returns:
+            PlanEstimate, or None if the dialect or plan output is unsupported
+        """
+        if ProviderCapability.COST_ESTIMATION not in self.get_capabilities():
+            return None
+        return await asyncio.to_thread(self._validate_with_database, query)
     
-    async def execute_query(self, query: str, limit: Optional[int] = None) -> ExecutionResult:
+    def limit_query(self, query: str, limit: int) -> str:
+        """
+        Rewrite a query with the row limit ``execute_query`` applies
+        
+        One row more than ``limit`` is requested, so that a result cut off
+        at the limit can be told apart from one that ends there.
+        """
+        return self._ensure_limit(query, limit + 1)
+    
+    def sample_query(
+        self, query: str, percent: float, estimate: Optional[PlanEstimate] = None
+    ) -> Optional[str]:
+        """
+        Rewrite a query with TABLESAMPLE on the tables it scans in full
+        
+        Only dialects with TABLESAMPLE are supported; every base table is
+        sampled if the estimate names no full scans.
+        """
+        tables = estimate.full_scans if estimate is not None and estimate.full_scans else None
+        return self.analyzer.sample(query, percent, tables)
+    
+    async def execute_query(
+        self, query: str, limit: Optional[int] = None, timeout_seconds: Optional[int] = None
+    ) -> ExecutionResult:
         """
         Execute SQL query and return results
         
+        The outermost query is rewritten to return at most ``limit + 1`` rows
+        (in the dialect's LIMIT/TOP/FETCH FIRST syntax), the statement runs
+        under a server-side timeout, and fetching stops at the row and byte
+        caps. The result is marked truncated when the extra row arrives.
+        
         Args:
             query: SQL query to execute
             limit: Maximum number of rows to return
+            timeout_seconds: Server-side statement timeout (default: provider timeout)
             
         Returns:
             ExecutionResult with query results
         """
         if limit is None:
             limit = self.provider_config.max_rows
+        if timeout_seconds is None:
+            timeout_seconds = self.provider_config.timeout_seconds
         
         start_time = time.time()
         
         try:
-            # Add LIMIT clause if not present
-            safe_query = self._ensure_limit(query, limit)
+            # Bound the rows of the outermost query
+            safe_query = self.limit_query(query, limit)
             
             # Execute query in thread pool
-            result = await asyncio.to_thread(self._execute_query_sync, safe_query)
+            result = await asyncio.to_thread(
+                self._execute_query_sync, safe_query, limit, timeout_seconds
+            )
             
             execution_time_ms = (time.time() - start_time) * 1000
             result.execution_time_ms = execution_time_ms
@@ -333,7 +434,7 @@ class SQLProvider(QueryProvider):
         except SQLTimeoutError:
             return ExecutionResult(
                 success=False,
-                error=f"Query execution timeout after {self.provider_config.timeout_seconds}s",
+                error=f"Query execution timeout after {timeout_seconds}s",
                 execution_time_ms=(time.time() - start_time) * 1000,
             )
         except SQLAlchemyError as e:
@@ -349,24 +450,59 @@ class SQLProvider(QueryProvider):
                 execution_time_ms=(time.time() - start_time) * 1000,
             )
     
-    def _execute_query_sync(self, query: str) -> ExecutionResult:
-        """Execute query synchronously"""
+    def _set_statement_timeout(self, conn, timeout_seconds: int) -> None:
+        """Limit the server-side run time of the next statement on this connection"""
+        timeout_ms = int(timeout_seconds * 1000)
+        dialect = self.config.dialect
+        if dialect == "postgresql":
+            # Scoped to the transaction the statement runs in
+            conn.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+        elif dialect == "redshift":
+            conn.execute(text(f"SET statement_timeout TO {timeout_ms}"))
+        elif dialect == "mysql":
+            conn.execute(text(f"SET SESSION max_execution_time = {timeout_ms}"))
+        elif dialect == "mariadb":
+            conn.execute(text(f"SET SESSION max_statement_time = {timeout_seconds}"))
+    
+    def _execute_query_sync(
+        self, query: str, limit: Optional[int] = None, timeout_seconds: Optional[int] = None
+    ) -> ExecutionResult:
+        """Execute query synchronously, streaming rows up to the row and byte caps"""
+        max_bytes = self.provider_config.max_result_bytes
+        
         with self.engine.connect() as conn:
-            result = conn.execute(text(query))
+            if timeout_seconds:
+                self._set_statement_timeout(conn, timeout_seconds)
+            
+            # Server-side cursor where supported, so unread rows never reach the client
+            result = conn.execution_options(stream_results=True).execute(text(query))
             
             # Check if this is a SELECT query
             if result.returns_rows:
-                rows = result.fetchall()
                 columns = list(result.keys())
+                sample_rows = []
+                row_count = 0
+                fetched_bytes = 0
+                truncated = False
                 
-                # Convert rows to list of dicts for easier handling
-                sample_rows = [dict(zip(columns, row)) for row in rows[:10]]
+                for row in result:
+                    if (limit is not None and row_count >= limit) or (
+                        max_bytes and fetched_bytes >= max_bytes
+                    ):
+                        truncated = True
+                        break
+                    row_count += 1
+                    fetched_bytes += _row_size(row)
+                    if len(sample_rows) < SAMPLE_ROW_COUNT:
+                        sample_rows.append(dict(zip(columns, row)))
+                result.close()
                 
                 return ExecutionResult(
                     success=True,
-                    row_count=len(rows),
+                    row_count=row_count,
                     columns=columns,
                     sample_rows=sample_rows,
+                    truncated=truncated,
                 )
             else:
                 # For INSERT/UPDATE/DELETE
@@ -391,42 +527,36 @@ class SQLProvider(QueryProvider):
             return f"Error getting query plan: {str(e)}"
     
     def _explain_query_sync(self, query: str) -> str:
-        """Get query execution plan synchronously"""
+        """Get query execution plan synchronously (planned only, never executed)"""
         with self.engine.connect() as conn:
-            if self.config.dialect == "postgresql":
-                result = conn.execute(text(f"EXPLAIN ANALYZE {query}"))
+            if self.config.dialect in ("postgresql", "redshift"):
+                result = conn.execute(text(f"EXPLAIN {query}"))
                 return "\n".join(row[0] for row in result.fetchall())
-            elif self.config.dialect == "mysql":
+            elif self.config.dialect in ("mysql", "mariadb"):
                 result = conn.execute(text(f"EXPLAIN {query}"))
                 rows = result.fetchall()
                 columns = result.keys()
                 return "\n".join(str(dict(zip(columns, row))) for row in rows)
+            elif self.config.dialect == "sqlite":
+                result = conn.execute(text(f"EXPLAIN QUERY PLAN {query}"))
+                return "\n".join(str(row[-1]) for row in result.fetchall())
             else:
                 return f"EXPLAIN not supported for {self.config.dialect}"
     
     def _ensure_limit(self, query: str, limit: int) -> str:
         """
-        Ensure query has a LIMIT clause
+        Ensure the outermost query returns at most ``limit`` rows
         
         Args:
             query: Original SQL query
             limit: Maximum number of rows
             
         Returns:
-            Query with LIMIT clause added if not present
+            Query rewritten with a row limit; queries that cannot be parsed
+            are returned unchanged and bounded only by the fetch caps
         """
-        query = query.strip().rstrip(";")
-        query_upper = query.upper()
-        
-        # Check if query already has a LIMIT
-        if re.search(r'\bLIMIT\s+\d+', query_upper):
-            return query
-        
-        # Add LIMIT for SELECT queries
-        if query_upper.startswith("SELECT"):
-            return f"{query} LIMIT {limit}"
-        
-        return query
+        limited = self.analyzer.limit(query, limit)
+        return limited if limited is not None else query.strip().rstrip(";")
     
     async def close(self) -> None:
         """Close database connections"""
@@ -8,6 +8,8 @@ from .conversation import ConversationRepository, ConversationTurnRepository
 from .feedback import FeedbackRepository
 from .provider import ProviderRepository
 from .rag import RAGExampleRepository
+from .stats import StatsRepository
+from .trace import TraceRepository
 from .user import UserRepository
 from .workspace import WorkspaceRepository
 
@@ -23,4 +25,6 @@ __all__ = [
     "RAGExampleRepository",
     "AuditLogRepository",
     "FeedbackRepository",
+    "TraceRepository",
+    "StatsRepository",
 ]
@@ -2,16 +2,30 @@
 Repository for SchemaAnnotation CRUD operations.
 """
 
-from typing import List, Optional
-from uuid import UUID
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from text2x.models.base import get_db
 from text2x.models.annotation import SchemaAnnotation
 
 
+# Annotation content fields accepted by upsert_many
+UPSERT_FIELDS = (
+    "description",
+    "business_terms",
+    "examples",
+    "relationships",
+    "date_format",
+    "enum_values",
+    "sensitive",
+)
+
+
 class SchemaAnnotationRepository:
     """Repository for managing SchemaAnnotation entities."""
 
@@ -65,8 +79,6 @@ class SchemaAnnotationRepository:
             )
             session.add(annotation)
             await session.flush()
-            await session.commit()
-            await session.refresh(annotation)
             return annotation
 
     async def get_by_id(self, annotation_id: UUID) -> Optional[SchemaAnnotation]:
@@ -157,6 +169,119 @@ class SchemaAnnotationRepository:
             result = await session.execute(stmt)
             return list(result.scalars().all())
 
+    async def list_by_columns(
+        self, provider_id: str, table_name: str, column_names: Iterable[str]
+    ) -> List[SchemaAnnotation]:
+        """
+        List annotations for several columns of a table in one query.
+
+        Matches both storage formats for column annotations: ``column_name``
+        with ``table_name`` set, and ``column_name`` as "table.column".
+
+        Args:
+            provider_id: The provider ID
+            table_name: The table name
+            column_names: Column names (without the table prefix)
+
+        Returns:
+            List of matching column annotations
+        """
+        column_names = list(column_names)
+        if not column_names:
+            return []
+
+        qualified = [f"{table_name}.{name}" for name in column_names]
+        db = get_db()
+        async with db.session() as session:
+            stmt = select(SchemaAnnotation).where(
+                SchemaAnnotation.provider_id == provider_id,
+                (
+                    (SchemaAnnotation.table_name == table_name)
+                    & SchemaAnnotation.column_name.in_(column_names)
+                )
+                | SchemaAnnotation.column_name.in_(qualified),
+            )
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+
+    async def upsert_many(
+        self,
+        provider_id: str,
+        annotations: List[Dict[str, Any]],
+        created_by: str,
+    ) -> List[SchemaAnnotation]:
+        """
+        Create or update many annotations with one INSERT ... ON CONFLICT.
+
+        Rows are matched on (provider_id, table_name, column_name). Only the
+        fields present in at least one input dict are updated on conflict, and
+        a None value keeps the stored value.
+
+        Args:
+            provider_id: The provider ID the annotations belong to
+            annotations: Dicts with ``description`` plus any of ``table_name``,
+                ``column_name``, ``business_terms``, ``examples``,
+                ``relationships``, ``date_format``, ``enum_values``, ``sensitive``
+            created_by: User who created the annotations
+
+        Returns:
+            The inserted or updated annotations
+        """
+        if not annotations:
+            return []
+
+        # Postgres rejects an upsert that touches the same row twice; last one wins
+        deduped: Dict[tuple, Dict[str, Any]] = {}
+        for annotation in annotations:
+            target = (annotation.get("table_name") or "", annotation.get("column_name") or "")
+            deduped[target] = annotation
+
+        provided = set().union(*(a.keys() for a in deduped.values())) & set(UPSERT_FIELDS)
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": uuid4(),
+                "provider_id": provider_id,
+                "created_by": created_by,
+                "created_at": now,
+                "updated_at": now,
+                "table_name": annotation.get("table_name"),
+                "column_name": annotation.get("column_name"),
+                "description": annotation.get("description") or "",
+                "sensitive": bool(annotation.get("sensitive", False)),
+                **{field: annotation.get(field) for field in UPSERT_FIELDS if field not in (
+                    "description", "sensitive"
+                )},
+            }
+            for annotation in deduped.values()
+        ]
+
+        stmt = insert(SchemaAnnotation).values(rows)
+        table = SchemaAnnotation.__table__
+        update_set = {"updated_at": stmt.excluded.updated_at}
+        for field in provided:
+            if field in ("description", "sensitive"):
+                update_set[field] = stmt.excluded[field]
+            else:
+                update_set[field] = func.coalesce(stmt.excluded[field], table.c[field])
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                table.c.provider_id,
+                func.coalesce(table.c.table_name, ""),
+                func.coalesce(table.c.column_name, ""),
+            ],
+            set_=update_set,
+        ).returning(SchemaAnnotation)
+
+        db = get_db()
+        async with db.session() as session:
+            result = await session.execute(
+                stmt, execution_options={"populate_existing": True}
+            )
+            upserted = list(result.scalars().all())
+            return upserted
+
     async def update(
         self,
         annotation_id: UUID,
@@ -209,8 +334,6 @@ class SchemaAnnotationRepository:
                 annotation.sensitive = sensitive
 
             await session.flush()
-            await session.commit()
-            await session.refresh(annotation)
             return annotation
 
     async def delete(self, annotation_id: UUID) -> bool:
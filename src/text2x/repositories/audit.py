@@ -2,14 +2,52 @@
 Repository for AuditLog CRUD operations.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from text2x.models.base import get_db
 from text2x.models.audit import AuditLog
+from text2x.repositories.trace import store_schema_contexts
+
+# Agent name -> (trace attribute, latency attribute) on AuditLog
+AGENT_TRACE_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "schema": ("schema_agent_trace", "schema_agent_latency_ms"),
+    "query_builder": ("query_builder_trace", "query_builder_latency_ms"),
+    "validator": ("validator_trace", "validator_latency_ms"),
+}
+
+_audit_logs = AuditLog.__table__
+
+# Executemany statements for batched writes (bind names must not match column names)
+_COST_UPDATE = (
+    update(_audit_logs)
+    .where(_audit_logs.c.id == bindparam("audit_id"))
+    .values(
+        total_tokens_input=_audit_logs.c.total_tokens_input + bindparam("input_tokens"),
+        total_tokens_output=_audit_logs.c.total_tokens_output + bindparam("output_tokens"),
+        total_cost_usd=_audit_logs.c.total_cost_usd + bindparam("cost_usd"),
+    )
+)
+
+
+def _trace_update(agent_name: str):
+    """UPDATE setting one agent's trace, keeping the latency when none is given."""
+    trace_column, latency_column = AGENT_TRACE_COLUMNS[agent_name]
+    trace = _audit_logs.c[trace_column]
+    latency = _audit_logs.c[latency_column]
+    return (
+        update(_audit_logs)
+        .where(_audit_logs.c.id == bindparam("audit_id"))
+        .values(
+            {
+                trace: bindparam("trace_data", type_=trace.type),
+                latency: func.coalesce(bindparam("latency_ms", type_=latency.type), latency),
+            }
+        )
+    )
 
 
 class AuditLogRepository:
@@ -48,7 +86,8 @@ class AuditLogRepository:
             turn_id: The conversation turn UUID
             user_input: The user's natural language input
             provider_id: The provider ID
-            schema_context_used: Schema context JSON
+            schema_context_used: Schema context JSON, stored once per fingerprint
+                in schema_contexts and referenced by ``schema_context_hash``
             final_query: The final generated query
             confidence_score: Confidence score (0-1)
             validation_status: Validation status
@@ -72,12 +111,13 @@ class AuditLogRepository:
         """
         db = get_db()
         async with db.session() as session:
+            (schema_context_hash,) = await store_schema_contexts(session, [schema_context_used])
             audit_log = AuditLog(
                 conversation_id=conversation_id,
                 turn_id=turn_id,
                 user_input=user_input,
                 provider_id=provider_id,
-                schema_context_used=schema_context_used,
+                schema_context_hash=schema_context_hash,
                 final_query=final_query,
                 confidence_score=confidence_score,
                 validation_status=validation_status,
@@ -98,7 +138,6 @@ class AuditLogRepository:
             )
             session.add(audit_log)
             await session.flush()
-            await session.refresh(audit_log)
             return audit_log
 
     async def get_by_id(self, audit_id: UUID) -> Optional[AuditLog]:
@@ -223,31 +262,27 @@ class AuditLogRepository:
         Returns:
             The updated audit log if found, None otherwise
         """
-        db = get_db()
-        async with db.session() as session:
-            stmt = select(AuditLog).where(AuditLog.id == audit_id)
-            result = await session.execute(stmt)
-            audit_log = result.scalar_one_or_none()
+        columns = AGENT_TRACE_COLUMNS.get(agent_name)
+        if columns is None:
+            return await self.get_by_id(audit_id)
 
-            if audit_log is None:
-                return None
-
-            if agent_name == "schema":
-                audit_log.schema_agent_trace = trace_data
-                if latency_ms:
-                    audit_log.schema_agent_latency_ms = latency_ms
-            elif agent_name == "query_builder":
-                audit_log.query_builder_trace = trace_data
-                if latency_ms:
-                    audit_log.query_builder_latency_ms = latency_ms
-            elif agent_name == "validator":
-                audit_log.validator_trace = trace_data
-                if latency_ms:
-                    audit_log.validator_latency_ms = latency_ms
+        trace_column, latency_column = columns
+        values = {trace_column: trace_data}
+        if latency_ms:
+            values[latency_column] = latency_ms
 
-            await session.flush()
-            await session.refresh(audit_log)
-            return audit_log
+        db = get_db()
+        async with db.session() as session:
+            stmt = (
+                update(AuditLog)
+                .where(AuditLog.id == audit_id)
+                .values(**values)
+                .returning(AuditLog)
+            )
+            result = await session.execute(
+                stmt, execution_options={"synchronize_session": False}
+            )
+            return result.scalar_one_or_none()
 
     async def add_cost(
         self,
@@ -259,6 +294,9 @@ class AuditLogRepository:
         """
         Add cost information to an audit log.
 
+        The totals are incremented in the database (``SET x = x + :delta``), so
+        concurrent additions are not lost.
+
         Args:
             audit_id: The audit log UUID
             input_tokens: Number of input tokens
@@ -270,20 +308,58 @@ class AuditLogRepository:
         """
         db = get_db()
         async with db.session() as session:
-            stmt = select(AuditLog).where(AuditLog.id == audit_id)
-            result = await session.execute(stmt)
-            audit_log = result.scalar_one_or_none()
+            stmt = (
+                update(AuditLog)
+                .where(AuditLog.id == audit_id)
+                .values(
+                    total_tokens_input=AuditLog.total_tokens_input + input_tokens,
+                    total_tokens_output=AuditLog.total_tokens_output + output_tokens,
+                    total_cost_usd=AuditLog.total_cost_usd + cost_usd,
+                )
+                .returning(AuditLog)
+            )
+            result = await session.execute(
+                stmt, execution_options={"synchronize_session": False}
+            )
+            return result.scalar_one_or_none()
 
-            if audit_log is None:
-                return None
+    async def write_batch(
+        self,
+        entries: List[dict],
+        traces: Dict[str, List[dict]],
+        costs: List[dict],
+    ) -> None:
+        """
+        Write a batch of audit events in one transaction.
 
-            audit_log.total_tokens_input += input_tokens
-            audit_log.total_tokens_output += output_tokens
-            audit_log.total_cost_usd += cost_usd
+        Used by the batched audit sink (``services.audit_sink``). Each kind of
+        event is written with a single executemany statement.
 
-            await session.flush()
-            await session.refresh(audit_log)
-            return audit_log
+        Args:
+            entries: New audit logs, as AuditLog attribute values (including id)
+            traces: Agent name -> [{"audit_id", "trace_data", "latency_ms"}]
+            costs: [{"audit_id", "input_tokens", "output_tokens", "cost_usd"}]
+                deltas added to the totals
+        """
+        db = get_db()
+        async with db.session() as session:
+            if entries:
+                fingerprints = await store_schema_contexts(
+                    session, [entry.get("schema_context_used") for entry in entries]
+                )
+                entries = [
+                    {
+                        **{k: v for k, v in entry.items() if k != "schema_context_used"},
+                        "schema_context_hash": fingerprint,
+                    }
+                    for entry, fingerprint in zip(entries, fingerprints)
+                ]
+                await session.execute(insert(AuditLog), entries)
+            for agent_name, rows in traces.items():
+                if rows and agent_name in AGENT_TRACE_COLUMNS:
+                    await session.execute(_trace_update(agent_name), rows)
+            if costs:
+                await session.execute(_COST_UPDATE, costs)
 
     async def delete(self, audit_id: UUID) -> bool:
         """
@@ -1,13 +1,22 @@
 """
 Repository for Conversation and ConversationTurn CRUD operations.
+
+Conversation listings never load turns. They return ``ConversationSummary``
+rows whose turn count and last turn come from one aggregate query per page,
+and are paginated by keyset: the cursor holds the (updated_at, id) of the
+last conversation returned, so each page is an index range scan on
+(user_id|connection_id, updated_at, id) however deep the client pages.
 """
 
-from typing import List, Optional
-from uuid import UUID
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, load_only, selectinload
 
 from text2x.models.base import get_db
 from text2x.models.conversation import (
@@ -15,6 +24,81 @@ from text2x.models.conversation import (
     ConversationStatus,
     ConversationTurn,
 )
+from text2x.models.trace import TURN_TRACE_COLUMNS
+from text2x.repositories.trace import (
+    apply_turn_details,
+    hydrate_turn,
+    show_turn_details,
+    store_schema_contexts,
+    turn_trace_options,
+)
+
+
+# Turn columns holding large JSON documents, only needed when a single turn is inspected
+TURN_DETAIL_COLUMNS = (
+    "reasoning_trace",
+    "schema_context",
+    "execution_result",
+    "rag_examples_used",
+)
+
+# Turn columns returned for the last turn of a listed conversation
+TURN_SUMMARY_COLUMNS = (
+    "id",
+    "conversation_id",
+    "turn_number",
+    "user_input",
+    "generated_query",
+    "confidence_score",
+    "created_at",
+)
+
+
+def defer_turn_details() -> List[Any]:
+    """
+    Loader options leaving the heavy JSON columns of turns unloaded.
+
+    Accessing a deferred column raises instead of issuing a lazy load.
+    """
+    return [defer(getattr(ConversationTurn, name), raiseload=True) for name in TURN_DETAIL_COLUMNS]
+
+
+def encode_cursor(conversation: Conversation) -> str:
+    """Encode the keyset position after a conversation as an opaque cursor."""
+    position = f"{conversation.updated_at.isoformat()}|{conversation.id}"
+    return base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, conversation_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(updated_at), UUID(conversation_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+@dataclass
+class ConversationSummary:
+    """A listed conversation with its turn aggregates (turns are not loaded)."""
+
+    conversation: Conversation
+    turn_count: int = 0
+    last_turn: Optional[ConversationTurn] = None  # only TURN_SUMMARY_COLUMNS loaded
+
+
+@dataclass
+class ConversationPage:
+    """One page of a conversation listing."""
+
+    items: List[ConversationSummary]
+    next_cursor: Optional[str] = None
 
 
 class ConversationRepository:
@@ -47,35 +131,145 @@ class ConversationRepository:
             )
             session.add(conversation)
             await session.flush()
-            await session.refresh(conversation)
             return conversation
 
-    async def get_by_id(self, conversation_id: UUID) -> Optional[Conversation]:
+    async def get_by_id(
+        self, conversation_id: UUID, with_turn_details: bool = True
+    ) -> Optional[Conversation]:
         """
         Get a conversation by ID with turns loaded.
 
         Args:
             conversation_id: The conversation UUID
+            with_turn_details: Also load the turns' TURN_DETAIL_COLUMNS, including
+                documents held in trace storage
 
         Returns:
             The conversation if found, None otherwise
         """
+        turns = selectinload(Conversation.turns)
+        if with_turn_details:
+            turns = turns.options(*turn_trace_options())
+        else:
+            turns = turns.options(*defer_turn_details())
+
         db = get_db()
         async with db.session() as session:
             stmt = (
                 select(Conversation)
                 .where(Conversation.id == conversation_id)
-                .options(selectinload(Conversation.turns))
+                .options(turns)
             )
             result = await session.execute(stmt)
-            return result.scalar_one_or_none()
+            conversation = result.scalar_one_or_none()
+            if conversation is not None and with_turn_details:
+                for turn in conversation.turns:
+                    hydrate_turn(turn)
+            return conversation
+
+    async def list_summaries(
+        self,
+        user_id: Optional[str] = None,
+        connection_id: Optional[UUID] = None,
+        status: Optional[ConversationStatus] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> ConversationPage:
+        """
+        List conversations, most recently updated first, one page at a time.
+
+        Args:
+            user_id: Optional user filter
+            connection_id: Optional connection filter
+            status: Optional status filter
+            limit: Maximum number of results
+            cursor: ``next_cursor`` of the previous page (optional)
+
+        Returns:
+            Page of conversation summaries and the cursor of the next page,
+            None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        stmt = (
+            select(Conversation)
+            .order_by(Conversation.updated_at.desc(), Conversation.id.desc())
+            .limit(limit + 1)
+        )
+        if user_id is not None:
+            stmt = stmt.where(Conversation.user_id == user_id)
+        if connection_id is not None:
+            stmt = stmt.where(Conversation.connection_id == connection_id)
+        if status:
+            stmt = stmt.where(Conversation.status == status)
+        if cursor:
+            updated_at, last_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                or_(
+                    Conversation.updated_at < updated_at,
+                    and_(Conversation.updated_at == updated_at, Conversation.id < last_id),
+                )
+            )
+
+        db = get_db()
+        async with db.session() as session:
+            result = await session.execute(stmt)
+            conversations = list(result.scalars().all())
+            has_more = len(conversations) > limit
+            conversations = conversations[:limit]
+            items = await self._summarize(session, conversations)
+
+        next_cursor = encode_cursor(conversations[-1]) if has_more else None
+        return ConversationPage(items=items, next_cursor=next_cursor)
+
+    async def _summarize(
+        self, session: AsyncSession, conversations: List[Conversation]
+    ) -> List[ConversationSummary]:
+        """Attach turn counts and last turns, read with one aggregate query."""
+        if not conversations:
+            return []
+
+        stats = (
+            select(
+                ConversationTurn.conversation_id,
+                func.count().label("turn_count"),
+                func.max(ConversationTurn.turn_number).label("last_turn_number"),
+            )
+            .where(ConversationTurn.conversation_id.in_([c.id for c in conversations]))
+            .group_by(ConversationTurn.conversation_id)
+            .subquery()
+        )
+        stmt = (
+            select(ConversationTurn, stats.c.turn_count)
+            .join(
+                stats,
+                and_(
+                    ConversationTurn.conversation_id == stats.c.conversation_id,
+                    ConversationTurn.turn_number == stats.c.last_turn_number,
+                ),
+            )
+            .options(load_only(*(getattr(ConversationTurn, c) for c in TURN_SUMMARY_COLUMNS)))
+        )
+        result = await session.execute(stmt)
+
+        last_turns = {}
+        for turn, turn_count in result.all():
+            last_turns.setdefault(turn.conversation_id, (turn, turn_count))
+
+        summaries = []
+        for conversation in conversations:
+            turn, turn_count = last_turns.get(conversation.id, (None, 0))
+            summaries.append(ConversationSummary(conversation, turn_count, turn))
+        return summaries
 
     async def list_by_user(
         self,
         user_id: str,
         status: Optional[ConversationStatus] = None,
         limit: int = 50,
-    ) -> List[Conversation]:
+        cursor: Optional[str] = None,
+    ) -> List[ConversationSummary]:
         """
         List conversations for a user.
 
@@ -83,48 +277,32 @@ class ConversationRepository:
             user_id: The user ID
             status: Optional status filter
             limit: Maximum number of results
+            cursor: Cursor of the page to return (see list_summaries)
 
         Returns:
-            List of conversations
+            List of conversation summaries
         """
-        db = get_db()
-        async with db.session() as session:
-            stmt = (
-                select(Conversation)
-                .where(Conversation.user_id == user_id)
-                .options(selectinload(Conversation.turns))
-                .order_by(Conversation.updated_at.desc())
-                .limit(limit)
-            )
-            if status:
-                stmt = stmt.where(Conversation.status == status)
-            result = await session.execute(stmt)
-            return list(result.scalars().all())
+        page = await self.list_summaries(
+            user_id=user_id, status=status, limit=limit, cursor=cursor
+        )
+        return page.items
 
     async def list_by_connection(
-        self, connection_id: UUID, limit: int = 50
-    ) -> List[Conversation]:
+        self, connection_id: UUID, limit: int = 50, cursor: Optional[str] = None
+    ) -> List[ConversationSummary]:
         """
         List conversations for a connection.
 
         Args:
             connection_id: The connection UUID
             limit: Maximum number of results
+            cursor: Cursor of the page to return (see list_summaries)
 
         Returns:
-            List of conversations
+            List of conversation summaries
         """
-        db = get_db()
-        async with db.session() as session:
-            stmt = (
-                select(Conversation)
-                .where(Conversation.connection_id == connection_id)
-                .options(selectinload(Conversation.turns))
-                .order_by(Conversation.updated_at.desc())
-                .limit(limit)
-            )
-            result = await session.execute(stmt)
-            return list(result.scalars().all())
+        page = await self.list_summaries(connection_id=connection_id, limit=limit, cursor=cursor)
+        return page.items
 
     async def update_status(
         self, conversation_id: UUID, status: ConversationStatus
@@ -154,7 +332,6 @@ class ConversationRepository:
 
             conversation.status = status
             await session.flush()
-            await session.refresh(conversation)
             return conversation
 
     async def delete(self, conversation_id: UUID) -> bool:
@@ -220,49 +397,61 @@ class ConversationTurnRepository:
         Returns:
             The newly created ConversationTurn
         """
+        details = {
+            "reasoning_trace": reasoning_trace,
+            "execution_result": execution_result,
+            "rag_examples_used": rag_examples_used,
+        }
         db = get_db()
         async with db.session() as session:
+            (schema_context_hash,) = await store_schema_contexts(session, [schema_context])
             turn = ConversationTurn(
+                id=uuid4(),
                 conversation_id=conversation_id,
                 turn_number=turn_number,
                 user_input=user_input,
                 generated_query=generated_query,
                 confidence_score=confidence_score,
-                reasoning_trace=reasoning_trace,
                 iterations=iterations,
                 clarification_needed=clarification_needed,
                 clarification_question=clarification_question,
                 validation_result=validation_result,
-                execution_result=execution_result,
-                schema_context=schema_context,
-                rag_examples_used=rag_examples_used,
+                schema_context_hash=schema_context_hash,
             )
+            trace = apply_turn_details(turn, details)
             session.add(turn)
             await session.flush()
-            await session.refresh(turn)
+            if trace is not None:
+                session.add(trace)
+                await session.flush()
+            show_turn_details(turn, {**details, "schema_context": schema_context})
             return turn
 
-    async def get_by_id(self, turn_id: UUID) -> Optional[ConversationTurn]:
+    async def get_by_id(
+        self, turn_id: UUID, with_details: bool = True
+    ) -> Optional[ConversationTurn]:
         """
         Get a turn by ID.
 
         Args:
             turn_id: The turn UUID
+            with_details: Also load the schema context and trace documents
+                from trace storage
 
         Returns:
             The turn if found, None otherwise
         """
-        from sqlalchemy.orm import selectinload
+        options = [selectinload(ConversationTurn.conversation)]
+        options += turn_trace_options() if with_details else defer_turn_details()
 
         db = get_db()
         async with db.session() as session:
-            stmt = (
-                select(ConversationTurn)
-                .where(ConversationTurn.id == turn_id)
-                .options(selectinload(ConversationTurn.conversation))
-            )
+            stmt = select(ConversationTurn).where(ConversationTurn.id == turn_id).options(*options)
             result = await session.execute(stmt)
-            return result.scalar_one_or_none()
+            turn = result.unique().scalar_one_or_none()
+            if turn is not None and with_details:
+                hydrate_turn(turn)
+            return turn
 
     async def list_by_conversation(
         self, conversation_id: UUID
@@ -274,7 +463,8 @@ class ConversationTurnRepository:
             conversation_id: The conversation UUID
 
         Returns:
-            List of turns ordered by turn number
+            List of turns ordered by turn number, without the documents held
+            in trace storage (see ``get_by_id``)
         """
         db = get_db()
         async with db.session() as session:
@@ -311,9 +501,13 @@ class ConversationTurnRepository:
         """
         db = get_db()
         async with db.session() as session:
-            stmt = select(ConversationTurn).where(ConversationTurn.id == turn_id)
+            stmt = (
+                select(ConversationTurn)
+                .where(ConversationTurn.id == turn_id)
+                .options(*turn_trace_options())
+            )
             result = await session.execute(stmt)
-            turn = result.scalar_one_or_none()
+            turn = result.unique().scalar_one_or_none()
 
             if turn is None:
                 return None
@@ -327,8 +521,18 @@ class ConversationTurnRepository:
             if validation_result is not None:
                 turn.validation_result = validation_result
             if execution_result is not None:
-                turn.execution_result = execution_result
+                # Rewrite the trace documents, which may move in or out of turn_traces
+                hydrate_turn(turn)
+                details = {name: getattr(turn, name) for name in TURN_TRACE_COLUMNS}
+                details["execution_result"] = execution_result
+                if turn.trace is not None:
+                    await session.delete(turn.trace)
+                    await session.flush()
+                trace = apply_turn_details(turn, details)
+                await session.flush()
+                if trace is not None:
+                    session.add(trace)
+                show_turn_details(turn, details)
 
             await session.flush()
-            await session.refresh(turn)
             return turn
@@ -50,7 +50,6 @@ class FeedbackRepository:
             )
             session.add(feedback)
             await session.flush()
-            await session.refresh(feedback)
             return feedback
 
     async def get_by_id(self, feedback_id: UUID) -> Optional[UserFeedback]:
@@ -300,7 +299,6 @@ class FeedbackRepository:
                 feedback.feedback_text = feedback_text
 
             await session.flush()
-            await session.refresh(feedback)
             return feedback
 
     async def delete(self, feedback_id: UUID) -> bool:
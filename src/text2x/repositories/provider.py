@@ -83,20 +83,20 @@ class ProviderRepository:
 
     async def get_by_id(self, provider_id: UUID) -> Optional[Provider]:
         """
-        Get a provider by ID with connections loaded.
+        Get a provider by ID with connections and workspace loaded.
 
         Args:
             provider_id: UUID of the provider
 
         Returns:
-            Provider instance with connections loaded, or None if not found
+            Provider instance with connections and workspace loaded, or None if not found
         """
         db = get_db()
 
         async with db.session() as session:
             query = (
                 select(Provider)
-                .options(selectinload(Provider.connections))
+                .options(selectinload(Provider.connections), selectinload(Provider.workspace))
                 .where(Provider.id == provider_id)
             )
 
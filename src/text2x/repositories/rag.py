@@ -3,14 +3,93 @@ Repository for RAGExample CRUD operations.
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Text, cast, func, literal, or_, select, text
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSQUERY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from text2x.models.base import get_db
-from text2x.models.rag import RAGExample, ExampleStatus
+from text2x.models.rag import SEARCH_CONFIG, RAGExample, ExampleStatus
+
+# Weights of full-text rank and trigram similarity in a search score
+TEXT_RANK_WEIGHT = 0.7
+TRIGRAM_WEIGHT = 0.3
+
+# Most examples scored in full by a search for any of a question's words;
+# bounds its cost when the words are common
+SEARCH_CANDIDATES = 1000
+
+# Whether pg_trgm is installed in the metadata database, checked once
+_trigram_available: Optional[bool] = None
+
+
+async def _has_trigram(session: AsyncSession) -> bool:
+    global _trigram_available
+    if _trigram_available is None:
+        stmt = text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        _trigram_available = bool((await session.execute(stmt)).scalar())
+    return _trigram_available
+
+
+def _search_query(
+    query: str,
+    provider_id: str,
+    limit: int,
+    query_intent: Optional[str] = None,
+    tables: Optional[Sequence[str]] = None,
+    trigram: bool = True,
+    match_all: bool = True,
+) -> Any:
+    """
+    Top approved examples for a question, with their score.
+
+    Candidates contain all of the question's words (any of them unless
+    ``match_all``) or, with ``trigram``, are similar to it as a whole
+    (pg_trgm ``%``, which also catches typos); both are found through a GIN
+    index. They are scored by ``ts_rank_cd`` (normalized to 0..1) and
+    trigram similarity, weighted like the former keyword scoring.
+
+    Requiring every word keeps the candidates few, so all of them are
+    scored. Any one word can match most examples: those candidates are
+    first ranked by ``ts_rank_cd`` alone, read from the stored search
+    vector, and only the best SEARCH_CANDIDATES are scored in full.
+    """
+    config = cast(literal(SEARCH_CONFIG), REGCONFIG)
+    words = func.plainto_tsquery(config, query)
+    if not match_all:
+        words = cast(func.replace(cast(words, Text), "&", "|"), TSQUERY)
+    question = RAGExample.natural_language_query
+    match = RAGExample.search_vector.op("@@")(words)
+    if trigram:
+        match = or_(match, question.op("%")(query))
+
+    candidates = select(RAGExample.id).where(
+        RAGExample.provider_id == provider_id,
+        RAGExample.status == ExampleStatus.APPROVED,
+        RAGExample.is_good_example == True,
+        match,
+    )
+    if query_intent:
+        candidates = candidates.where(RAGExample.query_intent == query_intent)
+    if tables:
+        candidates = candidates.where(RAGExample.involved_tables.overlap(list(tables)))
+
+    # 32: rank / (rank + 1)
+    rank = func.ts_rank_cd(RAGExample.search_vector, words, 32)
+    if not match_all:
+        candidates = candidates.order_by(rank.desc()).limit(SEARCH_CANDIDATES)
+    score = rank
+    if trigram:
+        score = TEXT_RANK_WEIGHT * score + TRIGRAM_WEIGHT * func.similarity(question, query)
+    score = score.label("score")
+    return (
+        select(RAGExample, score)
+        .where(RAGExample.id.in_(candidates))
+        .order_by(score.desc(), RAGExample.created_at.desc())
+        .limit(limit)
+    )
 
 
 class RAGExampleRepository:
@@ -61,7 +140,6 @@ class RAGExampleRepository:
             )
             session.add(example)
             await session.flush()
-            await session.refresh(example)
             return example
 
     async def get_by_id(self, example_id: UUID) -> Optional[RAGExample]:
@@ -174,6 +252,50 @@ class RAGExampleRepository:
             result = await session.execute(stmt)
             return list(result.scalars().all())
 
+    async def search(
+        self,
+        query: str,
+        provider_id: str,
+        limit: int = 5,
+        query_intent: Optional[str] = None,
+        tables: Optional[Sequence[str]] = None,
+    ) -> List[Tuple[RAGExample, float]]:
+        """
+        Search approved examples by their question (PostgreSQL only).
+
+        Uses full-text search and, where pg_trgm is installed, trigram
+        similarity on the question, so the best matches are found among all
+        of a provider's examples. Examples containing all of the question's
+        words are looked up first; examples containing some of them only
+        when those are fewer than ``limit``.
+
+        Args:
+            query: Natural language question
+            provider_id: The provider ID
+            limit: Maximum number of results
+            query_intent: Optional intent filter
+            tables: Optional tables filter (examples involving any of them)
+
+        Returns:
+            (example, score) pairs, best first; scores are between 0 and 1
+        """
+        db = get_db()
+        async with db.session() as session:
+            trigram = await _has_trigram(session)
+            results: List[Tuple[RAGExample, float]] = []
+            for match_all in (True, False):
+                stmt = _search_query(
+                    query, provider_id, limit, query_intent, tables,
+                    trigram=trigram, match_all=match_all,
+                )
+                found = {example.id for example, _ in results}
+                for example, score in await session.execute(stmt):
+                    if example.id not in found and len(results) < limit:
+                        results.append((example, float(score)))
+                if len(results) >= limit:
+                    break
+            return results
+
     async def mark_reviewed(
         self,
         example_id: UUID,
@@ -213,7 +335,6 @@ class RAGExampleRepository:
                 example.review_notes = notes
 
             await session.flush()
-            await session.refresh(example)
             return example
 
     async def update(
@@ -264,7 +385,6 @@ class RAGExampleRepository:
                 example.is_good_example = is_good_example
 
             await session.flush()
-            await session.refresh(example)
             return example
 
     async def delete(self, example_id: UUID) -> bool:
@@ -0,0 +1,385 @@
+"""
+Repository for dashboard statistics over RAG examples and user feedback.
+
+Each statistic is a single aggregate query: one ``GROUP BY`` whose counts and
+sums use ``FILTER`` clauses, so every figure of a group is computed in one
+pass and counts are exact at any table size (nothing is loaded to be
+counted in Python).
+
+With STATS_ROLLUPS_ENABLED, reads use the rollup tables of ``models.stats``
+once the background job (``services.stats_rollup``) has filled them, which
+makes dashboards independent of the data size:
+
+- RAG example counts are read from ``rag_example_stats`` and lag by at most
+  one refresh interval
+- feedback is read from ``feedback_daily_stats`` for complete days and
+  aggregated live for the rest of the window, so it stays exact
+
+Refreshes are incremental: only providers and days with rows updated since
+the previous refresh, and the days completed since then, are re-aggregated. Deletions are picked up by a full
+refresh, run every FULL_REFRESH_INTERVAL.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Date, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from text2x.config import settings
+from text2x.models.base import get_db
+from text2x.models.conversation import ConversationTurn
+from text2x.models.feedback import FeedbackRating, UserFeedback
+from text2x.models.rag import ExampleStatus, RAGExample
+from text2x.models.stats import FeedbackDailyStats, RAGExampleStats, StatsRollupState
+
+RAG_ROLLUP = "rag_examples"
+FEEDBACK_ROLLUP = "feedback"
+
+# Rows committed up to this long after their updated_at are still picked up
+REFRESH_LAG = timedelta(minutes=5)
+FULL_REFRESH_INTERVAL = timedelta(hours=1)
+
+
+@dataclass
+class RAGExampleCounts:
+    """Number of RAG examples per review status"""
+
+    pending_review: int = 0
+    approved: int = 0
+    rejected: int = 0
+    oldest_pending: Optional[datetime] = None
+
+    @property
+    def total(self) -> int:
+        return self.pending_review + self.approved + self.rejected
+
+    def add(self, status: str, count: int, oldest: Optional[datetime] = None) -> None:
+        """Add examples of one status (an ExampleStatus value)."""
+        setattr(self, status, getattr(self, status) + count)
+        if status == ExampleStatus.PENDING_REVIEW.value and oldest is not None:
+            if self.oldest_pending is None or oldest < self.oldest_pending:
+                self.oldest_pending = oldest
+
+    def by_status(self) -> Dict[str, int]:
+        return {status.value: getattr(self, status.value) for status in ExampleStatus}
+
+
+@dataclass
+class RAGStatistics:
+    """RAG example counts overall and per provider"""
+
+    totals: RAGExampleCounts = field(default_factory=RAGExampleCounts)
+    by_provider: Dict[str, RAGExampleCounts] = field(default_factory=dict)
+
+    def add(self, provider_id: str, status: str, count: int, oldest: Optional[datetime]) -> None:
+        if count:
+            self.totals.add(status, count, oldest)
+            self.by_provider.setdefault(provider_id, RAGExampleCounts()).add(status, count, oldest)
+
+
+@dataclass
+class FeedbackTotals:
+    """Feedback counts and rated turns' confidence sums of one category"""
+
+    feedback_count: int = 0
+    up_count: int = 0
+    down_count: int = 0
+    up_confidence_sum: float = 0.0
+    down_confidence_sum: float = 0.0
+
+    def add(self, *values: Any) -> None:
+        """Add a (count, up, down, up confidence, down confidence) row."""
+        count, up, down, up_confidence, down_confidence = values
+        self.feedback_count += count or 0
+        self.up_count += up or 0
+        self.down_count += down or 0
+        self.up_confidence_sum += float(up_confidence or 0.0)
+        self.down_confidence_sum += float(down_confidence or 0.0)
+
+
+def _rag_counts_query():
+    """Counts per provider by status, in one pass over rag_examples."""
+    status = RAGExample.status
+    pending = status == ExampleStatus.PENDING_REVIEW
+    return select(
+        RAGExample.provider_id,
+        func.count().filter(pending),
+        func.count().filter(status == ExampleStatus.APPROVED),
+        func.count().filter(status == ExampleStatus.REJECTED),
+        func.min(RAGExample.created_at).filter(pending),
+    ).group_by(RAGExample.provider_id)
+
+
+def _feedback_query(*conditions: Any):
+    """Feedback counts and confidence sums per category, in one pass."""
+    up = UserFeedback.rating == FeedbackRating.UP
+    down = UserFeedback.rating == FeedbackRating.DOWN
+    confidence = ConversationTurn.confidence_score
+    return (
+        select(
+            UserFeedback.feedback_category,
+            func.count(),
+            func.count().filter(up),
+            func.count().filter(down),
+            func.sum(confidence).filter(up),
+            func.sum(confidence).filter(down),
+        )
+        .join(ConversationTurn, UserFeedback.turn_id == ConversationTurn.id)
+        .where(*conditions)
+        .group_by(UserFeedback.feedback_category)
+    )
+
+
+def _feedback_day():
+    return func.date(UserFeedback.created_at, type_=Date)
+
+
+def _as_date(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _midnight(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day)
+
+
+class StatsRepository:
+    """Aggregate statistics, live or from rollup tables."""
+
+    def __init__(self, use_rollups: Optional[bool] = None):
+        """
+        Initialize the repository.
+
+        Args:
+            use_rollups: Read refreshed rollup tables
+                (default: STATS_ROLLUPS_ENABLED)
+        """
+        self.use_rollups = settings.stats_rollups_enabled if use_rollups is None else use_rollups
+
+    async def rag_statistics(self, provider_id: Optional[str] = None) -> RAGStatistics:
+        """
+        Count RAG examples by status, overall and per provider.
+
+        Args:
+            provider_id: Optional provider filter
+
+        Returns:
+            Exact counts, or rollup counts when rollups are in use
+        """
+        stats = RAGStatistics()
+        db = get_db()
+        async with db.session() as session:
+            if self.use_rollups and await self._refreshed_at(session, RAG_ROLLUP):
+                stmt = select(
+                    RAGExampleStats.provider_id,
+                    RAGExampleStats.status,
+                    RAGExampleStats.example_count,
+                    RAGExampleStats.oldest_created_at,
+                )
+                if provider_id is not None:
+                    stmt = stmt.where(RAGExampleStats.provider_id == provider_id)
+                for row in await session.execute(stmt):
+                    stats.add(*row)
+                return stats
+
+            stmt = _rag_counts_query()
+            if provider_id is not None:
+                stmt = stmt.where(RAGExample.provider_id == provider_id)
+            for provider, pending, approved, rejected, oldest in await session.execute(stmt):
+                stats.add(provider, ExampleStatus.PENDING_REVIEW.value, pending, oldest)
+                stats.add(provider, ExampleStatus.APPROVED.value, approved, None)
+                stats.add(provider, ExampleStatus.REJECTED.value, rejected, None)
+            return stats
+
+    async def feedback_by_category(self, since: datetime) -> Dict[str, FeedbackTotals]:
+        """
+        Aggregate feedback given since an instant, per category.
+
+        Args:
+            since: Start of the window
+
+        Returns:
+            FeedbackCategory value -> totals, for categories with feedback
+        """
+        totals: Dict[str, FeedbackTotals] = {}
+        created_at = UserFeedback.created_at
+        windows = [(created_at >= since,)]
+
+        db = get_db()
+        async with db.session() as session:
+            covered_until = None
+            if self.use_rollups:
+                state = await session.get(StatsRollupState, FEEDBACK_ROLLUP)
+                covered_until = state.covered_until if state else None
+            first_day = _midnight(since.date() + timedelta(days=1))
+            if covered_until is not None and first_day < covered_until:
+                # Complete days from the rollup, the partial first day and
+                # everything after the rollup's coverage live
+                stmt = (
+                    select(
+                        FeedbackDailyStats.category,
+                        func.sum(FeedbackDailyStats.feedback_count),
+                        func.sum(FeedbackDailyStats.up_count),
+                        func.sum(FeedbackDailyStats.down_count),
+                        func.sum(FeedbackDailyStats.up_confidence_sum),
+                        func.sum(FeedbackDailyStats.down_confidence_sum),
+                    )
+                    .where(
+                        FeedbackDailyStats.day >= first_day.date(),
+                        FeedbackDailyStats.day < covered_until.date(),
+                    )
+                    .group_by(FeedbackDailyStats.category)
+                )
+                for category, *values in await session.execute(stmt):
+                    totals.setdefault(category, FeedbackTotals()).add(*values)
+                # Two range queries rather than an OR, so each uses the index
+                windows = [
+                    (created_at >= since, created_at < first_day),
+                    (created_at >= covered_until,),
+                ]
+
+            for window in windows:
+                for category, *values in await session.execute(_feedback_query(*window)):
+                    totals.setdefault(category.value, FeedbackTotals()).add(*values)
+        return totals
+
+    async def refresh_rollups(self, full: bool = False) -> None:
+        """
+        Bring the rollup tables up to date.
+
+        Each rollup is refreshed in its own transaction, holding its state
+        row locked; a rollup another process is refreshing is skipped.
+
+        Args:
+            full: Re-aggregate everything instead of the changed groups
+                (a full refresh also runs every FULL_REFRESH_INTERVAL)
+        """
+        for name, refresh in (
+            (RAG_ROLLUP, self._refresh_rag_rollup),
+            (FEEDBACK_ROLLUP, self._refresh_feedback_rollup),
+        ):
+            now = datetime.utcnow()
+            db = get_db()
+            async with db.session() as session:
+                state = await self._lock_state(session, name)
+                if state is None:
+                    continue
+                full_refresh = (
+                    full
+                    or state.refreshed_at is None
+                    or state.full_refreshed_at is None
+                    or now - state.full_refreshed_at >= FULL_REFRESH_INTERVAL
+                )
+                since = None if full_refresh else state.refreshed_at - REFRESH_LAG
+                await refresh(session, since, now)
+                state.refreshed_at = now
+                if full_refresh:
+                    state.full_refreshed_at = now
+                state.updated_at = now
+
+    async def _refresh_rag_rollup(
+        self, session: AsyncSession, since: Optional[datetime], now: datetime
+    ) -> None:
+        stmt = _rag_counts_query()
+        if since is None:
+            await session.execute(delete(RAGExampleStats))
+        else:
+            changed = (
+                select(RAGExample.provider_id).where(RAGExample.updated_at >= since).distinct()
+            )
+            providers = list((await session.execute(changed)).scalars().all())
+            if not providers:
+                return
+            await session.execute(
+                delete(RAGExampleStats).where(RAGExampleStats.provider_id.in_(providers))
+            )
+            stmt = stmt.where(RAGExample.provider_id.in_(providers))
+
+        rows = []
+        for provider, pending, approved, rejected, oldest in await session.execute(stmt):
+            for status, count in (
+                (ExampleStatus.PENDING_REVIEW, pending),
+                (ExampleStatus.APPROVED, approved),
+                (ExampleStatus.REJECTED, rejected),
+            ):
+                if count:
+                    rows.append({
+                        "provider_id": provider,
+                        "status": status.value,
+                        "example_count": count,
+                        "oldest_created_at": (
+                            oldest if status is ExampleStatus.PENDING_REVIEW else None
+                        ),
+                    })
+        if rows:
+            await session.execute(insert(RAGExampleStats), rows)
+
+    async def _refresh_feedback_rollup(
+        self, session: AsyncSession, since: Optional[datetime], now: datetime
+    ) -> None:
+        # Only complete days are rolled up; today is always aggregated live
+        today = _midnight(now.date())
+        day = _feedback_day()
+        conditions = [UserFeedback.created_at < today]
+        days = []
+        state = await session.get(StatsRollupState, FEEDBACK_ROLLUP)
+        if since is None:
+            await session.execute(delete(FeedbackDailyStats))
+        else:
+            changed = (
+                select(day)
+                .where(UserFeedback.updated_at >= since, UserFeedback.created_at < today)
+                .distinct()
+            )
+            days = set(map(_as_date, (await session.execute(changed)).scalars()))
+            # Days completed since the previous refresh, whether or not they changed lately
+            if state.covered_until is not None:
+                first = state.covered_until.date()
+                days.update(first + timedelta(days=n) for n in range((today.date() - first).days))
+            days = sorted(days)
+            if days:
+                await session.execute(
+                    delete(FeedbackDailyStats).where(FeedbackDailyStats.day.in_(days))
+                )
+                conditions += [UserFeedback.created_at >= _midnight(days[0]), day.in_(days)]
+
+        if since is None or days:
+            stmt = _feedback_query(*conditions).add_columns(day).group_by(day)
+            rows = [
+                {
+                    "day": _as_date(row[-1]),
+                    "category": row[0].value,
+                    "feedback_count": row[1],
+                    "up_count": row[2] or 0,
+                    "down_count": row[3] or 0,
+                    "up_confidence_sum": float(row[4] or 0.0),
+                    "down_confidence_sum": float(row[5] or 0.0),
+                }
+                for row in await session.execute(stmt)
+            ]
+            if rows:
+                await session.execute(insert(FeedbackDailyStats), rows)
+
+        state.covered_until = today
+
+    async def _refreshed_at(self, session: AsyncSession, name: str) -> Optional[datetime]:
+        stmt = select(StatsRollupState.refreshed_at).where(StatsRollupState.name == name)
+        return (await session.execute(stmt)).scalar_one_or_none()
+
+    async def _lock_state(self, session: AsyncSession, name: str) -> Optional[StatsRollupState]:
+        """Create the state row if missing and lock it, or None if it is locked."""
+        table = StatsRollupState.__table__
+        dialect = sqlite if session.get_bind().dialect.name == "sqlite" else postgresql
+        await session.execute(
+            dialect.insert(table)
+            .values(name=name, updated_at=datetime.utcnow())
+            .on_conflict_do_nothing(index_elements=[table.c.name])
+        )
+        stmt = (
+            select(StatsRollupState)
+            .where(StatsRollupState.name == name)
+            .with_for_update(skip_locked=True)
+        )
+        return (await session.execute(stmt)).scalar_one_or_none()
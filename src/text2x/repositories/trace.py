@@ -0,0 +1,299 @@
+"""
+Trace storage for conversation turns and audit logs.
+
+Writers hand full documents to the helpers below, which keep conversation
+rows small:
+
+- schema contexts are stored once per fingerprint in ``schema_contexts`` and
+  referenced by ``schema_context_hash``
+- a turn's trace documents (TURN_TRACE_COLUMNS) stay inline while their JSON
+  fits in TRACE_INLINE_MAX_BYTES, and are otherwise compressed into
+  ``turn_traces``
+
+Readers that need the documents of a turn load it with
+``turn_trace_options()`` and call ``hydrate_turn``, which puts them back on
+the turn's attributes. ``TraceRepository.compact`` moves rows written before
+trace storage existed, expires old traces and drops unreferenced contexts.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, delete, exists, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
+from sqlalchemy.orm.attributes import flag_modified, set_committed_value
+
+from text2x.config import settings
+from text2x.models.audit import AuditLog
+from text2x.models.base import get_db
+from text2x.models.conversation import ConversationTurn
+from text2x.models.trace import (
+    TURN_TRACE_COLUMNS,
+    SchemaContextRecord,
+    TurnTrace,
+    canonical_json,
+)
+
+# Contexts used within this period are never deleted as unreferenced, so a
+# write that is about to reference one does not race with compaction
+ORPHAN_GRACE_PERIOD = timedelta(days=1)
+
+_schema_contexts = SchemaContextRecord.__table__
+_audit_logs = AuditLog.__table__
+
+_AUDIT_CONTEXT_UPDATE = (
+    update(_audit_logs)
+    .where(_audit_logs.c.id == bindparam("log_id"))
+    .values(schema_context_hash=bindparam("fingerprint"), schema_context_used=None)
+)
+
+
+def turn_trace_options() -> List[Any]:
+    """Loader options fetching a turn's stored trace and schema context."""
+    return [
+        joinedload(ConversationTurn.trace),
+        joinedload(ConversationTurn.schema_context_record),
+    ]
+
+
+def hydrate_turn(turn: ConversationTurn) -> ConversationTurn:
+    """
+    Put a turn's stored documents back on its attributes.
+
+    The turn must have been loaded with ``turn_trace_options()``. Values are
+    set as committed state, so the turn is not marked as modified.
+    """
+    if turn.schema_context is None and turn.schema_context_record is not None:
+        set_committed_value(turn, "schema_context", turn.schema_context_record.content)
+    if turn.trace is not None:
+        details = turn.trace.unpack()
+        for name in TURN_TRACE_COLUMNS:
+            set_committed_value(turn, name, details.get(name))
+    return turn
+
+
+def apply_turn_details(turn: ConversationTurn, details: Dict[str, Any]) -> Optional[TurnTrace]:
+    """
+    Set a turn's trace columns, inline or as a compressed side row.
+
+    Args:
+        turn: The turn, with its id assigned
+        details: TURN_TRACE_COLUMNS name -> document
+
+    Returns:
+        The TurnTrace to add once the turn row exists, or None when the
+        documents are stored inline
+    """
+    raw = canonical_json({name: details.get(name) for name in TURN_TRACE_COLUMNS})
+    offload = len(raw) > settings.trace_inline_max_bytes
+    for name in TURN_TRACE_COLUMNS:
+        setattr(turn, name, None if offload else details.get(name))
+        # A hydrated value equals its committed state but is not in the row
+        flag_modified(turn, name)
+    turn.trace_bytes = len(raw)
+    return TurnTrace.pack(turn.id, raw) if offload else None
+
+
+def show_turn_details(turn: ConversationTurn, details: Dict[str, Any]) -> None:
+    """Expose the given documents on a turn whose columns were just offloaded."""
+    for name, value in details.items():
+        set_committed_value(turn, name, value)
+
+
+async def store_schema_contexts(
+    session: AsyncSession, contexts: Iterable[Optional[Dict[str, Any]]]
+) -> List[Optional[str]]:
+    """
+    Store schema contexts once per fingerprint.
+
+    Contexts already stored only have their ``last_used_at`` refreshed.
+
+    Args:
+        session: Session to write with
+        contexts: Schema contexts (None entries are passed through)
+
+    Returns:
+        The fingerprint of each context, None for missing ones
+    """
+    now = datetime.utcnow()
+    rows: Dict[str, Dict[str, Any]] = {}
+    fingerprints: List[Optional[str]] = []
+    for content in contexts:
+        if content is None:
+            fingerprints.append(None)
+            continue
+        raw = canonical_json(content)
+        fingerprint = hashlib.sha256(raw).hexdigest()
+        rows.setdefault(
+            fingerprint,
+            {
+                "fingerprint": fingerprint,
+                "content": content,
+                "size_bytes": len(raw),
+                "created_at": now,
+                "last_used_at": now,
+            },
+        )
+        fingerprints.append(fingerprint)
+
+    if rows:
+        dialect = sqlite if session.get_bind().dialect.name == "sqlite" else postgresql
+        stmt = dialect.insert(_schema_contexts)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_schema_contexts.c.fingerprint],
+            set_={"last_used_at": stmt.excluded.last_used_at},
+        )
+        await session.execute(stmt, list(rows.values()))
+    return fingerprints
+
+
+@dataclass
+class CompactionResult:
+    """Row counts of one ``TraceRepository.compact`` run"""
+
+    turns_moved: int = 0
+    audit_logs_moved: int = 0
+    turns_expired: int = 0
+    schema_contexts_deleted: int = 0
+
+
+class TraceRepository:
+    """Maintenance of stored turn traces and schema contexts."""
+
+    async def compact(
+        self,
+        retention_days: Optional[int] = None,
+        batch_size: int = 500,
+    ) -> CompactionResult:
+        """
+        Compact trace storage, one committed batch at a time.
+
+        - turns and audit logs written before trace storage get their schema
+          context deduplicated and their large traces compressed
+        - traces of turns older than the retention period are deleted; the
+          turns themselves, their validation result and schema context stay
+        - schema contexts no longer referenced are deleted
+
+        Args:
+            retention_days: Days traces are kept (default: TRACE_RETENTION_DAYS,
+                0 keeps them forever)
+            batch_size: Rows per transaction
+
+        Returns:
+            Number of rows moved, expired and deleted
+        """
+        if retention_days is None:
+            retention_days = settings.trace_retention_days
+
+        result = CompactionResult()
+        while True:
+            moved = await self._move_inline_turns(batch_size)
+            result.turns_moved += moved
+            if moved < batch_size:
+                break
+        while True:
+            moved = await self._move_inline_audit_contexts(batch_size)
+            result.audit_logs_moved += moved
+            if moved < batch_size:
+                break
+        if retention_days > 0:
+            cutoff = datetime.utcnow() - timedelta(days=retention_days)
+            while True:
+                expired = await self._expire_turn_traces(cutoff, batch_size)
+                result.turns_expired += expired
+                if expired < batch_size:
+                    break
+        result.schema_contexts_deleted = await self._delete_unreferenced_contexts()
+        return result
+
+    async def _move_inline_turns(self, batch_size: int) -> int:
+        db = get_db()
+        async with db.session() as session:
+            stmt = (
+                select(ConversationTurn)
+                .where(ConversationTurn.trace_bytes.is_(None))
+                .options(
+                    load_only(
+                        ConversationTurn.id,
+                        ConversationTurn.schema_context,
+                        *(getattr(ConversationTurn, name) for name in TURN_TRACE_COLUMNS),
+                    )
+                )
+                .limit(batch_size)
+            )
+            turns = list((await session.execute(stmt)).scalars().all())
+            fingerprints = await store_schema_contexts(
+                session, [turn.schema_context for turn in turns]
+            )
+            traces = []
+            for turn, fingerprint in zip(turns, fingerprints):
+                if fingerprint is not None:
+                    turn.schema_context_hash = fingerprint
+                    turn.schema_context = None
+                details = {name: getattr(turn, name) for name in TURN_TRACE_COLUMNS}
+                trace = apply_turn_details(turn, details)
+                if trace is not None:
+                    traces.append(trace)
+            await session.flush()
+            session.add_all(traces)
+            return len(turns)
+
+    async def _move_inline_audit_contexts(self, batch_size: int) -> int:
+        db = get_db()
+        async with db.session() as session:
+            stmt = (
+                select(AuditLog.id, AuditLog.schema_context_used)
+                .where(
+                    AuditLog.schema_context_hash.is_(None),
+                    AuditLog.schema_context_used.is_not(None),
+                )
+                .limit(batch_size)
+            )
+            rows = (await session.execute(stmt)).all()
+            if not rows:
+                return 0
+            fingerprints = await store_schema_contexts(session, [row[1] for row in rows])
+            await session.execute(
+                _AUDIT_CONTEXT_UPDATE,
+                [
+                    {"log_id": row[0], "fingerprint": fingerprint}
+                    for row, fingerprint in zip(rows, fingerprints)
+                ],
+            )
+            return len(rows)
+
+    async def _expire_turn_traces(self, cutoff: datetime, batch_size: int) -> int:
+        db = get_db()
+        async with db.session() as session:
+            stmt = (
+                select(ConversationTurn.id)
+                .where(ConversationTurn.created_at < cutoff, ConversationTurn.trace_bytes > 0)
+                .limit(batch_size)
+            )
+            turn_ids = list((await session.execute(stmt)).scalars().all())
+            if not turn_ids:
+                return 0
+            await session.execute(delete(TurnTrace).where(TurnTrace.turn_id.in_(turn_ids)))
+            await session.execute(
+                update(ConversationTurn)
+                .where(ConversationTurn.id.in_(turn_ids))
+                .values({**{name: None for name in TURN_TRACE_COLUMNS}, "trace_bytes": 0})
+                .execution_options(synchronize_session=False)
+            )
+            return len(turn_ids)
+
+    async def _delete_unreferenced_contexts(self) -> int:
+        fingerprint = SchemaContextRecord.fingerprint
+        stmt = delete(SchemaContextRecord).where(
+            SchemaContextRecord.last_used_at < datetime.utcnow() - ORPHAN_GRACE_PERIOD,
+            ~exists().where(ConversationTurn.schema_context_hash == fingerprint),
+            ~exists().where(AuditLog.schema_context_hash == fingerprint),
+        )
+        db = get_db()
+        async with db.session() as session:
+            result = await session.execute(stmt)
+            return result.rowcount
@@ -63,7 +63,6 @@ class UserRepository:
 
             session.add(user)
             await session.flush()
-            await session.refresh(user)
             return user
 
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
@@ -173,7 +172,6 @@ class UserRepository:
                 user.is_active = is_active
 
             await session.flush()
-            await session.refresh(user)
             return user
 
     async def update_password(
@@ -203,7 +201,6 @@ class UserRepository:
             user.hashed_password = get_password_hash(new_password)
 
             await session.flush()
-            await session.refresh(user)
             return user
 
     async def delete_user(self, user_id: UUID) -> bool:
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Compact trace storage.
+
+This script:
+- Moves schema contexts and large traces of turns and audit logs written
+  before trace storage into schema_contexts and turn_traces
+- Deletes traces of turns older than TRACE_RETENTION_DAYS
+- Deletes schema contexts no longer referenced
+
+Run it after the trace_storage migration, then periodically (e.g. daily).
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path to allow imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from text2x.models.base import DatabaseConfig, close_db, init_db
+from text2x.repositories.trace import TraceRepository
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def compact_traces(retention_days: int | None, batch_size: int) -> None:
+    """Run one compaction pass."""
+    try:
+        init_db(DatabaseConfig.from_env())
+        result = await TraceRepository().compact(
+            retention_days=retention_days, batch_size=batch_size
+        )
+        logger.info("✅ Trace storage compacted")
+        logger.info(f"   Turns moved: {result.turns_moved}")
+        logger.info(f"   Audit logs moved: {result.audit_logs_moved}")
+        logger.info(f"   Turn traces expired: {result.turns_expired}")
+        logger.info(f"   Schema contexts deleted: {result.schema_contexts_deleted}")
+    except Exception as e:
+        logger.error(f"❌ Failed to compact traces: {e}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact trace storage")
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=None,
+        help="Days traces are kept (default: TRACE_RETENTION_DAYS, 0 keeps them forever)",
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per transaction")
+    args = parser.parse_args()
+    asyncio.run(compact_traces(args.retention_days, args.batch_size))
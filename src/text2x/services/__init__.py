@@ -8,6 +8,7 @@ from text2x.services.review_service import ReviewService, ReviewTrigger, ReviewD
 from text2x.services.rag_service import RAGService
 from text2x.services.opensearch_service import OpenSearchService
 from text2x.services.embedding_service import BedrockEmbeddingService, get_embedding_service
+from text2x.services.tiered_cache import TieredCache, get_tiered_cache
 
 __all__ = [
     "SchemaService",
@@ -18,4 +19,6 @@ __all__ = [
     "OpenSearchService",
     "BedrockEmbeddingService",
     "get_embedding_service",
+    "TieredCache",
+    "get_tiered_cache",
 ]
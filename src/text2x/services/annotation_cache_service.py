@@ -4,27 +4,39 @@ This service handles caching for schema annotations including:
 - Table annotations (descriptions, business terms, relationships)
 - Column annotations (descriptions, sensitive flags, search hints)
 - Cache invalidation on save/update/delete
+- Per-connection tag sets so a connection's keys are invalidated without KEYS
+- Bulk reads/writes (MGET and pipelines) for building prompts over wide tables
+
+Reads go through a shared TieredCache, so repeated lookups are served from
+an in-process LRU without a Redis round trip or JSON decoding.
 """
 
-import json
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Any
 from uuid import UUID
 
-import redis.asyncio as redis
 from redis.asyncio import Redis
 
 from text2x.config import settings
+from text2x.services.tiered_cache import TieredCache, get_tiered_cache
 
 logger = logging.getLogger(__name__)
 
+# Tag sets live outside the "annotations:" prefix so legacy patterns never match them
+TAG_KEY_PREFIX = "annotation-tags:"
+TAG_MIGRATION_FLAG_KEY = "annotation-tags:migrated"
+
+
+class _LoaderError(Exception):
+    """Raised through the cache when a fallback loader failed (see ``__cause__``)."""
+
 
 class AnnotationCacheService:
     """
     Service for caching and retrieving schema annotations.
 
     This service:
-    - Caches annotations in Redis with configurable TTL
+    - Caches annotations in an in-process LRU backed by Redis with configurable TTL
     - Supports table-level and column-level annotations
     - Invalidates cache when annotations are modified
     - Falls back to database when cache misses
@@ -39,19 +51,27 @@ class AnnotationCacheService:
         Initialize annotation cache service.
 
         Args:
-            redis_client: Redis client for caching (optional)
+            redis_client: Redis client for caching (optional, defaults to the
+                shared application client)
             cache_ttl: Cache TTL in seconds (optional, defaults to settings)
         """
         self._redis_client = redis_client
         self.cache_ttl = cache_ttl or settings.redis_annotation_cache_ttl
 
+        cache_options = dict(
+            ttl=self.cache_ttl,
+            local_ttl=settings.annotation_local_cache_ttl,
+            max_local_entries=settings.annotation_local_cache_max_entries,
+            negative_ttl=settings.cache_negative_ttl,
+        )
+        if redis_client is not None or cache_ttl is not None:
+            self.cache = TieredCache("annotations", redis_client=redis_client, **cache_options)
+        else:
+            self.cache = get_tiered_cache("annotations", **cache_options)
+
     async def _get_redis_client(self) -> Redis:
-        """Get or create Redis client."""
-        if self._redis_client is None:
-            self._redis_client = await redis.from_url(
-                settings.redis_url, encoding="utf-8", decode_responses=True
-            )
-        return self._redis_client
+        """Get the Redis client backing the cache."""
+        return self.cache.redis
 
     def _make_table_key(self, connection_id: UUID, table_name: str) -> str:
         """Generate cache key for table annotations."""
@@ -65,6 +85,32 @@ class AnnotationCacheService:
         """Generate cache key for all annotations in a connection."""
         return f"annotations:{connection_id}:all"
 
+    def _make_tag_key(self, connection_id: UUID) -> str:
+        """Generate key of the set listing every cached key of a connection."""
+        return f"{TAG_KEY_PREFIX}{connection_id}"
+
+    async def _get_or_load(
+        self,
+        cache_key: str,
+        connection_id: UUID,
+        fallback_fn: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Read through the cache, raising _LoaderError if ``fallback_fn`` fails.
+
+        Callers only fall back to ``fallback_fn`` when the cache itself failed;
+        a failing loader would just fail again.
+        """
+
+        async def load() -> Any:
+            try:
+                return await fallback_fn()
+            except Exception as e:
+                raise _LoaderError() from e
+
+        return await self.cache.get_or_load(
+            cache_key, load, tags=[self._make_tag_key(connection_id)]
+        )
+
     async def get_table_annotation(
         self,
         connection_id: UUID,
@@ -84,23 +130,12 @@ class AnnotationCacheService:
         """
         cache_key = self._make_table_key(connection_id, table_name)
         try:
-            redis_client = await self._get_redis_client()
-            cached = await redis_client.get(cache_key)
-
-            if cached:
-                logger.debug(f"Annotation cache HIT for table {table_name}")
-                return json.loads(cached)
-
-            logger.debug(f"Annotation cache MISS for table {table_name}")
-
             if fallback_fn:
-                result = await fallback_fn()
-                if result:
-                    await self.cache_table_annotation(connection_id, table_name, result)
-                return result
-
-            return None
+                return await self._get_or_load(cache_key, connection_id, fallback_fn)
+            return await self.cache.get(cache_key)
 
+        except _LoaderError as e:
+            raise e.__cause__
         except Exception as e:
             logger.warning(f"Failed to get annotation from cache: {e}")
             if fallback_fn:
@@ -128,25 +163,12 @@ class AnnotationCacheService:
         """
         cache_key = self._make_column_key(connection_id, table_name, column_name)
         try:
-            redis_client = await self._get_redis_client()
-            cached = await redis_client.get(cache_key)
-
-            if cached:
-                logger.debug(f"Annotation cache HIT for column {table_name}.{column_name}")
-                return json.loads(cached)
-
-            logger.debug(f"Annotation cache MISS for column {table_name}.{column_name}")
-
             if fallback_fn:
-                result = await fallback_fn()
-                if result:
-                    await self.cache_column_annotation(
-                        connection_id, table_name, column_name, result
-                    )
-                return result
-
-            return None
+                return await self._get_or_load(cache_key, connection_id, fallback_fn)
+            return await self.cache.get(cache_key)
 
+        except _LoaderError as e:
+            raise e.__cause__
         except Exception as e:
             logger.warning(f"Failed to get column annotation from cache: {e}")
             if fallback_fn:
@@ -172,8 +194,9 @@ class AnnotationCacheService:
         """
         cache_key = self._make_table_key(connection_id, table_name)
         try:
-            redis_client = await self._get_redis_client()
-            await redis_client.setex(cache_key, self.cache_ttl, json.dumps(annotation))
+            await self.cache.set(
+                cache_key, annotation, tags=[self._make_tag_key(connection_id)]
+            )
             logger.debug(f"Cached table annotation for {table_name}")
             return cache_key
         except Exception as e:
@@ -201,14 +224,149 @@ class AnnotationCacheService:
         """
         cache_key = self._make_column_key(connection_id, table_name, column_name)
         try:
-            redis_client = await self._get_redis_client()
-            await redis_client.setex(cache_key, self.cache_ttl, json.dumps(annotation))
+            await self.cache.set(
+                cache_key, annotation, tags=[self._make_tag_key(connection_id)]
+            )
             logger.debug(f"Cached column annotation for {table_name}.{column_name}")
             return cache_key
         except Exception as e:
             logger.error(f"Failed to cache column annotation: {e}")
             raise
 
+    async def get_many_columns(
+        self,
+        connection_id: UUID,
+        table_name: str,
+        column_names: Iterable[str],
+        fallback_fn: Optional[
+            Callable[[List[str]], Awaitable[Dict[str, Dict[str, Any]]]]
+        ] = None,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get cached annotations for several columns of a table at once.
+
+        Cached columns are read with a single MGET; the remaining columns are
+        passed to ``fallback_fn`` in one call and cached with one pipeline.
+
+        Args:
+            connection_id: UUID of the connection
+            table_name: Name of the table
+            column_names: Names of the columns
+            fallback_fn: Optional async function taking the missing column names
+                and returning a dict of column name to annotation
+
+        Returns:
+            Dict of every requested column name to its annotation (None if absent)
+        """
+        column_names = list(dict.fromkeys(column_names))
+        keys = {
+            name: self._make_column_key(connection_id, table_name, name) for name in column_names
+        }
+        result: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(column_names)
+
+        try:
+            cached = await self.cache.get_many(keys.values())
+        except Exception as e:
+            logger.warning(f"Failed to get column annotations from cache: {e}")
+            cached = {}
+
+        missing = []
+        for name, key in keys.items():
+            if key in cached:
+                result[name] = cached[key]
+            else:
+                missing.append(name)
+
+        logger.debug(
+            f"Annotation cache bulk lookup for {table_name}: "
+            f"{len(column_names) - len(missing)} hits, {len(missing)} misses"
+        )
+
+        if missing and fallback_fn:
+            loaded = await fallback_fn(missing) or {}
+            for name in missing:
+                result[name] = loaded.get(name)
+            try:
+                # Columns the fallback did not return are cached negatively
+                await self.cache.set_many(
+                    {keys[name]: loaded.get(name) for name in missing},
+                    tags=[self._make_tag_key(connection_id)],
+                )
+            except Exception as e:
+                logger.warning(f"Failed to cache column annotations: {e}")
+
+        return result
+
+    async def cache_many(
+        self,
+        connection_id: UUID,
+        table_name: str,
+        columns: Dict[str, Dict[str, Any]],
+        table_annotation: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """
+        Cache a table annotation and its column annotations in one pipeline.
+
+        Args:
+            connection_id: UUID of the connection
+            table_name: Name of the table
+            columns: Dict of column name to annotation dict
+            table_annotation: Optional table-level annotation dict
+
+        Returns:
+            Cache keys written
+        """
+        items: Dict[str, Any] = {
+            self._make_column_key(connection_id, table_name, name): annotation
+            for name, annotation in columns.items()
+        }
+        if table_annotation is not None:
+            items[self._make_table_key(connection_id, table_name)] = table_annotation
+
+        try:
+            await self.cache.set_many(items, tags=[self._make_tag_key(connection_id)])
+            logger.debug(f"Cached {len(items)} annotations for {table_name}")
+            return list(items)
+        except Exception as e:
+            logger.error(f"Failed to cache annotations for {table_name}: {e}")
+            raise
+
+    async def invalidate_many(
+        self,
+        connection_id: UUID,
+        table_name: str,
+        column_names: Optional[Iterable[str]] = None,
+    ) -> int:
+        """
+        Invalidate a table, some of its columns and the connection-wide entry.
+
+        All keys are removed with a single DEL, leaving other tables of the
+        connection cached.
+
+        Args:
+            connection_id: UUID of the connection
+            table_name: Name of the table
+            column_names: Names of the columns to invalidate (optional)
+
+        Returns:
+            Number of keys invalidated
+        """
+        keys = [
+            self._make_table_key(connection_id, table_name),
+            self._make_connection_key(connection_id),
+        ]
+        keys.extend(
+            self._make_column_key(connection_id, table_name, name)
+            for name in column_names or []
+        )
+        try:
+            result = await self.cache.invalidate(*keys)
+            logger.info(f"Invalidated {result} annotation cache keys for {table_name}")
+            return result
+        except Exception as e:
+            logger.error(f"Failed to invalidate annotation cache for {table_name}: {e}")
+            return 0
+
     async def invalidate_table_annotation(
         self,
         connection_id: UUID,
@@ -226,8 +384,7 @@ class AnnotationCacheService:
         """
         cache_key = self._make_table_key(connection_id, table_name)
         try:
-            redis_client = await self._get_redis_client()
-            result = await redis_client.delete(cache_key)
+            result = await self.cache.invalidate(cache_key)
             logger.info(f"Invalidated table annotation cache for {table_name}")
             return result > 0
         except Exception as e:
@@ -253,8 +410,7 @@ class AnnotationCacheService:
         """
         cache_key = self._make_column_key(connection_id, table_name, column_name)
         try:
-            redis_client = await self._get_redis_client()
-            result = await redis_client.delete(cache_key)
+            result = await self.cache.invalidate(cache_key)
             logger.info(f"Invalidated column annotation cache for {table_name}.{column_name}")
             return result > 0
         except Exception as e:
@@ -265,27 +421,77 @@ class AnnotationCacheService:
         """
         Invalidate all cached annotations for a connection.
 
+        Deletes the keys listed in the connection's tag set, so the cost is
+        proportional to that connection's keys rather than the whole keyspace.
+
         Args:
             connection_id: UUID of the connection
 
         Returns:
             Number of keys invalidated
         """
-        pattern = f"annotations:{connection_id}:*"
         try:
-            redis_client = await self._get_redis_client()
-            keys = await redis_client.keys(pattern)
-            if keys:
-                result = await redis_client.delete(*keys)
+            await self.cache.invalidate_local_prefix(f"annotations:{connection_id}:")
+            result = await self.cache.invalidate_tag(self._make_tag_key(connection_id))
+            if result:
                 logger.info(
                     f"Invalidated {result} annotation cache keys for connection {connection_id}"
                 )
-                return result
-            return 0
+            return result
         except Exception as e:
             logger.error(f"Failed to invalidate annotation cache for connection: {e}")
             return 0
 
+    async def migrate_untagged_keys(self, batch_size: int = 500) -> int:
+        """
+        Register annotation keys written before tag sets existed.
+
+        Walks the keyspace incrementally with SCAN (never KEYS) and adds each
+        annotation key to its connection's tag set. Runs once per Redis
+        instance; later calls return immediately. Untagged keys also expire
+        on their own within the annotation TTL, so this only matters for
+        deployments with long-lived entries.
+
+        Args:
+            batch_size: SCAN page size and pipeline flush size
+
+        Returns:
+            Number of keys tagged
+        """
+        redis_client = await self._get_redis_client()
+        if not await redis_client.set(TAG_MIGRATION_FLAG_KEY, "1", nx=True):
+            return 0
+
+        tagged = 0
+        pending: Dict[str, List[str]] = {}
+
+        async def flush() -> None:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for tag_key, keys in pending.items():
+                    pipe.sadd(tag_key, *keys)
+                    pipe.expire(tag_key, self.cache_ttl)
+                await pipe.execute()
+            pending.clear()
+
+        try:
+            async for key in redis_client.scan_iter(match="annotations:*", count=batch_size):
+                parts = key.split(":", 2)
+                if len(parts) < 3:
+                    continue
+                pending.setdefault(f"{TAG_KEY_PREFIX}{parts[1]}", []).append(key)
+                tagged += 1
+                if tagged % batch_size == 0:
+                    await flush()
+            if pending:
+                await flush()
+        except Exception:
+            # Allow a later run to retry the migration
+            await redis_client.delete(TAG_MIGRATION_FLAG_KEY)
+            raise
+
+        logger.info(f"Tagged {tagged} pre-existing annotation cache keys")
+        return tagged
+
     async def get_all_annotations_for_connection(
         self,
         connection_id: UUID,
@@ -303,23 +509,17 @@ class AnnotationCacheService:
         """
         cache_key = self._make_connection_key(connection_id)
         try:
-            redis_client = await self._get_redis_client()
-            cached = await redis_client.get(cache_key)
-
-            if cached:
-                logger.debug(f"Annotation cache HIT for connection {connection_id}")
-                return json.loads(cached)
-
-            logger.debug(f"Annotation cache MISS for connection {connection_id}")
-
             if fallback_fn:
-                result = await fallback_fn()
-                if result:
-                    await self.cache_all_annotations(connection_id, result)
-                return result
+                result = await self._get_or_load(cache_key, connection_id, fallback_fn)
+            else:
+                result = await self.cache.get(cache_key)
 
-            return {"tables": [], "columns": []}
+            if result is None:
+                return {"tables": [], "columns": []}
+            return result
 
+        except _LoaderError as e:
+            raise e.__cause__
         except Exception as e:
             logger.warning(f"Failed to get all annotations from cache: {e}")
             if fallback_fn:
@@ -343,8 +543,9 @@ class AnnotationCacheService:
         """
         cache_key = self._make_connection_key(connection_id)
         try:
-            redis_client = await self._get_redis_client()
-            await redis_client.setex(cache_key, self.cache_ttl, json.dumps(annotations))
+            await self.cache.set(
+                cache_key, annotations, tags=[self._make_tag_key(connection_id)]
+            )
             logger.debug(f"Cached all annotations for connection {connection_id}")
             return cache_key
         except Exception as e:
@@ -352,6 +553,9 @@ class AnnotationCacheService:
             raise
 
     async def close(self):
-        """Close Redis connection."""
+        """Close the Redis connection if one was passed in explicitly.
+
+        The shared application client is owned by the app lifespan and is left open.
+        """
         if self._redis_client:
             await self._redis_client.close()
@@ -0,0 +1,296 @@
+"""Batched, asynchronous writer for the audit trail.
+
+Recording an agent trace or an LLM cost used to read the audit row, change it
+and write it back on the request path: several round trips per agent step.
+The sink instead appends events to an in-memory queue, and a background task
+writes them in bulk every ``audit_flush_interval_ms`` or every
+``audit_batch_size`` events, whichever comes first:
+
+- new audit logs with one multi-row INSERT
+- agent traces with one executemany UPDATE per agent (the latest trace wins)
+- costs summed per audit log and added with ``SET x = x + :delta``
+
+All of a batch is written in one transaction. When the queue is full,
+producers wait for space (backpressure) rather than growing memory without
+bound. ``stop()`` writes everything still queued, so shutdown loses nothing.
+A batch that fails is retried once. If it fails again it is split in
+halves, recursively, so that only the events that cannot be written (e.g. a
+trace for an audit log that does not exist) are dropped and counted; the
+audit trail must never fail the request that produced it.
+
+When the sink is not running (scripts, tests) events are written immediately.
+"""
+
+import asyncio
+import contextvars
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from text2x.config import settings
+from text2x.repositories.audit import AuditLogRepository
+from text2x.utils.observability import record_audit_backpressure, record_audit_events
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AuditLogEntry:
+    """A new audit log (AuditLog attribute values, including its id)"""
+
+    values: Dict[str, Any]
+
+
+@dataclass
+class AuditTrace:
+    """An agent's trace for an audit log"""
+
+    audit_id: UUID
+    agent_name: str
+    trace_data: dict
+    latency_ms: Optional[int] = None
+
+
+@dataclass
+class AuditCost:
+    """Tokens and cost to add to an audit log's totals"""
+
+    audit_id: UUID
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+@dataclass
+class AuditBatch:
+    """Queued events reduced to the rows written in one transaction"""
+
+    entries: List[dict] = field(default_factory=list)
+    traces: Dict[str, List[dict]] = field(default_factory=dict)
+    costs: List[dict] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_events(cls, events: List[Any]) -> "AuditBatch":
+        batch = cls()
+        traces: Dict[tuple, dict] = {}
+        costs: Dict[UUID, dict] = {}
+        for event in events:
+            if isinstance(event, AuditLogEntry):
+                batch.entries.append(event.values)
+                kind = "log"
+            elif isinstance(event, AuditTrace):
+                key = (event.agent_name, event.audit_id)
+                previous = traces.get(key)
+                traces[key] = {
+                    "audit_id": event.audit_id,
+                    "trace_data": event.trace_data,
+                    # Falsy latencies never overwrote the stored one
+                    "latency_ms": event.latency_ms
+                    or (previous["latency_ms"] if previous else None),
+                }
+                kind = "trace"
+            else:
+                total = costs.setdefault(
+                    event.audit_id,
+                    dict(audit_id=event.audit_id, input_tokens=0, output_tokens=0, cost_usd=0.0),
+                )
+                total["input_tokens"] += event.input_tokens
+                total["output_tokens"] += event.output_tokens
+                total["cost_usd"] += event.cost_usd
+                kind = "cost"
+            batch.counts[kind] = batch.counts.get(kind, 0) + 1
+
+        for (agent_name, _), row in traces.items():
+            batch.traces.setdefault(agent_name, []).append(row)
+        batch.costs = list(costs.values())
+        return batch
+
+
+_STOP = object()
+
+
+class AuditSink:
+    """Queues audit events and writes them in batches from a background task."""
+
+    def __init__(
+        self,
+        repository: Optional[AuditLogRepository] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+    ):
+        """
+        Initialize the sink.
+
+        Args:
+            repository: Repository the batches are written with
+            batch_size: Events per batch (default: AUDIT_BATCH_SIZE)
+            flush_interval_ms: Longest time an event waits to be written
+                (default: AUDIT_FLUSH_INTERVAL_MS)
+            max_queue_size: Queued events before producers wait
+                (default: AUDIT_QUEUE_SIZE)
+        """
+        self.repository = repository or AuditLogRepository()
+        self.batch_size = batch_size or settings.audit_batch_size
+        self.flush_interval = (flush_interval_ms or settings.audit_flush_interval_ms) / 1000
+        self._queue: asyncio.Queue = asyncio.Queue(
+            maxsize=max_queue_size or settings.audit_queue_size
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._getter: Optional[asyncio.Future] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def record_log(self, **values: Any) -> UUID:
+        """
+        Queue a new audit log.
+
+        Args:
+            **values: AuditLog attribute values (see AuditLogRepository.create;
+                ``metadata`` is stored as ``extra_metadata``)
+
+        Returns:
+            The audit log's id, usable for traces and costs right away
+        """
+        values = dict(values)
+        values.setdefault("id", uuid4())
+        if "metadata" in values:
+            values["extra_metadata"] = values.pop("metadata")
+        await self._put(AuditLogEntry(values))
+        return values["id"]
+
+    async def record_trace(
+        self,
+        audit_id: UUID,
+        agent_name: str,
+        trace_data: dict,
+        latency_ms: Optional[int] = None,
+    ) -> None:
+        """Queue an agent's trace (see AuditLogRepository.add_agent_trace)."""
+        await self._put(AuditTrace(audit_id, agent_name, trace_data, latency_ms))
+
+    async def record_cost(
+        self,
+        audit_id: UUID,
+        input_tokens: int,
+        output_tokens: int,
+        cost_usd: float,
+    ) -> None:
+        """Queue tokens and cost to add to an audit log's totals."""
+        await self._put(AuditCost(audit_id, input_tokens, output_tokens, cost_usd))
+
+    async def _put(self, event: Any) -> None:
+        if not self.running:
+            await self._write([event])
+            return
+        if self._queue.full():
+            record_audit_backpressure()
+        await self._queue.put(event)
+
+    async def start(self) -> None:
+        """Start the background writer."""
+        if self.running:
+            return
+        # A fresh context, so the writer never joins a request's unit of work
+        self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+
+    async def stop(self) -> None:
+        """Write every queued event and stop the background writer."""
+        if self._task is None:
+            return
+        if self.running:
+            await self._queue.put(_STOP)
+        try:
+            await self._task
+        except Exception as e:
+            logger.error(f"Audit sink stopped with an error: {e}", exc_info=True)
+        self._task = None
+
+        remaining = []
+        while not self._queue.empty():
+            event = self._queue.get_nowait()
+            if event is not _STOP:
+                remaining.append(event)
+        if remaining:
+            await self._write(remaining)
+
+    async def _next(self, timeout: Optional[float]) -> Any:
+        """Next queued event, or None on timeout (a pending get is kept, not lost)."""
+        if self._getter is None:
+            self._getter = asyncio.ensure_future(self._queue.get())
+        done, _ = await asyncio.wait({self._getter}, timeout=timeout)
+        if not done:
+            return None
+        event = self._getter.result()
+        self._getter = None
+        return event
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                event = await self._next(None)
+                if event is _STOP:
+                    return
+                batch = [event]
+                deadline = loop.time() + self.flush_interval
+                stopping = False
+                while len(batch) < self.batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    event = await self._next(remaining)
+                    if event is None:
+                        break
+                    if event is _STOP:
+                        stopping = True
+                        break
+                    batch.append(event)
+                await self._write(batch, retry=True)
+                if stopping:
+                    return
+        finally:
+            if self._getter is not None:
+                self._getter.cancel()
+                self._getter = None
+
+    async def _write(self, events: List[Any], retry: bool = False) -> None:
+        batch = AuditBatch.from_events(events)
+        for attempt in range(2 if retry else 1):
+            try:
+                await self.repository.write_batch(batch.entries, batch.traces, batch.costs)
+            except Exception as e:
+                if retry and attempt == 0:
+                    # e.g. the audited turn is not committed yet
+                    logger.warning(f"Audit batch failed, retrying: {e}")
+                    await asyncio.sleep(self.flush_interval)
+                    continue
+                if len(events) > 1:
+                    # Halves are written in order, so logs still precede their traces and costs
+                    logger.warning(f"Audit batch of {len(events)} events failed, splitting it: {e}")
+                    middle = len(events) // 2
+                    await self._write(events[:middle])
+                    await self._write(events[middle:])
+                    return
+                logger.error(f"Dropped {len(events)} audit events: {e}", exc_info=True)
+                for kind, count in batch.counts.items():
+                    record_audit_events(kind, "dropped", count)
+                return
+            for kind, count in batch.counts.items():
+                record_audit_events(kind, "written", count)
+            return
+
+
+_audit_sink: Optional[AuditSink] = None
+
+
+def get_audit_sink() -> AuditSink:
+    """Get the shared audit sink."""
+    global _audit_sink
+    if _audit_sink is None:
+        _audit_sink = AuditSink()
+    return _audit_sink
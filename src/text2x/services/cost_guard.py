@@ -0,0 +1,207 @@
+"""Cost guardrails checked before a generated query is executed.
+
+Generated queries are executed against customer systems, so a bad join or an
+unfiltered scan can saturate a production replica. Before execution the
+provider estimates the query without running it (``QueryProvider.estimate_cost``:
+the SQL planner, MongoDB ``explain``) and the estimate is compared with the
+workspace's budget:
+
+- estimated rows
+- planner cost units (dialect-specific; off by default)
+- scanned bytes
+
+An over-budget query is either rejected or, with the "sample" action,
+rewritten to read a sample of its data (``QueryProvider.sample_query``:
+``TABLESAMPLE`` for SQL, ``$sample`` for MongoDB). Providers that cannot
+sample a query fall back to rejection. Queries that cannot be estimated are
+allowed, since the guardrail must not block providers without a planner.
+Splunk has none: it checks the same budget against the progress of the
+executing search job and cancels it when over budget, rather than running
+every search twice.
+
+Workspaces override the global thresholds under ``settings["cost_guardrails"]``::
+
+    {"max_estimated_rows": 1000000, "max_cost_units": 0,
+     "max_scanned_bytes": 1073741824, "action": "sample", "sample_percent": 5}
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from text2x.config import settings
+from text2x.providers.base import PlanEstimate, ProviderCapability, QueryProvider
+from text2x.utils.observability import record_cost_guard_decision
+
+logger = logging.getLogger(__name__)
+
+ACTION_REJECT = "reject"
+ACTION_SAMPLE = "sample"
+
+# Decisions
+ALLOWED = "allowed"
+SAMPLED = "sampled"
+REJECTED = "rejected"
+UNESTIMATED = "unestimated"
+
+WORKSPACE_SETTINGS_KEY = "cost_guardrails"
+
+
+@dataclass
+class CostBudget:
+    """Thresholds a query's estimate must stay within (0 disables a threshold)"""
+
+    max_estimated_rows: int = 0
+    max_cost_units: float = 0
+    max_scanned_bytes: int = 0
+    action: str = ACTION_REJECT
+    sample_percent: float = 1.0
+    enabled: bool = True
+
+    @classmethod
+    def from_settings(cls, workspace_settings: Optional[Dict[str, Any]] = None) -> "CostBudget":
+        """
+        Build the budget from global settings and a workspace's overrides.
+
+        Args:
+            workspace_settings: Workspace.settings (optional)
+        """
+        overrides = (workspace_settings or {}).get(WORKSPACE_SETTINGS_KEY) or {}
+        budget = cls(
+            max_estimated_rows=int(overrides.get("max_estimated_rows", settings.cost_guard_max_rows)),
+            max_cost_units=float(overrides.get("max_cost_units", settings.cost_guard_max_cost)),
+            max_scanned_bytes=int(
+                overrides.get("max_scanned_bytes", settings.cost_guard_max_scanned_bytes)
+            ),
+            action=overrides.get("action", settings.cost_guard_action),
+            sample_percent=float(overrides.get("sample_percent", settings.cost_guard_sample_percent)),
+            enabled=bool(overrides.get("enabled", settings.cost_guard_enabled)),
+        )
+        if budget.action not in (ACTION_REJECT, ACTION_SAMPLE):
+            logger.warning(f"Unknown cost guard action '{budget.action}', rejecting instead")
+            budget.action = ACTION_REJECT
+        return budget
+
+    def violations(self, estimate: PlanEstimate) -> List[str]:
+        """Describe every threshold the estimate exceeds."""
+        checks = [
+            ("estimated rows", estimate.estimated_rows, self.max_estimated_rows),
+            ("cost units", estimate.total_cost, self.max_cost_units),
+            ("scanned bytes", estimate.scanned_bytes, self.max_scanned_bytes),
+        ]
+        return [
+            f"{name} {value:,.0f} exceed the limit of {limit:,.0f}"
+            for name, value, limit in checks
+            if limit and value is not None and value > limit
+        ]
+
+
+@dataclass
+class CostDecision:
+    """Outcome of the cost check for one query"""
+
+    decision: str
+    query: str  # Query to execute (rewritten when sampled)
+    estimate: Optional[PlanEstimate] = None
+    violations: List[str] = field(default_factory=list)
+    sample_percent: Optional[float] = None
+
+    @property
+    def allowed(self) -> bool:
+        return self.decision != REJECTED
+
+    @property
+    def error(self) -> Optional[str]:
+        if self.allowed:
+            return None
+        return f"Query exceeds the cost budget: {'; '.join(self.violations)}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "decision": self.decision,
+            "violations": list(self.violations),
+            "sample_percent": self.sample_percent,
+            "estimate": self.estimate.to_dict() if self.estimate else None,
+        }
+
+
+class CostGuard:
+    """Checks queries against a cost budget before execution."""
+
+    async def check(
+        self,
+        provider: QueryProvider,
+        query: str,
+        budget: Optional[CostBudget] = None,
+        estimate: Optional[PlanEstimate] = None,
+        limit: Optional[int] = None,
+    ) -> CostDecision:
+        """
+        Decide whether, and in which form, a query may be executed.
+
+        Args:
+            provider: Provider the query will be executed with
+            query: Query to check
+            budget: Budget to enforce (default: the provider's workspace budget,
+                else the global settings)
+            estimate: Estimate already obtained during validation (optional,
+                saves a second EXPLAIN)
+            limit: Row limit the query will be executed with; the query is
+                checked, and returned, in the limited form the provider runs.
+                An ``estimate`` of the unlimited query is then not reused.
+
+        Returns:
+            CostDecision; execute ``decision.query`` if ``decision.allowed``
+        """
+        budget = budget or provider.cost_budget or CostBudget.from_settings()
+        if not budget.enabled:
+            return CostDecision(decision=ALLOWED, query=query)
+        if limit is not None:
+            limited = provider.limit_query(query, limit)
+            if limited != query:
+                query, estimate = limited, None
+
+        provider_type = provider.get_query_language()
+        if estimate is None and ProviderCapability.COST_ESTIMATION in provider.get_capabilities():
+            try:
+                estimate = await provider.estimate_cost(query)
+            except Exception as e:
+                logger.warning(f"Cost estimation failed for {provider_type}: {e}")
+        if estimate is None:
+            record_cost_guard_decision(provider_type, UNESTIMATED)
+            return CostDecision(decision=UNESTIMATED, query=query)
+
+        violations = budget.violations(estimate)
+        if not violations:
+            record_cost_guard_decision(provider_type, ALLOWED)
+            return CostDecision(decision=ALLOWED, query=query, estimate=estimate)
+
+        if budget.action == ACTION_SAMPLE:
+            sampled = provider.sample_query(query, budget.sample_percent, estimate)
+            if sampled is not None:
+                logger.info(
+                    f"Sampling {budget.sample_percent}% of over-budget query: {'; '.join(violations)}"
+                )
+                record_cost_guard_decision(provider_type, SAMPLED)
+                return CostDecision(
+                    decision=SAMPLED,
+                    query=sampled,
+                    estimate=estimate,
+                    violations=violations,
+                    sample_percent=budget.sample_percent,
+                )
+
+        logger.info(f"Rejected over-budget query: {'; '.join(violations)}")
+        record_cost_guard_decision(provider_type, REJECTED)
+        return CostDecision(decision=REJECTED, query=query, estimate=estimate, violations=violations)
+
+
+_cost_guard: Optional[CostGuard] = None
+
+
+def get_cost_guard() -> CostGuard:
+    """Get the shared cost guard."""
+    global _cost_guard
+    if _cost_guard is None:
+        _cost_guard = CostGuard()
+    return _cost_guard
@@ -20,6 +20,8 @@ from text2x.models.conversation import ConversationTurn
 from text2x.models.feedback import FeedbackCategory, FeedbackRating, UserFeedback
 from text2x.models.rag import ExampleStatus, RAGExample
 from text2x.repositories.feedback import FeedbackRepository
+from text2x.repositories.stats import StatsRepository
+from text2x.repositories.trace import hydrate_turn, turn_trace_options
 from text2x.services.rag_service import RAGService
 
 logger = logging.getLogger(__name__)
@@ -64,6 +66,7 @@ class FeedbackService:
 
     def __init__(self):
         self.feedback_repo = FeedbackRepository()
+        self.stats_repo = StatsRepository()
         self.rag_service = RAGService()
 
     async def submit_feedback(
@@ -145,14 +148,15 @@ class FeedbackService:
             stmt = (
                 select(ConversationTurn)
                 .where(ConversationTurn.id == turn_id)
-                .options(selectinload(ConversationTurn.conversation))
+                .options(selectinload(ConversationTurn.conversation), *turn_trace_options())
             )
             result = await session.execute(stmt)
-            turn = result.scalar_one_or_none()
+            turn = result.unique().scalar_one_or_none()
 
             if not turn:
                 logger.warning(f"Turn {turn_id} not found for auto-queue")
                 return
+            hydrate_turn(turn)
 
             confidence = turn.confidence_score
             logger.info(
@@ -200,8 +204,6 @@ class FeedbackService:
                     feedback_text=feedback_text,
                 )
 
-            await session.commit()
-
     async def _auto_approve_to_rag(
         self,
         session: AsyncSession,
@@ -354,84 +356,32 @@ class FeedbackService:
         """
         logger.info(f"Fetching feedback stats for last {days} days")
 
-        db = get_db()
-        async with db.session() as session:
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-            # Count total feedback
-            stmt = (
-                select(func.count())
-                .select_from(UserFeedback)
-                .where(UserFeedback.created_at >= cutoff_date)
-            )
-            result = await session.execute(stmt)
-            total_feedback = result.scalar() or 0
-
-            # Count by rating
-            stmt = (
-                select(UserFeedback.rating, func.count())
-                .where(UserFeedback.created_at >= cutoff_date)
-                .group_by(UserFeedback.rating)
-            )
-            result = await session.execute(stmt)
-            rating_counts = {rating.value: count for rating, count in result}
-
-            thumbs_up = rating_counts.get(FeedbackRating.UP.value, 0)
-            thumbs_down = rating_counts.get(FeedbackRating.DOWN.value, 0)
-
-            # Count by category
-            stmt = (
-                select(UserFeedback.feedback_category, func.count())
-                .where(UserFeedback.created_at >= cutoff_date)
-                .group_by(UserFeedback.feedback_category)
-            )
-            result = await session.execute(stmt)
-            by_category = {category.value: count for category, count in result}
-
-            # Calculate approval rate
-            approval_rate = thumbs_up / total_feedback if total_feedback > 0 else 0.0
-
-            # Calculate average confidence for thumbs up
-            stmt = (
-                select(func.avg(ConversationTurn.confidence_score))
-                .select_from(UserFeedback)
-                .join(ConversationTurn, UserFeedback.turn_id == ConversationTurn.id)
-                .where(
-                    UserFeedback.created_at >= cutoff_date,
-                    UserFeedback.rating == FeedbackRating.UP,
-                )
-            )
-            result = await session.execute(stmt)
-            avg_confidence_up = result.scalar() or 0.0
-
-            # Calculate average confidence for thumbs down
-            stmt = (
-                select(func.avg(ConversationTurn.confidence_score))
-                .select_from(UserFeedback)
-                .join(ConversationTurn, UserFeedback.turn_id == ConversationTurn.id)
-                .where(
-                    UserFeedback.created_at >= cutoff_date,
-                    UserFeedback.rating == FeedbackRating.DOWN,
-                )
-            )
-            result = await session.execute(stmt)
-            avg_confidence_down = result.scalar() or 0.0
-
-            stats = FeedbackStats(
-                total_feedback=total_feedback,
-                thumbs_up=thumbs_up,
-                thumbs_down=thumbs_down,
-                by_category=by_category,
-                approval_rate=approval_rate,
-                avg_confidence_thumbs_up=float(avg_confidence_up),
-                avg_confidence_thumbs_down=float(avg_confidence_down),
-            )
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        by_category = await self.stats_repo.feedback_by_category(cutoff_date)
+
+        total_feedback = sum(totals.feedback_count for totals in by_category.values())
+        thumbs_up = sum(totals.up_count for totals in by_category.values())
+        thumbs_down = sum(totals.down_count for totals in by_category.values())
+        up_confidence = sum(totals.up_confidence_sum for totals in by_category.values())
+        down_confidence = sum(totals.down_confidence_sum for totals in by_category.values())
+
+        stats = FeedbackStats(
+            total_feedback=total_feedback,
+            thumbs_up=thumbs_up,
+            thumbs_down=thumbs_down,
+            by_category={
+                category: totals.feedback_count for category, totals in by_category.items()
+            },
+            approval_rate=thumbs_up / total_feedback if total_feedback > 0 else 0.0,
+            avg_confidence_thumbs_up=up_confidence / thumbs_up if thumbs_up else 0.0,
+            avg_confidence_thumbs_down=down_confidence / thumbs_down if thumbs_down else 0.0,
+        )
 
-            logger.info(
-                f"Fetched feedback stats: {total_feedback} total, "
-                f"{thumbs_up} up, {thumbs_down} down"
-            )
-            return stats
+        logger.info(
+            f"Fetched feedback stats: {total_feedback} total, "
+            f"{thumbs_up} up, {thumbs_down} down"
+        )
+        return stats
 
     async def get_recent_feedback(
         self,
@@ -0,0 +1,541 @@
+"""Gateway that every LLM call goes through.
+
+Provider throttling under load used to turn into retry storms: each agent
+retried on its own fixed schedule with no limit on calls in flight. The
+gateway keeps, per model:
+- An AIMD concurrency limit: it grows by one slot per limit's worth of
+  successful calls and is halved on a 429 / throttling error
+- A token bucket on tokens per minute, charged with an estimate before the
+  call and settled with the reported usage afterwards
+- A circuit breaker that fast-fails calls while the provider keeps failing,
+  letting a single probe through after a cool-down
+
+Retries use full-jitter exponential backoff and wait at least as long as the
+provider's Retry-After. Limiter state is exported to Prometheus.
+
+The limiter is shared by calls from any event loop (the Strands agent runs
+its loop in a worker thread), so state is guarded by a threading lock and
+waiters are woken on their own loop.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from text2x.config import settings
+from text2x.utils.observability import (
+    record_llm_call,
+    set_llm_circuit_state,
+    set_llm_concurrency,
+    set_llm_tokens_available,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per token, used to estimate prompt size before a call
+CHARS_PER_TOKEN = 4
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while a model's circuit is open."""
+
+    def __init__(self, model: str, retry_in: float):
+        super().__init__(f"LLM circuit open for {model}; retry in {retry_in:.1f}s")
+        self.model = model
+        self.retry_in = retry_in
+
+
+# ============================================================================
+# Error classification
+# ============================================================================
+
+
+def _error_chain(exc: BaseException) -> List[BaseException]:
+    """The exception and the ones it was raised from (adapters wrap provider errors)."""
+    chain = []
+    while exc is not None and exc not in chain:
+        chain.append(exc)
+        exc = exc.__cause__ or exc.__context__
+    return chain
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_throttling_error(exc: BaseException) -> bool:
+    """Whether the provider rejected the call for rate or concurrency reasons."""
+    for error in _error_chain(exc):
+        if _status_code(error) == 429:
+            return True
+        name = type(error).__name__
+        if any(marker in name for marker in ("RateLimit", "Throttl", "TooManyRequests")):
+            return True
+        if "ThrottlingException" in str(error):
+            return True
+    return False
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """Whether a call may succeed if retried (throttling, 5xx, timeouts, connection errors)."""
+    if is_throttling_error(exc):
+        return True
+    for error in _error_chain(exc):
+        status = _status_code(error)
+        if status is not None:
+            return status >= 500
+        name = type(error).__name__
+        if any(
+            marker in name
+            for marker in ("Timeout", "Connect", "ServiceUnavailable", "InternalServerError")
+        ):
+            return True
+    return False
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait, from a Retry-After header if present."""
+    for error in _error_chain(exc):
+        value = getattr(error, "retry_after", None)
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        if value is None and headers is not None:
+            try:
+                value = headers.get("retry-after")
+            except Exception:
+                value = None
+        if value is not None:
+            try:
+                return max(0.0, float(value))
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def estimate_tokens(messages: Any, max_tokens: Optional[int] = None) -> int:
+    """Estimate the tokens a call will use: prompt size plus the completion budget."""
+    try:
+        prompt_chars = len(json.dumps(messages, default=str))
+    except (TypeError, ValueError):
+        prompt_chars = len(str(messages))
+    return prompt_chars // CHARS_PER_TOKEN + (max_tokens or 0)
+
+
+def _usage_tokens(result: Any) -> Optional[int]:
+    """Total tokens reported for a completed call, if the result carries usage."""
+    tokens = getattr(result, "tokens_used", None)
+    if tokens is None:
+        tokens = getattr(getattr(result, "usage", None), "total_tokens", None)
+    return tokens if isinstance(tokens, int) else None
+
+
+# ============================================================================
+# Limiter components
+# ============================================================================
+
+
+class AIMDLimiter:
+    """Concurrency limit that grows additively and shrinks multiplicatively."""
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        decrease_factor: float = 0.5,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    async def acquire(self) -> None:
+        """Wait for a free slot."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+                # A wake-up meant for this waiter goes to the next one
+                self._wake()
+                raise
+
+    def release(self, outcome: Optional[str] = None) -> None:
+        """
+        Free a slot and adapt the limit.
+
+        Args:
+            outcome: "success" grows the limit, "throttled" shrinks it,
+                anything else leaves it unchanged
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if outcome == "success":
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            elif outcome == "throttled":
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        self._wake()
+
+    def _wake(self) -> None:
+        with self._lock:
+            free = int(self.limit) - self.in_flight
+            to_wake = self._waiters[:max(free, 0)]
+            del self._waiters[:len(to_wake)]
+        for loop, waiter in to_wake:
+            loop.call_soon_threadsafe(_resolve, waiter)
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class TokenBucket:
+    """Tokens-per-minute budget; calls may overdraw it when settled with real usage."""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until the bucket holds ``tokens`` (capped at its capacity) and take them."""
+        needed = min(float(tokens), self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= needed:
+                    self.tokens -= needed
+                    return
+                wait = (needed - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Correct a charge made with an estimate once the real usage is known."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + min(estimated, self.capacity) - actual)
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self.tokens
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures; lets one probe through after a cool-down."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def check(self, model: str) -> None:
+        """Raise CircuitOpenError unless a call may proceed."""
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if self.state == CircuitState.OPEN and elapsed >= self.reset_timeout:
+                self.state = CircuitState.HALF_OPEN
+            if self.state == CircuitState.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenError(model, max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def record_neutral(self) -> None:
+        """A call that says nothing about provider health (e.g. a bad request)."""
+        with self._lock:
+            self._probing = False
+
+
+@dataclass
+class GatewayConfig:
+    """Limits applied to each model."""
+
+    initial_concurrency: int = 8
+    min_concurrency: int = 1
+    max_concurrency: int = 32
+    tokens_per_minute: int = 0  # 0 disables the token bucket
+    max_retries: int = 3
+    backoff_base: float = 1.0
+    backoff_max: float = 30.0
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+
+    @classmethod
+    def from_settings(cls) -> "GatewayConfig":
+        return cls(
+            initial_concurrency=settings.llm_initial_concurrency,
+            min_concurrency=settings.llm_min_concurrency,
+            max_concurrency=settings.llm_max_concurrency,
+            tokens_per_minute=settings.llm_tokens_per_minute,
+            max_retries=settings.llm_max_retries,
+            backoff_base=settings.llm_backoff_base,
+            backoff_max=settings.llm_backoff_max,
+            circuit_failure_threshold=settings.llm_circuit_failure_threshold,
+            circuit_reset_timeout=settings.llm_circuit_reset_timeout,
+        )
+
+
+class _ModelLimits:
+    """Limiter state for one model."""
+
+    def __init__(self, model: str, config: GatewayConfig):
+        self.model = model
+        self.limiter = AIMDLimiter(
+            config.initial_concurrency, config.min_concurrency, config.max_concurrency
+        )
+        self.bucket = TokenBucket(config.tokens_per_minute) if config.tokens_per_minute > 0 else None
+        self.breaker = CircuitBreaker(config.circuit_failure_threshold, config.circuit_reset_timeout)
+
+    def export(self) -> None:
+        set_llm_concurrency(self.model, self.limiter.limit, self.limiter.in_flight)
+        set_llm_circuit_state(self.model, self.breaker.state.value)
+        if self.bucket is not None:
+            set_llm_tokens_available(self.model, self.bucket.available())
+
+
+# ============================================================================
+# Gateway
+# ============================================================================
+
+
+class LLMGateway:
+    """Applies per-model concurrency, rate and failure limits to LLM calls."""
+
+    def __init__(self, config: Optional[GatewayConfig] = None):
+        """
+        Initialize the gateway.
+
+        Args:
+            config: Limits applied to each model (optional, defaults to settings)
+        """
+        self.config = config or GatewayConfig.from_settings()
+        self._models: Dict[str, _ModelLimits] = {}
+        self._lock = threading.Lock()
+
+    def limits(self, model: str) -> _ModelLimits:
+        """Limiter state for a model, created on first use."""
+        with self._lock:
+            if model not in self._models:
+                self._models[model] = _ModelLimits(model, self.config)
+            return self._models[model]
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Full-jitter exponential backoff, never shorter than the provider's Retry-After."""
+        delay = random.uniform(0, min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt))
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.config.backoff_max))
+        return delay
+
+    async def call(
+        self,
+        model: str,
+        invoke: Callable[[], Awaitable[Any]],
+        estimated_tokens: int = 0,
+        max_retries: Optional[int] = None,
+    ) -> Any:
+        """
+        Make an LLM call under the model's limits, retrying transient failures.
+
+        Args:
+            model: Model identifier the limits are kept for
+            invoke: Makes one attempt of the call
+            estimated_tokens: Tokens charged to the bucket before each attempt
+            max_retries: Attempts in total (optional, defaults to the config)
+
+        Returns:
+            The result of ``invoke``
+
+        Raises:
+            CircuitOpenError: If the model's circuit is open
+        """
+        limits = self.limits(model)
+        attempts = max(1, max_retries or self.config.max_retries)
+
+        for attempt in range(attempts):
+            await self._admit(limits, estimated_tokens)
+            try:
+                result = await invoke()
+            except asyncio.CancelledError:
+                self._finish(limits, None)
+                raise
+            except Exception as e:
+                if not self._finish(limits, e) or attempt == attempts - 1:
+                    raise
+                delay = self.backoff(attempt, e)
+                logger.warning(
+                    f"LLM call to {model} failed ({type(e).__name__}), retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self._finish(limits, None, success=True)
+            self._settle(limits, estimated_tokens, _usage_tokens(result))
+            return result
+
+    async def stream(
+        self,
+        model: str,
+        open_stream: Callable[[], AsyncIterator[Any]],
+        estimated_tokens: int = 0,
+        usage_of: Optional[Callable[[Any], Optional[int]]] = None,
+        max_retries: Optional[int] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Stream an LLM response under the model's limits.
+
+        The slot is held until the stream ends. Failures are retried only
+        before the first event, since later ones cannot be replayed.
+
+        Args:
+            model: Model identifier the limits are kept for
+            open_stream: Starts one attempt of the stream
+            estimated_tokens: Tokens charged to the bucket before each attempt
+            usage_of: Returns the total tokens reported by an event, if any
+            max_retries: Attempts in total (optional, defaults to the config)
+        """
+        limits = self.limits(model)
+        attempts = max(1, max_retries or self.config.max_retries)
+
+        for attempt in range(attempts):
+            await self._admit(limits, estimated_tokens)
+            started = False
+            used = None
+            try:
+                async for event in open_stream():
+                    started = True
+                    if usage_of is not None:
+                        used = usage_of(event) or used
+                    yield event
+            except (asyncio.CancelledError, GeneratorExit):
+                self._finish(limits, None)
+                raise
+            except Exception as e:
+                if not self._finish(limits, e) or started or attempt == attempts - 1:
+                    raise
+                delay = self.backoff(attempt, e)
+                logger.warning(
+                    f"LLM stream from {model} failed ({type(e).__name__}), retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self._finish(limits, None, success=True)
+            self._settle(limits, estimated_tokens, used)
+            return
+
+    async def _admit(self, limits: _ModelLimits, estimated_tokens: int) -> None:
+        try:
+            limits.breaker.check(limits.model)
+        except CircuitOpenError:
+            record_llm_call(limits.model, "rejected")
+            raise
+        try:
+            if limits.bucket is not None and estimated_tokens:
+                await limits.bucket.acquire(estimated_tokens)
+            await limits.limiter.acquire()
+        except asyncio.CancelledError:
+            limits.breaker.record_neutral()
+            raise
+        limits.export()
+
+    def _finish(
+        self, limits: _ModelLimits, error: Optional[BaseException], success: bool = False
+    ) -> bool:
+        """Release the slot and update limiter state; returns whether the error is retryable."""
+        retryable = False
+        if success:
+            limits.limiter.release("success")
+            limits.breaker.record_success()
+            record_llm_call(limits.model, "success")
+        elif error is None:
+            limits.limiter.release()
+            limits.breaker.record_neutral()
+        elif is_throttling_error(error):
+            retryable = True
+            limits.limiter.release("throttled")
+            limits.breaker.record_neutral()
+            record_llm_call(limits.model, "throttled")
+        elif is_retryable_error(error):
+            retryable = True
+            limits.limiter.release()
+            limits.breaker.record_failure()
+            record_llm_call(limits.model, "error")
+        else:
+            limits.limiter.release()
+            limits.breaker.record_neutral()
+            record_llm_call(limits.model, "error")
+        limits.export()
+        return retryable
+
+    def _settle(self, limits: _ModelLimits, estimated: int, actual: Optional[int]) -> None:
+        if limits.bucket is not None and estimated and actual is not None:
+            limits.bucket.settle(estimated, actual)
+            limits.export()
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get the process-wide LLM gateway."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
@@ -0,0 +1,116 @@
+"""Response cache for deterministic LLM calls.
+
+Agents send many temperature-0 prompts that repeat across users (table
+selection, join suggestions, keyword extraction, intent classification).
+For those calls the completion depends only on the request, so responses are
+cached in a TieredCache (in-process LRU + Redis) keyed by a hash of the
+model, messages, temperature and max_tokens.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from text2x.config import settings
+from text2x.services.tiered_cache import TieredCache, get_tiered_cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "llm-response:"
+
+
+class LLMResponseCache:
+    """Cache of LLM responses for deterministic (temperature 0) requests."""
+
+    def __init__(self, cache: Optional[TieredCache] = None):
+        """
+        Initialize the LLM response cache.
+
+        Args:
+            cache: TieredCache to store responses in (optional, defaults to the
+                shared "llm" cache)
+        """
+        self.cache = cache or get_tiered_cache(
+            "llm",
+            ttl=settings.llm_cache_ttl,
+            local_ttl=settings.llm_local_cache_ttl,
+            max_local_entries=settings.llm_local_cache_max_entries,
+        )
+
+    @staticmethod
+    def is_cacheable(temperature: Optional[float]) -> bool:
+        """Only temperature-0 requests are deterministic enough to cache."""
+        return temperature is not None and temperature == 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            model: Model identifier
+            messages: Messages as role/content dicts
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Cache key
+        """
+        payload = json.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "temperature": float(temperature),
+                "max_tokens": max_tokens,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return f"{KEY_PREFIX}{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response dict or None on a miss
+        """
+        try:
+            return await self.cache.get(key)
+        except Exception as e:
+            logger.warning(f"Failed to read LLM response cache: {e}")
+            return None
+
+    async def set(self, key: str, response: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """
+        Cache a response.
+
+        Args:
+            key: Cache key from make_key
+            response: Response dict to cache
+            ttl: TTL override in seconds (optional)
+        """
+        try:
+            await self.cache.set(key, response, ttl=ttl)
+        except Exception as e:
+            logger.warning(f"Failed to write LLM response cache: {e}")
+
+
+_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Get the shared LLM response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = LLMResponseCache()
+    return _response_cache
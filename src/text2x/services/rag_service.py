@@ -15,6 +15,7 @@ from uuid import UUID
 
 from text2x.models.rag import ExampleStatus, RAGExample
 from text2x.repositories.rag import RAGExampleRepository
+from text2x.repositories.stats import StatsRepository
 from text2x.services.opensearch_service import OpenSearchService
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ class RAGService:
         self,
         rag_repo: Optional[RAGExampleRepository] = None,
         opensearch_service: Optional[OpenSearchService] = None,
+        stats_repo: Optional[StatsRepository] = None,
     ):
         """
         Initialize RAG service.
@@ -34,8 +36,10 @@ class RAGService:
         Args:
             rag_repo: RAG example repository
             opensearch_service: OpenSearch service for vector search (optional)
+            stats_repo: Statistics repository
         """
         self.rag_repo = rag_repo or RAGExampleRepository()
+        self.stats_repo = stats_repo or StatsRepository()
         self.opensearch_service = opensearch_service
 
     async def add_example(
@@ -163,6 +167,7 @@ class RAGService:
         query_intent: Optional[str] = None,
         min_similarity: float = 0.7,
         include_sample_queries: bool = True,
+        tables: Optional[List[str]] = None,
     ) -> List[RAGExample]:
         """
         Search for similar examples using hybrid retrieval.
@@ -173,6 +178,7 @@ class RAGService:
         3. Sample queries from the reference index (if include_sample_queries=True)
 
         Only approved good examples are returned for use in query generation.
+        With ``tables``, only examples involving any of them are returned.
 
         Args:
             query: Natural language query to search for
@@ -181,6 +187,7 @@ class RAGService:
             query_intent: Optional intent filter (aggregation, filter, etc.)
             min_similarity: Minimum similarity threshold (0.0 to 1.0)
             include_sample_queries: Whether to include sample queries from reference index
+            tables: Optional tables filter (examples involving any of them)
 
         Returns:
             List of similar RAG examples, ranked by relevance
@@ -208,6 +215,7 @@ class RAGService:
                     query_intent=query_intent,
                     min_similarity=min_similarity,
                     limit=limit,
+                    tables=tables,
                 )
             except Exception as e:
                 logger.warning(f"OpenSearch search failed: {e}, falling back to database")
@@ -217,6 +225,7 @@ class RAGService:
                     provider_id=provider_id,
                     query_intent=query_intent,
                     limit=limit,
+                    tables=tables,
                 )
         else:
             # Fall back to database-only search
@@ -225,10 +234,12 @@ class RAGService:
                 provider_id=provider_id,
                 query_intent=query_intent,
                 limit=limit,
+                tables=tables,
             )
 
-        # Search sample queries index if requested and available
-        if include_sample_queries and self.opensearch_service:
+        # Search sample queries index if requested and available; sample queries
+        # record no tables, so they never match a tables filter
+        if include_sample_queries and self.opensearch_service and not tables:
             try:
                 sample_examples = await self._search_sample_queries(
                     query=query,
@@ -257,6 +268,7 @@ class RAGService:
         query_intent: Optional[str],
         min_similarity: float,
         limit: int,
+        tables: Optional[List[str]] = None,
     ) -> List[RAGExample]:
         """
         Search examples using OpenSearch hybrid search.
@@ -269,6 +281,7 @@ class RAGService:
             query_intent: Optional intent filter
             min_similarity: Minimum similarity threshold
             limit: Maximum results
+            tables: Optional tables filter, applied to the fetched examples
 
         Returns:
             List of RAG examples from OpenSearch
@@ -293,6 +306,8 @@ class RAGService:
                 example_id = UUID(result["id"])
                 example = await self.rag_repo.get_by_id(example_id)
 
+                if example and tables and not set(example.involved_tables or []) & set(tables):
+                    continue
                 if example:
                     # Add similarity score as a dynamic attribute
                     example.similarity_score = result["score"]
@@ -314,65 +329,38 @@ class RAGService:
         provider_id: str,
         query_intent: Optional[str],
         limit: int,
+        tables: Optional[List[str]] = None,
     ) -> List[RAGExample]:
         """
         Search database for approved examples.
 
-        This is a simple keyword-based search using the repository.
-        Future: Add full-text search capabilities.
+        Ranks all of the provider's approved examples in PostgreSQL, by
+        full-text rank and trigram similarity of their question.
 
         Args:
             query: Natural language query
             provider_id: Provider ID filter
             query_intent: Optional intent filter
             limit: Maximum results
+            tables: Optional tables filter (examples involving any of them)
 
         Returns:
-            List of approved RAG examples
+            List of approved RAG examples, best first
         """
-        # Get approved examples filtered by provider and intent
-        examples = await self.rag_repo.list_approved(
+        results = await self.rag_repo.search(
+            query=query,
             provider_id=provider_id,
+            limit=limit,
             query_intent=query_intent,
-            limit=limit * 2,  # Get more to filter/rank
+            tables=tables,
         )
 
-        # Improved keyword matching with TF-IDF-like scoring
-        query_lower = query.lower()
-        query_words = set(word for word in query_lower.split() if len(word) > 2)
-
-        scored_examples = []
-
-        for example in examples:
-            nl_query_lower = example.natural_language_query.lower()
-            example_words = set(word for word in nl_query_lower.split() if len(word) > 2)
-
-            # Keyword overlap score
-            overlap = len(query_words & example_words)
-            overlap_score = overlap / max(len(query_words), 1) if query_words else 0
-
-            # Substring matching score (for partial matches)
-            substring_score = 0
-            for qword in query_words:
-                if any(qword in eword or eword in qword for eword in example_words):
-                    substring_score += 0.5
-
-            substring_score = min(1.0, substring_score / max(len(query_words), 1))
-
-            # Combined score (weighted)
-            score = 0.7 * overlap_score + 0.3 * substring_score
-
-            # Boost score for good examples
-            if example.is_good_example:
-                score *= 1.1
-
-            scored_examples.append((score, example))
-
-        # Sort by score descending
-        scored_examples.sort(key=lambda x: x[0], reverse=True)
-
-        # Return top results
-        return [example for _, example in scored_examples[:limit]]
+        examples = []
+        for example, score in results:
+            # Add similarity score as a dynamic attribute
+            example.similarity_score = score
+            examples.append(example)
+        return examples
 
     async def _index_in_opensearch(self, example: RAGExample) -> None:
         """
@@ -654,28 +642,12 @@ class RAGService:
         """
         logger.info(f"Getting RAG statistics for provider={provider_id}")
 
-        # Get counts by status
-        pending = await self.rag_repo.list_pending_review(
-            provider_id=provider_id,
-            limit=1000,  # Just for counting
-        )
-
-        approved = await self.rag_repo.list_by_provider(
-            provider_id=provider_id or "",
-            status=ExampleStatus.APPROVED,
-            limit=1000,
-        ) if provider_id else []
-
-        rejected = await self.rag_repo.list_by_provider(
-            provider_id=provider_id or "",
-            status=ExampleStatus.REJECTED,
-            limit=1000,
-        ) if provider_id else []
+        counts = (await self.stats_repo.rag_statistics(provider_id)).totals
 
         return {
-            "pending_review": len(pending),
-            "approved": len(approved),
-            "rejected": len(rejected),
-            "total": len(pending) + len(approved) + len(rejected),
+            "pending_review": counts.pending_review,
+            "approved": counts.approved,
+            "rejected": counts.rejected,
+            "total": counts.total,
             "provider_id": provider_id,
         }
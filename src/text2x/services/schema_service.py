@@ -3,7 +3,7 @@
 This service handles schema introspection and caching for database connections.
 It supports:
 - Getting schema from cache or introspecting from database
-- Caching schemas in Redis with TTL
+- Caching schemas in a two-level cache (in-process LRU + Redis) with TTL
 - Converting between database models and provider abstractions
 """
 
@@ -13,7 +13,6 @@ from typing import Optional
 from uuid import UUID
 from datetime import datetime
 
-import redis.asyncio as redis
 from redis.asyncio import Redis
 
 from text2x.config import settings
@@ -22,6 +21,8 @@ from text2x.providers.base import SchemaDefinition, TableInfo, ColumnInfo, Forei
 from text2x.providers.sql_provider import SQLProvider, SQLConnectionConfig
 from text2x.repositories.connection import ConnectionRepository
 from text2x.repositories.provider import ProviderRepository
+from text2x.services.tiered_cache import TieredCache, get_tiered_cache
+from text2x.services.validation_cache import get_validation_cache
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +32,7 @@ class SchemaService:
     Service for managing database schema caching and retrieval.
 
     This service:
-    - Retrieves schemas from cache (Redis) when available
+    - Retrieves schemas from cache (in-process LRU, then Redis) when available
     - Falls back to database introspection when cache misses
     - Caches schemas with configurable TTL
     - Manages schema refresh operations
@@ -49,20 +50,26 @@ class SchemaService:
         Args:
             connection_repo: Repository for connection operations
             provider_repo: Repository for provider operations
-            redis_client: Redis client for caching (optional)
+            redis_client: Redis client for caching (optional, defaults to the
+                shared application client)
         """
         self.connection_repo = connection_repo or ConnectionRepository()
         self.provider_repo = provider_repo or ProviderRepository()
         self._redis_client = redis_client
         self.cache_ttl = settings.redis_schema_cache_ttl
 
-    async def _get_redis_client(self) -> Redis:
-        """Get or create Redis client."""
-        if self._redis_client is None:
-            self._redis_client = await redis.from_url(
-                settings.redis_url, encoding="utf-8", decode_responses=True
-            )
-        return self._redis_client
+        cache_options = dict(
+            ttl=self.cache_ttl,
+            local_ttl=settings.schema_local_cache_ttl,
+            max_local_entries=settings.schema_local_cache_max_entries,
+            negative_ttl=settings.cache_negative_ttl,
+            serializer=_dump_schema,
+            deserializer=_load_schema,
+        )
+        if redis_client is not None:
+            self.cache = TieredCache("schema", redis_client=redis_client, **cache_options)
+        else:
+            self.cache = get_tiered_cache("schema", **cache_options)
 
     def _make_cache_key(self, connection_id: UUID) -> str:
         """Generate Redis cache key for a connection's schema."""
@@ -72,7 +79,10 @@ class SchemaService:
         """
         Get schema for a connection.
 
-        Checks cache first, then introspects database if needed.
+        Checks the in-process cache, then Redis, then introspects the database.
+        Concurrent requests for an uncached schema share one introspection.
+        The returned SchemaDefinition may be shared with other callers and
+        must not be mutated.
 
         Args:
             connection_id: UUID of the connection
@@ -89,33 +99,22 @@ class SchemaService:
             logger.warning(f"Connection {connection_id} not found")
             return None
 
-        # Try to get from cache first
         cache_key = self._make_cache_key(connection_id)
-        try:
-            redis_client = await self._get_redis_client()
-            cached_schema = await redis_client.get(cache_key)
 
-            if cached_schema:
-                logger.info(f"Schema cache HIT for connection {connection_id}")
-                schema_dict = json.loads(cached_schema)
-                return self._deserialize_schema(schema_dict)
-        except Exception as e:
-            logger.warning(f"Failed to get schema from cache: {e}")
-            # Continue to introspection on cache failure
-
-        # Cache miss - introspect from database
-        logger.info(f"Schema cache MISS for connection {connection_id}, introspecting...")
-        schema = await self._introspect_schema(connection)
-
-        if schema:
-            # Cache the result
-            await self.cache_schema(connection_id, schema)
+        async def introspect() -> Optional[SchemaDefinition]:
+            logger.info(f"Schema cache MISS for connection {connection_id}, introspecting...")
+            schema = await self._introspect_schema(connection)
+            if schema:
+                await self.connection_repo.update_schema_refresh_time(
+                    connection_id=connection_id, schema_cache_key=cache_key
+                )
+            return schema
 
-        return schema
+        return await self.cache.get_or_load(cache_key, introspect)
 
     async def cache_schema(self, connection_id: UUID, schema: SchemaDefinition) -> str:
         """
-        Cache schema in Redis.
+        Cache schema in the local and Redis tiers.
 
         Args:
             connection_id: UUID of the connection
@@ -130,13 +129,7 @@ class SchemaService:
         cache_key = self._make_cache_key(connection_id)
 
         try:
-            # Serialize schema to JSON
-            schema_dict = self._serialize_schema(schema)
-            schema_json = json.dumps(schema_dict)
-
-            # Store in Redis with TTL
-            redis_client = await self._get_redis_client()
-            await redis_client.setex(cache_key, self.cache_ttl, schema_json)
+            await self.cache.set(cache_key, schema)
 
             # Update connection's schema_cache_key and refresh time
             await self.connection_repo.update_schema_refresh_time(
@@ -153,7 +146,7 @@ class SchemaService:
 
     async def invalidate_cache(self, connection_id: UUID) -> bool:
         """
-        Invalidate cached schema for a connection.
+        Invalidate cached schema (and validation results) for a connection on every node.
 
         Args:
             connection_id: UUID of the connection
@@ -164,8 +157,8 @@ class SchemaService:
         cache_key = self._make_cache_key(connection_id)
 
         try:
-            redis_client = await self._get_redis_client()
-            result = await redis_client.delete(cache_key)
+            await get_validation_cache().invalidate_connection(str(connection_id))
+            result = await self.cache.invalidate(cache_key)
 
             if result > 0:
                 logger.info(f"Invalidated schema cache for connection {connection_id}")
@@ -323,7 +316,8 @@ class SchemaService:
             logger.error(f"Failed to introspect MongoDB schema: {e}", exc_info=True)
             raise
 
-    def _serialize_schema(self, schema: SchemaDefinition) -> dict:
+    @staticmethod
+    def _serialize_schema(schema: SchemaDefinition) -> dict:
         """
         Serialize SchemaDefinition to dict for JSON storage.
 
@@ -403,7 +397,8 @@ class SchemaService:
             "metadata": schema.metadata,
         }
 
-    def _deserialize_schema(self, schema_dict: dict) -> SchemaDefinition:
+    @staticmethod
+    def _deserialize_schema(schema_dict: dict) -> SchemaDefinition:
         """
         Deserialize dict to SchemaDefinition.
 
@@ -459,6 +454,19 @@ class SchemaService:
         )
 
     async def close(self):
-        """Close Redis connection."""
+        """Close the Redis connection if one was passed in explicitly.
+
+        The shared application client is owned by the app lifespan and is left open.
+        """
         if self._redis_client:
             await self._redis_client.close()
+
+
+def _dump_schema(schema: SchemaDefinition) -> str:
+    """Serialize a schema for the Redis tier."""
+    return json.dumps(SchemaService._serialize_schema(schema))
+
+
+def _load_schema(raw: str) -> SchemaDefinition:
+    """Deserialize a schema read from the Redis tier."""
+    return SchemaService._deserialize_schema(json.loads(raw))
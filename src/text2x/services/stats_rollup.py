@@ -0,0 +1,95 @@
+"""Background refresh of the dashboard statistics rollups.
+
+With STATS_ROLLUPS_ENABLED, dashboards read pre-aggregated rows from the
+rollup tables (see ``repositories.stats``). This job keeps them current: it
+refreshes them incrementally every ``stats_refresh_interval_seconds``,
+re-aggregating only the providers and days whose rows changed since the
+previous refresh. Several API processes may run the job; a rollup being
+refreshed by one of them is skipped by the others.
+
+A refresh that fails is logged and retried at the next interval; readers
+keep using the previous rollup in the meantime.
+"""
+
+import asyncio
+import contextvars
+import logging
+from typing import Optional
+
+from text2x.config import settings
+from text2x.repositories.stats import StatsRepository
+
+logger = logging.getLogger(__name__)
+
+
+class StatsRollupJob:
+    """Periodic refresh of the statistics rollup tables."""
+
+    def __init__(
+        self,
+        repository: Optional[StatsRepository] = None,
+        interval_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the job.
+
+        Args:
+            repository: Repository the rollups are refreshed with
+            interval_seconds: Time between refreshes
+                (default: STATS_REFRESH_INTERVAL_SECONDS)
+        """
+        self.repository = repository or StatsRepository(use_rollups=True)
+        self.interval = interval_seconds or settings.stats_refresh_interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start refreshing in the background."""
+        if self.running:
+            return
+        # A fresh context, so refreshes never join a request's unit of work
+        self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+
+    async def stop(self) -> None:
+        """Stop refreshing, interrupting a refresh in progress."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def refresh(self, full: bool = False) -> bool:
+        """
+        Refresh the rollups once.
+
+        Returns:
+            Whether the refresh succeeded
+        """
+        try:
+            await self.repository.refresh_rollups(full=full)
+        except Exception as e:
+            logger.error(f"Statistics rollup refresh failed: {e}", exc_info=True)
+            return False
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+
+_stats_rollup_job: Optional[StatsRollupJob] = None
+
+
+def get_stats_rollup_job() -> StatsRollupJob:
+    """Get the shared statistics rollup job."""
+    global _stats_rollup_job
+    if _stats_rollup_job is None:
+        _stats_rollup_job = StatsRollupJob()
+    return _stats_rollup_job
@@ -0,0 +1,692 @@
+"""Two-level cache shared by the schema and annotation services.
+
+A ``TieredCache`` keeps a size-bounded in-process LRU in front of Redis:
+- Reads hit the local LRU first and only go to Redis (and JSON decoding) on a local miss
+- Concurrent misses for the same key share a single loader call (single-flight)
+- Loader results of ``None`` are negatively cached for a short TTL
+- Writes and invalidations are broadcast over Redis pub/sub so other nodes
+  drop their local copies
+- Keys can be tagged (Redis sets listing member keys) so a group of keys is
+  invalidated in O(group size) without scanning the keyspace
+- Per-tier hit/miss counts are kept locally and exported to Prometheus
+
+All caches use the pooled Redis client from ``app_state.redis_client`` when
+the API is running, falling back to one shared client created from settings.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+import redis.asyncio as redis
+from redis.asyncio import Redis
+
+from text2x.config import settings
+from text2x.utils.observability import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "text2x:cache:invalidate"
+
+# Stored in both tiers for keys whose loader returned None
+_NEGATIVE_MARKER = "__text2x_cache_negative__"
+
+# Identifies this process in invalidation messages so it ignores its own broadcasts
+_NODE_ID = uuid.uuid4().hex
+
+_MISSING = object()
+
+
+class _LoadAbandoned(Exception):
+    """The caller running a coalesced load was cancelled; its waiters retry."""
+
+_fallback_redis_client: Optional[Redis] = None
+_caches: Dict[str, "TieredCache"] = {}
+_listener_task: Optional[asyncio.Task] = None
+
+# Delay before the invalidation listener resubscribes, doubled per failure
+LISTENER_INITIAL_BACKOFF = 0.5
+LISTENER_MAX_BACKOFF = 30.0
+
+
+def get_shared_redis_client() -> Redis:
+    """
+    Get the process-wide Redis client.
+
+    Prefers the client created at API startup (``app_state.redis_client``) so
+    every cache shares one connection pool. Outside the API (CLI, scripts,
+    tests) a single fallback client is created lazily from settings.
+    """
+    global _fallback_redis_client
+
+    from text2x.api.state import app_state
+
+    if app_state.redis_client is not None:
+        return app_state.redis_client
+
+    if _fallback_redis_client is None:
+        _fallback_redis_client = redis.from_url(
+            settings.redis_url, encoding="utf-8", decode_responses=True
+        )
+    return _fallback_redis_client
+
+
+@dataclass
+class CacheStats:
+    """Per-tier hit/miss counters for a TieredCache."""
+
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    negative_hits: int = 0
+    loads: int = 0
+    coalesced_loads: int = 0
+    evictions: int = 0
+
+    @property
+    def requests(self) -> int:
+        """Total number of lookups."""
+        return self.local_hits + self.redis_hits + self.misses
+
+    @property
+    def local_hit_ratio(self) -> float:
+        """Fraction of lookups served from the in-process LRU."""
+        return self.local_hits / self.requests if self.requests else 0.0
+
+    @property
+    def redis_hit_ratio(self) -> float:
+        """Fraction of lookups that reached Redis and were served by it."""
+        redis_lookups = self.redis_hits + self.misses
+        return self.redis_hits / redis_lookups if redis_lookups else 0.0
+
+    @property
+    def overall_hit_ratio(self) -> float:
+        """Fraction of lookups served by either tier."""
+        return (self.local_hits + self.redis_hits) / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to a dictionary."""
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "loads": self.loads,
+            "coalesced_loads": self.coalesced_loads,
+            "evictions": self.evictions,
+            "requests": self.requests,
+            "local_hit_ratio": round(self.local_hit_ratio, 4),
+            "redis_hit_ratio": round(self.redis_hit_ratio, 4),
+            "overall_hit_ratio": round(self.overall_hit_ratio, 4),
+        }
+
+
+class TieredCache:
+    """
+    In-process LRU in front of Redis.
+
+    Keys are full Redis keys, so existing cache entries stay readable. Values
+    held in the local tier are the deserialized objects themselves; callers
+    must treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: int,
+        redis_client: Optional[Redis] = None,
+        local_ttl: Optional[int] = None,
+        max_local_entries: int = 1024,
+        negative_ttl: int = 60,
+        serializer: Callable[[Any], str] = json.dumps,
+        deserializer: Callable[[str], Any] = json.loads,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            namespace: Name used in metrics and invalidation messages
+            ttl: Redis TTL in seconds
+            redis_client: Redis client (optional, defaults to the shared client)
+            local_ttl: In-process TTL in seconds (optional, defaults to ``ttl``)
+            max_local_entries: Maximum number of entries kept in the local LRU
+            negative_ttl: TTL in seconds for cached "not found" results
+            serializer: Converts a value to the string stored in Redis
+            deserializer: Converts a string read from Redis back to a value
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local_ttl = local_ttl if local_ttl is not None else ttl
+        self.max_local_entries = max_local_entries
+        self.negative_ttl = negative_ttl
+        self._serialize = serializer
+        self._deserialize = deserializer
+        self._redis_client = redis_client
+
+        # key -> (expires_at, value); value is _NEGATIVE_MARKER for negative entries
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = CacheStats()
+
+    @property
+    def redis(self) -> Redis:
+        """Redis client used for the shared tier."""
+        return self._redis_client or get_shared_redis_client()
+
+    # ------------------------------------------------------------------
+    # Local tier
+    # ------------------------------------------------------------------
+
+    def _local_get(self, key: str) -> Any:
+        entry = self._local.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._local[key]
+            return _MISSING
+        self._local.move_to_end(key)
+        return value
+
+    def _local_set(self, key: str, value: Any, ttl: int) -> None:
+        self._local[key] = (time.monotonic() + ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+            self._stats.evictions += 1
+
+    def get_local(self, key: str) -> Optional[Any]:
+        """
+        Get a value from the local tier only, never reading Redis.
+
+        For values kept per process (see ``set_local``); invalidations still
+        reach every node through ``invalidate_local_prefix``.
+        """
+        value = self._local_get(key)
+        if value is _MISSING:
+            self._stats.misses += 1
+            record_cache_lookup(self.namespace, "local", False)
+            return None
+        self._stats.local_hits += 1
+        record_cache_lookup(self.namespace, "local", True)
+        return self._unwrap(value)
+
+    def set_local(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value in the local tier only, for ``ttl`` (default ``local_ttl``) seconds."""
+        self._local_set(key, value, self.local_ttl if ttl is None else ttl)
+
+    def evict_local(self, keys: Iterable[str]) -> None:
+        """Drop keys from the local tier only."""
+        for key in keys:
+            self._local.pop(key, None)
+
+    def evict_local_prefix(self, prefix: str) -> None:
+        """Drop every local entry whose key starts with ``prefix``."""
+        for key in [k for k in self._local if k.startswith(prefix)]:
+            del self._local[key]
+
+    def clear_local(self) -> None:
+        """Drop all entries from the local tier."""
+        self._local.clear()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _unwrap(self, value: Any) -> Any:
+        if value is _NEGATIVE_MARKER:
+            self._stats.negative_hits += 1
+            return None
+        return value
+
+    async def _lookup(self, key: str) -> Any:
+        """Look a key up in both tiers, returning _MISSING if neither has it."""
+        value = self._local_get(key)
+        if value is not _MISSING:
+            self._stats.local_hits += 1
+            record_cache_lookup(self.namespace, "local", True)
+            return value
+        record_cache_lookup(self.namespace, "local", False)
+
+        try:
+            raw = await self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"{self.namespace} cache: Redis read failed for {key}: {e}")
+            raw = None
+
+        if raw is None:
+            self._stats.misses += 1
+            record_cache_lookup(self.namespace, "redis", False)
+            return _MISSING
+
+        self._stats.redis_hits += 1
+        record_cache_lookup(self.namespace, "redis", True)
+
+        if raw == _NEGATIVE_MARKER:
+            self._local_set(key, _NEGATIVE_MARKER, min(self.negative_ttl, self.local_ttl))
+            return _NEGATIVE_MARKER
+
+        value = self._deserialize(raw)
+        self._local_set(key, value, self.local_ttl)
+        return value
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss or a negatively cached key
+        """
+        value = await self._lookup(key)
+        if value is _MISSING:
+            return None
+        return self._unwrap(value)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        """
+        Get several cached values, fetching local misses with one MGET.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of found keys to values; negatively cached keys map to
+            None and keys cached in neither tier are omitted
+        """
+        found: Dict[str, Optional[Any]] = {}
+        remote = []
+        for key in dict.fromkeys(keys):
+            value = self._local_get(key)
+            if value is _MISSING:
+                remote.append(key)
+                record_cache_lookup(self.namespace, "local", False)
+                continue
+            self._stats.local_hits += 1
+            record_cache_lookup(self.namespace, "local", True)
+            found[key] = self._unwrap(value)
+
+        if not remote:
+            return found
+
+        try:
+            raws = await self.redis.mget(remote)
+        except Exception as e:
+            logger.warning(f"{self.namespace} cache: Redis MGET failed: {e}")
+            raws = [None] * len(remote)
+
+        for key, raw in zip(remote, raws):
+            if raw is None:
+                self._stats.misses += 1
+                record_cache_lookup(self.namespace, "redis", False)
+                continue
+            self._stats.redis_hits += 1
+            record_cache_lookup(self.namespace, "redis", True)
+            if raw == _NEGATIVE_MARKER:
+                self._local_set(key, _NEGATIVE_MARKER, min(self.negative_ttl, self.local_ttl))
+                self._stats.negative_hits += 1
+                found[key] = None
+            else:
+                value = self._deserialize(raw)
+                self._local_set(key, value, self.local_ttl)
+                found[key] = value
+
+        return found
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Optional[Any]:
+        """
+        Get a cached value, loading and caching it on a miss.
+
+        Concurrent callers missing on the same key await a single loader call;
+        if the caller running it is cancelled, a waiting caller loads instead.
+        A loader result of None is cached for ``negative_ttl`` seconds.
+
+        Args:
+            key: Cache key
+            loader: Async function producing the value on a miss
+            ttl: Redis TTL override in seconds (optional)
+            tags: Tag sets to register the key in (optional)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        value = await self._lookup(key)
+        if value is not _MISSING:
+            return self._unwrap(value)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._stats.coalesced_loads += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _LoadAbandoned:
+                # The first waiter to retry becomes the new loader
+                return await self.get_or_load(key, loader, ttl=ttl, tags=tags)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            self._stats.loads += 1
+            result = await loader()
+            try:
+                if result is None:
+                    await self.set_negative(key, tags=tags)
+                else:
+                    await self.set(key, result, ttl=ttl, tags=tags)
+            except Exception as e:
+                logger.warning(f"{self.namespace} cache: failed to store {key}: {e}")
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Only this caller was cancelled, not the requests waiting on its load
+            future.set_exception(_LoadAbandoned())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting on it
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # Writes and invalidation
+    # ------------------------------------------------------------------
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Store a value in both tiers and tell other nodes to drop their copy.
+
+        Args:
+            key: Cache key
+            value: Value to cache (must not be None)
+            ttl: Redis TTL override in seconds (optional; 0 caches nothing
+                and drops any cached copy)
+            tags: Tag sets to register the key in (optional)
+
+        Raises:
+            Exception: If the Redis write fails (the local tier is still updated)
+        """
+        if ttl is None:
+            ttl = self.ttl
+        if ttl <= 0:
+            await self.invalidate(key)
+            return
+        self._local_set(key, value, min(ttl, self.local_ttl))
+        await self._store(key, self._serialize(value), ttl, tags)
+        await self._publish(keys=[key])
+
+    async def set_negative(self, key: str, tags: Optional[Iterable[str]] = None) -> None:
+        """Record that a key has no value for ``negative_ttl`` seconds."""
+        self._local_set(key, _NEGATIVE_MARKER, min(self.negative_ttl, self.local_ttl))
+        await self._store(key, _NEGATIVE_MARKER, self.negative_ttl, tags)
+        await self._publish(keys=[key])
+
+    async def set_many(
+        self,
+        items: Dict[str, Optional[Any]],
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Store several values with one pipelined Redis round trip.
+
+        Values of None are cached negatively for ``negative_ttl`` seconds.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Redis TTL override in seconds (optional; 0 caches nothing
+                and drops any cached copies)
+            tags: Tag sets to register every key in (optional)
+
+        Raises:
+            Exception: If the Redis write fails (the local tier is still updated)
+        """
+        if not items:
+            return
+        if ttl is None:
+            ttl = self.ttl
+        if ttl <= 0:
+            await self.invalidate(*items)
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                if value is None:
+                    self._local_set(key, _NEGATIVE_MARKER, min(self.negative_ttl, self.local_ttl))
+                    pipe.setex(key, self.negative_ttl, _NEGATIVE_MARKER)
+                else:
+                    self._local_set(key, value, min(ttl, self.local_ttl))
+                    pipe.setex(key, ttl, self._serialize(value))
+            self._queue_tags(pipe, list(items), ttl, list(tags or []))
+            await pipe.execute()
+        await self._publish(keys=list(items))
+
+    def _queue_tags(self, pipe: Any, keys: list, ttl: int, tags: list) -> None:
+        # Tag sets must outlive their members, so never shorten them below the default TTL
+        for tag in tags:
+            pipe.sadd(tag, *keys)
+            pipe.expire(tag, max(ttl, self.ttl))
+
+    async def _store(
+        self, key: str, raw: str, ttl: int, tags: Optional[Iterable[str]]
+    ) -> None:
+        tags = list(tags or [])
+        if not tags:
+            await self.redis.setex(key, ttl, raw)
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.setex(key, ttl, raw)
+            self._queue_tags(pipe, [key], ttl, tags)
+            await pipe.execute()
+
+    async def invalidate(self, *keys: str) -> int:
+        """
+        Remove keys from both tiers on every node.
+
+        Args:
+            *keys: Cache keys to remove
+
+        Returns:
+            Number of keys deleted from Redis
+        """
+        if not keys:
+            return 0
+        self.evict_local(keys)
+        deleted = await self.redis.delete(*keys)
+        await self._publish(keys=list(keys))
+        return deleted
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Remove every key registered in a tag set, on every node.
+
+        The tag set is read and deleted in one MULTI block, so keys tagged
+        concurrently land in a fresh set instead of being lost.
+
+        Args:
+            tag: Tag set key
+
+        Returns:
+            Number of keys deleted from Redis
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.smembers(tag)
+            pipe.delete(tag)
+            members, _ = await pipe.execute()
+
+        keys = sorted(members or [])
+        if not keys:
+            return 0
+        return await self.invalidate(*keys)
+
+    async def invalidate_local_prefix(self, prefix: str) -> None:
+        """
+        Drop local entries under a key prefix on every node.
+
+        Only the in-process tier is touched; callers remain responsible for
+        deleting the corresponding Redis keys.
+        """
+        self.evict_local_prefix(prefix)
+        await self._publish(prefix=prefix)
+
+    async def _publish(
+        self, keys: Optional[list] = None, prefix: Optional[str] = None
+    ) -> None:
+        message = {"origin": _NODE_ID, "namespace": self.namespace}
+        if keys:
+            message["keys"] = keys
+        if prefix:
+            message["prefix"] = prefix
+        try:
+            await self.redis.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.warning(f"{self.namespace} cache: failed to publish invalidation: {e}")
+
+    def handle_invalidation(self, message: Dict[str, Any]) -> None:
+        """Apply an invalidation message received from another node."""
+        if message.get("keys"):
+            self.evict_local(message["keys"])
+        if message.get("prefix"):
+            self.evict_local_prefix(message["prefix"])
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Get per-tier hit/miss counts and ratios."""
+        stats = self._stats.to_dict()
+        stats["namespace"] = self.namespace
+        stats["local_entries"] = len(self._local)
+        return stats
+
+
+def get_tiered_cache(namespace: str, ttl: int, **kwargs: Any) -> TieredCache:
+    """
+    Get or create the process-wide cache for a namespace.
+
+    Services are instantiated per request, so the local tier only pays off
+    when they share one TieredCache per namespace. The first call's options win.
+
+    Args:
+        namespace: Cache namespace (e.g. "schema", "annotations")
+        ttl: Redis TTL in seconds
+        **kwargs: Additional TieredCache options
+
+    Returns:
+        Shared TieredCache instance
+    """
+    cache = _caches.get(namespace)
+    if cache is None:
+        cache = TieredCache(namespace, ttl=ttl, **kwargs)
+        _caches[namespace] = cache
+    return cache
+
+
+def get_all_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get stats for every shared cache, keyed by namespace."""
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
+
+
+def dispatch_invalidation(raw_message: str) -> None:
+    """Route a pub/sub invalidation message to the shared cache it targets."""
+    try:
+        message = json.loads(raw_message)
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring malformed cache invalidation message: {raw_message!r}")
+        return
+
+    if message.get("origin") == _NODE_ID:
+        return
+
+    cache = _caches.get(message.get("namespace"))
+    if cache is not None:
+        cache.handle_invalidation(message)
+
+
+async def _listen_for_invalidations(
+    redis_client: Redis,
+    initial_backoff: float = LISTENER_INITIAL_BACKOFF,
+    max_backoff: float = LISTENER_MAX_BACKOFF,
+) -> None:
+    """
+    Apply invalidations from other nodes until cancelled.
+
+    When the subscription fails it is re-established with exponential
+    backoff. Invalidations published meanwhile are lost, so every local tier
+    is cleared once the listener is subscribed again.
+    """
+    backoff = initial_backoff
+    reconnecting = False
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            logger.info(f"Subscribed to cache invalidation channel {INVALIDATION_CHANNEL}")
+            if reconnecting:
+                for cache in _caches.values():
+                    cache.clear_local()
+            backoff = initial_backoff
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    dispatch_invalidation(message.get("data"))
+            raise ConnectionError("subscription closed")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                f"Cache invalidation listener failed, resubscribing in {backoff:.1f}s: {e}",
+                exc_info=True,
+            )
+        finally:
+            try:
+                await pubsub.unsubscribe(INVALIDATION_CHANNEL)
+                await pubsub.aclose()
+            except Exception:
+                pass
+        reconnecting = True
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, max_backoff)
+
+
+async def start_invalidation_listener(redis_client: Optional[Redis] = None) -> None:
+    """Start the background task applying invalidations from other nodes."""
+    global _listener_task
+    if _listener_task is not None and not _listener_task.done():
+        return
+    _listener_task = asyncio.create_task(
+        _listen_for_invalidations(redis_client or get_shared_redis_client())
+    )
+
+
+async def stop_invalidation_listener() -> None:
+    """Stop the invalidation listener task."""
+    global _listener_task
+    if _listener_task is None:
+        return
+    _listener_task.cancel()
+    try:
+        await _listener_task
+    except (asyncio.CancelledError, Exception):
+        pass
+    _listener_task = None
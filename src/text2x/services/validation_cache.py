@@ -0,0 +1,161 @@
+"""Cache of query validation results.
+
+The same generated query is often validated more than once: refinement loops,
+repeated questions, cached conversations and review re-checks. Validation
+costs a round trip to the customer's system (an ``EXPLAIN``, a Splunk parse
+job, a MongoDB collection listing), so results are cached in a TieredCache
+(in-process LRU + Redis) keyed by:
+
+- the provider's connection (``QueryProvider.get_cache_identity``)
+- the fingerprint of the schema the provider validates against
+- a hash of the canonicalized query (``QueryProvider.canonicalize_query``)
+
+A schema change produces a new fingerprint and therefore new keys; explicit
+schema invalidation also drops the connection's entries through a tag set.
+Invalid results are cached only briefly, since they are cheap to reproduce
+and an external fix (e.g. a table being created) should be seen quickly.
+"""
+
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+from text2x.config import settings
+from text2x.providers.base import PlanEstimate, QueryProvider, ValidationResult
+from text2x.services.tiered_cache import TieredCache, get_tiered_cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "validation:"
+TAG_PREFIX = "validation-tags:"
+
+
+def _to_dict(result: ValidationResult) -> Dict[str, Any]:
+    # parsed_query holds provider-specific objects (ASTs) and is not cached
+    return {
+        "valid": result.valid,
+        "error": result.error,
+        "warnings": list(result.warnings),
+        "plan_estimate": result.plan_estimate.to_dict() if result.plan_estimate else None,
+    }
+
+
+def _from_dict(data: Dict[str, Any]) -> ValidationResult:
+    plan_estimate = data.get("plan_estimate")
+    return ValidationResult(
+        valid=data["valid"],
+        error=data.get("error"),
+        warnings=data.get("warnings", []),
+        plan_estimate=PlanEstimate(**plan_estimate) if plan_estimate else None,
+        validation_time_ms=0.0,
+    )
+
+
+class ValidationCache:
+    """Provider-agnostic cache of ValidationResult."""
+
+    def __init__(self, cache: Optional[TieredCache] = None):
+        """
+        Initialize the validation cache.
+
+        Args:
+            cache: TieredCache to store results in (optional, defaults to the
+                shared "validation" cache)
+        """
+        self.cache = cache or get_tiered_cache(
+            "validation",
+            ttl=settings.validation_cache_ttl,
+            max_local_entries=settings.validation_local_cache_max_entries,
+        )
+        self.negative_ttl = settings.validation_cache_negative_ttl
+
+    @staticmethod
+    def make_key(provider: QueryProvider, query: str) -> str:
+        """
+        Build the cache key for validating a query with a provider.
+
+        Args:
+            provider: Provider the query is validated with
+            query: Query text
+
+        Returns:
+            Cache key
+        """
+        canonical = provider.canonicalize_query(query)
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        schema = provider.schema_fingerprint or "none"
+        return f"{KEY_PREFIX}{provider.get_cache_identity()}:{schema}:{digest}"
+
+    @staticmethod
+    def connection_tag(identity: str) -> str:
+        """Tag set listing every cached result for a connection."""
+        return f"{TAG_PREFIX}{identity}"
+
+    async def validate(self, provider: QueryProvider, query: str) -> ValidationResult:
+        """
+        Validate a query, serving repeated validations from cache.
+
+        Args:
+            provider: Provider to validate with on a miss
+            query: Query to validate
+
+        Returns:
+            ValidationResult (parsed_query is only set on a miss)
+        """
+        if not settings.validation_cache_enabled:
+            return await provider.validate_syntax(query)
+
+        try:
+            key = self.make_key(provider, query)
+        except Exception as e:
+            logger.warning(f"Cannot build validation cache key: {e}")
+            return await provider.validate_syntax(query)
+
+        try:
+            cached = await self.cache.get(key)
+        except Exception as e:
+            logger.warning(f"Failed to read validation cache: {e}")
+            cached = None
+        if cached:
+            return _from_dict(cached)
+
+        result = await provider.validate_syntax(query)
+
+        try:
+            await self.cache.set(
+                key,
+                _to_dict(result),
+                ttl=None if result.valid else self.negative_ttl,
+                tags=[self.connection_tag(provider.get_cache_identity())],
+            )
+        except Exception as e:
+            logger.warning(f"Failed to write validation cache: {e}")
+        return result
+
+    async def invalidate_connection(self, identity: str) -> int:
+        """
+        Drop every cached result for a connection, e.g. after a schema change.
+
+        Args:
+            identity: Connection identity (the connection ID for providers
+                created by the provider factory)
+
+        Returns:
+            Number of entries removed
+        """
+        try:
+            return await self.cache.invalidate_tag(self.connection_tag(identity))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate validation cache for {identity}: {e}")
+            return 0
+
+
+_validation_cache: Optional[ValidationCache] = None
+
+
+def get_validation_cache() -> ValidationCache:
+    """Get the shared validation cache."""
+    global _validation_cache
+    if _validation_cache is None:
+        _validation_cache = ValidationCache()
+    return _validation_cache
@@ -1,9 +1,15 @@
 """Observability utilities for metrics, logging, and tracing."""
+import atexit
+import contextvars
+import copy
 import json
 import logging
+import queue
 import time
 import uuid
 from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, AsyncGenerator, Dict, Optional
 
 from prometheus_client import (
@@ -52,6 +58,20 @@ validation_fail_counter = Counter(
     registry=REGISTRY,
 )
 
+validation_round_trips_avoided_counter = Counter(
+    "text2dsl_validation_round_trips_avoided_total",
+    "Queries rejected by local static analysis without a database round trip",
+    ["provider_type"],
+    registry=REGISTRY,
+)
+
+cost_guard_decisions_counter = Counter(
+    "text2dsl_cost_guard_decisions_total",
+    "Pre-execution cost guardrail decisions",
+    ["provider_type", "decision"],  # decision: allowed, sampled, rejected, unestimated
+    registry=REGISTRY,
+)
+
 user_satisfaction_counter = Counter(
     "text2dsl_user_satisfaction_total",
     "Total user satisfaction ratings",
@@ -106,6 +126,49 @@ tokens_by_agent_counter = Counter(
     registry=REGISTRY,
 )
 
+llm_cache_saved_tokens_counter = Counter(
+    "text2dsl_llm_cache_saved_tokens_total",
+    "Tokens not spent because an LLM response was served from cache",
+    ["agent_type"],
+    registry=REGISTRY,
+)
+
+# LLM Gateway Metrics
+llm_calls_counter = Counter(
+    "text2dsl_llm_calls_total",
+    "LLM call attempts through the gateway by outcome",
+    ["model", "outcome"],  # outcome: success, throttled, error, rejected
+    registry=REGISTRY,
+)
+
+llm_concurrency_limit_gauge = Gauge(
+    "text2dsl_llm_concurrency_limit",
+    "Current adaptive concurrency limit per model",
+    ["model"],
+    registry=REGISTRY,
+)
+
+llm_in_flight_gauge = Gauge(
+    "text2dsl_llm_in_flight",
+    "LLM calls currently in flight per model",
+    ["model"],
+    registry=REGISTRY,
+)
+
+llm_circuit_state_gauge = Gauge(
+    "text2dsl_llm_circuit_state",
+    "LLM circuit breaker state per model (0=closed, 1=half_open, 2=open)",
+    ["model"],
+    registry=REGISTRY,
+)
+
+llm_tokens_available_gauge = Gauge(
+    "text2dsl_llm_tokens_available",
+    "Tokens left in the per-minute token bucket per model",
+    ["model"],
+    registry=REGISTRY,
+)
+
 # RAG Metrics
 rag_retrieval_counter = Counter(
     "text2dsl_rag_retrieval_total",
@@ -160,6 +223,50 @@ http_request_duration_histogram = Histogram(
     registry=REGISTRY,
 )
 
+# Cache Metrics
+cache_lookups_total = Counter(
+    "text2dsl_cache_lookups_total",
+    "Cache lookups by cache namespace, tier and result",
+    ["cache", "tier", "result"],  # tier: local, redis; result: hit, miss
+    registry=REGISTRY,
+)
+
+# Audit Trail Metrics
+audit_events_counter = Counter(
+    "text2dsl_audit_events_total",
+    "Audit trail events handled by the batched sink",
+    ["kind", "outcome"],  # kind: log, trace, cost; outcome: written, dropped
+    registry=REGISTRY,
+)
+
+audit_backpressure_counter = Counter(
+    "text2dsl_audit_backpressure_total",
+    "Audit events whose producer waited for space in the full sink queue",
+    registry=REGISTRY,
+)
+
+# Metadata Database Pool Metrics
+db_pool_connections_gauge = Gauge(
+    "text2dsl_db_pool_connections",
+    "Metadata database pool connections by state",
+    ["state"],  # state: checked_out, idle, overflow
+    registry=REGISTRY,
+)
+
+db_pool_checkouts_counter = Counter(
+    "text2dsl_db_pool_checkouts_total",
+    "Metadata database pool checkouts by outcome",
+    ["outcome"],  # outcome: success, timeout
+    registry=REGISTRY,
+)
+
+db_pool_wait_histogram = Histogram(
+    "text2dsl_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a metadata database connection",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+    registry=REGISTRY,
+)
+
 
 # ============================================================================
 # Metrics Helper Functions
@@ -184,6 +291,16 @@ def record_validation_result(provider_type: str, passed: bool) -> None:
         validation_fail_counter.labels(provider_type=provider_type).inc()
 
 
+def record_validation_round_trip_avoided(provider_type: str) -> None:
+    """Record a query rejected locally, before reaching the database."""
+    validation_round_trips_avoided_counter.labels(provider_type=provider_type).inc()
+
+
+def record_cost_guard_decision(provider_type: str, decision: str) -> None:
+    """Record a pre-execution cost guardrail decision."""
+    cost_guard_decisions_counter.labels(provider_type=provider_type, decision=decision).inc()
+
+
 def record_user_satisfaction(rating: int, is_correct: bool) -> None:
     """Record user satisfaction feedback."""
     user_satisfaction_counter.labels(
@@ -227,6 +344,35 @@ def record_tokens_by_agent(agent_type: str, token_type: str, count: int) -> None
     )
 
 
+def record_llm_cache_saved_tokens(agent_type: str, count: int) -> None:
+    """Record tokens saved by an LLM response cache hit."""
+    llm_cache_saved_tokens_counter.labels(agent_type=agent_type).inc(count)
+
+
+def record_llm_call(model: str, outcome: str) -> None:
+    """Record an LLM call attempt made through the gateway."""
+    llm_calls_counter.labels(model=model, outcome=outcome).inc()
+
+
+def set_llm_concurrency(model: str, limit: float, in_flight: int) -> None:
+    """Set the adaptive concurrency limit and calls in flight for a model."""
+    llm_concurrency_limit_gauge.labels(model=model).set(limit)
+    llm_in_flight_gauge.labels(model=model).set(in_flight)
+
+
+_CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+def set_llm_circuit_state(model: str, state: str) -> None:
+    """Set the circuit breaker state for a model."""
+    llm_circuit_state_gauge.labels(model=model).set(_CIRCUIT_STATE_VALUES.get(state, 0))
+
+
+def set_llm_tokens_available(model: str, tokens: float) -> None:
+    """Set the tokens left in a model's per-minute bucket."""
+    llm_tokens_available_gauge.labels(model=model).set(tokens)
+
+
 def record_rag_retrieval(provider_type: str) -> None:
     """Record RAG retrieval event."""
     rag_retrieval_counter.labels(provider_type=provider_type).inc()
@@ -268,6 +414,36 @@ def record_http_duration(method: str, endpoint: str, duration_seconds: float) ->
     )
 
 
+def record_cache_lookup(cache: str, tier: str, hit: bool) -> None:
+    """Record a cache lookup against one tier."""
+    cache_lookups_total.labels(
+        cache=cache, tier=tier, result="hit" if hit else "miss"
+    ).inc()
+
+
+def record_audit_events(kind: str, outcome: str, count: int = 1) -> None:
+    """Record audit trail events written or dropped by the sink."""
+    audit_events_counter.labels(kind=kind, outcome=outcome).inc(count)
+
+
+def record_audit_backpressure() -> None:
+    """Record a producer waiting for space in the audit sink queue."""
+    audit_backpressure_counter.inc()
+
+
+def record_db_pool_checkout(wait_seconds: float, timed_out: bool = False) -> None:
+    """Record one metadata database pool checkout and the time spent waiting."""
+    db_pool_checkouts_counter.labels(outcome="timeout" if timed_out else "success").inc()
+    db_pool_wait_histogram.observe(wait_seconds)
+
+
+def set_db_pool_connections(checked_out: int, idle: int, overflow: int) -> None:
+    """Set the metadata database pool connection gauges."""
+    db_pool_connections_gauge.labels(state="checked_out").set(checked_out)
+    db_pool_connections_gauge.labels(state="idle").set(idle)
+    db_pool_connections_gauge.labels(state="overflow").set(max(overflow, 0))
+
+
 def get_metrics() -> bytes:
     """Get Prometheus metrics in text format."""
     return generate_latest(REGISTRY)
@@ -283,18 +459,52 @@ def get_metrics_content_type() -> str:
 # ============================================================================
 
 
-class CorrelationIdFilter(logging.Filter):
-    """Add correlation ID to log records."""
+class LogContextFilter(logging.Filter):
+    """
+    Add the correlation ID and the current log context to log records.
+
+    Installed once on the root handler, so it only runs for records that
+    passed the level check. Fields passed with ``extra`` take precedence.
+    """
 
     def filter(self, record: logging.LogRecord) -> bool:
         if not hasattr(record, "correlation_id"):
-            record.correlation_id = get_correlation_id()
+            record.correlation_id = _correlation_id_var.get()
+        for key, value in _log_context_var.get().items():
+            if key not in record.__dict__:
+                setattr(record, key, value)
         return True
 
 
+class LogQueueHandler(QueueHandler):
+    """
+    Queue handler that keeps records structured for the JSON formatter.
+
+    ``QueueHandler.prepare`` renders records with a plain formatter; this
+    only merges the message arguments and renders the traceback into
+    ``exc_text``, which the JSON formatter outputs as ``exc_info``.
+    """
+
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
     """Custom JSON formatter with standard fields."""
 
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Format the record time in UTC (``time.strftime`` has no ``%f``)."""
+        created = datetime.fromtimestamp(record.created, tz=timezone.utc)
+        return created.strftime(datefmt) if datefmt else created.isoformat()
+
     def add_fields(
         self,
         log_record: Dict[str, Any],
@@ -327,16 +537,42 @@ class CustomJsonFormatter(jsonlogger.JsonFormatter):
             log_record["turn_id"] = record.turn_id
 
 
-def setup_json_logging(log_level: str = "INFO") -> None:
-    """Setup JSON logging configuration."""
+_log_listener: Optional[QueueListener] = None
+
+
+def setup_json_logging(log_level: str = "INFO", use_queue: bool = False) -> None:
+    """
+    Setup JSON logging configuration.
+
+    Args:
+        log_level: Root logger level
+        use_queue: Hand records to a queue and format and write them on a
+            listener thread, so logging never blocks the event loop on I/O
+    """
+    global _log_listener
+
     formatter = CustomJsonFormatter(
         "%(timestamp)s %(level)s %(name)s %(message)s",
         datefmt="%Y-%m-%dT%H:%M:%S.%fZ",
     )
 
-    handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
-    handler.addFilter(CorrelationIdFilter())
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    stop_log_listener()
+    if use_queue:
+        handler: logging.Handler = LogQueueHandler(queue.SimpleQueue())
+        _log_listener = QueueListener(handler.queue, stream_handler)
+        _log_listener.start()
+    else:
+        handler = stream_handler
+    # Context is read in the logging thread, before records are queued
+    handler.addFilter(LogContextFilter())
+
+    # JSON logs never include thread or process details, so skip collecting them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
 
     # Configure root logger
     root_logger = logging.getLogger()
@@ -345,13 +581,19 @@ def setup_json_logging(log_level: str = "INFO") -> None:
     root_logger.setLevel(getattr(logging, log_level.upper()))
 
 
+@atexit.register
+def stop_log_listener() -> None:
+    """Write the records still queued and stop the logging listener thread."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
 # ============================================================================
 # Correlation ID Management
 # ============================================================================
 
-# Thread-local storage for correlation ID
-import contextvars
-
 _correlation_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
     "correlation_id", default=None
 )
@@ -390,47 +632,43 @@ def correlation_context(correlation_id: Optional[str] = None):
 # ============================================================================
 
 
+# Fields added to every log record, per asyncio task / thread (never mutated in place)
+_log_context_var: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar(
+    "log_context", default={}
+)
+
+
+def get_log_context() -> Dict[str, Any]:
+    """Get the fields added to log records in the current context."""
+    return _log_context_var.get()
+
+
 class LogContext:
-    """Context manager for enriching logs with additional fields."""
+    """
+    Context manager for enriching logs with additional fields.
+
+    Fields live in a context variable read by ``LogContextFilter``, so
+    concurrent requests never see each other's fields; nested contexts add to
+    (and may override) the enclosing one.
+    """
 
     def __init__(self, **kwargs: Any):
         self.context = kwargs
-        self.old_factory = None
+        self._token: Optional[contextvars.Token] = None
 
     def __enter__(self):
-        old_factory = logging.getLogRecordFactory()
-        self.old_factory = old_factory
-
-        def record_factory(*args, **kwargs):
-            record = old_factory(*args, **kwargs)
-            for key, value in self.context.items():
-                setattr(record, key, value)
-            return record
-
-        logging.setLogRecordFactory(record_factory)
+        self._token = _log_context_var.set({**_log_context_var.get(), **self.context})
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.old_factory:
-            logging.setLogRecordFactory(self.old_factory)
+        _log_context_var.reset(self._token)
 
 
 @asynccontextmanager
 async def async_log_context(**kwargs: Any) -> AsyncGenerator[None, None]:
     """Async context manager for enriching logs."""
-    old_factory = logging.getLogRecordFactory()
-
-    def record_factory(*args, **record_kwargs):
-        record = old_factory(*args, **record_kwargs)
-        for key, value in kwargs.items():
-            setattr(record, key, value)
-        return record
-
-    logging.setLogRecordFactory(record_factory)
-    try:
+    with LogContext(**kwargs):
         yield
-    finally:
-        logging.setLogRecordFactory(old_factory)
 
 
 # ============================================================================
@@ -461,6 +699,21 @@ def sanitize_endpoint(path: str) -> str:
     return path
 
 
+class _DefaultContextFilter(logging.Filter):
+    """Add a logger's default fields unless the record or log context sets them."""
+
+    def __init__(self, default_context: Dict[str, Any]):
+        super().__init__()
+        self.default_context = default_context
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context_var.get()
+        for key, value in self.default_context.items():
+            if key not in record.__dict__ and key not in context:
+                setattr(record, key, value)
+        return True
+
+
 def get_structured_logger(name: str, **default_context: Any) -> logging.Logger:
     """
     Get a logger with default context.
@@ -474,18 +727,9 @@ def get_structured_logger(name: str, **default_context: Any) -> logging.Logger:
     """
     logger = logging.getLogger(name)
 
+    for existing in [f for f in logger.filters if isinstance(f, _DefaultContextFilter)]:
+        logger.removeFilter(existing)
     if default_context:
-        old_factory = logging.getLogRecordFactory()
-
-        def record_factory(*args, **kwargs):
-            record = old_factory(*args, **kwargs)
-            for key, value in default_context.items():
-                if not hasattr(record, key):
-                    setattr(record, key, value)
-            return record
-
-        # Note: This modifies the global factory, which may not be ideal
-        # In production, consider using a custom logger class
-        logging.setLogRecordFactory(record_factory)
+        logger.addFilter(_DefaultContextFilter(default_context))
 
     return logger
@@ -184,6 +184,148 @@ class TestQueryAgentStrands:
         assert "id" in prompt
         assert "integer" in prompt
 
+    @pytest.mark.asyncio
+    async def test_stream_yields_tokens_tools_and_result(self):
+        """Test stream() turns Strands events into token, tool and result events."""
+        from text2x.agentcore.agents.query.strands_agent import QueryAgent
+
+        agent = QueryAgent(model=MagicMock())
+        strands_events = [
+            {"data": "Here:\n```sql\nSELECT"},
+            {"current_tool_use": {"toolUseId": "t1", "name": "validate_query", "input": ""}},
+            {"current_tool_use": {"toolUseId": "t1", "name": "validate_query", "input": "{}"}},
+            {"message": {"role": "user", "content": [
+                {"toolResult": {"toolUseId": "t1", "status": "success", "content": []}},
+            ]}},
+            {"data": " 1\n```"},
+            {"result": "Here:\n```sql\nSELECT 1\n```"},
+        ]
+
+        async def stream_async(prompt):
+            for event in strands_events:
+                yield event
+
+        agent.agent = MagicMock(stream_async=stream_async)
+        events = [event async for event in agent.stream({"user_message": "one"})]
+
+        assert [event["type"] for event in events] == [
+            "token", "tool_started", "tool_finished", "token", "result",
+        ]
+        assert events[0]["partial_query"] == "SELECT"
+        assert events[2]["tool"] == "validate_query"
+        assert events[3]["partial_query"] == "SELECT 1"
+        result = events[-1]["result"]
+        assert result["generated_query"] == "SELECT 1"
+        assert result["tool_calls"] == [
+            {"tool": "validate_query", "tool_use_id": "t1", "result": "success"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_execute_query_tool_records_jobs_in_the_query_scope(self):
+        """Test a search job started by the tool is collected by the caller's scope."""
+        from text2x.agentcore.agents.query.strands_agent import (
+            QueryToolContext,
+            execute_query,
+            set_query_context,
+        )
+        from text2x.providers.base import ExecutionResult, record_search_job, search_job_scope
+        from text2x.services.cost_guard import CostBudget
+
+        async def run_search(query, limit=None):
+            record_search_job("sid1")
+            return ExecutionResult(success=True, row_count=0, columns=[], sample_rows=[])
+
+        provider = MagicMock()
+        provider.cost_budget = CostBudget(enabled=False)
+        provider.execute_query = AsyncMock(side_effect=run_search)
+        set_query_context(QueryToolContext(provider=provider, enable_execution=True))
+
+        with search_job_scope() as sids:
+            # As Strands runs the tool during agent.stream_async()
+            events = [
+                event async for event in execute_query.stream(
+                    {"toolUseId": "t1", "name": "execute_query", "input": {"query": "search x"}}, {}
+                )
+            ]
+
+        assert events[-1].tool_result["status"] == "success"
+        assert sids == {"sid1"}
+
+    @pytest.mark.asyncio
+    async def test_execute_query_tool_guards_cost_without_blocking_the_loop(self):
+        """Test the cost guard is awaited on the running loop, which stays free meanwhile."""
+        import asyncio
+
+        from text2x.agentcore.agents.query.strands_agent import (
+            QueryToolContext,
+            execute_query,
+            set_query_context,
+        )
+        from text2x.providers.base import PlanEstimate, ProviderCapability
+        from text2x.services.cost_guard import CostBudget
+
+        released = asyncio.Event()
+
+        async def estimate(query):
+            # Only returns if the loop keeps running other tasks while the tool waits
+            await released.wait()
+            return PlanEstimate(estimated_rows=10_000_000)
+
+        provider = MagicMock()
+        provider.cost_budget = CostBudget(max_estimated_rows=1000)
+        provider.get_capabilities.return_value = [ProviderCapability.COST_ESTIMATION]
+        provider.get_query_language.return_value = "SQL"
+        provider.limit_query.side_effect = lambda query, limit: query
+        provider.estimate_cost = AsyncMock(side_effect=estimate)
+        provider.execute_query = AsyncMock()
+        set_query_context(QueryToolContext(provider=provider, enable_execution=True))
+
+        asyncio.get_running_loop().call_later(0.05, released.set)
+        result = await asyncio.wait_for(execute_query("SELECT * FROM orders"), timeout=5)
+
+        assert not result["success"] and result["cost_guard"]["decision"] == "rejected"
+        provider.execute_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_validate_query_tool_uses_the_validation_cache(self):
+        """Test validate_query awaits the validation cache when Strands runs it."""
+        from text2x.agentcore.agents.query.strands_agent import (
+            QueryToolContext,
+            set_query_context,
+            validate_query,
+        )
+        from text2x.providers.base import ValidationResult
+
+        provider = MagicMock()
+        set_query_context(QueryToolContext(provider=provider))
+        cache = MagicMock()
+        cache.validate = AsyncMock(return_value=ValidationResult(valid=True, warnings=["cached"]))
+
+        with patch("text2x.services.validation_cache.get_validation_cache", return_value=cache):
+            events = [
+                event async for event in validate_query.stream(
+                    {"toolUseId": "t1", "name": "validate_query", "input": {"query": "SELECT 1"}}, {}
+                )
+            ]
+
+        cache.validate.assert_awaited_once_with(provider, "SELECT 1")
+        assert events[-1].tool_result["status"] == "success"
+        assert '"cached"' in events[-1].tool_result["content"][0]["text"]
+
+    def test_partial_sql_is_reported_at_boundaries(self):
+        """Test the SQL block is followed across deltas and reported at boundaries."""
+        from text2x.agentcore.agents.query.strands_agent import PartialSQLTracker
+
+        tracker = PartialSQLTracker()
+        deltas = ["Here:\n``", "`SQL\nSELECT", " id", " FROM t\n", "WHERE x`", "``\n", "done\n"]
+        reported = [tracker.feed(delta) for delta in deltas]
+
+        assert reported == [
+            None, "SELECT", None, "SELECT id FROM t", None, "SELECT id FROM t\nWHERE x", None
+        ]
+        assert tracker.closed
+        assert tracker.query == "SELECT id FROM t\nWHERE x"
+
 
 class TestStrandsRuntimeCreation:
     """Tests for Strands runtime creation."""
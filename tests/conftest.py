@@ -0,0 +1,66 @@
+"""Shared fixtures for unit tests."""
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import text2x.models.base as models_base
+from text2x.models.base import DatabaseConfig, DatabaseSession
+
+
+@pytest_asyncio.fixture
+async def sqlite_db(monkeypatch):
+    """
+    Factory for the global DatabaseSession on in-memory SQLite.
+
+    ``await sqlite_db(*tables, ddl=(), savepoints=False)`` creates the tables
+    (in order), runs the extra DDL statements and installs the session as
+    ``get_db()``. It records the first keyword of every statement executed
+    in ``db.statements`` and counts commits in ``db.commits``; both start
+    empty after setup. With ``savepoints`` the driver's deferred BEGIN is
+    replaced by an explicit one, which savepoints need to roll back.
+    """
+    engines = []
+
+    async def create(*tables, ddl=(), savepoints=False) -> DatabaseSession:
+        db = DatabaseSession(DatabaseConfig())
+        db.engine = create_async_engine(
+            "sqlite+aiosqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+        )
+        db.session_factory = async_sessionmaker(db.engine, expire_on_commit=False)
+        engines.append(db.engine)
+        db.statements = []
+        db.commits = 0
+
+        def record_statement(conn, cursor, statement, parameters, context, executemany):
+            db.statements.append(statement.split()[0].upper())
+
+        def count_commit(conn):
+            db.commits += 1
+
+        if savepoints:
+            def disable_driver_transactions(dbapi_connection, connection_record):
+                dbapi_connection.isolation_level = None
+
+            def begin(conn):
+                conn.exec_driver_sql("BEGIN")
+
+            event.listen(db.engine.sync_engine, "connect", disable_driver_transactions)
+            event.listen(db.engine.sync_engine, "begin", begin)
+
+        def create_tables(conn):
+            for table in tables:
+                table.create(conn)
+
+        async with db.engine.begin() as conn:
+            await conn.run_sync(create_tables)
+            for statement in ddl:
+                await conn.execute(text(statement))
+        event.listen(db.engine.sync_engine, "before_cursor_execute", record_statement)
+        event.listen(db.engine.sync_engine, "commit", count_commit)
+        monkeypatch.setattr(models_base, "_db_session", db)
+        return db
+
+    yield create
+    for engine in engines:
+        await engine.dispose()
@@ -0,0 +1,264 @@
+"""Local stand-in for the Splunk REST API used by the Splunk provider tests"""
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+ATOM_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:s="http://dev.splunk.com/ns/rest">
+  <title>{title}</title>
+  {entries}
+</feed>"""
+
+ATOM_ENTRY = """<entry>
+    <title>{name}</title>
+    <id>http://localhost/servicesNS/nobody/search/{path}/{name}</id>
+    <link href="/servicesNS/nobody/search/{path}/{name}" rel="alternate"/>
+    <content type="text/xml"><s:dict>{keys}</s:dict></content>
+  </entry>"""
+
+INDEXES = {
+    "main": {"totalEventCount": "1000", "currentDBSizeMB": "50"},
+    "web": {"totalEventCount": "200", "currentDBSizeMB": "5"},
+    "_internal": {"totalEventCount": "10", "currentDBSizeMB": "1"},
+    "_thefishbucket": {"totalEventCount": "1", "currentDBSizeMB": "1"},
+}
+
+SOURCETYPES = [
+    {"index": "main", "sourcetype": "syslog"},
+    {"index": "main", "sourcetype": "access_combined"},
+    {"index": "web", "sourcetype": "access_combined"},
+    {"index": "_internal", "sourcetype": "splunkd"},
+]
+
+FIELDS = {
+    "syslog": [{"field": "process", "count": "10", "numeric_count": "0", "distinct_count": "4"}],
+    "access_combined": [
+        {"field": "status", "count": "10", "numeric_count": "10", "distinct_count": "5"},
+        {"field": "uri", "count": "10", "numeric_count": "0", "distinct_count": "9"},
+        {"field": "_cd", "count": "10", "numeric_count": "0", "distinct_count": "10"},
+    ],
+    "splunkd": [{"field": "component", "count": "10", "numeric_count": "0", "distinct_count": "3"}],
+}
+
+
+def _atom(title, path, entries):
+    """Render an Atom feed of entities"""
+    return ATOM_FEED.format(
+        title=title,
+        entries="".join(
+            ATOM_ENTRY.format(
+                name=name,
+                path=path,
+                keys="".join(f'<s:key name="{k}">{v}</s:key>' for k, v in content.items()),
+            )
+            for name, content in entries.items()
+        ),
+    )
+
+
+EVENT_ROWS = [
+    {"_time": f"2024-01-01T00:00:{i:02d}", "host": f"web{i % 3}", "status": "500"}
+    for i in range(25)
+]
+
+
+class SplunkStandIn:
+    """Records the requests made to the stand-in and controls its behaviour"""
+
+    def __init__(self, tstats_enabled=True, job_delay=0.0, polls_until_done=3):
+        self.tstats_enabled = tstats_enabled
+        self.job_delay = job_delay
+        self.polls_until_done = polls_until_done
+        self.session_valid = True
+        self.logins = 0
+        self.searches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.results = {}
+        self.jobs = {}
+        self.status_polls = 0
+        self.result_requests = []
+        self.cancelled = []
+        self.lock = threading.Lock()
+
+    def run_search(self, query):
+        """Create a job for a search and return its sid, or None if it is rejected"""
+        with self.lock:
+            self.searches.append(query)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            sid = f"sid{len(self.searches)}"
+        try:
+            time.sleep(self.job_delay)
+            if query.startswith("| tstats"):
+                if not self.tstats_enabled:
+                    return None
+                rows = SOURCETYPES
+            elif query.startswith("| metadata"):
+                index = re.search(r"index=(\S+)", query).group(1)
+                rows = [
+                    {"sourcetype": row["sourcetype"]} for row in SOURCETYPES if row["index"] == index
+                ]
+            elif "fieldsummary" in query:
+                sourcetype = re.search(r'sourcetype="([^"]+)"', query).group(1)
+                rows = FIELDS.get(sourcetype, [])
+            elif "badcommand" in query:
+                return None
+            else:
+                rows = EVENT_ROWS
+            with self.lock:
+                self.results[sid] = rows
+                self.jobs[sid] = {"polls": 0, "failed": "failing" in query}
+            return sid
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def job_content(self, sid):
+        """Advance a job by one poll and return its status content, or None if it is gone"""
+        with self.lock:
+            job = self.jobs.get(sid)
+            if job is None or sid in self.cancelled:
+                return None
+            self.status_polls += 1
+            job["polls"] += 1
+            done = job["polls"] >= self.polls_until_done
+            content = {
+                "sid": sid,
+                "dispatchState": "DONE" if done else "RUNNING",
+                "doneProgress": min(job["polls"] / self.polls_until_done, 1.0),
+                "eventCount": len(self.results[sid]),
+                "resultCount": len(self.results[sid]) if done else 0,
+                "scanCount": 100,
+                "runDuration": 0.1,
+                "isFailed": False,
+                "messages": [],
+            }
+            if job["failed"] and done:
+                content.update(
+                    dispatchState="FAILED",
+                    isFailed=True,
+                    messages=[{"type": "FATAL", "text": "Search failed on indexer"}],
+                )
+            return content
+
+    def handler(self):
+        """Build a request handler class bound to this stand-in"""
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body, content_type="text/xml"):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_json(self, status, body):
+                self._send(status, json.dumps(body), content_type="application/json")
+
+            def _form(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return parse_qs(self.rfile.read(length).decode("utf-8"))
+
+            def _authorized(self):
+                if self.path.startswith("/services/auth/login"):
+                    return True
+                has_session = self.headers.get("Authorization") or self.headers.get("Cookie")
+                if has_session and stand_in.session_valid:
+                    return True
+                self._send_json(401, {"messages": [{"type": "WARN", "text": "call not properly authenticated"}]})
+                return False
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                url = urlparse(self.path)
+                path = url.path
+                query = parse_qs(url.query)
+                job_match = re.search(r"/search/jobs/([^/]+)(/results)?$", path)
+                if path == "/services/server/info":
+                    self._send(200, _atom("server-info", "server/info", {"server-info": {"version": "9.1.0"}}))
+                elif path.rstrip("/").endswith("/data/indexes"):
+                    self._send(200, _atom("indexes", "data/indexes", INDEXES))
+                elif job_match and job_match.group(2):
+                    sid = job_match.group(1)
+                    offset = int(query.get("offset", ["0"])[0])
+                    count = int(query.get("count", ["100"])[0])
+                    with stand_in.lock:
+                        stand_in.result_requests.append((sid, offset, count))
+                    rows = stand_in.results.get(sid, [])
+                    rows = rows[offset:offset + count] if count else rows[offset:]
+                    fields = sorted({key for row in stand_in.results.get(sid, []) for key in row})
+                    self._send_json(
+                        200, {"preview": False, "fields": [{"name": f} for f in fields], "results": rows}
+                    )
+                elif job_match:
+                    content = stand_in.job_content(job_match.group(1))
+                    if content is None:
+                        self._send_json(404, {"messages": [{"type": "FATAL", "text": "Unknown sid"}]})
+                    else:
+                        self._send_json(200, {"entry": [{"name": content["sid"], "content": content}]})
+                else:
+                    self._send(404, "<response><messages/></response>")
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                path = urlparse(self.path).path
+                form = self._form()
+                if path == "/services/auth/login":
+                    with stand_in.lock:
+                        stand_in.logins += 1
+                        stand_in.session_valid = True
+                    self._send(200, "<response><sessionKey>session-key</sessionKey></response>")
+                elif re.search(r"/search/(v2/)?jobs/?$", path):
+                    sid = stand_in.run_search(form["search"][0])
+                    as_json = form.get("output_mode") == ["json"]
+                    if sid is None and as_json:
+                        self._send_json(400, {"messages": [{"type": "FATAL", "text": "Unknown search command"}]})
+                    elif sid is None:
+                        self._send(
+                            400,
+                            '<response><messages><msg type="FATAL">tstats not permitted</msg></messages></response>',
+                        )
+                    elif as_json:
+                        self._send_json(201, {"sid": sid})
+                    else:
+                        self._send(201, f"<response><sid>{sid}</sid></response>")
+                elif path.endswith("/results"):
+                    sid = path.split("/")[-2]
+                    body = json.dumps({"preview": False, "results": stand_in.results.get(sid, [])})
+                    self._send(200, body, content_type="application/json")
+                elif path.endswith("/control"):
+                    sid = path.split("/")[-2]
+                    if form.get("action") == ["cancel"]:
+                        with stand_in.lock:
+                            stand_in.cancelled.append(sid)
+                    self._send(200, "<response><messages/></response>")
+                else:
+                    self._send(404, "<response><messages/></response>")
+
+        return Handler
+
+
+@contextmanager
+def serve(stand_in):
+    """Serve a stand-in over HTTP on a free local port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), stand_in.handler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -8,6 +8,7 @@ from datetime import datetime
 from uuid import uuid4
 
 from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
 
 from text2x.models.base import Base, DatabaseConfig, init_db, close_db, get_db
 from text2x.models.workspace import Workspace, Provider, Connection, ProviderType, ConnectionStatus
@@ -18,7 +19,7 @@ from text2x.models.audit import AuditLog
 
 from text2x.repositories.annotation import SchemaAnnotationRepository
 from text2x.repositories.conversation import ConversationRepository, ConversationTurnRepository
-from text2x.repositories.rag import RAGExampleRepository
+from text2x.repositories.rag import RAGExampleRepository, _search_query
 from text2x.repositories.audit import AuditLogRepository
 
 from tests.config import TEST_POSTGRES_CONFIG
@@ -285,6 +286,51 @@ class TestSchemaAnnotationRepository:
         fetched = await annotation_repo.get_by_id(created.id)
         assert fetched is None
 
+    @pytest.mark.asyncio
+    async def test_upsert_many_inserts_and_updates(self, annotation_repo):
+        """Test bulk upsert updates existing targets instead of duplicating them."""
+        inserted = await annotation_repo.upsert_many(
+            "prov",
+            [
+                {"table_name": "orders", "description": "Orders"},
+                {"column_name": "orders.id", "description": "Order ID", "examples": ["1"]},
+            ],
+            created_by="admin",
+        )
+        assert len(inserted) == 2
+
+        updated = await annotation_repo.upsert_many(
+            "prov",
+            [{"column_name": "orders.id", "description": "Primary key", "sensitive": True}],
+            created_by="other",
+        )
+
+        assert len(updated) == 1
+        assert updated[0].description == "Primary key"
+        assert updated[0].sensitive is True
+        # Fields not supplied keep their previous values
+        assert updated[0].examples == ["1"]
+        assert updated[0].created_by == "admin"
+
+        results = await annotation_repo.list_by_provider("prov")
+        assert len(results) == 2
+
+    @pytest.mark.asyncio
+    async def test_list_by_columns(self, annotation_repo):
+        """Test fetching several column annotations in one query."""
+        await annotation_repo.upsert_many(
+            "prov",
+            [
+                {"table_name": "orders", "column_name": "id", "description": "ID"},
+                {"table_name": "orders", "column_name": "status", "description": "Status"},
+                {"table_name": "orders", "column_name": "total", "description": "Total"},
+            ],
+            created_by="admin",
+        )
+
+        results = await annotation_repo.list_by_columns("prov", "orders", ["id", "status"])
+        assert {r.column_name for r in results} == {"id", "status"}
+
 
 # ============================================================================
 # Conversation Repository Tests
@@ -585,6 +631,71 @@ class TestRAGExampleRepository:
         approved = await rag_repo.list_approved("prov")
         assert len(approved) == 1
 
+    @pytest.mark.asyncio
+    async def test_search_ranks_approved_examples(self, rag_repo):
+        """Test full-text and trigram search over approved examples."""
+        questions = [
+            ("total revenue per region", ["orders"]),
+            ("revenue of each product", ["products"]),
+            ("list all customers", ["customers"]),
+            ("average order value", ["orders"]),
+        ]
+        for question, tables in questions:
+            example = await rag_repo.create(
+                provider_id="prov",
+                natural_language_query=question,
+                generated_query="S",
+                involved_tables=tables,
+                query_intent="aggregation",
+                complexity_level="simple",
+            )
+            await rag_repo.mark_reviewed(example.id, "expert", approved=True)
+
+        results = await rag_repo.search("revenue by region", "prov")
+        assert [e.natural_language_query for e, _ in results[:2]] == [
+            "total revenue per region",
+            "revenue of each product",
+        ]
+        assert all(0 < score <= 1 for _, score in results)
+
+        results = await rag_repo.search("revenue", "prov", tables=["products"])
+        assert [e.natural_language_query for e, _ in results] == ["revenue of each product"]
+        assert await rag_repo.search("revenue", "prov", query_intent="filter") == []
+
+    def test_only_any_word_searches_are_capped(self):
+        """Test the any-word pass keeps its best text-ranked candidates."""
+        def compile(match_all):
+            stmt = _search_query("revenue by region", "prov", 5, match_all=match_all)
+            return str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "LIMIT" not in compile(True).split("ORDER BY")[0]
+        any_word = compile(False)
+        candidates = any_word[any_word.index("IN (SELECT"):]
+        assert "ORDER BY ts_rank_cd(" in candidates
+        assert candidates.index("LIMIT") < candidates.index(") ORDER BY score")
+
+    @pytest.mark.asyncio
+    async def test_search_matches_misspelled_questions(self, rag_repo):
+        """Test trigram similarity finds questions with typos."""
+        async with get_db().session() as session:
+            installed = await session.execute(
+                text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            )
+            if not installed.scalar():
+                pytest.skip("pg_trgm is not available")
+        example = await rag_repo.create(
+            provider_id="prov",
+            natural_language_query="list all customers",
+            generated_query="S",
+            involved_tables=["customers"],
+            query_intent="filter",
+            complexity_level="simple",
+        )
+        await rag_repo.mark_reviewed(example.id, "expert", approved=True)
+
+        results = await rag_repo.search("lst custmers", "prov")
+        assert [e.id for e, _ in results] == [example.id]
+
     @pytest.mark.asyncio
     async def test_delete_example(self, rag_repo):
         """Test deleting an example."""
@@ -869,3 +980,23 @@ class TestAuditLogRepository:
         
         fetched = await audit_repo.get_by_id(audit_log.id)
         assert fetched is None
+
+
+def test_rag_search_uses_indexed_operators():
+    """Test the search query is answerable from the GIN indexes."""
+    from sqlalchemy.dialects import postgresql
+
+    from text2x.repositories.rag import _search_query
+
+    stmt = _search_query("revenue by region", "prov", 5, tables=["orders"])
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "rag_examples.search_vector @@" in sql
+    assert "rag_examples.natural_language_query %%" in sql
+    assert "rag_examples.involved_tables &&" in sql
+    assert "ts_rank_cd(rag_examples.search_vector" in sql
+    assert "LIMIT" in sql
+
+    stmt = _search_query("revenue by region", "prov", 5, trigram=False)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "similarity(" not in sql and "%%" not in sql
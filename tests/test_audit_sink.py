@@ -0,0 +1,145 @@
+"""Tests for the batched audit trail sink"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from text2x.repositories.audit import _COST_UPDATE, _trace_update
+from text2x.services.audit_sink import AuditSink
+from text2x.utils.observability import REGISTRY
+
+
+class RecordingRepository:
+    """Stands in for AuditLogRepository.write_batch"""
+
+    def __init__(self, delay=0.0, failures=0, rejected=()):
+        self.batches = []
+        self.delay = delay
+        self.failures = failures
+        self.rejected = set(rejected)  # audit ids whose costs always fail
+
+    async def write_batch(self, entries, traces, costs):
+        await asyncio.sleep(self.delay)
+        if any(cost["audit_id"] in self.rejected for cost in costs):
+            raise RuntimeError("insert or update on table violates foreign key constraint")
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("insert or update on table violates foreign key constraint")
+        self.batches.append({"entries": entries, "traces": traces, "costs": costs})
+
+
+def written(kind, outcome="written"):
+    return REGISTRY.get_sample_value(
+        "text2dsl_audit_events_total", {"kind": kind, "outcome": outcome}
+    ) or 0
+
+
+def test_costs_are_incremented_in_the_database():
+    """Batched updates add deltas instead of writing back read values"""
+    costs = str(_COST_UPDATE.compile(dialect=postgresql.dialect()))
+    trace = str(_trace_update("validator").compile(dialect=postgresql.dialect()))
+
+    assert "total_tokens_input=(audit_logs.total_tokens_input + %(input_tokens)s" in costs
+    assert "total_cost_usd=(audit_logs.total_cost_usd + %(cost_usd)s)" in costs
+    assert "validator_latency_ms=coalesce(%(latency_ms)s" in trace
+
+
+@pytest.mark.asyncio
+async def test_events_are_coalesced_into_one_batch():
+    """A burst is written as one batch: costs summed, the latest trace per agent"""
+    repository = RecordingRepository()
+    sink = AuditSink(repository, batch_size=100, flush_interval_ms=50)
+    before = written("cost")
+    await sink.start()
+
+    audit_id = await sink.record_log(turn_id=uuid4(), user_input="q", metadata={"a": 1})
+    await sink.record_trace(audit_id, "schema", {"step": 1}, latency_ms=12)
+    await sink.record_trace(audit_id, "schema", {"step": 2})
+    for _ in range(3):
+        await sink.record_cost(audit_id, 100, 20, 0.01)
+    assert repository.batches == []  # nothing written on the caller's path
+
+    await asyncio.sleep(0.1)
+
+    assert len(repository.batches) == 1
+    batch = repository.batches[0]
+    assert batch["entries"][0]["id"] == audit_id
+    assert batch["entries"][0]["extra_metadata"] == {"a": 1}
+    assert batch["traces"] == {
+        "schema": [{"audit_id": audit_id, "trace_data": {"step": 2}, "latency_ms": 12}]
+    }
+    assert batch["costs"] == [
+        {"audit_id": audit_id, "input_tokens": 300, "output_tokens": 60,
+         "cost_usd": pytest.approx(0.03)}
+    ]
+    assert written("cost") == before + 3
+    await sink.stop()
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_and_producers_wait_when_full():
+    """Batches hold at most batch_size events; a full queue blocks producers"""
+    repository = RecordingRepository(delay=0.05)
+    sink = AuditSink(repository, batch_size=2, flush_interval_ms=1000, max_queue_size=2)
+    waits = REGISTRY.get_sample_value("text2dsl_audit_backpressure_total") or 0
+    await sink.start()
+
+    for _ in range(8):
+        await sink.record_cost(uuid4(), 1, 1, 0.0)
+    await sink.stop()
+
+    assert [len(batch["costs"]) for batch in repository.batches] == [2, 2, 2, 2]
+    assert REGISTRY.get_sample_value("text2dsl_audit_backpressure_total") > waits
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_queued_events():
+    """Shutdown writes events that were waiting for the flush interval"""
+    repository = RecordingRepository()
+    sink = AuditSink(repository, batch_size=100, flush_interval_ms=60_000)
+    await sink.start()
+
+    await sink.record_cost(uuid4(), 5, 5, 0.5)
+    await sink.stop()
+
+    assert len(repository.batches) == 1
+    assert not sink.running
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_retried_once_then_dropped():
+    """A transient failure is retried; a persistent one is dropped and counted"""
+    repository = RecordingRepository(failures=1)
+    sink = AuditSink(repository, batch_size=1, flush_interval_ms=10)
+    await sink.start()
+    await sink.record_cost(uuid4(), 1, 1, 0.0)
+    await sink.stop()
+    assert len(repository.batches) == 1
+
+    repository.failures = 2
+    dropped = written("trace", "dropped")
+    await sink.start()
+    await sink.record_trace(uuid4(), "validator", {})
+    await sink.stop()
+    assert len(repository.batches) == 1
+    assert written("trace", "dropped") == dropped + 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_split_to_drop_only_bad_events():
+    """After the retry, a batch is bisected so only the events that fail are dropped"""
+    bad = uuid4()
+    repository = RecordingRepository(rejected={bad})
+    sink = AuditSink(repository, batch_size=10, flush_interval_ms=10)
+    good = [uuid4() for _ in range(5)]
+    dropped = written("cost", "dropped")
+
+    await sink.start()
+    for audit_id in good[:2] + [bad] + good[2:]:
+        await sink.record_cost(audit_id, 1, 1, 0.0)
+    await sink.stop()
+
+    stored = [cost["audit_id"] for batch in repository.batches for cost in batch["costs"]]
+    assert stored == good
+    assert written("cost", "dropped") == dropped + 1
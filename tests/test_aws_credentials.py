@@ -0,0 +1,136 @@
+"""Tests for cached AWS credential resolution used by LiteLLMClient"""
+import os
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from text2x.llm.credentials import AWSCredentialProvider
+from text2x.llm.litellm_client import LiteLLMClient
+
+
+class FakeCredentials:
+    """botocore-style credentials with an optional expiry."""
+
+    def __init__(self, generation, expires_in=None):
+        self.generation = generation
+        if expires_in is not None:
+            self._expiry_time = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+
+    def get_frozen_credentials(self):
+        return SimpleNamespace(
+            access_key=f"AKID{self.generation}",
+            secret_key=f"secret{self.generation}",
+            token=f"token{self.generation}" if hasattr(self, "_expiry_time") else None,
+        )
+
+
+class FakeSession:
+    """boto3 session stand-in counting credential resolutions."""
+
+    def __init__(self, expires_in=None):
+        self.expires_in = expires_in
+        self.resolutions = 0
+
+    def get_credentials(self):
+        self.resolutions += 1
+        return FakeCredentials(self.resolutions, self.expires_in)
+
+
+def test_credentials_are_resolved_once():
+    """Repeated calls reuse the cached credentials"""
+    session = FakeSession()
+    provider = AWSCredentialProvider("us-west-2", session=session)
+
+    for _ in range(100):
+        kwargs = provider.litellm_kwargs()
+
+    assert session.resolutions == 1
+    assert kwargs == {
+        "aws_access_key_id": "AKID1",
+        "aws_secret_access_key": "secret1",
+        "aws_region_name": "us-west-2",
+    }
+
+
+def test_expiring_credentials_refresh_in_background():
+    """Within the advisory window the cached credentials are returned while a refresh runs"""
+    session = FakeSession(expires_in=600)
+    provider = AWSCredentialProvider(
+        "us-east-1", session=session, advisory_refresh=900, mandatory_refresh=60
+    )
+
+    assert provider.get_credentials().access_key == "AKID1"
+    session.expires_in = 3600
+    assert provider.get_credentials().access_key == "AKID1"
+
+    provider._refresh_thread.join(timeout=2)
+    assert session.resolutions == 2
+    assert provider.get_credentials().access_key == "AKID2"
+    assert provider.litellm_kwargs()["aws_session_token"] == "token2"
+
+
+def test_nearly_expired_credentials_refresh_before_returning():
+    """Within the mandatory window the caller waits for fresh credentials"""
+    session = FakeSession(expires_in=30)
+    provider = AWSCredentialProvider(
+        "us-east-1", session=session, advisory_refresh=900, mandatory_refresh=60
+    )
+    provider.get_credentials()
+
+    assert provider.get_credentials().access_key == "AKID2"
+
+
+@pytest.mark.asyncio
+async def test_client_passes_credentials_without_touching_environment():
+    """Bedrock calls get explicit credentials and os.environ is left alone"""
+    session = FakeSession()
+    client = LiteLLMClient(model="bedrock/test-model", region="us-west-2")
+    client.credentials = AWSCredentialProvider("us-west-2", session=session)
+    environ_before = dict(os.environ)
+
+    with patch("text2x.llm.litellm_client.acompletion", new=AsyncMock(return_value="ok")) as acompletion:
+        await client.acomplete([{"role": "user", "content": "hi"}])
+        await client.acomplete([{"role": "user", "content": "hi"}])
+
+    kwargs = acompletion.await_args.kwargs
+    assert kwargs["aws_access_key_id"] == "AKID1"
+    assert kwargs["aws_region_name"] == "us-west-2"
+    assert session.resolutions == 1
+    assert dict(os.environ) == environ_before
+
+
+def test_non_bedrock_client_gets_no_aws_credentials():
+    """Other providers only receive their API key"""
+    client = LiteLLMClient(model="openai/gpt-4o", api_key="sk-test")
+
+    assert client.credentials is None
+    assert client._request_kwargs({}) == {"api_key": "sk-test"}
+
+
+@pytest.mark.asyncio
+async def test_strands_model_passes_credentials_per_call():
+    """Each Strands model call gets the current credentials; the shared model is unchanged"""
+    from strands.models.litellm import LiteLLMModel
+
+    from text2x.agentcore.llm.strands_provider import GatewayLiteLLMModel
+
+    session = FakeSession()
+    model = GatewayLiteLLMModel(
+        model_id="bedrock/test-model",
+        client_args={"max_tokens": 10},
+        credentials=AWSCredentialProvider("us-west-2", session=session),
+    )
+    seen = []
+
+    async def fake_stream(self, messages, *args, **kwargs):
+        seen.append(self.client_args)
+        yield {"messageStop": {}}
+
+    with patch.object(LiteLLMModel, "stream", fake_stream):
+        async for _ in model.stream([{"role": "user", "content": [{"text": "hi"}]}]):
+            pass
+
+    assert model.client_args == {"max_tokens": 10}
+    assert seen == [{"max_tokens": 10, **model.credentials.litellm_kwargs()}]
@@ -0,0 +1,127 @@
+"""Tests for keyset-paginated conversation summaries"""
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy.exc import SQLAlchemyError
+
+from text2x.api.auth import User, get_current_user
+from text2x.api.routes import conversations
+from text2x.models.conversation import Conversation, ConversationStatus, ConversationTurn
+from text2x.repositories.conversation import ConversationRepository
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest_asyncio.fixture
+async def db(sqlite_db):
+    """Global DatabaseSession on in-memory SQLite, recording statements"""
+    return await sqlite_db(Conversation.__table__, ConversationTurn.__table__)
+
+
+async def add_conversation(db, user_id, updated_at, turns=0, status=ConversationStatus.ACTIVE):
+    async with db.session() as session:
+        conversation = Conversation(
+            user_id=user_id, provider_id="p1", status=status,
+            created_at=updated_at, updated_at=updated_at,
+        )
+        session.add(conversation)
+        await session.flush()
+        for number in range(1, turns + 1):
+            session.add(ConversationTurn(
+                conversation_id=conversation.id,
+                turn_number=number,
+                user_input=f"question {number}",
+                generated_query="SELECT 1",
+                confidence_score=0.9,
+                reasoning_trace={"steps": ["x" * 1000]},
+                schema_context={"tables": ["orders"]},
+            ))
+        return conversation.id
+
+
+@pytest.mark.asyncio
+async def test_pages_follow_the_keyset(db):
+    """Pages are ordered by (updated_at, id) desc and carry turn aggregates"""
+    ids = [
+        await add_conversation(db, "u1", START + timedelta(minutes=n // 2), turns=n)
+        for n in range(5)  # pairs share updated_at, so ties are broken by id
+    ]
+    await add_conversation(db, "u2", START, turns=1)
+    expected = sorted(
+        ids, key=lambda i: (START + timedelta(minutes=ids.index(i) // 2), i), reverse=True
+    )
+
+    repo = ConversationRepository()
+    seen, cursor = [], None
+    while True:
+        db.statements.clear()
+        page = await repo.list_summaries(user_id="u1", limit=2, cursor=cursor)
+        assert len(db.statements) == 2  # page + one aggregate query
+        seen.extend(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert [item.conversation.id for item in seen] == expected
+    by_id = {item.conversation.id: item for item in seen}
+    last = by_id[ids[4]]
+    assert last.turn_count == 4
+    assert last.last_turn.turn_number == 4 and last.last_turn.user_input == "question 4"
+    assert "reasoning_trace" not in last.last_turn.__dict__
+    assert by_id[ids[0]].turn_count == 0 and by_id[ids[0]].last_turn is None
+
+
+@pytest.mark.asyncio
+async def test_filters_and_invalid_cursor(db):
+    await add_conversation(db, "u1", START, status=ConversationStatus.COMPLETED)
+    await add_conversation(db, "u1", START + timedelta(minutes=1))
+    repo = ConversationRepository()
+
+    completed = await repo.list_by_user("u1", status=ConversationStatus.COMPLETED)
+    assert [item.conversation.status for item in completed] == [ConversationStatus.COMPLETED]
+
+    with pytest.raises(ValueError):
+        await repo.list_summaries(user_id="u1", cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_turn_details_are_deferred(db):
+    """Conversation details load turns without their large JSON columns"""
+    conversation_id = await add_conversation(db, "u1", START, turns=2)
+
+    conversation = await ConversationRepository().get_by_id(
+        conversation_id, with_turn_details=False
+    )
+
+    assert [turn.user_input for turn in conversation.turns] == ["question 1", "question 2"]
+    with pytest.raises(SQLAlchemyError):
+        _ = conversation.turns[0].reasoning_trace
+
+
+@pytest.mark.asyncio
+async def test_list_endpoint_returns_cursors(db):
+    for n in range(3):
+        await add_conversation(db, "u1", START + timedelta(minutes=n), turns=1)
+
+    app = FastAPI()
+    app.include_router(conversations.router, prefix="/api/v1")
+    app.dependency_overrides[get_current_user] = lambda: User(id="u1", email="u1@example.com")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = (await client.get("/api/v1/conversations", params={"limit": 2})).json()
+        second = (
+            await client.get(
+                "/api/v1/conversations", params={"limit": 2, "cursor": first["next_cursor"]}
+            )
+        ).json()
+        invalid = await client.get("/api/v1/conversations", params={"cursor": "bogus"})
+
+    assert len(first["conversations"]) == 2 and first["next_cursor"]
+    assert len(second["conversations"]) == 1 and second["next_cursor"] is None
+    assert first["conversations"][0]["last_user_input"] == "question 1"
+    assert first["conversations"][0]["turn_count"] == 1
+    assert invalid.status_code == 400
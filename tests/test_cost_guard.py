@@ -0,0 +1,185 @@
+"""Tests for pre-execution cost guardrails"""
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from text2x.agents.base import LLMConfig
+from text2x.agents.validator import ValidatorAgent
+from text2x.providers import (
+    MongoDBConnectionConfig,
+    NoSQLProvider,
+    PlanEstimate,
+    SQLProvider,
+    SQLConnectionConfig,
+)
+from text2x.providers.nosql_provider import _plan_stages
+from text2x.providers.sql_analysis import SQLStaticAnalyzer
+from text2x.services.cost_guard import (
+    ALLOWED,
+    REJECTED,
+    SAMPLED,
+    UNESTIMATED,
+    CostBudget,
+    CostGuard,
+)
+from text2x.utils.observability import REGISTRY
+from tests.config import TEST_POSTGRES_CONFIG
+
+CARTESIAN = PlanEstimate(
+    total_cost=4.2e9, estimated_rows=1_440_000_000, scanned_bytes=2_000_000, full_scans=["orders"]
+)
+
+
+def sql_provider(dialect="postgresql", estimate=CARTESIAN):
+    provider = SQLProvider(SQLConnectionConfig(**TEST_POSTGRES_CONFIG))
+    provider.config.dialect = dialect
+    provider.analyzer = SQLStaticAnalyzer(dialect)
+    provider.estimate_cost = AsyncMock(return_value=estimate)
+    return provider
+
+
+def test_workspace_settings_override_global_thresholds():
+    """Per-workspace thresholds take precedence; unknown actions reject"""
+    budget = CostBudget.from_settings(
+        {"cost_guardrails": {"max_estimated_rows": 1000, "action": "sample", "sample_percent": 5}}
+    )
+
+    assert budget.max_estimated_rows == 1000
+    assert budget.action == "sample" and budget.sample_percent == 5
+    assert CostBudget.from_settings({"cost_guardrails": {"action": "drop"}}).action == "reject"
+    assert budget.violations(PlanEstimate(estimated_rows=999, total_cost=1e12)) == []
+
+
+@pytest.mark.asyncio
+async def test_over_budget_query_is_rejected():
+    """Estimates over any threshold reject the query and are counted"""
+    provider = sql_provider()
+    before = REGISTRY.get_sample_value(
+        "text2dsl_cost_guard_decisions_total", {"provider_type": "SQL", "decision": "rejected"}
+    ) or 0
+
+    decision = await CostGuard().check(
+        provider, "SELECT * FROM orders, customers", CostBudget(max_estimated_rows=1_000_000)
+    )
+
+    assert decision.decision == REJECTED
+    assert "estimated rows 1,440,000,000 exceed the limit of 1,000,000" in decision.error
+    assert REGISTRY.get_sample_value(
+        "text2dsl_cost_guard_decisions_total", {"provider_type": "SQL", "decision": "rejected"}
+    ) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_postgres_samples_full_scans_with_tablesample():
+    """The sample action adds TABLESAMPLE to the fully scanned tables only"""
+    provider = sql_provider()
+    budget = CostBudget(max_scanned_bytes=1_000_000, action="sample", sample_percent=2)
+
+    decision = await CostGuard().check(
+        provider,
+        "WITH big AS (SELECT * FROM orders) SELECT * FROM big JOIN customers c ON c.id = big.customer_id",
+        budget,
+    )
+
+    assert decision.decision == SAMPLED and decision.allowed
+    assert "FROM orders TABLESAMPLE SYSTEM (2)" in decision.query
+    assert "customers AS c TABLESAMPLE" not in decision.query
+    assert "big TABLESAMPLE" not in decision.query
+
+
+@pytest.mark.asyncio
+async def test_dialects_without_tablesample_fall_back_to_rejection():
+    """MySQL cannot sample, so the sample action rejects"""
+    provider = sql_provider(dialect="mysql")
+
+    decision = await CostGuard().check(
+        provider, "SELECT * FROM orders", CostBudget(max_estimated_rows=10, action="sample")
+    )
+
+    assert decision.decision == REJECTED
+
+
+@pytest.mark.asyncio
+async def test_within_budget_and_unestimated_queries_run():
+    """Cheap queries and providers without estimates are allowed"""
+    budget = CostBudget(max_estimated_rows=100)
+    cheap = await CostGuard().check(sql_provider(estimate=PlanEstimate(estimated_rows=10)), "SELECT 1", budget)
+    unknown = await CostGuard().check(sql_provider(estimate=None), "SELECT 1", budget)
+
+    assert cheap.decision == ALLOWED
+    assert unknown.decision == UNESTIMATED and unknown.allowed
+
+
+def test_mongodb_plan_and_sample():
+    """COLLSCAN in the winning plan is a full scan; sampling prepends $sample"""
+    explained = {
+        "queryPlanner": {
+            "winningPlan": {"stage": "PROJECTION", "inputStage": {"stage": "COLLSCAN"}},
+            "rejectedPlans": [{"stage": "IXSCAN"}],
+        }
+    }
+    provider = NoSQLProvider(
+        MongoDBConnectionConfig(connection_string="mongodb://localhost:27017", database="db")
+    )
+    query = json.dumps({"collection": "events", "filter": {"type": "click"}, "sort": {"ts": -1}})
+
+    sampled = json.loads(provider.sample_query(query, 1, PlanEstimate(estimated_rows=50_000)))
+
+    assert _plan_stages(explained) == ["PROJECTION", "COLLSCAN"]
+    assert sampled["operation"] == "aggregate"
+    assert sampled["pipeline"] == [
+        {"$sample": {"size": 500}},
+        {"$match": {"type": "click"}},
+        {"$sort": {"ts": -1}},
+    ]
+
+
+def test_mongodb_limits_are_kept():
+    """The execution limit is applied to the query checked, and sampling keeps it"""
+    provider = NoSQLProvider(
+        MongoDBConnectionConfig(connection_string="mongodb://localhost:27017", database="db")
+    )
+    find = json.dumps({"collection": "events", "filter": {"type": "click"}, "limit": 20})
+    aggregate = json.dumps({"collection": "events", "operation": "aggregate", "pipeline": []})
+
+    assert json.loads(provider.limit_query(find, 100))["limit"] == 20
+    assert json.loads(provider.limit_query(find, 10))["limit"] == 10
+    assert json.loads(provider.limit_query(aggregate, 100))["pipeline"] == [{"$limit": 100}]
+
+    sampled = json.loads(provider.sample_query(find, 1, PlanEstimate(estimated_rows=50_000)))
+    assert sampled["pipeline"][-1] == {"$limit": 20}
+
+
+@pytest.mark.asyncio
+async def test_limited_query_is_estimated():
+    """The guard estimates the query in the limited form it is executed in"""
+    provider = sql_provider(estimate=PlanEstimate(total_cost=12.0, estimated_rows=100))
+
+    decision = await CostGuard().check(
+        provider,
+        "SELECT * FROM orders",
+        CostBudget(max_estimated_rows=1_000_000),
+        estimate=CARTESIAN,
+        limit=100,
+    )
+
+    assert decision.decision == ALLOWED
+    assert decision.query == "SELECT * FROM orders LIMIT 101"
+    provider.estimate_cost.assert_awaited_once_with("SELECT * FROM orders LIMIT 101")
+
+
+@pytest.mark.asyncio
+async def test_validator_does_not_execute_rejected_queries():
+    """ValidatorAgent checks the validation estimate of an already limited query"""
+    provider = sql_provider()
+    provider.cost_budget = CostBudget(max_estimated_rows=1000)
+    validator = ValidatorAgent(LLMConfig(model="test-model", use_litellm=False), provider)
+
+    with patch.object(provider, "execute_query", new=AsyncMock()) as execute:
+        result = await validator._execute_query("SELECT * FROM orders, customers LIMIT 50", CARTESIAN)
+
+    assert not result.success and "cost budget" in result.error
+    execute.assert_not_called()
+    provider.estimate_cost.assert_not_called()
+    assert validator.get_traces()[-1].step == "cost_guard"
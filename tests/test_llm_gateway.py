@@ -0,0 +1,242 @@
+"""Tests for the LLM gateway (adaptive concurrency, token bucket, retries, circuit breaker)"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from text2x.services.llm_gateway import (
+    AIMDLimiter,
+    CircuitOpenError,
+    GatewayConfig,
+    LLMGateway,
+    TokenBucket,
+    is_retryable_error,
+    is_throttling_error,
+    retry_after_seconds,
+)
+from text2x.utils.observability import REGISTRY
+
+
+class ProviderError(Exception):
+    """Provider error carrying an HTTP status and optional Retry-After."""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class RateLimitError(Exception):
+    """Named like litellm's throttling error, without a status code."""
+
+
+def make_gateway(**overrides):
+    config = dict(
+        initial_concurrency=2,
+        max_concurrency=4,
+        max_retries=3,
+        backoff_base=0.001,
+        backoff_max=1.0,
+        circuit_failure_threshold=2,
+        circuit_reset_timeout=0.1,
+    )
+    config.update(overrides)
+    return LLMGateway(GatewayConfig(**config))
+
+
+# ============================================================================
+# Error Classification Tests
+# ============================================================================
+
+
+def test_throttling_is_detected_through_wrapping():
+    """Adapters wrap provider errors; the cause is still classified"""
+    try:
+        try:
+            raise RateLimitError("slow down")
+        except RateLimitError as e:
+            raise RuntimeError("LiteLLM invocation failed") from e
+    except RuntimeError as wrapped:
+        assert is_throttling_error(wrapped)
+        assert is_retryable_error(wrapped)
+
+    assert is_throttling_error(ProviderError(429))
+    assert is_retryable_error(ProviderError(503))
+    assert not is_retryable_error(ProviderError(400))
+    assert retry_after_seconds(ProviderError(429, retry_after="2")) == 2.0
+
+
+# ============================================================================
+# Limiter Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_aimd_limit_adapts():
+    """Successes grow the limit additively; throttling halves it"""
+    limiter = AIMDLimiter(initial_limit=4, max_limit=8)
+
+    for _ in range(4):
+        await limiter.acquire()
+        limiter.release("success")
+    assert limiter.limit == pytest.approx(5, abs=0.1)
+
+    await limiter.acquire()
+    limiter.release("throttled")
+    assert limiter.limit == pytest.approx(2.5, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped():
+    """No more calls run at once than the model's limit"""
+    gateway = make_gateway()
+    running = 0
+    peak = 0
+
+    async def invoke():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(gateway.call("m", invoke) for _ in range(10)))
+
+    assert results == ["ok"] * 10
+    assert peak <= 3  # starts at 2, may grow to 3 as calls succeed
+
+
+@pytest.mark.asyncio
+async def test_slot_is_handed_to_another_event_loop():
+    """A waiter on one loop is woken by a release on another"""
+    limiter = AIMDLimiter(initial_limit=1)
+    await limiter.acquire()
+    acquired = threading.Event()
+
+    def other_loop():
+        asyncio.run(limiter.acquire())
+        acquired.set()
+
+    thread = threading.Thread(target=other_loop)
+    thread.start()
+    await asyncio.sleep(0.05)
+    assert not acquired.is_set()
+
+    limiter.release("success")
+    thread.join(timeout=2)
+    assert acquired.is_set()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_calls():
+    """Once the per-minute budget is spent, calls wait for it to refill"""
+    bucket = TokenBucket(tokens_per_minute=600)  # 10 tokens/s
+    await bucket.acquire(600)
+
+    start = time.monotonic()
+    await bucket.acquire(3)
+    assert time.monotonic() - start >= 0.25
+
+    bucket.settle(estimated=500, actual=100)
+    assert bucket.available() >= 399
+
+
+# ============================================================================
+# Retry Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_throttled_call_is_retried_after_retry_after():
+    """A 429 shrinks the limit and the retry waits for Retry-After"""
+    gateway = make_gateway(initial_concurrency=4)
+    attempts = []
+
+    async def invoke():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise ProviderError(429, retry_after=0.2)
+        return "ok"
+
+    assert await gateway.call("m", invoke) == "ok"
+    assert attempts[1] - attempts[0] >= 0.2
+    assert gateway.limits("m").limiter.limit < 4
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    """A bad request fails immediately"""
+    gateway = make_gateway()
+    calls = 0
+
+    async def invoke():
+        nonlocal calls
+        calls += 1
+        raise ProviderError(400)
+
+    with pytest.raises(ProviderError):
+        await gateway.call("m", invoke)
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_is_retried_only_before_first_event():
+    """A stream that fails before yielding is retried; after yielding it is not"""
+    gateway = make_gateway()
+    opened = 0
+
+    async def failing_then_ok():
+        nonlocal opened
+        opened += 1
+        if opened == 1:
+            raise ProviderError(503)
+        yield {"data": "a"}
+        yield {"metadata": {"usage": {"totalTokens": 7}}}
+
+    events = [event async for event in gateway.stream("m", failing_then_ok)]
+    assert opened == 2 and len(events) == 2
+
+    async def fails_midway():
+        yield {"data": "a"}
+        raise ProviderError(503)
+
+    with pytest.raises(ProviderError):
+        async for _ in gateway.stream("m2", fails_midway):
+            pass
+
+
+# ============================================================================
+# Circuit Breaker Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_recovers():
+    """Repeated failures fast-fail further calls until a probe succeeds"""
+    gateway = make_gateway(max_retries=1)
+    healthy = False
+    calls = 0
+
+    async def invoke():
+        nonlocal calls
+        calls += 1
+        if not healthy:
+            raise ProviderError(500)
+        return "ok"
+
+    for _ in range(2):
+        with pytest.raises(ProviderError):
+            await gateway.call("m", invoke)
+
+    with pytest.raises(CircuitOpenError):
+        await gateway.call("m", invoke)
+    assert calls == 2
+    assert REGISTRY.get_sample_value("text2dsl_llm_circuit_state", {"model": "m"}) == 2
+
+    await asyncio.sleep(0.1)
+    healthy = True
+    assert await gateway.call("m", invoke) == "ok"
+    assert gateway.limits("m").breaker.state.value == "closed"
+    assert REGISTRY.get_sample_value("text2dsl_llm_circuit_state", {"model": "m"}) == 0
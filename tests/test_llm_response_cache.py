@@ -0,0 +1,151 @@
+"""Tests for the LLM response cache and its use in BaseAgent.invoke_llm"""
+import pytest
+from unittest.mock import AsyncMock
+
+from text2x.agents.base import BaseAgent, LLMConfig, LLMMessage, LLMResponse
+from text2x.services.llm_response_cache import LLMResponseCache
+from text2x.services.tiered_cache import TieredCache
+from tests.test_tiered_cache import FakeRedis
+
+
+class CachingAgent(BaseAgent):
+    """Agent that opts in to response caching"""
+
+    llm_cache_enabled = True
+
+    async def process(self, input_data):
+        response = await self.invoke_llm(
+            [LLMMessage(role="user", content=input_data["question"])],
+            temperature=input_data.get("temperature", 0.0),
+        )
+        self.add_trace("answer", input_data, {"answer": response.content}, 1.0)
+        return {"answer": response.content}
+
+
+class PlainAgent(CachingAgent):
+    """Agent that keeps the default (no caching)"""
+
+    llm_cache_enabled = False
+
+
+@pytest.fixture
+def fake_redis():
+    """In-memory Redis stand-in."""
+    return FakeRedis()
+
+
+@pytest.fixture
+def response_cache(fake_redis):
+    """Response cache backed by the fake Redis."""
+    return LLMResponseCache(TieredCache("llm-test", ttl=60, redis_client=fake_redis))
+
+
+def make_agent(agent_class, response_cache):
+    """Build an agent whose LLM client is mocked."""
+    agent = agent_class(LLMConfig(model="test-model", use_litellm=False))
+    agent.llm_response_cache = response_cache
+    agent.llm_client.invoke = AsyncMock(
+        return_value=LLMResponse(content="orders", tokens_used=120, model="test-model", finish_reason="stop")
+    )
+    return agent
+
+
+# ============================================================================
+# Key Tests
+# ============================================================================
+
+
+def test_key_depends_on_request():
+    """Different prompts or parameters produce different keys"""
+    messages = [{"role": "user", "content": "which table?"}]
+    key = LLMResponseCache.make_key("m", messages, 0.0, 100)
+
+    assert key == LLMResponseCache.make_key("m", list(messages), 0, 100)
+    assert key != LLMResponseCache.make_key("m", messages, 0.0, 200)
+    assert key != LLMResponseCache.make_key("other", messages, 0.0, 100)
+    assert key != LLMResponseCache.make_key("m", [{"role": "user", "content": "which column?"}], 0.0, 100)
+
+
+def test_only_temperature_zero_is_cacheable():
+    """Sampling at a non-zero temperature is never cached"""
+    assert LLMResponseCache.is_cacheable(0.0)
+    assert not LLMResponseCache.is_cacheable(0.1)
+    assert not LLMResponseCache.is_cacheable(None)
+
+
+# ============================================================================
+# Agent Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_repeat_call_is_served_from_cache(response_cache):
+    """The second identical temperature-0 call does not reach the LLM"""
+    agent = make_agent(CachingAgent, response_cache)
+
+    first = await agent.process({"question": "which table has orders?"})
+    second = await agent.process({"question": "which table has orders?"})
+
+    assert first == second == {"answer": "orders"}
+    assert agent.llm_client.invoke.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_is_shared_between_agent_instances(response_cache):
+    """A response cached by one agent instance serves another"""
+    await make_agent(CachingAgent, response_cache).process({"question": "q"})
+
+    agent = make_agent(CachingAgent, response_cache)
+    await agent.process({"question": "q"})
+
+    agent.llm_client.invoke.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_non_zero_temperature_is_not_cached(response_cache):
+    """Calls at temperature > 0 always reach the LLM"""
+    agent = make_agent(CachingAgent, response_cache)
+
+    await agent.process({"question": "q", "temperature": 0.1})
+    await agent.process({"question": "q", "temperature": 0.1})
+
+    assert agent.llm_client.invoke.await_count == 2
+    assert "llm_cache" not in agent.get_traces()[-1].output_data
+
+
+@pytest.mark.asyncio
+async def test_agents_without_opt_in_are_not_cached(response_cache):
+    """Agents keep calling the LLM unless they opt in"""
+    agent = make_agent(PlainAgent, response_cache)
+
+    await agent.process({"question": "q"})
+    await agent.process({"question": "q"})
+
+    assert agent.llm_client.invoke.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_disabled_by_settings(response_cache, monkeypatch):
+    """LLM_CACHE_ENABLED=false turns caching off for every agent"""
+    from text2x.config import settings
+
+    monkeypatch.setattr(settings, "llm_cache_enabled", False)
+    agent = make_agent(CachingAgent, response_cache)
+
+    await agent.process({"question": "q"})
+    await agent.process({"question": "q"})
+
+    assert agent.llm_client.invoke.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_trace_records_cache_usage(response_cache):
+    """Reasoning traces report hits, misses and saved tokens"""
+    agent = make_agent(CachingAgent, response_cache)
+
+    await agent.process({"question": "q"})
+    await agent.process({"question": "q"})
+
+    first, second = agent.get_traces()
+    assert first.output_data["llm_cache"] == {"hits": 0, "misses": 1, "saved_tokens": 0}
+    assert second.output_data["llm_cache"] == {"hits": 1, "misses": 0, "saved_tokens": 120}
@@ -0,0 +1,103 @@
+"""Tests for context-variable log enrichment and queued JSON logging"""
+import asyncio
+import json
+import logging
+
+import pytest
+
+from text2x.utils import observability
+from text2x.utils.observability import (
+    LogContext,
+    LogContextFilter,
+    async_log_context,
+    correlation_context,
+    get_structured_logger,
+    setup_json_logging,
+    stop_log_listener,
+)
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.addFilter(LogContextFilter())
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def handler():
+    logger = logging.getLogger("test.log_context")
+    handler = RecordingHandler()
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    yield handler
+    logger.removeHandler(handler)
+    logger.filters.clear()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_keep_their_own_context(handler):
+    """Each task's records carry only that task's fields"""
+    logger = logging.getLogger("test.log_context")
+
+    async def work(turn: int):
+        async with async_log_context(conversation_id="c1", turn_id=str(turn)):
+            await asyncio.sleep(0)
+            logger.info("step")
+
+    await asyncio.gather(*(work(turn) for turn in range(5)))
+    logger.info("outside")
+
+    assert sorted(r.turn_id for r in handler.records[:5]) == ["0", "1", "2", "3", "4"]
+    assert {r.conversation_id for r in handler.records[:5]} == {"c1"}
+    assert not hasattr(handler.records[5], "turn_id")
+    assert logging.getLogRecordFactory() is logging.LogRecord
+
+
+def test_precedence_of_extra_context_and_defaults(handler):
+    """extra beats the log context, which beats a logger's defaults"""
+    logger = get_structured_logger("test.log_context", provider_id="default", user_id="u0")
+
+    with correlation_context("cid"), LogContext(provider_id="outer"):
+        with LogContext(turn_id="t1"):
+            logger.info("nested")
+        logger.info("explicit", extra={"provider_id": "extra"})
+
+    nested, explicit = handler.records
+    assert (nested.provider_id, nested.turn_id, nested.user_id) == ("outer", "t1", "u0")
+    assert nested.correlation_id == "cid"
+    assert explicit.provider_id == "extra"
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    saved = root.handlers[:], root.level
+    flags = logging.logThreads, logging.logProcesses, logging.logMultiprocessing
+    yield root
+    stop_log_listener()
+    root.handlers, root.level = saved[0], saved[1]
+    logging.logThreads, logging.logProcesses, logging.logMultiprocessing = flags
+
+
+def test_queued_json_logging(root_logger, capsys):
+    """Records are written as JSON by the listener thread, with context and traceback"""
+    setup_json_logging("INFO", use_queue=True)
+    assert observability._log_listener is not None
+    logger = logging.getLogger("test.log_context.queue")
+
+    with LogContext(conversation_id="c9"):
+        try:
+            raise ValueError("bad input")
+        except ValueError:
+            logger.exception("Failed %s", "turn")
+    stop_log_listener()
+
+    line = json.loads(capsys.readouterr().err.strip().splitlines()[-1])
+    assert line["message"] == "Failed turn"
+    assert line["conversation_id"] == "c9"
+    assert "ValueError: bad input" in line["exc_info"]
+    assert line["timestamp"].endswith("Z") and "%f" not in line["timestamp"]
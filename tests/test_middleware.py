@@ -0,0 +1,91 @@
+"""Tests for the request tracing ASGI middleware"""
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from text2x.api.middleware import RequestTracingMiddleware
+from text2x.utils.observability import REGISTRY, get_correlation_id
+
+
+def make_app(**options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"correlation_id": get_correlation_id()}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def events():
+            for number in range(3):
+                yield f"data: {number} {get_correlation_id()}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/boom")
+    async def boom() -> dict:
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestTracingMiddleware, **options)
+    return app
+
+
+def client(app: FastAPI) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+def requests_total(endpoint: str, status: str) -> float:
+    return REGISTRY.get_sample_value(
+        "text2dsl_http_requests_total",
+        {"method": "GET", "endpoint": endpoint, "status_code": status},
+    ) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_correlation_id_and_metrics():
+    """The correlation ID is set for the endpoint and returned; metrics are recorded"""
+    before = requests_total("/ping", "200")
+    async with client(make_app()) as http:
+        generated = await http.get("/ping")
+        forwarded = await http.get("/ping", headers={"X-Correlation-ID": "abc-123"})
+
+    assert generated.headers["X-Correlation-ID"] == generated.json()["correlation_id"]
+    assert forwarded.headers["X-Correlation-ID"] == "abc-123"
+    assert forwarded.json() == {"correlation_id": "abc-123"}
+    assert requests_total("/ping", "200") == before + 2
+
+
+@pytest.mark.asyncio
+async def test_streaming_responses_pass_through():
+    """Streamed chunks arrive unbuffered, with the correlation ID still set"""
+    async with client(make_app()) as http:
+        async with http.stream("GET", "/stream", headers={"X-Correlation-ID": "s-1"}) as response:
+            chunks = [chunk async for chunk in response.aiter_text()]
+
+    assert response.headers["X-Correlation-ID"] == "s-1"
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "".join(chunks) == "".join(f"data: {n} s-1\n\n" for n in range(3))
+
+
+@pytest.mark.asyncio
+async def test_request_logs_are_sampled(caplog):
+    """Sampled-out requests are not logged; failed and slow requests always are"""
+    before = requests_total("/boom", "500")
+    caplog.set_level(logging.INFO, logger="text2x.api.middleware")
+
+    async with client(make_app(sample_rate=0.0)) as http:
+        await http.get("/ping")
+        assert not caplog.records
+        assert (await http.get("/boom")).status_code == 500
+
+    assert [r.getMessage() for r in caplog.records] == ["Request failed"]
+    assert requests_total("/boom", "500") == before + 1
+
+    caplog.clear()
+    async with client(make_app(sample_rate=0.0, slow_ms=0)) as http:
+        await http.get("/ping")
+    assert [r.status_code for r in caplog.records] == [200]
@@ -0,0 +1,126 @@
+"""Tests for the in-process cache of authenticated principals"""
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from text2x.api.auth import get_current_user_from_token, invalidate_principal
+from text2x.config import settings
+from text2x.models.user import UserRole
+from text2x.repositories.user import UserRepository
+from text2x.services import tiered_cache
+from text2x.services.tiered_cache import INVALIDATION_CHANNEL, dispatch_invalidation
+from text2x.utils.observability import REGISTRY
+
+
+def make_token(user_id: str, issued_at: datetime) -> HTTPAuthorizationCredentials:
+    token = jwt.encode(
+        {
+            "sub": user_id,
+            "email": "analyst@example.com",
+            "roles": ["user"],
+            "exp": issued_at + timedelta(minutes=30),
+            "iat": issued_at,
+            "type": "access",
+        },
+        settings.jwt_secret_key,
+        algorithm=settings.jwt_algorithm,
+    )
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture
+def users(monkeypatch):
+    """Fake user table behind UserRepository.get_by_id, counting reads"""
+    rows = {}
+    reads = []
+
+    async def get_by_id(self, user_id):
+        reads.append(user_id)
+        return rows.get(user_id)
+
+    def add(role=UserRole.USER, is_active=True):
+        now = datetime.utcnow()
+        user = SimpleNamespace(
+            id=uuid4(), email="analyst@example.com", name="Analyst", role=role,
+            is_active=is_active, created_at=now, updated_at=now,
+        )
+        rows[user.id] = user
+        return user
+
+    redis_client = AsyncMock()
+    monkeypatch.setattr(tiered_cache, "_caches", {})
+    monkeypatch.setattr(tiered_cache, "get_shared_redis_client", lambda: redis_client)
+    monkeypatch.setattr(UserRepository, "get_by_id", get_by_id)
+    return SimpleNamespace(add=add, reads=reads, redis=redis_client)
+
+
+def local_hits() -> float:
+    return REGISTRY.get_sample_value(
+        "text2dsl_cache_lookups_total",
+        {"cache": "principals", "tier": "local", "result": "hit"},
+    ) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_principal_is_loaded_once_per_token(users):
+    """Repeated requests with one token read the user table once"""
+    user = users.add(role=UserRole.EXPERT)
+    issued_at = datetime.utcnow().replace(microsecond=0)
+    credentials = make_token(str(user.id), issued_at)
+    hits = local_hits()
+
+    for _ in range(3):
+        principal = await get_current_user_from_token(credentials)
+        assert principal.role == "expert"
+
+    assert len(users.reads) == 1
+    assert local_hits() == hits + 2
+
+    # A newly issued token loads the user again
+    await get_current_user_from_token(make_token(str(user.id), issued_at + timedelta(seconds=1)))
+    assert len(users.reads) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_local_and_broadcast(users):
+    """Role changes evict here at once and are published for other nodes"""
+    user = users.add()
+    credentials = make_token(str(user.id), datetime.utcnow())
+    await get_current_user_from_token(credentials)
+
+    user.role = UserRole.EXPERT
+    await invalidate_principal(str(user.id))
+
+    channel, raw = users.redis.publish.call_args.args
+    assert channel == INVALIDATION_CHANNEL
+    assert json.loads(raw)["prefix"] == f"{user.id}:"
+    assert (await get_current_user_from_token(credentials)).role == "expert"
+    assert len(users.reads) == 2
+
+    # Broadcasts from another node evict the local copy too
+    user.role = UserRole.USER
+    dispatch_invalidation(json.dumps(
+        {"origin": "other-node", "namespace": "principals", "prefix": f"{user.id}:"}
+    ))
+    assert (await get_current_user_from_token(credentials)).role == "user"
+
+
+@pytest.mark.asyncio
+async def test_inactive_user_is_rejected(users):
+    """Inactive users get 403, from the database and from the cache"""
+    user = users.add(is_active=False)
+    credentials = make_token(str(user.id), datetime.utcnow())
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user_from_token(credentials)
+        assert exc_info.value.status_code == 403
+
+    assert len(users.reads) == 1
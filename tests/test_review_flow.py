@@ -616,6 +616,32 @@ async def test_rag_search_examples(rag_service, rag_repo):
     assert all(r.provider_id == "postgresql" for r in results)
 
 
+@pytest.mark.asyncio
+async def test_rag_search_with_tables_filter(rag_service):
+    """Test searching only examples involving given tables."""
+    for nl_query, tables in (
+        ("Count all orders", ["orders"]),
+        ("Count all customers", ["customers"]),
+    ):
+        await rag_service.add_example(
+            nl_query=nl_query,
+            generated_query="SELECT COUNT(*) FROM t",
+            is_good=True,
+            provider_id="postgresql",
+            involved_tables=tables,
+            query_intent="aggregation",
+            auto_approve=True,
+        )
+
+    results = await rag_service.search_examples(
+        query="Count all rows",
+        provider_id="postgresql",
+        tables=["customers"],
+    )
+
+    assert [r.natural_language_query for r in results] == ["Count all customers"]
+
+
 @pytest.mark.asyncio
 async def test_rag_search_with_intent_filter(rag_service):
     """Test searching with intent filter."""
@@ -1,4 +1,5 @@
 """Tests for Splunk Provider"""
+import asyncio
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from src.text2x.providers.splunk_provider import (
@@ -11,7 +12,9 @@ from src.text2x.providers.base import (
     ProviderCapability,
     ValidationResult,
     ExecutionResult,
+    search_job_scope,
 )
+from tests.splunk_stand_in import SplunkStandIn, serve
 
 
 @pytest.fixture
@@ -35,16 +38,36 @@ def mock_splunk_service():
     # Mock indexes
     index_mock = Mock()
     index_mock.name = "main"
-    index_mock.get = Mock(side_effect=lambda k, default=0: {
+    index_mock.content = {
         'totalEventCount': 1000,
         'currentDBSizeMB': 50.5,
-    }.get(k, default))
+    }
 
     service.indexes = [index_mock]
 
     return service
 
 
+@pytest.fixture
+def stand_in():
+    """Splunk REST stand-in state"""
+    return SplunkStandIn()
+
+
+@pytest.fixture
+def stand_in_provider(stand_in):
+    """Provider pointed at a local Splunk REST stand-in"""
+    with serve(stand_in) as server:
+        config = SplunkConnectionConfig(
+            host="127.0.0.1",
+            port=server.server_address[1],
+            username="admin",
+            password="changeme",
+            scheme="http",
+        )
+        yield SplunkProvider(config)
+
+
 class TestSplunkProvider:
     """Test suite for SplunkProvider"""
 
@@ -120,68 +143,50 @@ class TestSplunkProvider:
             assert any("search" in w.lower() for w in result.warnings)
 
     @pytest.mark.asyncio
-    @patch('src.text2x.providers.splunk_provider.JSONResultsReader')
-    @patch('src.text2x.providers.splunk_provider.client.connect')
-    async def test_execute_query_success(self, mock_connect, mock_results_reader, splunk_config):
+    async def test_execute_query_success(self, stand_in_provider, stand_in):
         """Test successful query execution"""
-        # Setup mock
-        mock_service = Mock()
-        mock_job = Mock()
-        mock_job.sid = "12345"
-        mock_job.is_done = Mock(return_value=True)
-        mock_job.get = Mock(side_effect=lambda k, default=0: {
-            'doneProgress': '1.0',
-            'eventCount': '100',
-            'resultCount': '100',
-            'scanCount': '100',
-            'runDuration': '1.5',
-            'isFailed': '0',
-        }.get(k, str(default)))
-
-        # Mock results
-        mock_results = [
-            {'_time': '2024-01-01', 'host': 'server1', 'message': 'error'},
-            {'_time': '2024-01-02', 'host': 'server2', 'message': 'warning'},
-        ]
-        mock_results_reader.return_value = iter(mock_results)
-        mock_job.results = Mock()
-        mock_job.cancel = Mock()
-
-        mock_service.jobs.create = Mock(return_value=mock_job)
-        mock_connect.return_value = mock_service
-
-        provider = SplunkProvider(splunk_config)
-        result = await provider.execute_query("search index=main error", limit=10)
+        result = await stand_in_provider.execute_query("search index=main error", limit=100)
 
         assert result.success
-        assert result.row_count == 2
-        assert len(result.sample_rows) == 2
+        assert result.row_count == 25
+        assert len(result.sample_rows) == 10
         assert '_time' in result.columns
 
     @pytest.mark.asyncio
-    @patch('src.text2x.providers.splunk_provider.client.connect')
-    async def test_execute_query_failure(self, mock_connect, splunk_config):
-        """Test query execution failure"""
-        # Setup mock for failed job
-        mock_service = Mock()
-        mock_job = Mock()
-        mock_job.sid = "12345"
-        mock_job.is_done = Mock(return_value=True)
-        mock_job.get = Mock(side_effect=lambda k, default=0: {
-            'isFailed': '1',
-            'messages': 'Invalid search command',
-        }.get(k, str(default)))
-
-        mock_service.jobs.create = Mock(return_value=mock_job)
-        mock_connect.return_value = mock_service
+    async def test_execute_query_records_job_in_scope(self, stand_in_provider, stand_in):
+        """Jobs started by execute_query are collected by the enclosing search_job_scope"""
+        with search_job_scope() as sids:
+            await stand_in_provider.execute_query("search index=main error", limit=100)
 
-        provider = SplunkProvider(splunk_config)
-        result = await provider.execute_query("search invalid syntax", limit=10)
+        assert len(sids) == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_query_failure(self, stand_in_provider):
+        """Test query execution failure"""
+        result = await stand_in_provider.execute_query("search failing", limit=10)
 
         assert not result.success
         # The error message should contain the message from Splunk
-        assert result.error is not None
-        assert len(result.error) > 0
+        assert "Search failed on indexer" in result.error
+
+    @pytest.mark.asyncio
+    async def test_over_budget_search_is_cancelled_while_running(
+        self, stand_in_provider, stand_in, monkeypatch
+    ):
+        """The executing job's progress is extrapolated; over budget, it is cancelled"""
+        from text2x.services.cost_guard import CostBudget
+
+        monkeypatch.setattr("text2x.providers.splunk_provider.COST_ESTIMATE_SECONDS", 0.2)
+        stand_in.polls_until_done = 1000
+        stand_in_provider.cost_budget = CostBudget(max_estimated_rows=1000)
+
+        result = await stand_in_provider.execute_query("search index=main", limit=10)
+
+        assert not result.success
+        assert "exceeds the cost budget" in result.error
+        assert len(stand_in.searches) == 1  # the search is dispatched once
+        assert stand_in.cancelled == ["sid1"]
+        assert ProviderCapability.COST_ESTIMATION not in stand_in_provider.get_capabilities()
 
     def test_factory_function(self):
         """Test factory function"""
@@ -198,46 +203,29 @@ class TestSplunkProvider:
         assert provider.config.username == "admin"
 
     @pytest.mark.asyncio
-    @patch('src.text2x.providers.splunk_provider.client.connect')
-    async def test_search_job_cancellation(self, mock_connect, splunk_config):
+    async def test_search_job_cancellation(self, stand_in_provider, stand_in):
         """Test search job cancellation"""
-        mock_service = Mock()
-        mock_job = Mock()
-        mock_job.cancel = Mock()
-
-        mock_service.job = Mock(return_value=mock_job)
-        mock_connect.return_value = mock_service
-
-        provider = SplunkProvider(splunk_config)
-        result = await provider.cancel_search_job("test_sid_123")
+        result = await stand_in_provider.cancel_search_job("test_sid_123")
 
         assert result is True
-        mock_job.cancel.assert_called_once()
+        assert stand_in.cancelled == ["test_sid_123"]
 
     @pytest.mark.asyncio
-    @patch('src.text2x.providers.splunk_provider.client.connect')
-    async def test_get_search_job_status(self, mock_connect, splunk_config):
+    async def test_get_search_job_status(self, stand_in_provider, stand_in):
         """Test getting search job status"""
-        mock_service = Mock()
-        mock_job = Mock()
-        mock_job.sid = "test_sid"
-        mock_job.get = Mock(side_effect=lambda k, default=0: {
-            'dispatchState': 'RUNNING',
-            'doneProgress': '0.5',
-            'eventCount': '50',
-            'resultCount': '50',
-        }.get(k, str(default)))
-
-        mock_service.job = Mock(return_value=mock_job)
-        mock_connect.return_value = mock_service
+        sid = stand_in.run_search("search index=main")
 
-        provider = SplunkProvider(splunk_config)
-        status = await provider.get_search_job_status("test_sid")
+        status = await stand_in_provider.get_search_job_status(sid)
 
         assert status is not None
-        assert status.sid == "test_sid"
+        assert status.sid == sid
         assert status.status == SearchJobStatus.RUNNING
-        assert status.event_count == 50
+        assert status.event_count == 25
+
+    @pytest.mark.asyncio
+    async def test_get_search_job_status_unknown_sid(self, stand_in_provider):
+        """Test status of a job that does not exist"""
+        assert await stand_in_provider.get_search_job_status("missing") is None
 
     @pytest.mark.asyncio
     async def test_close_connection(self, splunk_config):
@@ -249,6 +237,75 @@ class TestSplunkProvider:
         assert provider._service is None
 
 
+class TestSplunkSearchJobs:
+    """Test suite for the async search job lifecycle"""
+
+    @pytest.mark.asyncio
+    async def test_job_is_polled_not_blocking(self, stand_in_provider, stand_in):
+        """Test jobs are submitted in normal mode and polled until done"""
+        stand_in.polls_until_done = 4
+
+        result = await stand_in_provider.execute_query("search index=main", limit=100)
+
+        assert result.success
+        assert stand_in.status_polls == 4
+
+    @pytest.mark.asyncio
+    async def test_results_stop_when_sample_is_full(self, stand_in_provider, stand_in):
+        """Test only the sample page is fetched and the job is cleaned up"""
+        await stand_in_provider.execute_query("search index=main", limit=100)
+
+        sid = stand_in.cancelled[-1]
+        assert stand_in.result_requests == [(sid, 0, 10)]
+        assert stand_in_provider.get_active_search_jobs() == []
+
+    @pytest.mark.asyncio
+    async def test_stream_results_pages(self, stand_in_provider, stand_in):
+        """Test results are streamed page by page with offset/count"""
+        sid = stand_in.run_search("search index=main")
+
+        pages = [page async for page in stand_in_provider.stream_results(sid, page_size=10)]
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert [r[1:] for r in stand_in.result_requests] == [(0, 10), (10, 10), (20, 10)]
+
+    @pytest.mark.asyncio
+    async def test_rejected_search(self, stand_in_provider):
+        """Test a search rejected at submission returns Splunk's message"""
+        result = await stand_in_provider.execute_query("| badcommand", limit=10)
+
+        assert not result.success
+        assert "Unknown search command" in result.error
+
+    @pytest.mark.asyncio
+    async def test_expired_session_logs_in_again(self, stand_in_provider, stand_in):
+        """Test a 401 triggers one new login and the request is retried"""
+        await stand_in_provider.get_search_job_status("missing")
+        stand_in.session_valid = False
+
+        result = await stand_in_provider.execute_query("search index=main", limit=100)
+
+        assert result.success
+        assert stand_in.logins == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_cancels_job(self, stand_in_provider, stand_in):
+        """Test a running job is tracked and cancelled with its caller"""
+        stand_in.polls_until_done = 1000
+
+        task = asyncio.create_task(stand_in_provider.execute_query("search index=main", limit=100))
+        while not stand_in_provider.get_active_search_jobs():
+            await asyncio.sleep(0.01)
+        sid = stand_in_provider.get_active_search_jobs()[0].sid
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert sid in stand_in.cancelled
+        assert stand_in_provider.get_active_search_jobs() == []
+
+
 class TestSplunkConnectionConfig:
     """Test suite for SplunkConnectionConfig"""
 
@@ -0,0 +1,113 @@
+"""Tests for Splunk schema discovery against a local stand-in for the Splunk REST API"""
+import pytest
+
+from src.text2x.providers.splunk_provider import SplunkProvider, SplunkConnectionConfig
+from tests.splunk_stand_in import SplunkStandIn, serve
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture
+def stand_in():
+    """Splunk REST stand-in state"""
+    return SplunkStandIn()
+
+
+@pytest.fixture
+def splunk_server(stand_in):
+    """Serve the stand-in over HTTP on a free local port"""
+    with serve(stand_in) as server:
+        yield server
+
+
+@pytest.fixture
+def provider(splunk_server):
+    """Provider pointed at the stand-in"""
+    config = SplunkConnectionConfig(
+        host="127.0.0.1",
+        port=splunk_server.server_address[1],
+        username="admin",
+        password="changeme",
+        scheme="http",
+        max_concurrent_searches=2,
+    )
+    return SplunkProvider(config)
+
+
+# ============================================================================
+# Schema Discovery Tests
+# ============================================================================
+
+
+class TestSplunkSchemaDiscovery:
+    """Schema discovery against the REST stand-in"""
+
+    @pytest.mark.asyncio
+    async def test_sourcetypes_discovered_with_one_search(self, provider, stand_in):
+        """A single tstats search covers the sourcetypes of every index"""
+        schema = await provider.get_schema()
+
+        metadata_searches = [q for q in stand_in.searches if "fieldsummary" not in q]
+        assert len(metadata_searches) == 1
+        assert metadata_searches[0].startswith("| tstats")
+
+        tables = {table.name: table for table in schema.tables}
+        assert set(tables) == {"main", "web", "_internal"}
+        assert tables["main"].row_count == 1000
+        assert "syslog" in tables["main"].comment
+        assert schema.sourcetypes == ["access_combined", "splunkd", "syslog"]
+
+    @pytest.mark.asyncio
+    async def test_columns_come_from_index_sourcetypes(self, provider):
+        """Each index gets the default fields plus its own sourcetypes' fields"""
+        schema = await provider.get_schema()
+        tables = {table.name: table for table in schema.tables}
+
+        web_columns = {column.name: column for column in tables["web"].columns}
+        assert {"_time", "host", "status", "uri"} <= set(web_columns)
+        assert "process" not in web_columns
+        assert "_cd" not in web_columns
+        assert web_columns["status"].type == "number"
+
+        main_columns = {column.name for column in tables["main"].columns}
+        assert {"process", "status", "uri"} <= main_columns
+
+    @pytest.mark.asyncio
+    async def test_session_is_reused(self, provider, stand_in):
+        """All introspection searches share one login"""
+        await provider.get_schema()
+        await provider.execute_query("search index=main | head 1")
+
+        assert stand_in.logins == 1
+
+    @pytest.mark.asyncio
+    async def test_fields_are_cached_per_sourcetype(self, provider, stand_in):
+        """A schema refresh does not resample sourcetypes with cached fields"""
+        await provider.get_schema()
+        field_searches = [q for q in stand_in.searches if "fieldsummary" in q]
+        assert len(field_searches) == 3
+
+        provider._schema_cache = None
+        await provider.get_schema()
+
+        field_searches = [q for q in stand_in.searches if "fieldsummary" in q]
+        assert len(field_searches) == 3
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_bounded_per_index_searches(self, provider, stand_in):
+        """Without tstats, per-index metadata searches run at most N at a time"""
+        stand_in.tstats_enabled = False
+        stand_in.job_delay = 0.05
+
+        schema = await provider.get_schema()
+
+        metadata_searches = [q for q in stand_in.searches if q.startswith("| metadata")]
+        assert len(metadata_searches) == 3
+        assert stand_in.max_in_flight <= 2
+
+        tables = {table.name: table for table in schema.tables}
+        assert "access_combined" in tables["web"].comment
+        assert schema.sourcetypes == ["access_combined", "splunkd", "syslog"]
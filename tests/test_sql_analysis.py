@@ -0,0 +1,187 @@
+"""Tests for local SQL static analysis"""
+from unittest.mock import patch
+
+import pytest
+
+from text2x.providers import ColumnInfo, SchemaDefinition, SQLProvider, SQLConnectionConfig, TableInfo
+from text2x.providers.sql_analysis import SQLStaticAnalyzer
+from text2x.utils.observability import REGISTRY
+from tests.config import TEST_POSTGRES_CONFIG
+
+
+@pytest.fixture
+def schema():
+    return SchemaDefinition(
+        tables=[
+            TableInfo(
+                name="orders",
+                columns=[
+                    ColumnInfo(name="id", type="INTEGER"),
+                    ColumnInfo(name="customer_id", type="INTEGER"),
+                    ColumnInfo(name="amount", type="NUMERIC(10, 2)"),
+                    ColumnInfo(name="status", type="VARCHAR(50)"),
+                ],
+            ),
+            TableInfo(
+                name="customers",
+                columns=[
+                    ColumnInfo(name="id", type="INTEGER"),
+                    ColumnInfo(name="name", type="VARCHAR(100)"),
+                ],
+            ),
+        ]
+    )
+
+
+@pytest.fixture
+def analyzer(schema):
+    return SQLStaticAnalyzer("postgresql", schema)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT o.id, c.name FROM orders o JOIN customers c ON c.id = o.customer_id WHERE o.status = 'paid'",
+        "WITH totals AS (SELECT customer_id, SUM(amount) AS total FROM orders GROUP BY customer_id) "
+        "SELECT c.name, t.total FROM totals t JOIN customers c ON c.id = t.customer_id ORDER BY total DESC",
+        "SELECT name FROM customers c WHERE EXISTS (SELECT 1 FROM orders o WHERE o.customer_id = c.id)",
+        "SELECT status, COUNT(*) AS n FROM orders GROUP BY status ORDER BY n",
+        "SELECT id FROM orders WHERE amount > '10.5'",
+        "SELECT x.anything FROM (SELECT * FROM orders) x",
+        # Views, other schemas and new tables are left to the database
+        "SELECT o.anything FROM order_summary o JOIN orders ON orders.id = o.order_id",
+        "SELECT total FROM archive.orders",
+        "SELECT a.total, o.status FROM archive.orders a JOIN orders o ON o.id = a.id",
+    ],
+)
+def test_valid_queries_pass(analyzer, query):
+    """Queries that resolve against the schema pass with their AST"""
+    result = analyzer.analyze(query)
+
+    assert result.valid, result.error
+    assert result.parsed_query is not None
+
+
+@pytest.mark.parametrize(
+    "query, error",
+    [
+        ("SELECT * FORM orders", "Syntax error"),
+        ("SELECT 1; SELECT 2", "Multiple statements"),
+        ("DELETE FROM orders", "read-only"),
+        ("WITH d AS (DELETE FROM orders RETURNING *) SELECT * FROM d", "read-only"),
+        ("SELECT * INTO archive FROM orders", "INTO"),
+        ("SELECT o.total FROM archive.orders a JOIN orders o ON o.id = a.id", "'total'"),
+        ("SELECT o.stats FROM orders o", "did you mean 'status'"),
+        ("SELECT total FROM orders", "Column 'total' does not exist"),
+        ("SELECT id FROM orders WHERE amount = 'lots'", "Type mismatch"),
+        ("SELECT id FROM orders WHERE id IN ('1', 'two')", "Type mismatch"),
+    ],
+)
+def test_invalid_queries_are_rejected(analyzer, query, error):
+    """Bad queries are rejected with a specific error"""
+    result = analyzer.analyze(query)
+
+    assert not result.valid
+    assert error in result.error
+
+
+def test_without_schema_only_statement_checks_run():
+    """References are not resolved until a schema is set"""
+    analyzer = SQLStaticAnalyzer("postgresql")
+
+    assert analyzer.analyze("SELECT anything FROM anywhere").valid
+    assert not analyzer.analyze("DROP TABLE orders").valid
+
+
+@pytest.mark.asyncio
+async def test_provider_skips_database_for_rejected_queries(schema):
+    """Locally rejected queries never reach the database and are counted"""
+    provider = SQLProvider(SQLConnectionConfig(**TEST_POSTGRES_CONFIG))
+    provider.set_schema(schema)
+    avoided_before = REGISTRY.get_sample_value(
+        "text2dsl_validation_round_trips_avoided_total", {"provider_type": "postgresql"}
+    ) or 0
+
+    with patch.object(provider, "_validate_with_database") as database:
+        rejected = await provider.validate_syntax("SELECT nme FROM customers")
+        accepted = await provider.validate_syntax("SELECT name FROM customers")
+
+    assert not rejected.valid and "did you mean 'name'" in rejected.error
+    assert accepted.valid
+    database.assert_called_once_with("SELECT name FROM customers")
+    assert REGISTRY.get_sample_value(
+        "text2dsl_validation_round_trips_avoided_total", {"provider_type": "postgresql"}
+    ) == avoided_before + 1
+    await provider.close()
+
+
+@pytest.mark.parametrize(
+    "dialect, query, expected",
+    [
+        ("postgresql", "SELECT id FROM orders", "SELECT id FROM orders LIMIT 100"),
+        (
+            "postgresql",
+            "WITH t AS (SELECT id FROM orders) SELECT id FROM t",
+            "WITH t AS (SELECT id FROM orders) SELECT id FROM t LIMIT 100",
+        ),
+        (
+            "postgresql",
+            "SELECT id FROM (SELECT id FROM orders LIMIT 5000) s",
+            "SELECT id FROM (SELECT id FROM orders LIMIT 5000) AS s LIMIT 100",
+        ),
+        ("postgresql", "SELECT id FROM orders LIMIT 5", "SELECT id FROM orders LIMIT 5"),
+        ("postgresql", "SELECT id FROM orders LIMIT 500", "SELECT id FROM orders LIMIT 100"),
+        (
+            "postgresql",
+            "SELECT id FROM orders FETCH FIRST 500 ROWS ONLY",
+            "SELECT id FROM orders LIMIT 100",
+        ),
+        (
+            "postgresql",
+            "SELECT id FROM orders FETCH FIRST 50 PERCENT ROWS ONLY",
+            "SELECT * FROM (SELECT id FROM orders FETCH FIRST 50 PERCENT ROWS ONLY) AS _limited"
+            " LIMIT 100",
+        ),
+        ("mssql", "SELECT TOP 500 id FROM orders", "SELECT TOP 100 id FROM orders"),
+        ("oracle", "SELECT id FROM orders", "SELECT id FROM orders FETCH FIRST 100 ROWS ONLY"),
+    ],
+)
+def test_limit_rewrites_the_outermost_query(dialect, query, expected):
+    """Row limits are applied to the outermost query in the dialect's syntax"""
+    assert SQLStaticAnalyzer(dialect).limit(query, 100) == expected
+
+
+def test_limit_leaves_non_queries_alone():
+    """Statements that are not a single query are not rewritten"""
+    analyzer = SQLStaticAnalyzer("postgresql")
+
+    assert analyzer.limit("DELETE FROM orders", 100) is None
+    assert analyzer.limit("SELECT 1; SELECT 2", 100) is None
+
+
+@pytest.mark.asyncio
+async def test_execution_stops_at_the_byte_cap():
+    """Results cut off at the row limit or the byte cap are marked truncated"""
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import StaticPool
+
+    provider = SQLProvider(SQLConnectionConfig(**TEST_POSTGRES_CONFIG))
+    provider.config.dialect = "sqlite"
+    provider.analyzer = SQLStaticAnalyzer("sqlite")
+    provider.engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    with provider.engine.begin() as conn:
+        conn.execute(text("CREATE TABLE notes (body TEXT)"))
+        conn.execute(text("INSERT INTO notes VALUES " + ", ".join(["('0123456789')"] * 300)))
+
+    limited = await provider.execute_query(
+        "WITH n AS (SELECT body FROM notes) SELECT body FROM n", limit=50
+    )
+    complete = await provider.execute_query("SELECT body FROM notes LIMIT 50", limit=50)
+    provider.provider_config.max_result_bytes = 100
+    capped = await provider.execute_query("SELECT body FROM notes", limit=50)
+
+    assert limited.row_count == 50 and limited.truncated
+    assert complete.row_count == 50 and not complete.truncated
+    assert capped.success and capped.row_count == 10 and capped.truncated
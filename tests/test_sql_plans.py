@@ -0,0 +1,195 @@
+"""Tests for plan-only validation and planner estimates"""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from text2x.providers import PlanEstimate, SQLProvider, SQLConnectionConfig
+from text2x.providers.sql_plans import (
+    parse_mysql_plan,
+    parse_postgres_plan,
+    parse_sqlite_plan,
+    parse_text_plan,
+)
+from tests.config import TEST_POSTGRES_CONFIG
+
+# EXPLAIN (FORMAT JSON) of a join + aggregate, captured from PostgreSQL 16
+POSTGRES_PLAN = [{"Plan": {
+    "Node Type": "Aggregate", "Startup Cost": 69.74, "Total Cost": 72.24, "Plan Rows": 200, "Plan Width": 64,
+    "Plans": [{
+        "Node Type": "Hash Join", "Startup Cost": 38.58, "Total Cost": 63.74, "Plan Rows": 1200, "Plan Width": 64,
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "orders", "Alias": "o",
+             "Startup Cost": 0.0, "Total Cost": 22.0, "Plan Rows": 1200, "Plan Width": 36},
+            {"Node Type": "Hash", "Startup Cost": 22.7, "Total Cost": 22.7, "Plan Rows": 1270, "Plan Width": 36,
+             "Plans": [{"Node Type": "Index Scan", "Relation Name": "customers", "Alias": "c",
+                        "Startup Cost": 0.0, "Total Cost": 22.7, "Plan Rows": 1270, "Plan Width": 36}]},
+        ],
+    }],
+}}]
+
+REDSHIFT_PLAN = [
+    "XN HashAggregate  (cost=20000000069.74..20000000072.24 rows=200 width=64)",
+    "  ->  XN Hash Join DS_BCAST_INNER  (cost=38.58..63.74 rows=1200 width=64)",
+    "        Hash Cond: (\"outer\".customer_id = \"inner\".id)",
+    "        ->  XN Seq Scan on orders o  (cost=0.00..22.00 rows=1200 width=36)",
+    "        ->  XN Hash  (cost=22.70..22.70 rows=1270 width=36)",
+    "              ->  XN Seq Scan on customers c  (cost=0.00..22.70 rows=1270 width=36)",
+]
+
+# SELECT ... LIMIT 100 over a large scan, and over a sort that reads everything first
+LIMITED_POSTGRES_PLAN = [{"Plan": {
+    "Node Type": "Limit", "Startup Cost": 0.0, "Total Cost": 1.8, "Plan Rows": 100, "Plan Width": 36,
+    "Plans": [{"Node Type": "Seq Scan", "Relation Name": "events",
+               "Startup Cost": 0.0, "Total Cost": 18000.0, "Plan Rows": 1000000, "Plan Width": 36}],
+}}]
+SORTED_POSTGRES_PLAN = [{"Plan": {
+    "Node Type": "Limit", "Startup Cost": 900.0, "Total Cost": 900.3, "Plan Rows": 100, "Plan Width": 36,
+    "Plans": [{
+        "Node Type": "Sort", "Startup Cost": 900.0, "Total Cost": 950.0, "Plan Rows": 1000000, "Plan Width": 36,
+        "Plans": [{"Node Type": "Seq Scan", "Relation Name": "events",
+                   "Startup Cost": 0.0, "Total Cost": 18000.0, "Plan Rows": 1000000, "Plan Width": 36}],
+    }],
+}}]
+
+LIMITED_REDSHIFT_PLAN = [
+    "XN Limit  (cost=0.00..1.00 rows=100 width=36)",
+    "  ->  XN Seq Scan on events  (cost=0.00..10000.00 rows=1000000 width=36)",
+]
+
+MYSQL_PLAN = json.dumps({"query_block": {
+    "select_id": 1,
+    "cost_info": {"query_cost": "412.50"},
+    "nested_loop": [
+        {"table": {"table_name": "o", "access_type": "ALL", "rows_examined_per_scan": 1000,
+                   "rows_produced_per_join": 1000}},
+        {"table": {"table_name": "c", "access_type": "eq_ref", "rows_examined_per_scan": 1,
+                   "rows_produced_per_join": 1000}},
+    ],
+}})
+
+
+def test_postgres_json_plan():
+    """Root costs and rows, and every sequentially scanned relation"""
+    estimate = parse_postgres_plan(json.dumps(POSTGRES_PLAN))
+
+    assert estimate.total_cost == 72.24
+    assert estimate.startup_cost == 69.74
+    assert estimate.estimated_rows == 200
+    assert estimate.estimated_bytes == 200 * 64
+    assert estimate.full_scans == ["orders"]
+    assert estimate.node_types == ["Aggregate", "Hash Join", "Seq Scan", "Hash", "Index Scan"]
+
+
+def test_redshift_text_plan():
+    """Redshift's text EXPLAIN yields the same estimates"""
+    estimate = parse_text_plan(REDSHIFT_PLAN)
+
+    assert estimate.total_cost == 20000000072.24
+    assert estimate.estimated_rows == 200
+    assert estimate.full_scans == ["orders", "customers"]
+    assert estimate.node_types[1] == "Hash Join DS_BCAST_INNER"
+
+
+def test_scans_under_a_limit_are_capped():
+    """A top-level Limit caps the scans feeding it, unless a sort reads them in full"""
+    limited = parse_postgres_plan(json.dumps(LIMITED_POSTGRES_PLAN))
+    assert limited.scanned_bytes == 100 * 36
+    assert limited.full_scans == []
+
+    sorted_ = parse_postgres_plan(json.dumps(SORTED_POSTGRES_PLAN))
+    assert sorted_.scanned_bytes == 1000000 * 36
+    assert sorted_.full_scans == ["events"]
+
+    redshift = parse_text_plan(LIMITED_REDSHIFT_PLAN)
+    assert redshift.scanned_bytes == 100 * 36
+    assert redshift.full_scans == []
+    assert parse_text_plan(REDSHIFT_PLAN).scanned_bytes == 1200 * 36 + 1270 * 36
+
+
+def test_mysql_json_plan():
+    """Query cost, rows of the last joined table and full scans (access_type ALL)"""
+    estimate = parse_mysql_plan(MYSQL_PLAN)
+
+    assert estimate.total_cost == 412.5
+    assert estimate.estimated_rows == 1000
+    assert estimate.full_scans == ["o"]
+
+
+def test_sqlite_query_plan():
+    """SQLite reports access paths only"""
+    estimate = parse_sqlite_plan([(2, 0, 0, "SCAN o"), (4, 0, 0, "SEARCH c USING INTEGER PRIMARY KEY (rowid=?)")])
+
+    assert estimate.total_cost is None
+    assert estimate.full_scans == ["o"]
+    assert estimate.node_types == ["SCAN", "SEARCH"]
+
+
+@pytest.fixture
+def sqlite_provider():
+    """SQL provider whose engine is an in-memory SQLite database"""
+    provider = SQLProvider(SQLConnectionConfig(**TEST_POSTGRES_CONFIG))
+    provider.config.dialect = "sqlite"
+    provider.engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    with provider.engine.begin() as conn:
+        conn.execute(text("CREATE TABLE orders (id INTEGER PRIMARY KEY, amount REAL)"))
+        conn.execute(text("INSERT INTO orders (amount) VALUES (10), (20)"))
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_validation_plans_without_executing(sqlite_provider):
+    """Validation returns the plan and never runs the query"""
+    # Executing this query raises "integer overflow"; planning it does not
+    result = await sqlite_provider.validate_syntax(
+        "SELECT id FROM orders WHERE abs(-9223372036854775808) > 0"
+    )
+
+    assert result.valid, result.error
+    assert result.plan_estimate.source == "sqlite"
+    assert result.plan_estimate.full_scans == ["orders"]
+    assert "Full table scan on: orders" in result.warnings
+    assert "SCAN orders" in await sqlite_provider.explain_query("SELECT id FROM orders")
+
+
+@pytest.mark.asyncio
+async def test_planner_errors_fail_validation(sqlite_provider):
+    """Unknown objects are reported by the planner"""
+    result = await sqlite_provider.validate_syntax("SELECT id FROM missing_table")
+
+    assert not result.valid
+    assert "Database validation failed" in result.error
+
+
+@pytest.mark.asyncio
+async def test_postgres_uses_explain_json_without_analyze():
+    """PostgreSQL is planned with EXPLAIN (FORMAT JSON), never EXPLAIN ANALYZE"""
+    provider = SQLProvider(SQLConnectionConfig(**TEST_POSTGRES_CONFIG))
+    conn = MagicMock()
+    conn.execute.return_value.fetchall.return_value = [(POSTGRES_PLAN,)]
+    provider.engine = MagicMock()
+    provider.engine.connect.return_value.__enter__.return_value = conn
+
+    estimate = await provider.estimate_cost("SELECT 1")
+
+    statement = str(conn.execute.call_args[0][0])
+    assert statement == "EXPLAIN (FORMAT JSON) SELECT 1"
+    assert isinstance(estimate, PlanEstimate) and estimate.total_cost == 72.24
+
+
+@pytest.mark.asyncio
+async def test_unsupported_dialect_skips_database():
+    """Dialects without a plan-only EXPLAIN are not executed to validate them"""
+    provider = SQLProvider(SQLConnectionConfig(**TEST_POSTGRES_CONFIG))
+    provider.config.dialect = "mssql"
+    provider.engine = MagicMock()
+
+    result = await provider.validate_syntax("SELECT 1")
+
+    assert result.valid
+    assert "Database validation skipped" in result.warnings[0]
+    provider.engine.connect.assert_not_called()
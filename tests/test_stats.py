@@ -0,0 +1,156 @@
+"""Tests for aggregate dashboard statistics and their rollups"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text, update
+from sqlalchemy.dialects import postgresql
+
+from text2x.models.conversation import Conversation, ConversationTurn
+from text2x.models.feedback import FeedbackCategory, FeedbackRating, UserFeedback
+from text2x.models.stats import FeedbackDailyStats, RAGExampleStats, StatsRollupState
+import text2x.repositories.stats as stats_module
+from text2x.repositories.stats import StatsRepository, _rag_counts_query
+from text2x.services.feedback_service import FeedbackService
+from text2x.services.rag_service import RAGService
+
+
+@pytest_asyncio.fixture
+async def db(sqlite_db):
+    """Global DatabaseSession on in-memory SQLite"""
+    return await sqlite_db(
+        Conversation.__table__,
+        ConversationTurn.__table__,
+        UserFeedback.__table__,
+        RAGExampleStats.__table__,
+        FeedbackDailyStats.__table__,
+        StatsRollupState.__table__,
+        # rag_examples has Postgres-only column types; statistics only read these
+        ddl=[
+            "CREATE TABLE rag_examples (id CHAR(32) PRIMARY KEY, provider_id VARCHAR(255), "
+            "status VARCHAR(14), created_at DATETIME, updated_at DATETIME)"
+        ],
+    )
+
+
+async def add_examples(db, provider_id, status, count, created_at):
+    async with db.session() as session:
+        for _ in range(count):
+            await session.execute(
+                text("INSERT INTO rag_examples VALUES (:id, :provider, :status, :at, :at)"),
+                {"id": uuid4().hex, "provider": provider_id, "status": status, "at": created_at},
+            )
+
+
+async def add_feedback(db, rating, category, confidence, created_at, updated_at=None):
+    async with db.session() as session:
+        conversation = Conversation(user_id="u1", provider_id="p1")
+        session.add(conversation)
+        await session.flush()
+        turn = ConversationTurn(
+            conversation_id=conversation.id, turn_number=1, user_input="q",
+            generated_query="SELECT 1", confidence_score=confidence,
+        )
+        session.add(turn)
+        await session.flush()
+        session.add(UserFeedback(
+            turn_id=turn.id, rating=rating, feedback_category=category, user_id="u1",
+            created_at=created_at, updated_at=updated_at or datetime.utcnow(),
+        ))
+
+
+def test_rag_counts_are_one_filtered_group_by():
+    sql = str(_rag_counts_query().compile(dialect=postgresql.dialect()))
+
+    assert sql.count("SELECT") == 1
+    assert sql.count("FILTER (WHERE") == 4
+    assert "GROUP BY rag_examples.provider_id" in sql
+
+
+@pytest.mark.asyncio
+async def test_rag_statistics_live_and_from_rollup(db):
+    old = datetime.utcnow() - timedelta(days=3)
+    await add_examples(db, "p1", "PENDING_REVIEW", 3, old)
+    await add_examples(db, "p1", "APPROVED", 2, datetime.utcnow())
+    await add_examples(db, "p2", "REJECTED", 1, datetime.utcnow())
+
+    stats = await RAGService().get_statistics()
+    assert (stats["pending_review"], stats["approved"], stats["rejected"]) == (3, 2, 1)
+    assert stats["total"] == 6
+    assert (await RAGService().get_statistics("p2"))["total"] == 1
+
+    repo = StatsRepository(use_rollups=True)
+    await repo.refresh_rollups()
+    await add_examples(db, "p2", "PENDING_REVIEW", 1, datetime.utcnow())
+    # Rollups lag until the next refresh, which only re-aggregates p2
+    assert (await repo.rag_statistics()).totals.pending_review == 3
+    await repo.refresh_rollups()
+
+    stats = await repo.rag_statistics()
+    assert stats.totals.by_status() == {"pending_review": 4, "approved": 2, "rejected": 1}
+    assert stats.by_provider["p1"].oldest_pending == old
+    assert stats.by_provider["p2"].pending_review == 1
+
+
+@pytest.mark.asyncio
+async def test_feedback_stats_are_exact_with_rollups(db):
+    now = datetime.utcnow()
+    great, incorrect = FeedbackCategory.GREAT_RESULT, FeedbackCategory.INCORRECT_RESULT
+    await add_feedback(db, FeedbackRating.UP, great, 0.9, now - timedelta(days=2))
+    await add_feedback(db, FeedbackRating.DOWN, incorrect, 0.4, now - timedelta(days=1))
+    await add_feedback(db, FeedbackRating.UP, great, 0.7, now)
+    await add_feedback(db, FeedbackRating.UP, great, 0.5, now - timedelta(days=40))
+
+    service = FeedbackService()
+    live = await service.get_stats(days=30)
+    assert (live.total_feedback, live.thumbs_up, live.thumbs_down) == (3, 2, 1)
+    assert live.by_category == {"great_result": 2, "incorrect_result": 1}
+    assert live.avg_confidence_thumbs_up == pytest.approx(0.8)
+    assert live.avg_confidence_thumbs_down == pytest.approx(0.4)
+
+    service.stats_repo = StatsRepository(use_rollups=True)
+    await service.stats_repo.refresh_rollups()
+    async with db.session() as session:
+        rolled_up = await session.execute(select(func.sum(FeedbackDailyStats.feedback_count)))
+        assert rolled_up.scalar() == 3  # every day before today
+    assert (await service.get_stats(days=30)).to_dict() == live.to_dict()
+
+    # A changed category is re-aggregated by the next incremental refresh
+    async with db.session() as session:
+        await session.execute(
+            update(UserFeedback)
+            .where(UserFeedback.rating == FeedbackRating.DOWN)
+            .values(
+                feedback_category=FeedbackCategory.SYNTAX_ERROR, updated_at=datetime.utcnow()
+            )
+        )
+    await service.stats_repo.refresh_rollups()
+    stats = await service.get_stats(days=30)
+    assert stats.by_category == {"great_result": 2, "syntax_error": 1}
+
+
+@pytest.mark.asyncio
+async def test_days_completed_between_refreshes_are_rolled_up(db, monkeypatch):
+    """A day is rolled up even if none of its rows changed in the last refresh lag"""
+    day = datetime(2026, 3, 10)
+    created = day + timedelta(hours=10)
+    await add_feedback(
+        db, FeedbackRating.UP, FeedbackCategory.GREAT_RESULT, 0.9, created, updated_at=created
+    )
+
+    class Clock(datetime):
+        current = day
+
+        @classmethod
+        def utcnow(cls):
+            return cls.current
+
+    monkeypatch.setattr(stats_module, "datetime", Clock)
+    repo = StatsRepository(use_rollups=True)
+    for at in (timedelta(hours=9), timedelta(hours=23, minutes=30), timedelta(days=1, minutes=10)):
+        Clock.current = day + at
+        await repo.refresh_rollups()
+
+    totals = await repo.feedback_by_category(day - timedelta(days=1))
+    assert totals["great_result"].feedback_count == 1
@@ -0,0 +1,527 @@
+"""Tests for the two-level (in-process + Redis) cache."""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from text2x.services import tiered_cache
+from text2x.services.annotation_cache_service import AnnotationCacheService
+from text2x.services.tiered_cache import TieredCache, dispatch_invalidation
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+class FakePipeline:
+    """Queues FakeRedis commands and runs them on execute()."""
+
+    def __init__(self, redis_client):
+        self._redis = redis_client
+        self._commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self._redis.pipeline_executions += 1
+        results = []
+        for name, args, kwargs in self._commands:
+            results.append(await getattr(self._redis, name)(*args, **kwargs))
+        self._commands = []
+        return results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio client."""
+
+    def __init__(self):
+        self.store = {}
+        self.sets = {}
+        self.published = []
+        self.get_calls = 0
+        self.mget_calls = 0
+        self.pipeline_executions = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        self.get_calls += 1
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        self.mget_calls += 1
+        return [self.store.get(key) for key in keys]
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def set(self, key, value, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            if self.store.pop(key, None) is not None or self.sets.pop(key, None) is not None:
+                deleted += 1
+        return deleted
+
+    async def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = (match or "*").rstrip("*")
+        for key in list(self.store):
+            if key.startswith(prefix):
+                yield key
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_redis():
+    """In-memory Redis stand-in."""
+    return FakeRedis()
+
+
+@pytest.fixture
+def cache(fake_redis):
+    """TieredCache backed by the fake Redis."""
+    return TieredCache("test", ttl=60, redis_client=fake_redis, max_local_entries=3)
+
+
+# ============================================================================
+# Read Path Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_local_tier_serves_repeat_reads(cache, fake_redis):
+    """Second read is served from the local LRU without touching Redis"""
+    fake_redis.store["k"] = json.dumps({"a": 1})
+
+    assert await cache.get("k") == {"a": 1}
+    assert await cache.get("k") == {"a": 1}
+
+    assert fake_redis.get_calls == 1
+    stats = cache.stats()
+    assert stats["redis_hits"] == 1
+    assert stats["local_hits"] == 1
+    assert stats["local_hit_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_local_tier_is_size_bounded(cache, fake_redis):
+    """Least recently used entries are evicted once the LRU is full"""
+    for i in range(4):
+        await cache.set(f"k{i}", i)
+
+    assert cache.stats()["local_entries"] == 3
+    assert cache.stats()["evictions"] == 1
+
+    # k0 was evicted locally but is still in Redis
+    assert await cache.get("k0") == 0
+    assert cache.stats()["redis_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_is_treated_as_miss(cache, fake_redis):
+    """Redis read errors fall through to the loader"""
+    fake_redis.get = AsyncMock(side_effect=ConnectionError("down"))
+    loader = AsyncMock(return_value={"v": 1})
+
+    assert await cache.get_or_load("k", loader) == {"v": 1}
+    loader.assert_awaited_once()
+
+
+# ============================================================================
+# Loader Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_misses(cache):
+    """Concurrent misses on one key share a single loader call"""
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"loaded": True}
+
+    results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+
+    assert calls == 1
+    assert all(result == {"loaded": True} for result in results)
+    assert cache.stats()["coalesced_loads"] == 4
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_loader_errors(cache):
+    """Waiters see the loader's exception and the next call retries"""
+
+    async def failing_loader():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        *(cache.get_or_load("k", failing_loader) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    assert await cache.get_or_load("k", AsyncMock(return_value=1)) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_loader_hands_off_to_a_waiter(cache):
+    """Cancelling the caller running a load does not cancel the callers waiting on it"""
+    started = asyncio.Event()
+
+    async def slow_loader():
+        started.set()
+        await asyncio.sleep(10)
+
+    leader = asyncio.ensure_future(cache.get_or_load("k", slow_loader))
+    await started.wait()
+    waiters = [
+        asyncio.ensure_future(cache.get_or_load("k", AsyncMock(return_value={"loaded": True})))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await asyncio.gather(*waiters) == [{"loaded": True}] * 2
+    assert leader.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_caches_nothing(cache, fake_redis):
+    """An explicit ttl of 0 is not replaced by the default TTL"""
+    await cache.set("k", {"v": 1})
+    await cache.set("k", {"v": 2}, ttl=0)
+
+    assert "k" not in fake_redis.store
+    assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_none_results_are_negatively_cached(cache, fake_redis):
+    """A loader returning None is not called again within the negative TTL"""
+    loader = AsyncMock(return_value=None)
+
+    assert await cache.get_or_load("missing", loader) is None
+    assert await cache.get_or_load("missing", loader) is None
+
+    loader.assert_awaited_once()
+    assert fake_redis.store["missing"] == tiered_cache._NEGATIVE_MARKER
+    assert cache.stats()["negative_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_negative_entry_from_redis_is_honoured(fake_redis):
+    """Another node's negative entry stops this node from reloading"""
+    cache = TieredCache("test", ttl=60, redis_client=fake_redis)
+    fake_redis.store["missing"] = tiered_cache._NEGATIVE_MARKER
+    loader = AsyncMock(return_value={"v": 1})
+
+    assert await cache.get_or_load("missing", loader) is None
+    loader.assert_not_awaited()
+
+
+# ============================================================================
+# Invalidation Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_invalidate_clears_both_tiers_and_broadcasts(cache, fake_redis):
+    """Invalidation deletes from Redis, evicts locally and publishes"""
+    await cache.set("k", {"a": 1})
+
+    assert await cache.invalidate("k") == 1
+    assert "k" not in fake_redis.store
+    assert await cache.get("k") is None
+
+    channel, message = fake_redis.published[-1]
+    assert channel == tiered_cache.INVALIDATION_CHANNEL
+    assert message["keys"] == ["k"]
+    assert message["namespace"] == "test"
+
+
+@pytest.mark.asyncio
+async def test_remote_invalidation_evicts_local_copy(fake_redis, monkeypatch):
+    """Messages from other nodes evict the shared cache's local entries"""
+    monkeypatch.setattr(tiered_cache, "_caches", {})
+    cache = tiered_cache.get_tiered_cache("remote-test", ttl=60, redis_client=fake_redis)
+    await cache.set("k", 1)
+    await cache.set("prefix:a", 2)
+
+    # Own broadcasts are ignored
+    dispatch_invalidation(json.dumps(fake_redis.published[-1][1]))
+    assert cache.stats()["local_entries"] == 2
+
+    dispatch_invalidation(
+        json.dumps({"origin": "other-node", "namespace": "remote-test", "keys": ["k"]})
+    )
+    dispatch_invalidation(
+        json.dumps({"origin": "other-node", "namespace": "remote-test", "prefix": "prefix:"})
+    )
+    assert cache.stats()["local_entries"] == 0
+
+
+class FlakyPubSub:
+    """Pub/sub whose first subscription drops, the second delivers a message."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def subscribe(self, channel):
+        self.client.subscriptions += 1
+
+    async def listen(self):
+        if self.client.subscriptions == 1:
+            raise ConnectionError("connection reset")
+        yield {"type": "subscribe"}
+        yield {"type": "message", "data": json.dumps(
+            {"origin": "other-node", "namespace": "flaky-test", "keys": ["k"]}
+        )}
+        self.client.delivered.set()
+        await asyncio.Event().wait()
+
+    async def unsubscribe(self, channel):
+        pass
+
+    async def aclose(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_invalidation_listener_resubscribes_after_errors(fake_redis, monkeypatch):
+    """A failed subscription is retried and stale local entries are dropped"""
+    monkeypatch.setattr(tiered_cache, "_caches", {})
+    cache = tiered_cache.get_tiered_cache("flaky-test", ttl=60, redis_client=fake_redis)
+    await cache.set("k", 1)
+    await cache.set("other", 2)
+
+    fake_redis.subscriptions = 0
+    fake_redis.delivered = asyncio.Event()
+    fake_redis.pubsub = lambda: FlakyPubSub(fake_redis)
+    task = asyncio.create_task(
+        tiered_cache._listen_for_invalidations(fake_redis, initial_backoff=0.01)
+    )
+    try:
+        await asyncio.wait_for(fake_redis.delivered.wait(), timeout=5)
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert fake_redis.subscriptions == 2
+    # Invalidations may have been missed while disconnected
+    assert cache.stats()["local_entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_client_comes_from_app_state(monkeypatch, fake_redis):
+    """Caches without an explicit client use app_state.redis_client"""
+    from text2x.api.state import app_state
+
+    monkeypatch.setattr(app_state, "redis_client", fake_redis)
+    cache = TieredCache("test", ttl=60)
+
+    await cache.set("k", 1)
+    assert fake_redis.store["k"] == "1"
+
+
+# ============================================================================
+# Service Integration Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_annotation_service_uses_local_tier(fake_redis):
+    """Repeated annotation reads do not go back to Redis"""
+    service = AnnotationCacheService(redis_client=fake_redis)
+    connection_id = uuid4()
+    fallback = AsyncMock(return_value={"description": "Users table"})
+
+    for _ in range(3):
+        result = await service.get_table_annotation(connection_id, "users", fallback)
+        assert result == {"description": "Users table"}
+
+    fallback.assert_awaited_once()
+    assert fake_redis.get_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_annotation_loader_failure_is_not_retried(fake_redis):
+    """A failing fallback propagates instead of being called a second time"""
+    service = AnnotationCacheService(redis_client=fake_redis)
+    fallback = AsyncMock(side_effect=RuntimeError("database down"))
+
+    with pytest.raises(RuntimeError, match="database down"):
+        await service.get_table_annotation(uuid4(), "users", fallback)
+    with pytest.raises(RuntimeError):
+        await service.get_all_annotations_for_connection(uuid4(), fallback)
+
+    assert fallback.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_annotation_connection_invalidation_clears_local_tier(fake_redis):
+    """Connection-wide invalidation drops locally cached annotations"""
+    service = AnnotationCacheService(redis_client=fake_redis)
+    connection_id = uuid4()
+    await service.cache_table_annotation(connection_id, "users", {"description": "old"})
+
+    await service.invalidate_all_for_connection(connection_id)
+
+    assert await service.get_table_annotation(connection_id, "users") is None
+
+
+@pytest.mark.asyncio
+async def test_connection_invalidation_uses_tag_set(fake_redis):
+    """Only keys tagged for the connection are deleted, without KEYS"""
+    service = AnnotationCacheService(redis_client=fake_redis)
+    connection_id, other_id = uuid4(), uuid4()
+    await service.cache_table_annotation(connection_id, "users", {"d": 1})
+    await service.cache_column_annotation(connection_id, "users", "id", {"d": 2})
+    await service.cache_table_annotation(other_id, "users", {"d": 3})
+
+    assert await service.invalidate_all_for_connection(connection_id) == 2
+
+    assert service._make_tag_key(connection_id) not in fake_redis.sets
+    assert service._make_table_key(other_id, "users") in fake_redis.store
+    assert await service.get_table_annotation(other_id, "users") == {"d": 3}
+
+
+@pytest.mark.asyncio
+async def test_tagged_writes_are_pipelined(cache, fake_redis):
+    """A tagged write sends SETEX, SADD and EXPIRE in one round trip"""
+    await cache.set("k", 1, tags=["tag"])
+
+    assert fake_redis.pipeline_executions == 1
+    assert fake_redis.sets["tag"] == {"k"}
+
+
+@pytest.mark.asyncio
+async def test_migrate_untagged_keys_runs_once(fake_redis):
+    """Legacy keys are added to their connection's tag set exactly once"""
+    service = AnnotationCacheService(redis_client=fake_redis)
+    connection_id = uuid4()
+    legacy_key = service._make_table_key(connection_id, "orders")
+    fake_redis.store[legacy_key] = json.dumps({"d": 1})
+
+    assert await service.migrate_untagged_keys() == 1
+    assert fake_redis.sets[service._make_tag_key(connection_id)] == {legacy_key}
+    assert await service.migrate_untagged_keys() == 0
+
+    assert await service.invalidate_all_for_connection(connection_id) == 1
+    assert legacy_key not in fake_redis.store
+
+
+# ============================================================================
+# Bulk Operation Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_get_many_uses_one_mget(cache, fake_redis):
+    """Local misses are fetched with a single MGET"""
+    fake_redis.store["a"] = json.dumps(1)
+    fake_redis.store["b"] = tiered_cache._NEGATIVE_MARKER
+    await cache.set("c", 3)
+
+    found = await cache.get_many(["a", "b", "c", "d"])
+
+    assert found == {"a": 1, "b": None, "c": 3}
+    assert fake_redis.mget_calls == 1
+    assert fake_redis.get_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_annotation_bulk_read_calls_fallback_once(fake_redis):
+    """Missing columns are loaded in one fallback call and cached negatively"""
+    service = AnnotationCacheService(redis_client=fake_redis)
+    connection_id = uuid4()
+    await service.cache_column_annotation(connection_id, "users", "id", {"d": "pk"})
+    fallback = AsyncMock(return_value={"email": {"d": "mail"}})
+
+    result = await service.get_many_columns(
+        connection_id, "users", ["id", "email", "name"], fallback
+    )
+
+    assert result == {"id": {"d": "pk"}, "email": {"d": "mail"}, "name": None}
+    fallback.assert_awaited_once_with(["email", "name"])
+
+    # Second read is served entirely from cache, including the negative entry
+    again = await service.get_many_columns(
+        connection_id, "users", ["id", "email", "name"], fallback
+    )
+    assert again == result
+    fallback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_annotation_cache_many_is_one_round_trip(fake_redis):
+    """Table and column annotations are written with one pipeline"""
+    service = AnnotationCacheService(redis_client=fake_redis)
+    connection_id = uuid4()
+
+    keys = await service.cache_many(
+        connection_id,
+        "orders",
+        {"id": {"d": 1}, "status": {"d": 2}},
+        table_annotation={"d": 0},
+    )
+
+    assert len(keys) == 3
+    assert fake_redis.pipeline_executions == 1
+    assert fake_redis.sets[service._make_tag_key(connection_id)] == set(keys)
+
+
+@pytest.mark.asyncio
+async def test_annotation_invalidate_many_keeps_other_tables(fake_redis):
+    """Bulk invalidation only touches the given table's keys"""
+    service = AnnotationCacheService(redis_client=fake_redis)
+    connection_id = uuid4()
+    await service.cache_many(connection_id, "orders", {"id": {"d": 1}}, {"d": 0})
+    await service.cache_table_annotation(connection_id, "users", {"d": 2})
+
+    assert await service.invalidate_many(connection_id, "orders", ["id"]) == 2
+
+    assert await service.get_column_annotation(connection_id, "orders", "id") is None
+    assert await service.get_table_annotation(connection_id, "users") == {"d": 2}
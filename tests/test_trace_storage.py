@@ -0,0 +1,136 @@
+"""Tests for deduplicated schema contexts and compressed turn traces"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, insert, select, text, update
+
+from text2x.config import settings
+from text2x.models.conversation import Conversation, ConversationTurn
+from text2x.models.trace import SchemaContextRecord, TurnTrace
+from text2x.repositories.conversation import ConversationRepository, ConversationTurnRepository
+from text2x.repositories.trace import TraceRepository
+
+CONTEXT = {"tables": ["orders", "customers"], "relevant_tables": [{"name": "orders"}]}
+LARGE_TRACE = {"steps": [f"step {n}: " + "x" * 200 for n in range(40)], "intent": "filter"}
+
+
+@pytest_asyncio.fixture
+async def db(sqlite_db, monkeypatch):
+    """Global DatabaseSession on in-memory SQLite"""
+    monkeypatch.setattr(settings, "trace_inline_max_bytes", 1024)
+    return await sqlite_db(
+        Conversation.__table__,
+        ConversationTurn.__table__,
+        SchemaContextRecord.__table__,
+        TurnTrace.__table__,
+        # audit_logs has Postgres-only column types; compaction only reads these
+        ddl=[
+            "CREATE TABLE audit_logs (id CHAR(32) PRIMARY KEY, "
+            "schema_context_used JSON, schema_context_hash VARCHAR(64), updated_at DATETIME)"
+        ],
+    )
+
+
+async def scalar(db, stmt):
+    async with db.session() as session:
+        return (await session.execute(stmt)).scalar()
+
+
+async def new_conversation():
+    return (await ConversationRepository().create(user_id="u1", provider_id="p1")).id
+
+
+@pytest.mark.asyncio
+async def test_contexts_are_shared_and_large_traces_compressed(db):
+    conversation_id = await new_conversation()
+    repo = ConversationTurnRepository()
+    small = await repo.create(
+        conversation_id, 1, "q1", "SELECT 1", 0.9,
+        reasoning_trace={"intent": "count"}, schema_context=CONTEXT,
+    )
+    large = await repo.create(
+        conversation_id, 2, "q2", "SELECT 2", 0.8,
+        reasoning_trace=LARGE_TRACE, execution_result={"success": True},
+        schema_context=dict(reversed(list(CONTEXT.items()))),  # same content, other key order
+    )
+
+    assert large.reasoning_trace == LARGE_TRACE and large.schema_context == CONTEXT
+    assert await scalar(db, select(func.count()).select_from(SchemaContextRecord)) == 1
+    assert await scalar(db, select(func.count()).select_from(TurnTrace)) == 1
+    stored = await scalar(db, select(TurnTrace).where(TurnTrace.turn_id == large.id))
+    assert stored.stored_bytes < stored.raw_bytes / 5
+    inline = await scalar(
+        db, select(ConversationTurn.reasoning_trace).where(ConversationTurn.id == large.id)
+    )
+    assert inline is None
+
+    fetched = await repo.get_by_id(large.id)
+    assert fetched.reasoning_trace == LARGE_TRACE
+    assert fetched.execution_result == {"success": True}
+    assert fetched.schema_context == CONTEXT
+    assert (await repo.get_by_id(small.id)).reasoning_trace == {"intent": "count"}
+
+    conversation = await ConversationRepository().get_by_id(conversation_id)
+    assert [turn.reasoning_trace for turn in conversation.turns] == [{"intent": "count"}, LARGE_TRACE]
+
+
+@pytest.mark.asyncio
+async def test_updated_execution_result_moves_between_storages(db):
+    conversation_id = await new_conversation()
+    repo = ConversationTurnRepository()
+    turn = await repo.create(
+        conversation_id, 1, "q", "SELECT 1", 0.9, reasoning_trace={"intent": "count"}
+    )
+
+    preview = [{"id": n, "name": "y" * 50} for n in range(40)]
+    await repo.update(turn.id, execution_result={"success": True, "result_preview": preview})
+    assert await scalar(db, select(func.count()).select_from(TurnTrace)) == 1
+
+    await repo.update(turn.id, execution_result={"success": False})
+    assert await scalar(db, select(func.count()).select_from(TurnTrace)) == 0
+    fetched = await repo.get_by_id(turn.id)
+    assert fetched.execution_result == {"success": False}
+    assert fetched.reasoning_trace == {"intent": "count"}
+
+
+@pytest.mark.asyncio
+async def test_compaction_moves_expires_and_deletes(db):
+    conversation_id = await new_conversation()
+    old = datetime.utcnow() - timedelta(days=200)
+    legacy_id, audit_id = uuid4(), uuid4()
+    async with db.session() as session:
+        await session.execute(insert(ConversationTurn).values(
+            id=legacy_id, conversation_id=conversation_id, turn_number=1, user_input="q",
+            generated_query="SELECT 1", confidence_score=0.9, iterations=1,
+            clarification_needed=False, reasoning_trace=LARGE_TRACE, schema_context=CONTEXT,
+            created_at=datetime.utcnow(), updated_at=datetime.utcnow(),
+        ))
+        await session.execute(
+            text("INSERT INTO audit_logs (id, schema_context_used) VALUES (:id, :context)"),
+            {"id": audit_id.hex, "context": '{"tables": ["orders"]}'},
+        )
+    repo = ConversationTurnRepository()
+    expired = await repo.create(
+        conversation_id, 2, "q2", "SELECT 2", 0.9,
+        reasoning_trace=LARGE_TRACE, schema_context={"tables": ["gone"]},
+    )
+    async with db.session() as session:
+        await session.execute(
+            update(ConversationTurn).where(ConversationTurn.id == expired.id)
+            .values(created_at=old, schema_context_hash=None)
+        )
+        await session.execute(update(SchemaContextRecord).values(last_used_at=old))
+
+    result = await TraceRepository().compact(retention_days=90, batch_size=1)
+
+    assert (result.turns_moved, result.audit_logs_moved) == (1, 1)
+    assert (result.turns_expired, result.schema_contexts_deleted) == (1, 1)
+    legacy = await repo.get_by_id(legacy_id)
+    assert legacy.schema_context == CONTEXT and legacy.reasoning_trace == LARGE_TRACE
+    assert legacy.trace_bytes > settings.trace_inline_max_bytes
+    gone = await repo.get_by_id(expired.id)
+    assert gone.reasoning_trace is None and gone.trace_bytes == 0
+    assert await scalar(db, text("SELECT schema_context_hash FROM audit_logs")) is not None
+    assert await scalar(db, select(func.count()).select_from(SchemaContextRecord)) == 2
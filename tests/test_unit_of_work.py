@@ -0,0 +1,132 @@
+"""Tests for request-scoped units of work on the metadata database"""
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy import Column, Integer, String, func, select
+from sqlalchemy.orm import DeclarativeBase
+
+import text2x.models.base as models_base
+from text2x.api.dependencies import db_unit_of_work
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Note(Base):
+    __tablename__ = "notes"
+
+    id = Column(Integer, primary_key=True)
+    text = Column(String, nullable=False)
+
+
+class NoteRepository:
+    """Repository written like the application's: one ``db.session()`` per call."""
+
+    async def create(self, text: str) -> Note:
+        async with models_base.get_db().session() as session:
+            note = Note(text=text)
+            session.add(note)
+            await session.flush()
+            return note
+
+    async def count(self) -> int:
+        async with models_base.get_db().session() as session:
+            return (await session.execute(select(func.count(Note.id)))).scalar_one()
+
+
+@pytest_asyncio.fixture
+async def db(sqlite_db):
+    """Global DatabaseSession backed by in-memory SQLite, with working savepoints"""
+    return await sqlite_db(Note.__table__, savepoints=True)
+
+
+@pytest.mark.asyncio
+async def test_repository_calls_share_one_commit(db):
+    """Inside a unit of work repositories join one session and commit once"""
+    repo = NoteRepository()
+
+    async with db.unit_of_work() as session:
+        first = await repo.create("a")
+        second = await repo.create("b")
+        assert first.id and second.id
+        assert await repo.count() == 2
+        assert session.in_transaction()
+
+    assert db.commits == 1
+    assert "SAVEPOINT" not in db.statements  # joined scopes add no round trips
+    await repo.create("c")
+    assert db.commits == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_roll_back_the_whole_unit(db):
+    """A failure discards every change made in the unit of work"""
+    repo = NoteRepository()
+
+    with pytest.raises(RuntimeError):
+        async with db.unit_of_work():
+            await repo.create("a")
+            async with db.unit_of_work():  # nested units join the outer one
+                await repo.create("b")
+            raise RuntimeError("boom")
+
+    assert await repo.count() == 0
+    assert db.commits == 1  # only the count's own session
+
+
+@pytest.mark.asyncio
+async def test_handled_error_rolls_back_the_unit(db):
+    """A joined scope that failed without a savepoint stops the unit from committing"""
+    repo = NoteRepository()
+
+    with pytest.raises(RuntimeError, match="unit of work failed"):
+        async with db.unit_of_work():
+            await repo.create("a")
+            with pytest.raises(RuntimeError, match="boom"):
+                async with models_base.get_db().session() as session:
+                    session.add(Note(text="b"))
+                    raise RuntimeError("boom")
+            await repo.create("c")
+
+    assert await repo.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_savepoint_scope_is_not_committed(db):
+    """An error in a savepoint scope discards that scope's changes, not the others'"""
+    repo = NoteRepository()
+
+    async with db.unit_of_work():
+        await repo.create("a")
+        with pytest.raises(RuntimeError):
+            async with models_base.get_db().session(savepoint=True) as session:
+                session.add(Note(text="b"))
+                await repo.create("b2")  # joins the savepoint
+                raise RuntimeError("boom")
+        await repo.create("c")
+
+    async with db.session() as session:
+        texts = (await session.execute(select(Note.text).order_by(Note.id))).scalars().all()
+    assert texts == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_dependency_commits_before_the_response(db):
+    """The FastAPI dependency scopes one unit of work to the endpoint"""
+    app = FastAPI()
+    repo = NoteRepository()
+
+    @app.post("/notes", dependencies=[db_unit_of_work])
+    async def create_notes() -> dict:
+        notes = [await repo.create(text) for text in ("a", "b", "c")]
+        return {"ids": [note.id for note in notes]}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/notes")
+
+    assert response.status_code == 200
+    assert response.json() == {"ids": [1, 2, 3]}
+    assert db.commits == 1
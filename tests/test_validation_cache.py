@@ -0,0 +1,117 @@
+"""Tests for the provider-agnostic validation result cache"""
+from unittest.mock import patch
+
+import pytest
+
+from text2x.providers import (
+    ColumnInfo,
+    PlanEstimate,
+    SchemaDefinition,
+    SQLProvider,
+    SQLConnectionConfig,
+    TableInfo,
+)
+from text2x.services.tiered_cache import TieredCache
+from text2x.services.validation_cache import ValidationCache
+from tests.config import TEST_POSTGRES_CONFIG
+from tests.test_tiered_cache import FakeRedis
+
+
+def make_schema(*columns):
+    return SchemaDefinition(
+        tables=[TableInfo(name="orders", columns=[ColumnInfo(name=c, type="INTEGER") for c in columns])]
+    )
+
+
+@pytest.fixture
+def fake_redis():
+    """In-memory Redis stand-in."""
+    return FakeRedis()
+
+
+@pytest.fixture
+def validation_cache(fake_redis):
+    """Validation cache backed by the fake Redis."""
+    return ValidationCache(TieredCache("validation-test", ttl=3600, redis_client=fake_redis))
+
+
+@pytest.fixture
+def provider():
+    """SQL provider for a metadata connection, with its database EXPLAIN mocked."""
+    provider = SQLProvider(SQLConnectionConfig(**TEST_POSTGRES_CONFIG))
+    provider.connection_id = "conn-1"
+    provider.set_schema(make_schema("id", "amount"))
+    with patch.object(provider, "_validate_with_database", return_value=None) as database:
+        provider.database = database
+        yield provider
+
+
+@pytest.mark.asyncio
+async def test_formatting_variants_share_one_database_validation(validation_cache, provider):
+    """Keyword case, whitespace and a trailing semicolon do not change the key"""
+    first = await validation_cache.validate(provider, "SELECT id FROM orders WHERE amount > 10")
+    second = await validation_cache.validate(provider, "select id\n  from orders\n where amount > 10;")
+
+    assert first.valid and second.valid
+    assert provider.database.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_plan_estimates_are_cached(validation_cache, provider):
+    """Cached results carry the planner estimates"""
+    provider.database.return_value = PlanEstimate(total_cost=72.24, estimated_rows=200, source="postgresql")
+    await validation_cache.validate(provider, "SELECT id FROM orders")
+    cached = await validation_cache.validate(provider, "SELECT id FROM orders")
+
+    assert provider.database.call_count == 1
+    assert cached.plan_estimate == PlanEstimate(total_cost=72.24, estimated_rows=200, source="postgresql")
+
+
+@pytest.mark.asyncio
+async def test_invalid_results_use_the_short_ttl(validation_cache, provider, fake_redis):
+    """Negative results expire after the negative TTL"""
+    validation_cache.negative_ttl = 5
+    provider.database.side_effect = RuntimeError("permission denied for table orders")
+    ttls = {}
+    setex = fake_redis.setex
+
+    async def recording_setex(key, ttl, value):
+        ttls[key] = ttl
+        await setex(key, ttl, value)
+
+    fake_redis.setex = recording_setex
+
+    result = await validation_cache.validate(provider, "SELECT id FROM orders")
+    key = ValidationCache.make_key(provider, "SELECT id FROM orders")
+
+    assert not result.valid
+    assert ttls[key] == 5
+
+
+@pytest.mark.asyncio
+async def test_schema_change_changes_the_key(validation_cache, provider):
+    """A new schema fingerprint forces revalidation"""
+    await validation_cache.validate(provider, "SELECT id FROM orders")
+    provider.set_schema(make_schema("id", "amount", "status"))
+    await validation_cache.validate(provider, "SELECT id FROM orders")
+
+    assert provider.database.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_connection_drops_entries(validation_cache, provider):
+    """Explicit invalidation drops every cached result of the connection"""
+    await validation_cache.validate(provider, "SELECT id FROM orders")
+    await validation_cache.validate(provider, "SELECT amount FROM orders")
+
+    assert await validation_cache.invalidate_connection("conn-1") == 2
+    await validation_cache.validate(provider, "SELECT id FROM orders")
+    assert provider.database.call_count == 3
+
+
+def test_providers_without_connection_do_not_share_entries():
+    """Ad-hoc providers are scoped to their own instance"""
+    config = SQLConnectionConfig(**TEST_POSTGRES_CONFIG)
+    first, second = SQLProvider(config), SQLProvider(config)
+
+    assert ValidationCache.make_key(first, "SELECT 1") != ValidationCache.make_key(second, "SELECT 1")
@@ -1,9 +1,14 @@
 """Tests for WebSocket streaming functionality."""
+import asyncio
 import json
 import pytest
+from fastapi import WebSocketDisconnect
 from fastapi.testclient import TestClient
 
 from text2x.api.app import app
+from text2x.api.websocket import EventRelay, EventType, process_with_controls, stream_agent_events
+from text2x.providers.base import ProviderCapability, record_search_job
+from text2x.providers.splunk_provider import SearchJobStatus, SplunkSearchJob
 
 
 @pytest.fixture
@@ -184,5 +189,209 @@ def test_websocket_enable_execution(client):
             # execution_result might be None if not actually executed, but field should exist
 
 
+class QueueWebSocket:
+    """WebSocket stand-in fed from a queue of client messages."""
+
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+
+    async def receive_json(self):
+        message = await self.incoming.get()
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+
+class SearchJobProvider:
+    """Shared provider running one job for this query and one for another client."""
+
+    def __init__(self):
+        self.jobs = {
+            sid: SplunkSearchJob(sid=sid, status=SearchJobStatus.RUNNING, progress=40.0)
+            for sid in ("sid1", "other")
+        }
+        self.cancelled = []
+
+    def get_capabilities(self):
+        return [ProviderCapability.SEARCH_JOBS]
+
+    def get_active_search_jobs(self):
+        return [job for sid, job in self.jobs.items() if sid not in self.cancelled]
+
+    async def get_search_job_status(self, sid):
+        return self.jobs.get(sid)
+
+    async def cancel_search_job(self, sid):
+        self.cancelled.append(sid)
+        return True
+
+
+async def run_search(seconds, result=None):
+    """Processing that starts search job sid1, as the provider would."""
+    record_search_job("sid1")
+    await asyncio.sleep(seconds)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_job_progress_and_status_are_relayed():
+    """Running jobs are reported and job_status requests are answered"""
+    websocket, provider = QueueWebSocket(), SearchJobProvider()
+    await websocket.incoming.put({"action": "job_status", "sid": "sid1"})
+    await websocket.incoming.put({"action": "job_status"})
+
+    result = await process_with_controls(
+        websocket, run_search(0.1, {"generated_query": "search index=main"}), provider
+    )
+
+    assert result == {"generated_query": "search index=main"}
+    progress = [e for e in websocket.sent if e["type"] == EventType.PROGRESS]
+    assert [e["data"]["job"]["sid"] for e in progress] == ["sid1"]
+    assert progress[0]["data"]["progress"] == 0.4
+    status = [e for e in websocket.sent if e["type"] == EventType.JOB_STATUS]
+    assert status[0]["data"]["jobs"][0]["status"] == "RUNNING"
+    assert [job["sid"] for job in status[1]["data"]["jobs"]] == ["sid1"]
+
+
+@pytest.mark.asyncio
+async def test_other_clients_jobs_are_rejected():
+    """Jobs started by other queries on the shared provider cannot be inspected or cancelled"""
+    websocket, provider = QueueWebSocket(), SearchJobProvider()
+    await websocket.incoming.put({"action": "job_status", "sid": "other"})
+    await websocket.incoming.put({"action": "cancel", "sid": "other"})
+
+    await process_with_controls(websocket, run_search(0.1), provider)
+
+    errors = [e for e in websocket.sent if e["type"] == EventType.ERROR]
+    assert [e["data"]["error"] for e in errors] == ["unknown_job", "unknown_job"]
+    assert not [e for e in websocket.sent if e["type"] == EventType.JOB_STATUS]
+    assert provider.cancelled == []
+
+
+@pytest.mark.asyncio
+async def test_client_cancel_stops_processing():
+    """A cancel message cancels this query's jobs and the processing"""
+    websocket, provider = QueueWebSocket(), SearchJobProvider()
+    await websocket.incoming.put({"action": "cancel"})
+
+    result = await process_with_controls(websocket, run_search(10), provider)
+
+    assert result is None
+    assert provider.cancelled == ["sid1"]
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_jobs():
+    """A disconnect during processing cancels this query's jobs"""
+    websocket, provider = QueueWebSocket(), SearchJobProvider()
+    await websocket.incoming.put(WebSocketDisconnect())
+
+    with pytest.raises(WebSocketDisconnect):
+        await process_with_controls(websocket, run_search(10), provider)
+
+    assert provider.cancelled == ["sid1"]
+
+
+class StreamingAgent:
+    """Agent whose stream yields scripted events."""
+
+    def __init__(self, events, hang=False):
+        self.events = events
+        self.hang = hang
+        self.closed = False
+
+    async def stream(self, agent_input):
+        try:
+            for event in self.events:
+                yield event
+            if self.hang:
+                await asyncio.sleep(10)
+        finally:
+            self.closed = True
+
+
+class SlowWebSocket(QueueWebSocket):
+    """WebSocket stand-in that takes a while to send each event."""
+
+    async def send_json(self, data):
+        await asyncio.sleep(0.01)
+        self.sent.append(data)
+
+
+@pytest.mark.asyncio
+async def test_agent_events_are_streamed():
+    """Token and tool events are forwarded in order before the result is returned"""
+    websocket = QueueWebSocket()
+    agent = StreamingAgent([
+        {"type": "token", "text": "```sql\nSELECT"},
+        {"type": "tool_started", "tool": "validate_query", "tool_use_id": "t1"},
+        {"type": "tool_finished", "tool": "validate_query", "tool_use_id": "t1", "status": "success"},
+        {"type": "token", "text": " 1", "partial_query": "SELECT 1"},
+        {"type": "result", "result": {"generated_query": "SELECT 1"}},
+    ])
+
+    result = await process_with_controls(
+        websocket, stream_agent_events(websocket, agent, {"user_message": "q"}), None
+    )
+
+    assert result == {"generated_query": "SELECT 1"}
+    assert [e["type"] for e in websocket.sent] == [
+        EventType.TOKEN, EventType.TOOL_STARTED, EventType.TOOL_FINISHED, EventType.TOKEN,
+    ]
+    assert websocket.sent[3]["data"] == {"text": " 1", "partial_query": "SELECT 1"}
+
+
+@pytest.mark.asyncio
+async def test_slow_client_gets_merged_tokens():
+    """Token deltas are merged rather than buffered without bound"""
+    websocket = SlowWebSocket()
+    relay = EventRelay(websocket, max_buffered=2)
+    sender = asyncio.create_task(relay.run())
+
+    for i in range(20):
+        await relay.publish(EventType.TOKEN, {"text": str(i % 10), "partial_query": str(i)})
+    await relay.close()
+    await sender
+
+    assert len(websocket.sent) < 20
+    assert "".join(e["data"]["text"] for e in websocket.sent) == "01234567890123456789"
+    assert websocket.sent[-1]["data"]["partial_query"] == "19"
+    assert relay.merged_tokens == 20 - len(websocket.sent)
+
+
+@pytest.mark.asyncio
+async def test_client_cancel_without_search_jobs():
+    """A cancel message stops processing for any provider"""
+    websocket = QueueWebSocket()
+    agent = StreamingAgent([{"type": "token", "text": "SELECT"}], hang=True)
+    await websocket.incoming.put({"action": "cancel"})
+
+    result = await process_with_controls(
+        websocket, stream_agent_events(websocket, agent, {"user_message": "q"}), None
+    )
+
+    assert result is None
+    assert agent.closed
+
+
+@pytest.mark.asyncio
+async def test_disconnect_closes_agent_stream():
+    """A disconnect stops the agent stream"""
+    websocket = QueueWebSocket()
+    agent = StreamingAgent([{"type": "token", "text": "SELECT"}], hang=True)
+    await websocket.incoming.put(WebSocketDisconnect())
+
+    with pytest.raises(WebSocketDisconnect):
+        await process_with_controls(
+            websocket, stream_agent_events(websocket, agent, {"user_message": "q"}), None
+        )
+
+    assert agent.closed
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])